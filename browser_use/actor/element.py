@@ -6,6 +6,15 @@ from typing import TYPE_CHECKING, Literal, Union
 from cdp_use.client import logger
 from typing_extensions import TypedDict
 
+from browser_use.browser.keyboard import (
+	ENTER_KEY_EVENTS,
+	FRAMEWORK_EVENTS_JS,
+	TypingMode,
+	char_key_events,
+	dispatch_key_events_pipelined,
+	insert_text,
+)
+
 if TYPE_CHECKING:
 	from cdp_use.cdp.dom.commands import (
 		DescribeNodeParameters,
@@ -17,6 +26,7 @@ if TYPE_CHECKING:
 		ResolveNodeParameters,
 	)
 	from cdp_use.cdp.input.commands import (
+		DispatchKeyEventParameters,
 		DispatchMouseEventParameters,
 	)
 	from cdp_use.cdp.input.types import MouseButton
@@ -350,8 +360,11 @@ class Element:
 			# Extract key element info for error message
 			raise RuntimeError(f'Failed to click element: {e}')
 
-	async def fill(self, value: str, clear: bool = True) -> None:
-		"""Fill the input element using proper CDP methods with improved focus handling."""
+	async def fill(self, value: str, clear: bool = True, typing_mode: TypingMode | None = None) -> None:
+		"""Fill the input element using proper CDP methods with improved focus handling.
+
+		typing_mode overrides the browser profile's typing_mode ('human', 'pipelined' or 'fast') for this call.
+		"""
 		try:
 			# Use the existing CDP client and session
 			cdp_client = self._client
@@ -417,91 +430,41 @@ class Element:
 				if not cleared_successfully:
 					logger.warning('Text field clearing failed, typing may append to existing text')
 
-			# Step 3: Type the text character by character using proper human-like key events
-			logger.debug(f'Typing text character by character: "{value}"')
+			# Step 3: Type the text, by default character by character using proper human-like key events
+			typing_mode = typing_mode or self._browser_session.browser_profile.typing_mode
+			logger.debug(f'Typing text ({typing_mode} typing): "{value}"')
 
-			for i, char in enumerate(value):
-				# Handle newline characters as Enter key
-				if char == '\n':
-					# Send proper Enter key sequence
-					await cdp_client.send.Input.dispatchKeyEvent(
-						params={
-							'type': 'keyDown',
-							'key': 'Enter',
-							'code': 'Enter',
-							'windowsVirtualKeyCode': 13,
-						},
-						session_id=session_id,
-					)
-
-					# Small delay to emulate human typing speed
-					await asyncio.sleep(0.001)
-
-					# Send char event with carriage return
-					await cdp_client.send.Input.dispatchKeyEvent(
-						params={
-							'type': 'char',
-							'text': '\r',
-							'key': 'Enter',
-						},
-						session_id=session_id,
-					)
-
-					# Send keyUp event
-					await cdp_client.send.Input.dispatchKeyEvent(
-						params={
-							'type': 'keyUp',
-							'key': 'Enter',
-							'code': 'Enter',
-							'windowsVirtualKeyCode': 13,
-						},
+			if typing_mode == 'fast':
+				await insert_text(cdp_client, session_id, value)
+				# Input.insertText skips the key events, let frameworks know the value changed
+				try:
+					await cdp_client.send.Runtime.callFunctionOn(
+						params={'functionDeclaration': FRAMEWORK_EVENTS_JS, 'objectId': object_id, 'returnByValue': True},
 						session_id=session_id,
 					)
-				else:
-					# Handle regular characters
-					# Get proper modifiers, VK code, and base key for the character
-					modifiers, vk_code, base_key = self._get_char_modifiers_and_vk(char)
-					key_code = self._get_key_code_for_char(base_key)
+				except Exception as e:
+					logger.debug(f'Failed to trigger framework events: {e}')
+			elif typing_mode == 'pipelined':
+				key_events = [params for char in value for params in self._key_events_for_char(char)]
+				await dispatch_key_events_pipelined(cdp_client, session_id, key_events)
+			else:
+				for char in value:
+					key_down, key_char, key_up = self._key_events_for_char(char)
 
 					# Step 1: Send keyDown event (NO text parameter)
-					await cdp_client.send.Input.dispatchKeyEvent(
-						params={
-							'type': 'keyDown',
-							'key': base_key,
-							'code': key_code,
-							'modifiers': modifiers,
-							'windowsVirtualKeyCode': vk_code,
-						},
-						session_id=session_id,
-					)
+					await cdp_client.send.Input.dispatchKeyEvent(params=key_down, session_id=session_id)
 
 					# Small delay to emulate human typing speed
 					await asyncio.sleep(0.001)
 
 					# Step 2: Send char event (WITH text parameter) - this is crucial for text input
-					await cdp_client.send.Input.dispatchKeyEvent(
-						params={
-							'type': 'char',
-							'text': char,
-							'key': char,
-						},
-						session_id=session_id,
-					)
+					await cdp_client.send.Input.dispatchKeyEvent(params=key_char, session_id=session_id)
 
 					# Step 3: Send keyUp event (NO text parameter)
-					await cdp_client.send.Input.dispatchKeyEvent(
-						params={
-							'type': 'keyUp',
-							'key': base_key,
-							'code': key_code,
-							'modifiers': modifiers,
-							'windowsVirtualKeyCode': vk_code,
-						},
-						session_id=session_id,
-					)
+					await cdp_client.send.Input.dispatchKeyEvent(params=key_up, session_id=session_id)
 
-				# Add 18ms delay between keystrokes
-				await asyncio.sleep(0.018)
+					# Add 18ms delay between keystrokes
+					await asyncio.sleep(0.018)
 
 		except Exception as e:
 			raise Exception(f'Failed to fill element: {str(e)}')
@@ -829,6 +792,13 @@ class Element:
 				return str(value)
 
 	# Helpers for modifiers etc
+	def _key_events_for_char(self, char: str) -> tuple['DispatchKeyEventParameters', ...]:
+		"""keyDown/char/keyUp events that type one character, newlines are typed as Enter."""
+		if char == '\n':
+			return ENTER_KEY_EVENTS
+		modifiers, vk_code, base_key = self._get_char_modifiers_and_vk(char)
+		return char_key_events(char, base_key, self._get_key_code_for_char(base_key), modifiers, vk_code)
+
 	def _get_char_modifiers_and_vk(self, char: str) -> tuple[int, int, str]:
 		"""Get modifiers, virtual key code, and base key for a character.
 
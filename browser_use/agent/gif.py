@@ -1,15 +1,25 @@
 from __future__ import annotations
 
 import base64
+import functools
+import importlib.util
 import io
 import logging
 import os
 import platform
-from typing import TYPE_CHECKING
-
-from browser_use.agent.views import AgentHistoryList
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+from browser_use.agent.views import AgentHistory, AgentHistoryList
 from browser_use.browser.views import PLACEHOLDER_4PX_SCREENSHOT
 from browser_use.config import CONFIG
+from browser_use.screenshots.image_pool import image_pool
 
 if TYPE_CHECKING:
 	from PIL import Image, ImageFont
@@ -32,6 +42,255 @@ def decode_unicode_escapes_to_utf8(text: str) -> str:
 		return text
 
 
+# Font candidates in order of preference, ArialUni comes with Office and can render most non-alphabet characters
+_FONT_OPTIONS = [
+	'PingFang',
+	'STHeiti Medium',
+	'Microsoft YaHei',  # 微软雅黑
+	'SimHei',  # 黑体
+	'SimSun',  # 宋体
+	'Noto Sans CJK SC',  # 思源黑体
+	'WenQuanYi Micro Hei',  # 文泉驿微米黑
+	'Helvetica',
+	'Arial',
+	'DejaVuSans',
+	'Verdana',
+]
+
+VIDEO_CODECS = {'.mp4': 'libx264', '.webm': 'libvpx-vp9'}
+
+_FONT_PATH: str | None = None
+
+# FreeType fonts must not be shared between threads, every image worker thread loads (and caches) its own
+_thread_fonts = threading.local()
+
+
+def _find_font_path() -> str | None:
+	"""Path (or name) of the first preferred font that can be loaded, cached for the process."""
+	global _FONT_PATH
+	if _FONT_PATH is None:
+		from PIL import ImageFont
+
+		_FONT_PATH = ''
+		for font_name in _FONT_OPTIONS:
+			if platform.system() == 'Windows':
+				# Need to specify the abs font path on Windows
+				font_name = os.path.join(CONFIG.WIN_FONT_DIR, font_name + '.ttf')
+			try:
+				ImageFont.truetype(font_name, 12)
+			except OSError:
+				continue
+			_FONT_PATH = font_name
+			break
+	return _FONT_PATH or None
+
+
+def _load_fonts(
+	font_size: int, title_font_size: int, goal_font_size: int
+) -> tuple[ImageFont.FreeTypeFont, ImageFont.FreeTypeFont, ImageFont.FreeTypeFont]:
+	"""(regular, title, goal) fonts, loaded once per thread and size."""
+	from PIL import ImageFont
+
+	cache: dict[tuple[int, int, int], tuple] = _thread_fonts.__dict__.setdefault('fonts', {})
+	key = (font_size, title_font_size, goal_font_size)
+	fonts = cache.get(key)
+	if fonts is None:
+		font_path = _find_font_path()
+		if font_path:
+			fonts = (
+				ImageFont.truetype(font_path, font_size),
+				ImageFont.truetype(font_path, title_font_size),
+				ImageFont.truetype(font_path, goal_font_size),
+			)
+		else:
+			regular_font = ImageFont.load_default()
+			fonts = (regular_font, ImageFont.load_default(), regular_font)
+		cache[key] = fonts
+	return fonts  # type: ignore[return-value]
+
+
+@functools.cache
+def _load_logo(logo_path: str = './static/browser-use.png', logo_height: int = 150) -> Image.Image | None:
+	"""The logo resized to logo_height, loaded once."""
+	from PIL import Image
+
+	try:
+		with Image.open(logo_path) as logo:
+			aspect_ratio = logo.width / logo.height
+			logo_width = int(logo_height * aspect_ratio)
+			resized = logo.resize((logo_width, logo_height), Image.Resampling.LANCZOS)
+		resized.load()
+		return resized
+	except Exception as e:
+		logger.warning(f'Could not load logo: {e}')
+		return None
+
+
+@dataclass
+class _Frame:
+	"""A rendered frame, encoded for the output format."""
+
+	size: tuple[int, int]
+	gif_blocks: list[bytes] | None = None
+	"""Encoded GIF image blocks (local palette, duration)"""
+	gif_palette_image: Image.Image | None = None
+	"""Paletted frame, only kept for the first frame (the GIF header is built from it)"""
+	video_array: Any = None
+
+
+class _GifWriter:
+	"""Writes a looping GIF block by block, so frames don't have to be kept in memory until the end."""
+
+	def __init__(self, output_path: str, duration: int):
+		self.output_path = output_path
+		self.duration = duration
+		self.canvas_size: tuple[int, int] | None = None
+		self._file: BinaryIO | None = None
+
+	def write(self, frame: _Frame) -> None:
+		from PIL import GifImagePlugin
+
+		if self._file is None:
+			assert frame.gif_palette_image is not None
+			header, _ = GifImagePlugin.getheader(frame.gif_palette_image.copy(), info={'loop': 0, 'duration': self.duration})
+			self._file = open(self.output_path, 'wb')
+			self._file.write(b''.join(header))
+		assert frame.gif_blocks is not None
+		self._file.write(b''.join(frame.gif_blocks))
+
+	def close(self) -> None:
+		if self._file is not None:
+			self._file.write(b';')  # GIF trailer
+			self._file.close()
+			self._file = None
+
+
+class _VideoWriter:
+	"""Appends frames to an MP4/WebM file through one persistent ffmpeg encoder (imageio)."""
+
+	FPS = 2
+
+	def __init__(self, output_path: str, duration: int):
+		self.output_path = output_path
+		self.repeat = max(1, round(duration * self.FPS / 1000))
+		self._writer: Any = None
+
+	def write(self, frame: _Frame) -> None:
+		if self._writer is None:
+			import imageio.v2 as iio  # type: ignore[import-not-found]
+
+			self._writer = iio.get_writer(
+				self.output_path,
+				fps=self.FPS,
+				codec=VIDEO_CODECS[Path(self.output_path).suffix.lower()],
+				quality=8,
+				pixelformat='yuv420p',
+				macro_block_size=None,  # frames are padded to multiples of 16 when they are rendered
+			)
+		for _ in range(self.repeat):
+			self._writer.append_data(frame.video_array)
+
+	def close(self) -> None:
+		if self._writer is not None:
+			self._writer.close()
+			self._writer = None
+
+
+def _encode_frame(image: Image.Image, canvas_size: tuple[int, int], video: bool, duration: int, keep_palette: bool) -> _Frame:
+	"""Fit a rendered frame to the canvas and encode it for the output format (runs in the frame workers)."""
+	from PIL import GifImagePlugin, Image
+
+	image = image.convert('RGB')
+	if image.size != canvas_size:
+		image = image.resize(canvas_size, Image.Resampling.LANCZOS)
+
+	if video:
+		import numpy as np  # type: ignore[import-not-found]
+
+		# pad to the codec's macro block size (16), keeping the frame centered
+		width, height = canvas_size
+		padded_size = (-(-width // 16) * 16, -(-height // 16) * 16)
+		if padded_size != canvas_size:
+			padded = Image.new('RGB', padded_size, (0, 0, 0))
+			padded.paste(image, ((padded_size[0] - width) // 2, (padded_size[1] - height) // 2))
+			image = padded
+		return _Frame(size=canvas_size, video_array=np.asarray(image))
+
+	paletted = image.convert('P', palette=Image.Palette.ADAPTIVE)
+	blocks = GifImagePlugin.getdata(paletted, duration=duration, include_color_table=True)
+	return _Frame(size=canvas_size, gif_blocks=blocks, gif_palette_image=paletted if keep_palette else None)
+
+
+def _render_task_frame(
+	task: str, first_screenshot: str, fonts: tuple[int, int, int], show_logo: bool, line_spacing: float
+) -> Image.Image:
+	regular_font, title_font, _ = _load_fonts(*fonts)
+	return _create_task_frame(
+		task,
+		first_screenshot,
+		title_font,
+		regular_font,
+		_load_logo() if show_logo else None,
+		line_spacing,
+	)
+
+
+def _render_step_frame(
+	item: AgentHistory, step_number: int, fonts: tuple[int, int, int], show_goals: bool, show_logo: bool, margin: int
+) -> Image.Image | None:
+	from PIL import Image
+
+	from browser_use.utils import is_new_tab_page
+
+	screenshot = item.state.get_screenshot()
+	if not screenshot:
+		return None
+
+	# Skip placeholder screenshots from about:blank pages
+	# These are 4x4 white PNGs encoded as a specific base64 string
+	if screenshot == PLACEHOLDER_4PX_SCREENSHOT:
+		logger.debug(f'Skipping placeholder screenshot from about:blank page at step {step_number}')
+		return None
+
+	# Skip screenshots from new tab pages
+	if is_new_tab_page(item.state.url):
+		logger.debug(f'Skipping screenshot from new tab page ({item.state.url}) at step {step_number}')
+		return None
+
+	# Convert base64 screenshot to PIL Image
+	image = Image.open(io.BytesIO(base64.b64decode(screenshot)))
+
+	if show_goals and item.model_output:
+		regular_font, title_font, _ = _load_fonts(*fonts)
+		image = _add_overlay_to_image(
+			image=image,
+			step_number=step_number,
+			goal_text=item.model_output.current_state.next_goal,
+			regular_font=regular_font,
+			title_font=title_font,
+			margin=margin,
+			logo=_load_logo() if show_logo else None,
+		)
+	return image
+
+
+def _render_and_encode(
+	render: Callable[[], Image.Image | None],
+	canvas_size: tuple[int, int],
+	video: bool,
+	duration: int,
+	keep_palette: bool,
+) -> _Frame | None:
+	try:
+		image = render()
+		if image is None:
+			return None
+		return _encode_frame(image, canvas_size, video, duration, keep_palette)
+	except Exception as e:
+		logger.warning(f'Could not render history frame: {type(e).__name__}: {e}')
+		return None
+
+
 def create_history_gif(
 	task: str,
 	history: AgentHistoryList,
@@ -46,34 +305,28 @@ def create_history_gif(
 	goal_font_size: int = 44,
 	margin: int = 40,
 	line_spacing: float = 1.5,
+	frame_window: int = 8,
 ) -> None:
-	"""Create a GIF from the agent's history with overlaid task and goal text."""
-	if not history.history:
-		logger.warning('No history to create GIF from')
-		return
-
-	from PIL import Image, ImageFont
+	"""Create a GIF from the agent's history with overlaid task and goal text.
 
-	images = []
-
-	# if history is empty, we can't create a gif
+	An output_path ending in .mp4 or .webm writes a video instead (needs the `video` extra: imageio + ffmpeg).
+	Frames are decoded and composed on the shared image worker pool and written to the file in order as soon as
+	they are ready, with at most `frame_window` frames in memory at once. This blocks until the file is written, call
+	it from a thread (not an image pool worker) inside async code.
+	"""
 	if not history.history:
 		logger.warning('No history to create GIF from')
 		return
 
-	# Get all screenshots from history (including None placeholders)
-	screenshots = history.screenshots(return_none_if_not_screenshot=True)
-
-	if not screenshots:
-		logger.warning('No screenshots found in history')
+	video = Path(output_path).suffix.lower() in VIDEO_CODECS
+	if video and importlib.util.find_spec('imageio') is None:
+		logger.error('MP4/WebM history videos require optional dependencies. Install them with: pip install "browser-use[video]"')
 		return
 
-	# Find the first non-placeholder screenshot
-	# A screenshot is considered a placeholder if:
-	# 1. It's the exact 4px placeholder for about:blank pages, OR
-	# 2. It comes from a new tab page (chrome://newtab/, about:blank, etc.)
+	# Find the first non-placeholder screenshot, it decides the size of all frames
 	first_real_screenshot = None
-	for screenshot in screenshots:
+	for item in history.history:
+		screenshot = item.state.get_screenshot()
 		if screenshot and screenshot != PLACEHOLDER_4PX_SCREENSHOT:
 			first_real_screenshot = screenshot
 			break
@@ -82,129 +335,59 @@ def create_history_gif(
 		logger.warning('No valid screenshots found (all are placeholders or from new tab pages)')
 		return
 
-	# Try to load nicer fonts
-	try:
-		# Try different font options in order of preference
-		# ArialUni is a font that comes with Office and can render most non-alphabet characters
-		font_options = [
-			'PingFang',
-			'STHeiti Medium',
-			'Microsoft YaHei',  # 微软雅黑
-			'SimHei',  # 黑体
-			'SimSun',  # 宋体
-			'Noto Sans CJK SC',  # 思源黑体
-			'WenQuanYi Micro Hei',  # 文泉驿微米黑
-			'Helvetica',
-			'Arial',
-			'DejaVuSans',
-			'Verdana',
-		]
-		font_loaded = False
-
-		for font_name in font_options:
-			try:
-				if platform.system() == 'Windows':
-					# Need to specify the abs font path on Windows
-					font_name = os.path.join(CONFIG.WIN_FONT_DIR, font_name + '.ttf')
-				regular_font = ImageFont.truetype(font_name, font_size)
-				title_font = ImageFont.truetype(font_name, title_font_size)
-				goal_font = ImageFont.truetype(font_name, goal_font_size)
-				font_loaded = True
-				break
-			except OSError:
-				continue
-
-		if not font_loaded:
-			raise OSError('No preferred fonts found')
-
-	except OSError:
-		regular_font = ImageFont.load_default()
-		title_font = ImageFont.load_default()
-
-		goal_font = regular_font
+	from PIL import Image
 
-	# Load logo if requested
-	logo = None
-	if show_logo:
-		try:
-			logo = Image.open('./static/browser-use.png')
-			# Resize logo to be small (e.g., 40px height)
-			logo_height = 150
-			aspect_ratio = logo.width / logo.height
-			logo_width = int(logo_height * aspect_ratio)
-			logo = logo.resize((logo_width, logo_height), Image.Resampling.LANCZOS)
-		except Exception as e:
-			logger.warning(f'Could not load logo: {e}')
+	with Image.open(io.BytesIO(base64.b64decode(first_real_screenshot))) as first_image:
+		canvas_size = first_image.size
 
-	# Create task frame if requested
+	fonts = (font_size, title_font_size, goal_font_size)
+	renders: list[Callable[[], Image.Image | None]] = []
 	if show_task and task:
-		# Find the first non-placeholder screenshot for the task frame
-		first_real_screenshot = None
-		for item in history.history:
-			screenshot_b64 = item.state.get_screenshot()
-			if screenshot_b64 and screenshot_b64 != PLACEHOLDER_4PX_SCREENSHOT:
-				first_real_screenshot = screenshot_b64
-				break
-
-		if first_real_screenshot:
-			task_frame = _create_task_frame(
-				task,
-				first_real_screenshot,
-				title_font,  # type: ignore
-				regular_font,  # type: ignore
-				logo,
-				line_spacing,
-			)
-			images.append(task_frame)
-		else:
-			logger.warning('No real screenshots found for task frame, skipping task frame')
-
-	# Process each history item with its corresponding screenshot
-	for i, (item, screenshot) in enumerate(zip(history.history, screenshots), 1):
-		if not screenshot:
-			continue
-
-		# Skip placeholder screenshots from about:blank pages
-		# These are 4x4 white PNGs encoded as a specific base64 string
-		if screenshot == PLACEHOLDER_4PX_SCREENSHOT:
-			logger.debug(f'Skipping placeholder screenshot from about:blank page at step {i}')
-			continue
-
-		# Skip screenshots from new tab pages
-		from browser_use.utils import is_new_tab_page
-
-		if is_new_tab_page(item.state.url):
-			logger.debug(f'Skipping screenshot from new tab page ({item.state.url}) at step {i}')
-			continue
-
-		# Convert base64 screenshot to PIL Image
-		img_data = base64.b64decode(screenshot)
-		image = Image.open(io.BytesIO(img_data))
-
-		if show_goals and item.model_output:
-			image = _add_overlay_to_image(
-				image=image,
-				step_number=i,
-				goal_text=item.model_output.current_state.next_goal,
-				regular_font=regular_font,  # type: ignore
-				title_font=title_font,  # type: ignore
-				margin=margin,
-				logo=logo,
-			)
+		renders.append(functools.partial(_render_task_frame, task, first_real_screenshot, fonts, show_logo, line_spacing))
+	for i, item in enumerate(history.history, 1):
+		renders.append(functools.partial(_render_step_frame, item, i, fonts, show_goals, show_logo, margin))
+
+	writer = _VideoWriter(output_path, duration) if video else _GifWriter(output_path, duration)
+	frames_written = 0
+	start = time.perf_counter()
+	pending: deque[Future[_Frame | None]] = deque()
+
+	def write_next() -> None:
+		nonlocal frames_written
+		frame = pending.popleft().result()
+		if frame is not None:
+			writer.write(frame)
+			frames_written += 1
 
-		images.append(image)
-
-	if images:
-		# Save the GIF
-		images[0].save(
-			output_path,
-			save_all=True,
-			append_images=images[1:],
-			duration=duration,
-			loop=0,
-			optimize=False,
+	try:
+		for render in renders:
+			pending.append(
+				image_pool.submit(
+					'history_gif_frame',
+					_render_and_encode,
+					render,
+					canvas_size,
+					video,
+					duration,
+					keep_palette=frames_written == 0,
+				)
+			)
+			if len(pending) >= max(1, frame_window):
+				write_next()
+		while pending:
+			write_next()
+	except BaseException:
+		for future in pending:
+			future.cancel()
+		writer.close()
+		Path(output_path).unlink(missing_ok=True)
+		raise
+	writer.close()
+
+	if frames_written:
+		logger.info(
+			f'Created {"video" if video else "GIF"} at {output_path} ({frames_written} frames in {time.perf_counter() - start:.1f}s)'
 		)
-		logger.info(f'Created GIF at {output_path}')
 	else:
 		logger.warning('No images found in history to create GIF')
 
@@ -12,6 +12,7 @@ from browser_use.llm.messages import (
 	SystemMessage,
 	UserMessage,
 )
+from browser_use.screenshots.service import SCREENSHOT_MEDIA_TYPES
 
 logger = logging.getLogger(__name__)
 
@@ -74,11 +75,12 @@ def construct_judge_messages(
 	for img_path in selected_screenshots:
 		encoded = _encode_image(img_path)
 		if encoded:
+			media_type = SCREENSHOT_MEDIA_TYPES.get(Path(img_path).suffix.lower(), 'image/png')
 			encoded_images.append(
 				ContentPartImageParam(
 					image_url=ImageURL(
-						url=f'data:image/png;base64,{encoded}',
-						media_type='image/png',
+						url=f'data:{media_type};base64,{encoded}',
+						media_type=media_type,  # type: ignore[arg-type]
 					)
 				)
 			)
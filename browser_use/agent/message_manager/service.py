@@ -4,6 +4,7 @@ import logging
 from typing import Literal
 
 from browser_use.agent.message_manager.views import (
+	HistoryDescriptionBuffer,
 	HistoryItem,
 )
 from browser_use.agent.prompts import AgentMessagePrompt
@@ -22,6 +23,7 @@ from browser_use.llm.messages import (
 	SystemMessage,
 )
 from browser_use.observability import observe_debug
+from browser_use.sensitive_data import get_sensitive_data_matcher
 from browser_use.utils import match_url_with_domain_pattern, time_execution_sync
 
 logger = logging.getLogger(__name__)
@@ -132,38 +134,26 @@ class MessageManager:
 		self.sensitive_data = sensitive_data
 		self.last_input_messages = []
 		self.last_state_message_text: str | None = None
+		self._history_buffer = HistoryDescriptionBuffer(max_history_items)
 		# Only initialize messages if state is empty
 		if len(self.state.history.get_messages()) == 0:
 			self._set_message_with_type(self.system_prompt, 'system')
 
 	@property
 	def agent_history_description(self) -> str:
-		"""Build agent history description from list of items, respecting max_history_items limit"""
-		if self.max_history_items is None:
-			# Include all items
-			return '\n'.join(item.to_string() for item in self.state.agent_history_items)
+		"""Build agent history description from list of items, respecting max_history_items limit
 
-		total_items = len(self.state.agent_history_items)
+		Items are rendered once and the description is maintained incrementally, see HistoryDescriptionBuffer.
+		"""
+		self._history_buffer.sync(self.state.agent_history_items)
+		return self._history_buffer.description
 
-		# If we have fewer items than the limit, just return all items
-		if total_items <= self.max_history_items:
-			return '\n'.join(item.to_string() for item in self.state.agent_history_items)
-
-		# We have more items than the limit, so we need to omit some
-		omitted_count = total_items - self.max_history_items
-
-		# Show first item + omitted message + most recent (max_history_items - 1) items
-		# The omitted message doesn't count against the limit, only real history items do
-		recent_items_count = self.max_history_items - 1  # -1 for first item
-
-		items_to_include = [
-			self.state.agent_history_items[0].to_string(),  # Keep first item (initialization)
-			f'<sys>[... {omitted_count} previous steps omitted...]</sys>',
-		]
-		# Add most recent items
-		items_to_include.extend([item.to_string() for item in self.state.agent_history_items[-recent_items_count:]])
-
-		return '\n'.join(items_to_include)
+	@property
+	def agent_history_cache_boundaries(self) -> tuple[int, int]:
+		"""Leading characters of agent_history_description that stay unchanged at the next step, and those cached at
+		the previous step (see HistoryDescriptionBuffer)"""
+		self._history_buffer.sync(self.state.agent_history_items)
+		return self._history_buffer.stable_prefix_length, self._history_buffer.cached_prefix_length
 
 	def add_new_task(self, new_task: str) -> None:
 		new_task = '<follow_up_user_request> ' + new_task.strip() + ' </follow_up_user_request>'
@@ -188,16 +178,15 @@ class MessageManager:
 		self.state.read_state_description = ''
 		self.state.read_state_images = []  # Clear images from previous step
 
-		action_results = ''
-		result_len = len(result)
-		read_state_idx = 0
+		read_state_parts: list[str] = []
+		action_result_parts: list[str] = []
 
-		for idx, action_result in enumerate(result):
+		for action_result in result:
 			if action_result.include_extracted_content_only_once and action_result.extracted_content:
-				self.state.read_state_description += (
+				read_state_idx = len(read_state_parts)
+				read_state_parts.append(
 					f'<read_state_{read_state_idx}>\n{action_result.extracted_content}\n</read_state_{read_state_idx}>\n'
 				)
-				read_state_idx += 1
 				logger.debug(f'Added extracted_content to read_state_description: {action_result.extracted_content}')
 
 			# Store images for one-time inclusion in the next message
@@ -206,10 +195,10 @@ class MessageManager:
 				logger.debug(f'Added {len(action_result.images)} image(s) to read_state_images')
 
 			if action_result.long_term_memory:
-				action_results += f'{action_result.long_term_memory}\n'
+				action_result_parts.append(f'{action_result.long_term_memory}\n')
 				logger.debug(f'Added long_term_memory to action_results: {action_result.long_term_memory}')
 			elif action_result.extracted_content and not action_result.include_extracted_content_only_once:
-				action_results += f'{action_result.extracted_content}\n'
+				action_result_parts.append(f'{action_result.extracted_content}\n')
 				logger.debug(f'Added extracted_content to action_results: {action_result.extracted_content}')
 
 			if action_result.error:
@@ -217,19 +206,19 @@ class MessageManager:
 					error_text = action_result.error[:100] + '......' + action_result.error[-100:]
 				else:
 					error_text = action_result.error
-				action_results += f'{error_text}\n'
+				action_result_parts.append(f'{error_text}\n')
 				logger.debug(f'Added error to action_results: {error_text}')
 
 		# Simple 60k character limit for read_state_description
 		MAX_CONTENT_SIZE = 60000
-		if len(self.state.read_state_description) > MAX_CONTENT_SIZE:
-			self.state.read_state_description = (
-				self.state.read_state_description[:MAX_CONTENT_SIZE] + '\n... [Content truncated at 60k characters]'
-			)
+		read_state_description = ''.join(read_state_parts)
+		if len(read_state_description) > MAX_CONTENT_SIZE:
+			read_state_description = read_state_description[:MAX_CONTENT_SIZE] + '\n... [Content truncated at 60k characters]'
 			logger.debug(f'Truncated read_state_description to {MAX_CONTENT_SIZE} characters')
 
-		self.state.read_state_description = self.state.read_state_description.strip('\n')
+		self.state.read_state_description = read_state_description.strip('\n')
 
+		action_results = ''.join(action_result_parts)
 		if action_results:
 			action_results = f'Result\n{action_results}'
 		action_results = action_results.strip('\n') if action_results else None
@@ -299,6 +288,7 @@ class MessageManager:
 		sensitive_data=None,
 		available_file_paths: list[str] | None = None,  # Always pass current available_file_paths
 		unavailable_skills_info: str | None = None,  # Information about skills that cannot be used yet
+		llm_screenshot: str | None = None,  # Current screenshot already resized to llm_screenshot_size
 	) -> None:
 		"""Create single state message with all content"""
 
@@ -341,7 +331,7 @@ class MessageManager:
 		# else: use_vision is False, never include screenshot (include_screenshot stays False)
 
 		if include_screenshot and browser_state_summary.screenshot:
-			screenshots.append(browser_state_summary.screenshot)
+			screenshots.append(llm_screenshot or browser_state_summary.screenshot)
 
 		# Use vision in the user message if screenshots are included
 		effective_use_vision = len(screenshots) > 0
@@ -368,6 +358,15 @@ class MessageManager:
 			unavailable_skills_info=unavailable_skills_info,
 		).get_user_message(effective_use_vision)
 
+		# Mark the part of the history that stays unchanged at the next step as a prompt cache prefix, and where the
+		# previous step's prefix ended so it can be read back
+		history_tag = '<agent_history>\n'
+		stable_length, cached_length = self.agent_history_cache_boundaries
+		if stable_length and state_message.text.startswith(history_tag + self.agent_history_description):
+			state_message.cache_prefix_length = len(history_tag) + stable_length
+			if cached_length:
+				state_message.cached_prefix_length = len(history_tag) + cached_length
+
 		# Store state message text for history
 		self.last_state_message_text = state_message.text
 
@@ -443,30 +442,15 @@ class MessageManager:
 			if not self.sensitive_data:
 				return value
 
-			# Collect all sensitive values, immediately converting old format to new format
-			sensitive_values: dict[str, str] = {}
-
-			# Process all sensitive data entries
-			for key_or_domain, content in self.sensitive_data.items():
-				if isinstance(content, dict):
-					# Already in new format: {domain: {key: value}}
-					for key, val in content.items():
-						if val:  # Skip empty values
-							sensitive_values[key] = val
-				elif content:  # Old format: {key: value} - convert to new format internally
-					# We treat this as if it was {'http*://*': {key_or_domain: content}}
-					sensitive_values[key_or_domain] = content
+			matcher = get_sensitive_data_matcher(self.sensitive_data)
 
 			# If there are no valid sensitive data entries, just return the original value
-			if not sensitive_values:
+			if not matcher.has_secrets:
 				logger.warning('No valid entries found in sensitive_data dictionary')
 				return value
 
 			# Replace all valid sensitive data values with their placeholder tags
-			for key, val in sensitive_values.items():
-				value = value.replace(val, f'<secret>{key}</secret>')
-
-			return value
+			return matcher.mask(value)
 
 		if isinstance(message.content, str):
 			message.content = replace_sensitive(message.content)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections import deque
 from typing import TYPE_CHECKING, Any
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -63,6 +64,78 @@ class HistoryItem(BaseModel):
 {content}"""
 
 
+class HistoryDescriptionBuffer:
+	"""Incrementally rendered agent history description
+
+	Tracks a list of HistoryItems and renders each item once, when it is first seen. Without a history window the
+	description is extended with each new item; with `max_history_items` the most recent items are kept in a
+	bounded deque, so adding a step is O(1) and only the window is joined. The list is re-rendered from scratch only
+	when it is replaced or items other than new ones at the end change.
+
+	`stable_prefix_length` is the number of leading characters of the description that stay unchanged when the next
+	item is added (the whole description without a window, the first item with one), providers can place a prompt
+	cache breakpoint there. `cached_prefix_length` is the previous description's `stable_prefix_length` if that prefix
+	is still in place, i.e. where the previous request's breakpoint was.
+	"""
+
+	def __init__(self, max_history_items: int | None = None):
+		self.max_history_items = max_history_items
+		self.stable_prefix_length = 0
+		self.cached_prefix_length = 0
+		self._reset(None)
+
+	def _reset(self, items: list[HistoryItem] | None) -> None:
+		self._items = items
+		self._last_item: HistoryItem | None = None
+		self._total = 0
+		self._first: str | None = None
+		# the first item is always shown, the window holds the most recent max_history_items - 1 items
+		self._recent: deque[str] = deque(maxlen=self.max_history_items - 1 if self.max_history_items is not None else None)
+		self._description = ''
+
+	def sync(self, items: list[HistoryItem]) -> None:
+		"""Render the items added to the list since the last sync"""
+		if (
+			items is not self._items
+			or len(items) < self._total
+			or (self._total and items[self._total - 1] is not self._last_item)
+		):
+			self._reset(items)
+			self.stable_prefix_length = 0
+			self.cached_prefix_length = 0
+		if len(items) == self._total:
+			return
+
+		previous, rendered_before = self._description, self._total
+		new_texts = [item.to_string() for item in items[rendered_before:]]
+		for text in new_texts:
+			if self._first is None:
+				self._first = text
+			elif self.max_history_items is not None:
+				self._recent.append(text)
+		self._total += len(new_texts)
+		self._last_item = items[-1]
+
+		if self.max_history_items is None or self._total <= self.max_history_items:
+			# All items are shown, the new ones are appended to the description
+			self._description = '\n'.join([previous, *new_texts] if rendered_before else new_texts)
+		else:
+			omitted_count = self._total - self.max_history_items
+			self._description = '\n'.join(
+				[self._first, f'<sys>[... {omitted_count} previous steps omitted...]</sys>', *self._recent]
+			)
+
+		assert self._first is not None
+		cached = self.stable_prefix_length if rendered_before else 0
+		self.cached_prefix_length = cached if self._description[:cached] == previous[:cached] else 0
+		# Inside a window only the first item stays in place, without one new items are appended
+		self.stable_prefix_length = len(self._first) if self.max_history_items is not None else len(self._description)
+
+	@property
+	def description(self) -> str:
+		return self._description
+
+
 class MessageHistory(BaseModel):
 	"""History of messages"""
 
@@ -68,6 +68,35 @@ class SystemPrompt:
 		return self.system_message
 
 
+def resize_screenshot(screenshot_b64: str, size: tuple[int, int]) -> str:
+	"""Resize a base64 PNG screenshot to size (LANCZOS), returning it unchanged if it already has that size.
+
+	CPU heavy for large screenshots, the agent runs it in the image worker pool before building the state message.
+	"""
+	try:
+		import base64
+		import logging
+		from io import BytesIO
+
+		from PIL import Image
+
+		img = Image.open(BytesIO(base64.b64decode(screenshot_b64)))
+		if img.size == size:
+			return screenshot_b64
+
+		logging.getLogger(__name__).info(
+			f'🔄 Resizing screenshot from {img.size[0]}x{img.size[1]} to {size[0]}x{size[1]} for LLM'
+		)
+
+		img_resized = img.resize(size, Image.Resampling.LANCZOS)
+		buffer = BytesIO()
+		img_resized.save(buffer, format='PNG')
+		return base64.b64encode(buffer.getvalue()).decode('utf-8')
+	except Exception as e:
+		logging.getLogger(__name__).warning(f'Failed to resize screenshot: {e}, using original')
+		return screenshot_b64
+
+
 class AgentMessagePrompt:
 	vision_detail_level: Literal['auto', 'low', 'high']
 
@@ -199,7 +228,10 @@ class AgentMessagePrompt:
 		stats_text += f', {page_stats["total_elements"]} total elements'
 		stats_text += '</page_stats>\n'
 
-		elements_text = self.browser_state.dom_state.llm_representation(include_attributes=self.include_attributes)
+		# serialize one char past the limit so we can tell whether anything was cut, without serializing the whole page
+		elements_text = self.browser_state.dom_state.llm_representation(
+			include_attributes=self.include_attributes, max_chars=self.max_clickable_elements_length + 1
+		)
 
 		if len(elements_text) > self.max_clickable_elements_length:
 			elements_text = elements_text[: self.max_clickable_elements_length]
@@ -325,29 +357,7 @@ Available tabs:
 		"""Resize screenshot to llm_screenshot_size if configured."""
 		if not self.llm_screenshot_size:
 			return screenshot_b64
-
-		try:
-			import base64
-			import logging
-			from io import BytesIO
-
-			from PIL import Image
-
-			img = Image.open(BytesIO(base64.b64decode(screenshot_b64)))
-			if img.size == self.llm_screenshot_size:
-				return screenshot_b64
-
-			logging.getLogger(__name__).info(
-				f'🔄 Resizing screenshot from {img.size[0]}x{img.size[1]} to {self.llm_screenshot_size[0]}x{self.llm_screenshot_size[1]} for LLM'
-			)
-
-			img_resized = img.resize(self.llm_screenshot_size, Image.Resampling.LANCZOS)
-			buffer = BytesIO()
-			img_resized.save(buffer, format='PNG')
-			return base64.b64encode(buffer.getvalue()).decode('utf-8')
-		except Exception as e:
-			logging.getLogger(__name__).warning(f'Failed to resize screenshot: {e}, using original')
-			return screenshot_b64
+		return resize_screenshot(screenshot_b64, self.llm_screenshot_size)
 
 	@observe_debug(ignore_input=True, ignore_output=True, name='get_user_message')
 	def get_user_message(self, use_vision: bool = True) -> UserMessage:
@@ -25,6 +25,7 @@ from browser_use.agent.cloud_events import (
 )
 from browser_use.agent.message_manager.utils import save_conversation
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.client_pool import llm_client_pool
 from browser_use.llm.exceptions import ModelProviderError, ModelRateLimitError
 from browser_use.llm.messages import BaseMessage, ContentPartImageParam, ContentPartTextParam, UserMessage
 from browser_use.tokens.service import TokenCost
@@ -43,7 +44,7 @@ from browser_use.agent.judge import construct_judge_messages
 from browser_use.agent.message_manager.service import (
 	MessageManager,
 )
-from browser_use.agent.prompts import SystemPrompt
+from browser_use.agent.prompts import SystemPrompt, resize_screenshot
 from browser_use.agent.views import (
 	ActionResult,
 	AgentError,
@@ -57,7 +58,9 @@ from browser_use.agent.views import (
 	BrowserStateHistory,
 	DetectedVariable,
 	JudgementResult,
+	LazyAgentHistoryList,
 	StepMetadata,
+	is_jsonl_history_file,
 )
 from browser_use.browser.session import DEFAULT_BROWSER_PROFILE
 from browser_use.browser.views import BrowserStateSummary
@@ -65,6 +68,7 @@ from browser_use.config import CONFIG
 from browser_use.dom.views import DOMInteractedElement
 from browser_use.filesystem.file_system import FileSystem
 from browser_use.observability import observe, observe_debug
+from browser_use.screenshots.image_pool import image_pool
 from browser_use.telemetry.service import ProductTelemetry
 from browser_use.telemetry.views import AgentTelemetryEvent
 from browser_use.tools.registry.views import ActionModel
@@ -161,6 +165,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		use_vision: bool | Literal['auto'] = True,
 		save_conversation_path: str | Path | None = None,
 		save_conversation_path_encoding: str | None = 'utf-8',
+		save_history_path: str | Path | None = None,
 		max_failures: int = 3,
 		override_system_message: str | None = None,
 		extend_system_message: str | None = None,
@@ -192,6 +197,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		sample_images: list[ContentPartTextParam | ContentPartImageParam] | None = None,
 		final_response_after_failure: bool = True,
 		llm_screenshot_size: tuple[int, int] | None = None,
+		screenshot_format: Literal['png', 'webp', 'jpeg'] = 'png',
+		screenshot_quality: int = 80,
 		_url_shortening_limit: int = 25,
 		**kwargs,
 	):
@@ -352,6 +359,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			vision_detail_level=vision_detail_level,
 			save_conversation_path=save_conversation_path,
 			save_conversation_path_encoding=save_conversation_path_encoding,
+			save_history_path=save_history_path,
 			max_failures=max_failures,
 			override_system_message=override_system_message,
 			extend_system_message=extend_system_message,
@@ -367,6 +375,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			llm_timeout=llm_timeout,
 			step_timeout=step_timeout,
 			final_response_after_failure=final_response_after_failure,
+			screenshot_format=screenshot_format,
+			screenshot_quality=screenshot_quality,
 			use_judge=use_judge,
 			ground_truth=ground_truth,
 		)
@@ -531,6 +541,14 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			self.settings.save_conversation_path = Path(self.settings.save_conversation_path).expanduser().resolve()
 			self.logger.info(f'💬 Saving conversation to {_log_pretty_path(self.settings.save_conversation_path)}')
 
+		if self.settings.save_history_path:
+			self.settings.save_history_path = Path(self.settings.save_history_path).expanduser().resolve()
+			if not is_jsonl_history_file(self.settings.save_history_path):
+				raise ValueError(f'save_history_path must be a .jsonl file, got {self.settings.save_history_path}')
+			self.logger.info(f'📜 Saving history to {_log_pretty_path(self.settings.save_history_path)}')
+		self._history_items_persisted = 0
+		self._history_last_item_offset = 0  # byte offset of the last item in the save_history_path file
+
 		# Initialize download tracking
 		assert self.browser_session is not None, 'BrowserSession is not set up'
 		self.has_downloads_path = self.browser_session.browser_profile.downloads_path is not None
@@ -542,6 +560,10 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		self._external_pause_event = asyncio.Event()
 		self._external_pause_event.set()
 
+		# Whether this agent holds a reference on the shared LLM client pool (released in close())
+		self._llm_client_pool_retained = False
+		self._image_pool_retained = False
+
 	def _enhance_task_with_schema(self, task: str, output_model_schema: type[AgentStructuredOutput] | None) -> str:
 		"""Enhance task description with output schema information if provided."""
 		if output_model_schema is None:
@@ -669,7 +691,9 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		try:
 			from browser_use.screenshots.service import ScreenshotService
 
-			self.screenshot_service = ScreenshotService(self.agent_directory)
+			self.screenshot_service = ScreenshotService(
+				self.agent_directory, image_format=self.settings.screenshot_format, quality=self.settings.screenshot_quality
+			)
 			self.logger.debug(f'📸 Screenshot service initialized in: {self.agent_directory}/screenshots')
 		except Exception as e:
 			self.logger.error(f'📸 Failed to initialize screenshot service: {e}.')
@@ -1026,6 +1050,14 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		if self.skill_service is not None:
 			unavailable_skills_info = await self._get_unavailable_skills_info()
 
+		# Resize the screenshot for the LLM in the image worker pool, off the event loop
+		llm_screenshot = None
+		llm_screenshot_size = self._message_manager.llm_screenshot_size
+		if llm_screenshot_size and browser_state_summary.screenshot and self.settings.use_vision is not False:
+			llm_screenshot = await image_pool.run(
+				'resize_screenshot', resize_screenshot, browser_state_summary.screenshot, llm_screenshot_size
+			)
+
 		self._message_manager.create_state_messages(
 			browser_state_summary=browser_state_summary,
 			model_output=self.state.last_model_output,
@@ -1036,6 +1068,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			sensitive_data=self.sensitive_data,
 			available_file_paths=self.available_file_paths,  # Always pass current available_file_paths
 			unavailable_skills_info=unavailable_skills_info,
+			llm_screenshot=llm_screenshot,
 		)
 
 		await self._force_done_after_last_step(step_info)
@@ -1240,6 +1273,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		task = self.task
 		final_result = self.history.final_result() or ''
 		agent_steps = self.history.agent_steps()
+		await self.screenshot_service.flush()
 		screenshot_paths = [p for p in self.history.screenshot_paths() if p is not None]
 
 		# Construct input messages for judge evaluation
@@ -1414,6 +1448,38 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		)
 
 		self.history.add_item(history_item)
+		await self._persist_history()
+
+	async def _persist_history(self, final: bool = False) -> None:
+		"""Append the history items added since the last call to the save_history_path JSONL file
+
+		With final=True the last item is written again (the judge sets its judgement after it was appended) and the
+		run's usage is appended as well.
+		"""
+		if not self.settings.save_history_path or not self.history.history:
+			return
+		start, offset = self._history_items_persisted, None
+		if final and start == len(self.history.history):
+			start, offset = start - 1, self._history_last_item_offset
+		if start >= len(self.history.history):
+			return
+		new_items = self.history.history[start:]
+		# The first write of the agent replaces the file, later writes only append the new steps
+		truncate = self._history_items_persisted == 0
+		try:
+			item_offsets = await asyncio.to_thread(
+				AgentHistoryList.append_to_file,
+				self.settings.save_history_path,
+				new_items,
+				sensitive_data=self.sensitive_data,
+				truncate=truncate,
+				usage=self.history.usage if final else None,
+				offset=offset,
+			)
+			self._history_items_persisted = len(self.history.history)
+			self._history_last_item_offset = item_offsets[-1]
+		except Exception as e:
+			self.logger.error(f'📜 Failed to save history to {self.settings.save_history_path}: {type(e).__name__}: {e}')
 
 	def _remove_think_tags(self, text: str) -> str:
 		THINK_TAGS = re.compile(r'<think>.*?</think>', re.DOTALL)
@@ -2161,6 +2227,14 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		)
 		signal_handler.register()
 
+		# Keep pooled LLM clients (and their connections) alive while this agent runs
+		if not self._llm_client_pool_retained:
+			llm_client_pool.retain()
+			self._llm_client_pool_retained = True
+		if not self._image_pool_retained:
+			image_pool.retain()
+			self._image_pool_retained = True
+
 		try:
 			await self._log_agent_run()
 
@@ -2261,10 +2335,12 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 						metadata=None,
 					)
 				)
+				await self._persist_history()
 
 				self.logger.info(f'❌ {agent_run_error}')
 
 			self.history.usage = await self.token_cost_service.get_usage_summary()
+			await self._persist_history(final=True)
 
 			# set the model output schema and call it on the fly
 			if self.history._output_model_schema is None and self.output_model_schema is not None:
@@ -2278,6 +2354,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			agent_run_error = 'KeyboardInterrupt'
 
 			self.history.usage = await self.token_cost_service.get_usage_summary()
+			await self._persist_history(final=True)
 
 			return self.history
 
@@ -2322,7 +2399,10 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 				# Lazy import gif module to avoid heavy startup cost
 				from browser_use.agent.gif import create_history_gif
 
-				create_history_gif(task=self.task, history=self.history, output_path=output_path)
+				await self.screenshot_service.flush()
+
+				# Frames are rendered on the image pool, the thread only writes them to the file in order
+				await asyncio.to_thread(create_history_gif, task=self.task, history=self.history, output_path=output_path)
 
 				# Only emit output file event if GIF was actually created
 				if Path(output_path).exists():
@@ -2608,7 +2688,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 		# Extract clean markdown
 		try:
-			from browser_use.dom.markdown_extractor import extract_clean_markdown
+			from browser_use.dom.markdown_extractor import describe_content_source, extract_clean_markdown
 
 			content, content_stats = await extract_clean_markdown(
 				browser_session=self.browser_session, extract_links=extract_links
@@ -2629,12 +2709,12 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 				self.logger.warning(f'Failed to capture screenshot for ai_step: {e}')
 
 		# Build prompt with content stats
-		original_html_length = content_stats['original_html_chars']
+		content_source = describe_content_source(content_stats)
 		initial_markdown_length = content_stats['initial_markdown_chars']
 		final_filtered_length = content_stats['final_filtered_chars']
 		chars_filtered = content_stats['filtered_chars_removed']
 
-		stats_summary = f"""Content processed: {original_html_length:,} HTML chars → {initial_markdown_length:,} initial markdown → {final_filtered_length:,} filtered markdown"""
+		stats_summary = f"""Content processed: {content_source} → {initial_markdown_length:,} initial markdown → {final_filtered_length:,} filtered markdown"""
 		if chars_filtered > 0:
 			stats_summary += f' (filtered {chars_filtered:,} chars of noise)'
 
@@ -2685,7 +2765,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 	async def rerun_history(
 		self,
-		history: AgentHistoryList,
+		history: AgentHistoryList | LazyAgentHistoryList,
 		max_retries: int = 3,
 		skip_failures: bool = True,
 		delay_between_actions: float = 2.0,
@@ -2696,7 +2776,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		Rerun a saved history of actions with error handling and retry logic.
 
 		Args:
-		                history: The history to replay
+		                history: The history to replay, a LazyAgentHistoryList is replayed as a stream (one step in memory)
 		                max_retries: Maximum number of retries per action
 		                skip_failures: Whether to skip failed actions or stop execution
 		                delay_between_actions: Delay between actions in seconds
@@ -2713,6 +2793,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		await self.browser_session.start()
 
 		results = []
+		total_steps = len(history.history)
 
 		for i, history_item in enumerate(history.history):
 			goal = history_item.model_output.current_state.next_goal if history_item.model_output else ''
@@ -2736,7 +2817,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 					delay_str = f'{step_delay:.1f}s'
 				delay_source = f'using default delay={delay_str}'
 
-			self.logger.info(f'Replaying {step_name} ({i + 1}/{len(history.history)}) [{delay_source}]: {goal}')
+			self.logger.info(f'Replaying {step_name} ({i + 1}/{total_steps}) [{delay_source}]: {goal}')
 
 			if (
 				not history_item.model_output
@@ -2820,6 +2901,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			)
 
 			self.history.add_item(history_item)
+			await self._persist_history()
 			self.logger.debug('📝 Saved initial actions to history as step 0')
 			self.logger.debug('Initial actions completed')
 
@@ -2897,19 +2979,10 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		if not historical_element or not browser_state_summary.dom_state.selector_map:
 			return action
 
-		# selector_hash_map = {hash(e): e for e in browser_state_summary.dom_state.selector_map.values()}
-
-		highlight_index, current_element = next(
-			(
-				(highlight_index, element)
-				for highlight_index, element in browser_state_summary.dom_state.selector_map.items()
-				if element.element_hash == historical_element.element_hash
-			),
-			(None, None),
-		)
-
-		if not current_element or highlight_index is None:
+		match = browser_state_summary.dom_state.find_element_by_hash(historical_element.element_hash)
+		if match is None:
 			return None
+		highlight_index, _ = match
 
 		old_index = action.get_index()
 		if old_index != highlight_index:
@@ -2928,13 +3001,17 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		Load history from file and rerun it, optionally substituting variables.
 
 		Args:
-			history_file: Path to the history file
+			history_file: Path to the history file, JSONL history files (.jsonl) are streamed
 			variables: Optional dict mapping variable names to new values (e.g. {'email': 'new@example.com'})
 			**kwargs: Additional arguments passed to rerun_history
 		"""
 		if not history_file:
 			history_file = 'AgentHistory.json'
-		history = AgentHistoryList.load_from_file(history_file, self.AgentOutput)
+		history: AgentHistoryList | LazyAgentHistoryList
+		if is_jsonl_history_file(history_file):
+			history = LazyAgentHistoryList(history_file, self.AgentOutput)
+		else:
+			history = AgentHistoryList.load_from_file(history_file, self.AgentOutput)
 
 		# Substitute variables if provided
 		if variables:
@@ -3012,6 +3089,9 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 	async def close(self):
 		"""Close all resources"""
 		try:
+			# Finish writing the stored screenshots
+			await self.screenshot_service.flush()
+
 			# Only close browser if keep_alive is False (or not set)
 			if self.browser_session is not None:
 				if not self.browser_session.browser_profile.keep_alive:
@@ -3023,6 +3103,16 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			if self.skill_service is not None:
 				await self.skill_service.close()
 
+			# Close pooled LLM clients once no other agent on this event loop uses them
+			if self._llm_client_pool_retained:
+				self._llm_client_pool_retained = False
+				await llm_client_pool.release()
+
+			# Stop the image workers once no other agent uses them
+			if self._image_pool_retained:
+				self._image_pool_retained = False
+				image_pool.release()
+
 			# Force garbage collection
 			gc.collect()
 
@@ -3098,8 +3188,13 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 		return detect_variables_in_history(self.history)
 
-	def _substitute_variables_in_history(self, history: AgentHistoryList, variables: dict[str, str]) -> AgentHistoryList:
-		"""Substitute variables in history with new values for rerunning with different data"""
+	def _substitute_variables_in_history(
+		self, history: AgentHistoryList | LazyAgentHistoryList, variables: dict[str, str]
+	) -> AgentHistoryList | LazyAgentHistoryList:
+		"""Substitute variables in history with new values for rerunning with different data
+
+		A LazyAgentHistoryList stays lazy, the values are substituted in each item when it is loaded.
+		"""
 		from browser_use.agent.variable_detector import detect_variables_in_history
 
 		# Detect variables in the history
@@ -3118,6 +3213,15 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			self.logger.info('No variables to substitute')
 			return history
 
+		if isinstance(history, LazyAgentHistoryList):
+			# Items are loaded fresh on every access, so they can be modified in place
+			def substitute(history_item: AgentHistory) -> AgentHistory:
+				self._substitute_variables_in_item(history_item, value_replacements)
+				return history_item
+
+			self.logger.info(f'Substituting {len(value_replacements)} variable type(s) while replaying the history')
+			return history.map(substitute)
+
 		# Create a deep copy of history to avoid modifying the original
 		import copy
 
@@ -3126,40 +3230,47 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		# Substitute values in all actions
 		substitution_count = 0
 		for history_item in modified_history.history:
-			if not history_item.model_output or not history_item.model_output.action:
-				continue
-
-			for action in history_item.model_output.action:
-				# Handle both Pydantic models and dicts
-				if hasattr(action, 'model_dump'):
-					action_dict = action.model_dump()
-				elif isinstance(action, dict):
-					action_dict = action
-				else:
-					action_dict = vars(action) if hasattr(action, '__dict__') else {}
-
-				# Substitute in all string fields
-				substitution_count += self._substitute_in_dict(action_dict, value_replacements)
-
-				# Update the action with modified values
-				if hasattr(action, 'model_dump'):
-					# For Pydantic RootModel, we need to recreate from the modified dict
-					if hasattr(action, 'root'):
-						# This is a RootModel - recreate it from the modified dict
-						new_action = type(action).model_validate(action_dict)
-						# Replace the root field in-place using object.__setattr__ to bypass Pydantic's immutability
-						object.__setattr__(action, 'root', getattr(new_action, 'root'))
-					else:
-						# Regular Pydantic model - update fields in-place
-						for key, val in action_dict.items():
-							if hasattr(action, key):
-								setattr(action, key, val)
-				elif isinstance(action, dict):
-					action.update(action_dict)
+			substitution_count += self._substitute_variables_in_item(history_item, value_replacements)
 
 		self.logger.info(f'Substituted {substitution_count} value(s) in {len(value_replacements)} variable type(s) in history')
 		return modified_history
 
+	def _substitute_variables_in_item(self, history_item: AgentHistory, value_replacements: dict[str, str]) -> int:
+		"""Substitute values in the actions of one history item, returns count of substitutions made"""
+		if not history_item.model_output or not history_item.model_output.action:
+			return 0
+
+		substitution_count = 0
+		for action in history_item.model_output.action:
+			# Handle both Pydantic models and dicts
+			if hasattr(action, 'model_dump'):
+				action_dict = action.model_dump()
+			elif isinstance(action, dict):
+				action_dict = action
+			else:
+				action_dict = vars(action) if hasattr(action, '__dict__') else {}
+
+			# Substitute in all string fields
+			substitution_count += self._substitute_in_dict(action_dict, value_replacements)
+
+			# Update the action with modified values
+			if hasattr(action, 'model_dump'):
+				# For Pydantic RootModel, we need to recreate from the modified dict
+				if hasattr(action, 'root'):
+					# This is a RootModel - recreate it from the modified dict
+					new_action = type(action).model_validate(action_dict)
+					# Replace the root field in-place using object.__setattr__ to bypass Pydantic's immutability
+					object.__setattr__(action, 'root', getattr(new_action, 'root'))
+				else:
+					# Regular Pydantic model - update fields in-place
+					for key, val in action_dict.items():
+						if hasattr(action, key):
+							setattr(action, key, val)
+			elif isinstance(action, dict):
+				action.update(action_dict)
+
+		return substitution_count
+
 	def _substitute_in_dict(self, data: dict, replacements: dict[str, str]) -> int:
 		"""Recursively substitute values in a dictionary, returns count of substitutions made"""
 		count = 0
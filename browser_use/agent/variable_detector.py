@@ -2,11 +2,11 @@
 
 import re
 
-from browser_use.agent.views import AgentHistoryList, DetectedVariable
+from browser_use.agent.views import AgentHistoryList, DetectedVariable, LazyAgentHistoryList
 from browser_use.dom.views import DOMInteractedElement
 
 
-def detect_variables_in_history(history: AgentHistoryList) -> dict[str, DetectedVariable]:
+def detect_variables_in_history(history: AgentHistoryList | LazyAgentHistoryList) -> dict[str, DetectedVariable]:
 	"""
 	Analyze agent history and detect reusable variables.
 
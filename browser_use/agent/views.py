@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import functools
 import json
 import logging
+import os
 import traceback
+from collections.abc import Callable, Iterator, Sequence
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Generic, Literal
+from typing import Any, Generic, Literal, overload
 
 from openai import RateLimitError
 from pydantic import BaseModel, ConfigDict, Field, ValidationError, create_model, model_validator
@@ -24,6 +27,7 @@ from browser_use.dom.views import DEFAULT_INCLUDE_ATTRIBUTES, DOMInteractedEleme
 # from browser_use.dom.views import SelectorMap
 from browser_use.filesystem.file_system import FileSystemState
 from browser_use.llm.base import BaseChatModel
+from browser_use.sensitive_data import get_sensitive_data_matcher
 from browser_use.tokens.views import UsageSummary
 from browser_use.tools.registry.views import ActionModel
 
@@ -37,6 +41,7 @@ class AgentSettings(BaseModel):
 	vision_detail_level: Literal['auto', 'low', 'high'] = 'auto'
 	save_conversation_path: str | Path | None = None
 	save_conversation_path_encoding: str | None = 'utf-8'
+	save_history_path: str | Path | None = None  # JSONL file the history is appended to after every step
 	max_failures: int = 3
 	generate_gif: bool | str = False
 	override_system_message: str | None = None
@@ -55,6 +60,8 @@ class AgentSettings(BaseModel):
 	llm_timeout: int = 60  # Timeout in seconds for LLM calls (auto-detected: 30s for gemini, 90s for o3, 60s default)
 	step_timeout: int = 180  # Timeout in seconds for each step
 	final_response_after_failure: bool = True  # If True, attempt one final recovery call after max_failures
+	screenshot_format: Literal['png', 'webp', 'jpeg'] = 'png'  # Format screenshots are stored in (webp/jpeg are transcoded)
+	screenshot_quality: int = 80  # WebP/JPEG quality of stored screenshots
 
 
 class AgentState(BaseModel):
@@ -212,7 +219,11 @@ class AgentOutput(BaseModel):
 			next_goal=self.next_goal if self.next_goal else '',
 		)
 
+	# The type_with_custom_actions* builders are cached per action model class: the tools registry returns the same
+	# ActionModel for the same set of actions, so unchanged pages reuse the same AgentOutput type (and its JSON schema)
+
 	@staticmethod
+	@functools.lru_cache(maxsize=32)
 	def type_with_custom_actions(custom_actions: type[ActionModel]) -> type[AgentOutput]:
 		"""Extend actions with custom actions"""
 
@@ -228,6 +239,7 @@ class AgentOutput(BaseModel):
 		return model_
 
 	@staticmethod
+	@functools.lru_cache(maxsize=32)
 	def type_with_custom_actions_no_thinking(custom_actions: type[ActionModel]) -> type[AgentOutput]:
 		"""Extend actions with custom actions and exclude thinking field"""
 
@@ -252,6 +264,7 @@ class AgentOutput(BaseModel):
 		return model
 
 	@staticmethod
+	@functools.lru_cache(maxsize=32)
 	def type_with_custom_actions_flash_mode(custom_actions: type[ActionModel]) -> type[AgentOutput]:
 		"""Extend actions with custom actions for flash mode - memory and action fields only"""
 
@@ -291,6 +304,22 @@ class AgentHistory(BaseModel):
 
 	model_config = ConfigDict(arbitrary_types_allowed=True, protected_namespaces=())
 
+	@classmethod
+	def load_from_dict(cls, data: dict[str, Any], output_model: type[AgentOutput]) -> AgentHistory:
+		"""Validate a single serialized history item, enriching model_output with the custom actions of output_model"""
+		if data['model_output']:
+			if isinstance(data['model_output'], dict):
+				data['model_output'] = output_model.model_validate(data['model_output'])
+			else:
+				data['model_output'] = None
+		if 'interacted_element' not in data['state']:
+			data['state']['interacted_element'] = None
+		return cls.model_validate(data)
+
+	def to_json_line(self, sensitive_data: dict[str, str | dict[str, str]] | None = None) -> str:
+		"""Serialize as one line of a JSONL history file"""
+		return json.dumps(self.model_dump(sensitive_data=sensitive_data), ensure_ascii=False) + '\n'
+
 	@staticmethod
 	def get_interacted_element(model_output: AgentOutput, selector_map: DOMSelectorMap) -> list[DOMInteractedElement | None]:
 		elements = []
@@ -308,29 +337,8 @@ class AgentHistory(BaseModel):
 		if not sensitive_data:
 			return value
 
-		# Collect all sensitive values, immediately converting old format to new format
-		sensitive_values: dict[str, str] = {}
-
-		# Process all sensitive data entries
-		for key_or_domain, content in sensitive_data.items():
-			if isinstance(content, dict):
-				# Already in new format: {domain: {key: value}}
-				for key, val in content.items():
-					if val:  # Skip empty values
-						sensitive_values[key] = val
-			elif content:  # Old format: {key: value} - convert to new format internally
-				# We treat this as if it was {'http*://*': {key_or_domain: content}}
-				sensitive_values[key_or_domain] = content
-
-		# If there are no valid sensitive data entries, just return the original value
-		if not sensitive_values:
-			return value
-
 		# Replace all valid sensitive data values with their placeholder tags
-		for key, val in sensitive_values.items():
-			value = value.replace(val, f'<secret>{key}</secret>')
-
-		return value
+		return get_sensitive_data_matcher(sensitive_data).mask(value)
 
 	def _filter_sensitive_data_from_dict(
 		self, data: dict[str, Any], sensitive_data: dict[str, str | dict[str, str]] | None
@@ -432,15 +440,61 @@ class AgentHistoryList(BaseModel, Generic[AgentStructuredOutput]):
 		return self.__str__()
 
 	def save_to_file(self, filepath: str | Path, sensitive_data: dict[str, str | dict[str, str]] | None = None) -> None:
-		"""Save history to JSON file with proper serialization and optional sensitive data filtering"""
+		"""Save history to JSON file with proper serialization and optional sensitive data filtering
+
+		Files ending in .jsonl are written in the JSONL history format (one AgentHistory per line and a usage record,
+		see `append_to_file()` and `LazyAgentHistoryList`).
+		"""
 		try:
 			Path(filepath).parent.mkdir(parents=True, exist_ok=True)
+			if is_jsonl_history_file(filepath):
+				self.append_to_file(filepath, self.history, sensitive_data=sensitive_data, truncate=True, usage=self.usage)
+				return
 			data = self.model_dump(sensitive_data=sensitive_data)
 			with open(filepath, 'w', encoding='utf-8') as f:
 				json.dump(data, f, indent=2)
 		except Exception as e:
 			raise e
 
+	@staticmethod
+	def append_to_file(
+		filepath: str | Path,
+		items: Sequence[AgentHistory],
+		sensitive_data: dict[str, str | dict[str, str]] | None = None,
+		truncate: bool = False,
+		usage: UsageSummary | None = None,
+		offset: int | None = None,
+	) -> list[int]:
+		"""Append history items to a JSONL history file, one line per item
+
+		Only the new items are written, so persisting a long run after every step stays cheap. Each append is
+		flushed to disk, a crash can only lose (or truncate) the line being written, which the loader skips.
+
+		Args:
+			usage: Written after the items as a usage record, the loader uses the last one in the file
+			offset: Write at this byte offset instead of the end, replacing everything after it (e.g. an item
+				updated after it was appended)
+
+		Returns:
+			The byte offset of every written item
+		"""
+		Path(filepath).parent.mkdir(parents=True, exist_ok=True)
+		item_offsets: list[int] = []
+		with open(filepath, 'wb' if truncate or not Path(filepath).exists() else 'r+b') as f:
+			if offset is not None:
+				f.seek(offset)
+				f.truncate()
+			else:
+				f.seek(0, os.SEEK_END)
+			for item in items:
+				item_offsets.append(f.tell())
+				f.write(item.to_json_line(sensitive_data).encode())
+			if usage is not None:
+				f.write((json.dumps({_USAGE_RECORD_KEY: usage.model_dump(mode='json')}) + '\n').encode())
+			f.flush()
+			os.fsync(f.fileno())
+		return item_offsets
+
 	# def save_as_playwright_script(
 	# 	self,
 	# 	output_path: str | Path,
@@ -496,7 +550,9 @@ class AgentHistoryList(BaseModel, Generic[AgentStructuredOutput]):
 
 	@classmethod
 	def load_from_file(cls, filepath: str | Path, output_model: type[AgentOutput]) -> AgentHistoryList:
-		"""Load history from JSON file"""
+		"""Load history from JSON file (or JSONL history file, see `LazyAgentHistoryList` to load it lazily)"""
+		if is_jsonl_history_file(filepath):
+			return LazyAgentHistoryList(filepath, output_model).load()
 		with open(filepath, encoding='utf-8') as f:
 			data = json.load(f)
 		return cls.load_from_dict(data, output_model)
@@ -730,6 +786,120 @@ class AgentHistoryList(BaseModel, Generic[AgentStructuredOutput]):
 		return None
 
 
+def is_jsonl_history_file(filepath: str | Path) -> bool:
+	"""Whether a history file uses the JSONL history format (one AgentHistory per line)"""
+	return Path(filepath).suffix.lower() == '.jsonl'
+
+
+# Usage records of JSONL history files are one-key objects, history items never start with this key
+_USAGE_RECORD_KEY = 'usage'
+_USAGE_RECORD_PREFIX = b'{"' + _USAGE_RECORD_KEY.encode() + b'":'
+
+
+class LazyAgentHistoryList(Sequence[AgentHistory]):
+	"""Read-only view of a JSONL history file that validates items on access
+
+	Opening only indexes the line offsets of the file, items are parsed and validated when they are accessed,
+	so iterating a long history streams it with one item in memory at a time. A truncated last line (left by a
+	crash while it was appended) is skipped. The last usage record of the file is exposed as `usage`.
+	"""
+
+	def __init__(
+		self,
+		filepath: str | Path,
+		output_model: type[AgentOutput],
+		transform: Callable[[AgentHistory], AgentHistory] | None = None,
+		_offsets: list[tuple[int, int]] | None = None,
+		_usage_offset: tuple[int, int] | None = None,
+	):
+		"""
+		Args:
+			filepath: Path of the JSONL history file
+			output_model: AgentOutput model with the custom actions used to validate model outputs
+			transform: Optional function applied to each item after it is loaded
+		"""
+		self.filepath = Path(filepath)
+		self.output_model = output_model
+		self.transform = transform
+		self._usage_offset = _usage_offset
+		self._offsets = _offsets if _offsets is not None else self._index_lines()
+
+	def _index_lines(self) -> list[tuple[int, int]]:
+		"""(offset, length) of every non-empty item line of the file, the last usage record is kept separately"""
+		offsets: list[tuple[int, int]] = []
+		usage_offsets: list[tuple[int, int]] = []
+		offset = 0
+		last_line = b''
+		with open(self.filepath, 'rb') as f:
+			for line in f:
+				if line.strip():
+					(usage_offsets if line.startswith(_USAGE_RECORD_PREFIX) else offsets).append((offset, len(line)))
+					last_line = line
+				offset += len(line)
+		if last_line and not last_line.endswith(b'\n'):
+			try:
+				json.loads(last_line)
+			except ValueError:
+				logger.warning(f'Skipping truncated last line of history file {self.filepath}')
+				(usage_offsets if last_line.startswith(_USAGE_RECORD_PREFIX) else offsets).pop()
+		self._usage_offset = usage_offsets[-1] if usage_offsets else None
+		return offsets
+
+	@functools.cached_property
+	def usage(self) -> UsageSummary | None:
+		"""Token usage of the run, from the last usage record of the file"""
+		if self._usage_offset is None:
+			return None
+		offset, length = self._usage_offset
+		with open(self.filepath, 'rb') as f:
+			f.seek(offset)
+			return UsageSummary.model_validate(json.loads(f.read(length))[_USAGE_RECORD_KEY])
+
+	def _load_line(self, data: bytes) -> AgentHistory:
+		item = AgentHistory.load_from_dict(json.loads(data), self.output_model)
+		return self.transform(item) if self.transform else item
+
+	def __len__(self) -> int:
+		return len(self._offsets)
+
+	@overload
+	def __getitem__(self, index: int) -> AgentHistory: ...
+
+	@overload
+	def __getitem__(self, index: slice) -> list[AgentHistory]: ...
+
+	def __getitem__(self, index: int | slice) -> AgentHistory | list[AgentHistory]:
+		if isinstance(index, slice):
+			return [self[i] for i in range(*index.indices(len(self)))]
+		offset, length = self._offsets[index]
+		with open(self.filepath, 'rb') as f:
+			f.seek(offset)
+			return self._load_line(f.read(length))
+
+	def __iter__(self) -> Iterator[AgentHistory]:
+		with open(self.filepath, 'rb') as f:
+			for offset, length in self._offsets:
+				f.seek(offset)
+				yield self._load_line(f.read(length))
+
+	@property
+	def history(self) -> LazyAgentHistoryList:
+		"""The items, for code written against `AgentHistoryList.history`"""
+		return self
+
+	def map(self, transform: Callable[[AgentHistory], AgentHistory]) -> LazyAgentHistoryList:
+		"""View of the same file with transform applied to every item when it is loaded"""
+		previous = self.transform
+		combined = (lambda item: transform(previous(item))) if previous else transform
+		return LazyAgentHistoryList(
+			self.filepath, self.output_model, transform=combined, _offsets=self._offsets, _usage_offset=self._usage_offset
+		)
+
+	def load(self) -> AgentHistoryList:
+		"""Load and validate all items into an AgentHistoryList"""
+		return AgentHistoryList(history=list(self), usage=self.usage)
+
+
 class AgentError:
 	"""Container for agent error handling"""
 
@@ -9,6 +9,7 @@ from bubus.models import T_EventResultType
 from cdp_use.cdp.target import TargetID
 from pydantic import BaseModel, Field, field_validator
 
+from browser_use.browser.keyboard import TypingMode
 from browser_use.browser.views import BrowserStateSummary
 from browser_use.dom.views import EnhancedDOMTreeNode
 
@@ -152,6 +153,7 @@ class TypeTextEvent(ElementSelectedEvent[dict | None]):
 	clear: bool = True
 	is_sensitive: bool = False  # Flag to indicate if text contains sensitive data
 	sensitive_key_name: str | None = None  # Name of the sensitive key being typed (e.g., 'username', 'password')
+	typing_mode: TypingMode | None = None  # None means use the browser profile's typing_mode
 
 	event_timeout: float | None = Field(default_factory=lambda: _get_timeout('TIMEOUT_TypeTextEvent', 60.0))  # seconds
 
@@ -521,6 +523,17 @@ class StorageStateLoadedEvent(BaseEvent):
 # ============================================================================
 
 
+class FileDownloadProgressEvent(BaseEvent):
+	"""Progress of a file download streamed to disk by the browser-use process (e.g. PDF auto-download)."""
+
+	url: str
+	path: str
+	received_bytes: int
+	total_bytes: int | None = None  # From the Content-Length header, None if unknown
+
+	event_timeout: float | None = Field(default_factory=lambda: _get_timeout('TIMEOUT_FileDownloadProgressEvent', 5.0))  # seconds
+
+
 class FileDownloadedEvent(BaseEvent):
 	"""A file has been downloaded."""
 
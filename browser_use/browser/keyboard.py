@@ -0,0 +1,156 @@
+"""Keystroke dispatch shared by TypeTextEvent and Element.fill."""
+
+import asyncio
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any, Literal
+
+if TYPE_CHECKING:
+	from cdp_use.cdp.input.commands import DispatchKeyEventParameters
+
+TypingMode = Literal['human', 'pipelined', 'fast']
+"""How text is typed into the page:
+
+- 'human': keyDown/char/keyUp per character, every event awaited, with small delays between keystrokes
+- 'pipelined': the same key events, sent all at once and awaited together (one round-trip instead of three per character)
+- 'fast': Input.insertText for each line of text, Enter key events for newlines, followed by the framework events
+"""
+
+ENTER_KEY_EVENTS: tuple['DispatchKeyEventParameters', ...] = (
+	{'type': 'keyDown', 'key': 'Enter', 'code': 'Enter', 'windowsVirtualKeyCode': 13},
+	{'type': 'char', 'text': '\r', 'key': 'Enter'},
+	{'type': 'keyUp', 'key': 'Enter', 'code': 'Enter', 'windowsVirtualKeyCode': 13},
+)
+
+# Dispatches the input/change/blur events (and React/Vue specific ones) that frameworks listen to after text input.
+# Called with Runtime.callFunctionOn on the input element, returns true when all events were dispatched.
+FRAMEWORK_EVENTS_JS = """
+function() {
+	// Find the target element (available as 'this' when using objectId)
+	const element = this;
+	if (!element) return false;
+
+	// Ensure element is focused
+	element.focus();
+
+	// Comprehensive event sequence for maximum framework compatibility
+	const events = [
+		// Input event - primary event for React controlled components
+		{ type: 'input', bubbles: true, cancelable: true },
+		// Change event - important for form validation and Vue v-model
+		{ type: 'change', bubbles: true, cancelable: true },
+		// Blur event - triggers validation in many frameworks
+		{ type: 'blur', bubbles: true, cancelable: true }
+	];
+
+	let success = true;
+
+	events.forEach(eventConfig => {
+		try {
+			const event = new Event(eventConfig.type, {
+				bubbles: eventConfig.bubbles,
+				cancelable: eventConfig.cancelable
+			});
+
+			// Special handling for InputEvent (more specific than Event)
+			if (eventConfig.type === 'input') {
+				const inputEvent = new InputEvent('input', {
+					bubbles: true,
+					cancelable: true,
+					data: element.value,
+					inputType: 'insertText'
+				});
+				element.dispatchEvent(inputEvent);
+			} else {
+				element.dispatchEvent(event);
+			}
+		} catch (e) {
+			success = false;
+			console.warn('Framework event dispatch failed:', eventConfig.type, e);
+		}
+	});
+
+	// Special React synthetic event handling
+	// React uses internal fiber properties for event system
+	if (element._reactInternalFiber || element._reactInternalInstance || element.__reactInternalInstance) {
+		try {
+			// Trigger React's synthetic event system
+			const syntheticInputEvent = new InputEvent('input', {
+				bubbles: true,
+				cancelable: true,
+				data: element.value
+			});
+
+			// Force React to process this as a synthetic event
+			Object.defineProperty(syntheticInputEvent, 'isTrusted', { value: true });
+			element.dispatchEvent(syntheticInputEvent);
+		} catch (e) {
+			console.warn('React synthetic event failed:', e);
+		}
+	}
+
+	// Special Vue reactivity trigger
+	// Vue uses __vueParentComponent or __vue__ for component access
+	if (element.__vue__ || element._vnode || element.__vueParentComponent) {
+		try {
+			// Vue often needs explicit input event with proper timing
+			const vueEvent = new Event('input', { bubbles: true });
+			setTimeout(() => element.dispatchEvent(vueEvent), 0);
+		} catch (e) {
+			console.warn('Vue reactivity trigger failed:', e);
+		}
+	}
+
+	return success;
+}
+"""
+
+
+def char_key_events(
+	char: str, base_key: str, key_code: str, modifiers: int, vk_code: int
+) -> tuple['DispatchKeyEventParameters', ...]:
+	"""keyDown/char/keyUp events for one printable character (newlines use ENTER_KEY_EVENTS).
+
+	Only the char event carries the text, keyDown and keyUp describe the physical key (base key + modifiers).
+	"""
+	key_params: 'DispatchKeyEventParameters' = {
+		'key': base_key,
+		'code': key_code,
+		'modifiers': modifiers,
+		'windowsVirtualKeyCode': vk_code,
+	}
+	return (
+		{'type': 'keyDown', **key_params},
+		{'type': 'char', 'text': char, 'key': char},
+		{'type': 'keyUp', **key_params},
+	)
+
+
+async def dispatch_key_events_pipelined(
+	cdp_client: Any, session_id: str | None, key_events: Iterable['DispatchKeyEventParameters']
+) -> None:
+	"""Send all key events without waiting for each response, then wait for all of them.
+
+	The commands are written to the websocket in order and the browser handles the input events of a session in
+	order, so the page sees the same keystroke sequence as with one awaited round-trip per event.
+	"""
+	sends = [
+		asyncio.ensure_future(cdp_client.send.Input.dispatchKeyEvent(params=params, session_id=session_id))
+		for params in key_events
+	]
+	if not sends:
+		return
+	try:
+		await asyncio.gather(*sends)
+	except BaseException:
+		for send in sends:
+			send.cancel()
+		raise
+
+
+async def insert_text(cdp_client: Any, session_id: str | None, text: str) -> None:
+	"""Insert text with one Input.insertText per line, newlines are still typed as Enter key presses."""
+	for i, line in enumerate(text.split('\n')):
+		if i > 0:
+			await dispatch_key_events_pipelined(cdp_client, session_id, ENTER_KEY_EVENTS)
+		if line:
+			await cdp_client.send.Input.insertText(params={'text': line}, session_id=session_id)
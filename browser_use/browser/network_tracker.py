@@ -0,0 +1,211 @@
+"""Event-driven tracking of in-flight network requests per CDP session."""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+	from browser_use.browser.views import NetworkRequest
+
+# Curated ad/tracking hosts, requests to them (or their subdomains) are blocked by block_resources=['tracker']
+AD_AND_TRACKING_DOMAINS = (
+	# Standard ad/tracking networks
+	'doubleclick.net',
+	'googlesyndication.com',
+	'googletagmanager.com',
+	'googleadservices.com',
+	'adservice.google.com',
+	'amazon-adsystem.com',
+	'adnxs.com',
+	'adsrvr.org',
+	'criteo.com',
+	'criteo.net',
+	'pubmatic.com',
+	'rubiconproject.com',
+	'casalemedia.com',
+	'moatads.com',
+	'taboola.com',
+	'outbrain.com',
+	'facebook.net',
+	'hotjar.com',
+	'clarity.ms',
+	'mixpanel.com',
+	'segment.com',
+	# Analytics platforms
+	'demdex.net',
+	'omtrdc.net',
+	'adobedtm.com',
+	'ensighten.com',
+	'newrelic.com',
+	'nr-data.net',
+	'google-analytics.com',
+	'scorecardresearch.com',
+	'quantserve.com',
+	'bat.bing.com',
+	# Social media trackers
+	'connect.facebook.net',
+	'platform.twitter.com',
+	'platform.linkedin.com',
+)
+
+# Common ad/tracking domains and url patterns, requests to them never block network idle
+AD_AND_TRACKING_PATTERNS = (
+	*AD_AND_TRACKING_DOMAINS,
+	'analytics',
+	'ads',
+	'tracking',
+	'pixel',
+	# CDN/image hosts (usually not critical for functionality)
+	'.cloudfront.net/image/',
+	'.akamaized.net/image/',
+	# Common tracking paths
+	'/tracker/',
+	'/collector/',
+	'/beacon/',
+	'/telemetry/',
+	'/log/',
+	'/events/',
+	'/eventBatch',
+	'/track.',
+	'/metrics/',
+)
+
+# Long-lived or fire-and-forget request types that never "finish" loading the page
+IGNORED_RESOURCE_TYPES = {'WebSocket', 'EventSource', 'Ping', 'CSPViolationReport', 'Preflight', 'Prefetch'}
+
+# Images and fonts stop counting as pending once they have been loading for a while
+NON_CRITICAL_RESOURCE_TYPES = {'Image', 'Font', 'Media'}
+NON_CRITICAL_TIMEOUT = 3.0
+
+# Per-session cap, old entries are dropped first (e.g. requests whose session detached mid-flight)
+MAX_TRACKED_REQUESTS = 1000
+
+
+@dataclass(slots=True)
+class _InflightRequest:
+	url: str
+	method: str
+	resource_type: str | None
+	start_time: float
+
+
+class NetworkActivityTracker:
+	"""Tracks in-flight requests from CDP `Network` events, so the browser state capture can wait for network idle
+	(instead of sleeping a fixed time) and list pending requests without evaluating JavaScript in the page.
+
+	Requests to ad/tracking hosts, long-lived connections (websockets, event streams) and requests loading for
+	longer than `stuck_request_timeout` (polling) don't count as pending.
+
+	Requests the browser refused to send because of `Network.setBlockedURLs` (block_resources) are counted per resource
+	type in `blocked_requests`.
+	"""
+
+	def __init__(self, stuck_request_timeout: float = 10.0):
+		self.stuck_request_timeout = stuck_request_timeout
+		self._requests: dict[str, dict[str, _InflightRequest]] = {}
+		self._idle_waiters: dict[str, list[asyncio.Event]] = {}
+		self._registered_client: Any = None
+		self.blocked_requests: dict[str, int] = {}
+
+	def register_handlers(self, cdp_client: Any) -> None:
+		"""Subscribe to network events on a CDP client (once per client)."""
+		if self._registered_client is cdp_client:
+			return
+
+		cdp_client.register.Network.requestWillBeSent(self.on_request_will_be_sent)
+		cdp_client.register.Network.loadingFinished(self.on_loading_finished)
+		cdp_client.register.Network.loadingFailed(self.on_loading_failed)
+		self._registered_client = cdp_client
+
+	# ========== CDP event handlers ==========
+
+	def on_request_will_be_sent(self, event: Any, session_id: str | None = None) -> None:
+		if not session_id:
+			return
+		request = event.get('request', {})
+		url = request.get('url', '')
+		resource_type = event.get('type')
+		if (
+			resource_type in IGNORED_RESOURCE_TYPES
+			or url.startswith('data:')
+			or len(url) > 500
+			or any(pattern in url for pattern in AD_AND_TRACKING_PATTERNS)
+		):
+			return
+
+		requests = self._requests.setdefault(session_id, {})
+		# a redirect reuses the request id, the request is still in flight
+		requests[event['requestId']] = _InflightRequest(
+			url=url, method=request.get('method', 'GET'), resource_type=resource_type, start_time=time.monotonic()
+		)
+		if len(requests) > MAX_TRACKED_REQUESTS:
+			del requests[next(iter(requests))]
+
+	def on_loading_finished(self, event: Any, session_id: str | None = None) -> None:
+		self._finish(event.get('requestId'), session_id)
+
+	def on_loading_failed(self, event: Any, session_id: str | None = None) -> None:
+		# 'inspector' is the reason Chrome gives for requests blocked by Network.setBlockedURLs
+		if event.get('blockedReason') == 'inspector':
+			resource_type = event.get('type') or 'Other'
+			self.blocked_requests[resource_type] = self.blocked_requests.get(resource_type, 0) + 1
+		self._finish(event.get('requestId'), session_id)
+
+	def _finish(self, request_id: str | None, session_id: str | None) -> None:
+		requests = self._requests.get(session_id or '')
+		if requests is None or requests.pop(request_id or '', None) is None:
+			return
+		if session_id in self._idle_waiters and self.is_idle(session_id):
+			for waiter in self._idle_waiters.pop(session_id):
+				waiter.set()
+
+	# ========== Queries ==========
+
+	def _blocking_requests(self, session_id: str) -> list[_InflightRequest]:
+		now = time.monotonic()
+		blocking = []
+		for request in self._requests.get(session_id, {}).values():
+			loading_duration = now - request.start_time
+			if loading_duration > self.stuck_request_timeout:
+				continue
+			if request.resource_type in NON_CRITICAL_RESOURCE_TYPES and loading_duration > NON_CRITICAL_TIMEOUT:
+				continue
+			blocking.append(request)
+		return blocking
+
+	def is_idle(self, session_id: str) -> bool:
+		"""True when no request that matters for page stability is loading in the session."""
+		return not self._blocking_requests(session_id)
+
+	def get_pending_requests(self, session_id: str, limit: int = 20) -> list['NetworkRequest']:
+		"""Currently loading requests of a session, oldest first."""
+		from browser_use.browser.views import NetworkRequest
+
+		now = time.monotonic()
+		return [
+			NetworkRequest(
+				url=request.url,
+				method=request.method,
+				loading_duration_ms=round((now - request.start_time) * 1000),
+				resource_type=request.resource_type,
+			)
+			for request in self._blocking_requests(session_id)[:limit]
+		]
+
+	async def wait_for_idle(self, session_id: str, timeout: float) -> bool:
+		"""Wait until the session's network is idle, returns False if it still wasn't after `timeout` seconds."""
+		if self.is_idle(session_id):
+			return True
+		waiter = asyncio.Event()
+		self._idle_waiters.setdefault(session_id, []).append(waiter)
+		try:
+			# requests can also stop counting by aging out, which sends no event, so check again on timeout
+			await asyncio.wait_for(waiter.wait(), timeout=timeout)
+			return True
+		except TimeoutError:
+			return self.is_idle(session_id)
+		finally:
+			waiters = self._idle_waiters.get(session_id)
+			if waiters and waiter in waiters:
+				waiters.remove(waiter)
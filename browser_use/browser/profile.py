@@ -10,11 +10,12 @@ from urllib.parse import urlparse
 from pydantic import AfterValidator, AliasChoices, BaseModel, ConfigDict, Field, field_validator, model_validator
 
 from browser_use.browser.cloud.views import CloudBrowserParams
+from browser_use.browser.keyboard import TypingMode
 from browser_use.config import CONFIG
 from browser_use.utils import _log_pretty_path, logger
 
 CHROME_DEBUG_PORT = 9242  # use a non-default port to avoid conflicts with other tools / devs using 9222
-DOMAIN_OPTIMIZATION_THRESHOLD = 100  # Convert domain lists to sets for O(1) lookup when >= this size
+DOMAIN_OPTIMIZATION_THRESHOLD = 100  # Convert exact domain lists to sets for O(1) lookup when >= this size
 CHROME_DISABLED_COMPONENTS = [
 	# Playwright defaults: https://github.com/microsoft/playwright/blob/41008eeddd020e2dee1c540f7c0cdfa337e99637/packages/playwright-core/src/server/chromium/chromiumSwitches.ts#L76
 	# AcceptCHFrame,AutoExpandDetailsElement,AvoidUnnecessaryBeforeUnloadCheckSync,CertificateTransparencyComponentUpdater,DeferRendererTasksAfterInput,DestroyProfileOnBrowserClose,DialMediaRouteProvider,ExtensionManifestV2Disabled,GlobalMediaControls,HttpsUpgrades,ImprovedCookieControls,LazyFrameLoading,LensOverlay,MediaRouter,PaintHolding,ThirdPartyStoragePartitioning,Translate
@@ -285,6 +286,7 @@ BROWSERUSE_DEFAULT_CHANNEL = BrowserChannel.CHROMIUM
 UrlStr = Annotated[str, AfterValidator(validate_url)]
 NonNegativeFloat = Annotated[float, AfterValidator(lambda x: validate_float_range(x, 0, float('inf')))]
 CliArgStr = Annotated[str, AfterValidator(validate_cli_arg)]
+BlockableResource = Literal['image', 'media', 'font', 'stylesheet', 'tracker']
 
 
 # ===== Base Models =====
@@ -569,17 +571,40 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 	deterministic_rendering: bool = Field(default=False, description='Enable deterministic rendering flags.')
 	allowed_domains: list[str] | set[str] | None = Field(
 		default=None,
-		description='List of allowed domains for navigation e.g. ["*.google.com", "https://example.com", "chrome-extension://*"]. Lists with 100+ items are auto-optimized to sets (no pattern matching).',
+		description='List of allowed domains for navigation e.g. ["*.google.com", "https://example.com", "chrome-extension://*"]. Lists of 100+ exact domains are auto-optimized to sets, lists with patterns are compiled for fast matching.',
 	)
 	prohibited_domains: list[str] | set[str] | None = Field(
 		default=None,
-		description='List of prohibited domains for navigation e.g. ["*.google.com", "https://example.com", "chrome-extension://*"]. Allowed domains take precedence over prohibited domains. Lists with 100+ items are auto-optimized to sets (no pattern matching).',
+		description='List of prohibited domains for navigation e.g. ["*.google.com", "https://example.com", "chrome-extension://*"]. Allowed domains take precedence over prohibited domains. Lists of 100+ exact domains are auto-optimized to sets, lists with patterns are compiled for fast matching.',
 	)
 	block_ip_addresses: bool = Field(
 		default=False,
 		description='Block navigation to URLs containing IP addresses (both IPv4 and IPv6). When True, blocks all IP-based URLs including localhost and private networks.',
 	)
+	block_resources: list[BlockableResource] = Field(
+		default_factory=list,
+		description="Resources the browser never requests, for faster and cheaper page loads: 'image', 'media', 'font', 'stylesheet' (matched by file extension) and 'tracker' (requests to known ad/tracking domains).",
+	)
+	block_resources_overrides: dict[str, list[BlockableResource]] = Field(
+		default_factory=dict,
+		description='Per-site block_resources, keyed by domain pattern of the page URL (same format as sensitive_data domains), e.g. {"*.figma.com": ["tracker"]}. The first matching pattern wins.',
+	)
 	keep_alive: bool | None = Field(default=None, description='Keep browser alive after agent run.')
+	browser_pool_size: int = Field(
+		default=0,
+		ge=0,
+		description='Number of local browsers to keep pre-launched in the background, shared by all sessions of the process with the same launch args, so sessions start without waiting for a browser launch. 0 disables the pool. Only used for profiles without a user_data_dir.',
+	)
+	browser_pool_max_uses: int = Field(
+		default=1,
+		ge=1,
+		description='Number of sessions a pooled browser serves before it is replaced by a freshly launched one. 1 gives every session a new browser; above 1 browsers are reset between sessions (tabs closed, cookies, cache and site storage cleared).',
+	)
+	browser_pool_max_memory_mb: float | None = Field(
+		default=None,
+		gt=0,
+		description='Replace a pooled browser instead of reusing it once it uses more memory (resident, all browser processes) than this.',
+	)
 
 	# --- Proxy settings ---
 	# New consolidated proxy config (typed)
@@ -623,13 +648,31 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 		default=5,
 		description='Maximum depth for cross-origin iframe recursion (default: 5 levels deep).',
 	)
+	max_concurrent_iframe_fetches: int = Field(
+		ge=1,
+		default=4,
+		description='Maximum number of cross-origin iframe DOM trees fetched at the same time.',
+	)
+	iframe_fetch_timeout: float = Field(
+		gt=0,
+		default=5.0,
+		description='Timeout in seconds for fetching the DOM of one cross-origin iframe, frames that take longer are left out of the DOM tree.',
+	)
 
 	# --- Page load/wait timings ---
 
 	minimum_wait_page_load_time: float = Field(default=0.25, description='Minimum time to wait before capturing page state.')
 	wait_for_network_idle_page_load_time: float = Field(default=0.5, description='Time to wait for network idle.')
+	pipelined_state_capture: bool = Field(
+		default=False,
+		description='Capture the browser state with fewer sequential CDP round-trips: wait for network idle from CDP Network events (at most wait_for_network_idle_page_load_time) instead of a fixed sleep, and take the title and page metrics from the DOM capture.',
+	)
 
 	wait_between_actions: float = Field(default=0.1, description='Time to wait between actions.')
+	typing_mode: TypingMode = Field(
+		default='human',
+		description="How text is typed: 'human' (one awaited keyDown/char/keyUp per character with small delays), 'pipelined' (the same key events sent without waiting for each response) or 'fast' (Input.insertText followed by the input/change events frameworks listen to).",
+	)
 
 	# --- UI/viewport/DOM ---
 	highlight_elements: bool = Field(default=True, description='Highlight interactive elements on the page.')
@@ -640,6 +683,15 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 		default=True, description='Only show element IDs in highlights if llm_representation is less than 10 characters.'
 	)
 	paint_order_filtering: bool = Field(default=True, description='Enable paint order filtering. Slightly experimental.')
+	incremental_dom: bool = Field(
+		default=False,
+		description='Keep the DOM tree between steps and patch it from CDP DOM mutation events instead of re-fetching it every step. Experimental.',
+	)
+	incremental_dom_max_mutations: int = Field(
+		ge=0,
+		default=500,
+		description='Maximum number of DOM mutations between two steps before incremental_dom falls back to a full DOM rebuild.',
+	)
 	interaction_highlight_color: str = Field(
 		default='rgb(255, 127, 39)',
 		description='Color to use for highlighting elements during interactions (CSS color string).',
@@ -687,16 +739,15 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 	@field_validator('allowed_domains', 'prohibited_domains', mode='after')
 	@classmethod
 	def optimize_large_domain_lists(cls, v: list[str] | set[str] | None) -> list[str] | set[str] | None:
-		"""Convert large domain lists (>=100 items) to sets for O(1) lookup performance."""
+		"""Convert large lists (>=100 items) of exact domains to sets for O(1) lookup performance.
+
+		Lists containing patterns (*.domain.com, https://...) stay lists, they are compiled for fast matching.
+		"""
 		if v is None or isinstance(v, set):
 			return v
 
-		if len(v) >= DOMAIN_OPTIMIZATION_THRESHOLD:
-			logger.warning(
-				f'🔧 Optimizing domain list with {len(v)} items to set for O(1) lookup. '
-				f'Note: Pattern matching (*.domain.com, etc.) is not supported for lists >= {DOMAIN_OPTIMIZATION_THRESHOLD} items. '
-				f'Use exact domains only or keep list size < {DOMAIN_OPTIMIZATION_THRESHOLD} for pattern support.'
-			)
+		if len(v) >= DOMAIN_OPTIMIZATION_THRESHOLD and not any('*' in domain or '://' in domain for domain in v):
+			logger.debug(f'🔧 Optimizing domain list with {len(v)} exact domains to set for O(1) lookup')
 			return set(v)
 
 		return v
@@ -9,11 +9,13 @@ import base64
 import io
 import logging
 import os
+from typing import NamedTuple
 
 from PIL import Image, ImageDraw, ImageFont
 
 from browser_use.dom.views import DOMSelectorMap, EnhancedDOMTreeNode
 from browser_use.observability import observe_debug
+from browser_use.screenshots.image_pool import image_pool
 from browser_use.utils import time_execution_async
 
 logger = logging.getLogger(__name__)
@@ -337,29 +339,68 @@ def draw_bounding_box_with_text(
 			logger.debug(f'Failed to draw text overlay: {e}')
 
 
-def process_element_highlight(
-	element_id: int,
-	element: EnhancedDOMTreeNode,
+class HighlightBox(NamedTuple):
+	"""What is drawn for one element: its bounds in CSS pixels, colour and index label."""
+
+	element_id: int
+	x: float
+	y: float
+	width: float
+	height: float
+	color: str
+	index_text: str | None
+	tag_name: str
+
+
+def get_highlight_box(element_id: int, element: EnhancedDOMTreeNode, filter_highlight_ids: bool) -> HighlightBox | None:
+	"""Collect what is needed to highlight an element, so drawing doesn't need the DOM tree."""
+	# Use absolute_position coordinates directly
+	if not element.absolute_position:
+		return None
+
+	bounds = element.absolute_position
+
+	# Get element color based on type
+	tag_name = element.tag_name if hasattr(element, 'tag_name') else 'div'
+	element_type = None
+	if hasattr(element, 'attributes') and element.attributes:
+		element_type = element.attributes.get('type')
+
+	color = get_element_color(tag_name, element_type)
+
+	# Get element index for overlay and apply filtering
+	backend_node_id = getattr(element, 'backend_node_id', None)
+	index_text = None
+
+	if backend_node_id is not None:
+		if filter_highlight_ids:
+			# Use the meaningful text that matches what the LLM sees
+			meaningful_text = element.get_meaningful_text_for_llm()
+			# Show ID only if meaningful text is less than 5 characters
+			if len(meaningful_text) < 3:
+				index_text = str(backend_node_id)
+		else:
+			# Always show ID when filter is disabled
+			index_text = str(backend_node_id)
+
+	return HighlightBox(element_id, bounds.x, bounds.y, bounds.width, bounds.height, color, index_text, tag_name)
+
+
+def draw_highlight_box(
+	box: HighlightBox,
 	draw,
 	device_pixel_ratio: float,
 	font,
-	filter_highlight_ids: bool,
 	image_size: tuple[int, int],
 ) -> None:
-	"""Process a single element for highlighting."""
+	"""Draw the highlight of a single element."""
 	try:
-		# Use absolute_position coordinates directly
-		if not element.absolute_position:
-			return
-
-		bounds = element.absolute_position
-
 		# Scale coordinates from CSS pixels to device pixels for screenshot
 		# The screenshot is captured at device pixel resolution, but coordinates are in CSS pixels
-		x1 = int(bounds.x * device_pixel_ratio)
-		y1 = int(bounds.y * device_pixel_ratio)
-		x2 = int((bounds.x + bounds.width) * device_pixel_ratio)
-		y2 = int((bounds.y + bounds.height) * device_pixel_ratio)
+		x1 = int(box.x * device_pixel_ratio)
+		y1 = int(box.y * device_pixel_ratio)
+		x2 = int((box.x + box.width) * device_pixel_ratio)
+		y2 = int((box.y + box.height) * device_pixel_ratio)
 
 		# Ensure coordinates are within image bounds
 		img_width, img_height = image_size
@@ -372,38 +413,65 @@ def process_element_highlight(
 		if x2 - x1 < 2 or y2 - y1 < 2:
 			return
 
-		# Get element color based on type
-		tag_name = element.tag_name if hasattr(element, 'tag_name') else 'div'
-		element_type = None
-		if hasattr(element, 'attributes') and element.attributes:
-			element_type = element.attributes.get('type')
-
-		color = get_element_color(tag_name, element_type)
-
-		# Get element index for overlay and apply filtering
-		backend_node_id = getattr(element, 'backend_node_id', None)
-		index_text = None
-
-		if backend_node_id is not None:
-			if filter_highlight_ids:
-				# Use the meaningful text that matches what the LLM sees
-				meaningful_text = element.get_meaningful_text_for_llm()
-				# Show ID only if meaningful text is less than 5 characters
-				if len(meaningful_text) < 3:
-					index_text = str(backend_node_id)
-			else:
-				# Always show ID when filter is disabled
-				index_text = str(backend_node_id)
-
 		# Draw enhanced bounding box with bigger index
 		draw_enhanced_bounding_box_with_text(
-			draw, (x1, y1, x2, y2), color, index_text, font, tag_name, image_size, device_pixel_ratio
+			draw, (x1, y1, x2, y2), box.color, box.index_text, font, box.tag_name, image_size, device_pixel_ratio
 		)
 
+	except Exception as e:
+		logger.debug(f'Failed to draw highlight for element {box.element_id}: {e}')
+
+
+def process_element_highlight(
+	element_id: int,
+	element: EnhancedDOMTreeNode,
+	draw,
+	device_pixel_ratio: float,
+	font,
+	filter_highlight_ids: bool,
+	image_size: tuple[int, int],
+) -> None:
+	"""Process a single element for highlighting."""
+	try:
+		box = get_highlight_box(element_id, element, filter_highlight_ids)
+		if box is not None:
+			draw_highlight_box(box, draw, device_pixel_ratio, font, image_size)
 	except Exception as e:
 		logger.debug(f'Failed to draw highlight for element {element_id}: {e}')
 
 
+def render_highlighted_screenshot(screenshot_b64: str, boxes: list[HighlightBox], device_pixel_ratio: float = 1.0) -> str:
+	"""Decode the screenshot, draw the highlight boxes and encode it again (CPU heavy, runs in the image worker pool).
+
+	Returns:
+	    Base64 encoded highlighted screenshot
+	"""
+	# Decode screenshot
+	screenshot_data = base64.b64decode(screenshot_b64)
+	image = Image.open(io.BytesIO(screenshot_data)).convert('RGBA')
+	output_buffer = io.BytesIO()
+	try:
+		# Create drawing context
+		draw = ImageDraw.Draw(image)
+
+		# Load font using shared function with caching
+		font = get_cross_platform_font(12)
+		# If no system fonts found, font remains None and will use default font
+
+		# Process elements sequentially to avoid ImageDraw thread safety issues
+		# PIL ImageDraw is not thread-safe, so we process elements one by one
+		for box in boxes:
+			draw_highlight_box(box, draw, device_pixel_ratio, font, image.size)
+
+		# Convert back to base64
+		image.save(output_buffer, format='PNG')
+		return base64.b64encode(output_buffer.getvalue()).decode('utf-8')
+	finally:
+		# Explicit cleanup to prevent memory leaks
+		output_buffer.close()
+		image.close()
+
+
 @observe_debug(ignore_input=True, ignore_output=True, name='create_highlighted_screenshot')
 @time_execution_async('create_highlighted_screenshot')
 async def create_highlighted_screenshot(
@@ -416,6 +484,8 @@ async def create_highlighted_screenshot(
 ) -> str:
 	"""Create a highlighted screenshot with bounding boxes around interactive elements.
 
+	The image work runs in the shared image worker pool, so the event loop keeps serving CDP events meanwhile.
+
 	Args:
 	    screenshot_b64: Base64 encoded screenshot
 	    selector_map: Map of interactive elements with their positions
@@ -427,42 +497,24 @@ async def create_highlighted_screenshot(
 	    Base64 encoded highlighted screenshot
 	"""
 	try:
-		# Decode screenshot
-		screenshot_data = base64.b64decode(screenshot_b64)
-		image = Image.open(io.BytesIO(screenshot_data)).convert('RGBA')
-
-		# Create drawing context
-		draw = ImageDraw.Draw(image)
-
-		# Load font using shared function with caching
-		font = get_cross_platform_font(12)
-		# If no system fonts found, font remains None and will use default font
-
-		# Process elements sequentially to avoid ImageDraw thread safety issues
-		# PIL ImageDraw is not thread-safe, so we process elements one by one
+		boxes = []
 		for element_id, element in selector_map.items():
-			process_element_highlight(element_id, element, draw, device_pixel_ratio, font, filter_highlight_ids, image.size)
+			try:
+				box = get_highlight_box(element_id, element, filter_highlight_ids)
+			except Exception as e:
+				logger.debug(f'Failed to get highlight for element {element_id}: {e}')
+				continue
+			if box is not None:
+				boxes.append(box)
 
-		# Convert back to base64
-		output_buffer = io.BytesIO()
-		try:
-			image.save(output_buffer, format='PNG')
-			output_buffer.seek(0)
-			highlighted_b64 = base64.b64encode(output_buffer.getvalue()).decode('utf-8')
-
-			logger.debug(f'Successfully created highlighted screenshot with {len(selector_map)} elements')
-			return highlighted_b64
-		finally:
-			# Explicit cleanup to prevent memory leaks
-			output_buffer.close()
-			if 'image' in locals():
-				image.close()
+		highlighted_b64 = await image_pool.run(
+			'highlight_screenshot', render_highlighted_screenshot, screenshot_b64, boxes, device_pixel_ratio
+		)
+		logger.debug(f'Successfully created highlighted screenshot with {len(selector_map)} elements')
+		return highlighted_b64
 
 	except Exception as e:
 		logger.error(f'Failed to create highlighted screenshot: {e}')
-		# Clean up on error as well
-		if 'image' in locals():
-			image.close()
 		# Return original screenshot on error
 		return screenshot_b64
 
@@ -545,4 +597,9 @@ async def create_highlighted_screenshot_async(
 
 
 # Export the cleanup function for external use in long-running applications
-__all__ = ['create_highlighted_screenshot', 'create_highlighted_screenshot_async', 'cleanup_font_cache']
+__all__ = [
+	'create_highlighted_screenshot',
+	'create_highlighted_screenshot_async',
+	'render_highlighted_screenshot',
+	'cleanup_font_cache',
+]
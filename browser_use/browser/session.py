@@ -152,6 +152,8 @@ class BrowserSession(BaseModel):
 		paint_order_filtering: bool | None = None,
 		max_iframes: int | None = None,
 		max_iframe_depth: int | None = None,
+		max_concurrent_iframe_fetches: int | None = None,
+		iframe_fetch_timeout: float | None = None,
 	) -> None: ...
 
 	# Overload 2: Local browser mode (use local browser params)
@@ -184,6 +186,8 @@ class BrowserSession(BaseModel):
 		paint_order_filtering: bool | None = None,
 		max_iframes: int | None = None,
 		max_iframe_depth: int | None = None,
+		max_concurrent_iframe_fetches: int | None = None,
+		iframe_fetch_timeout: float | None = None,
 		# All other local params
 		env: dict[str, str | float | bool] | None = None,
 		ignore_default_args: list[str] | Literal[True] | None = None,
@@ -291,6 +295,8 @@ class BrowserSession(BaseModel):
 		# Iframe processing limits
 		max_iframes: int | None = None,
 		max_iframe_depth: int | None = None,
+		max_concurrent_iframe_fetches: int | None = None,
+		iframe_fetch_timeout: float | None = None,
 	):
 		# Following the same pattern as AgentSettings in service.py
 		# Only pass non-None values to avoid validation errors
@@ -433,6 +439,7 @@ class BrowserSession(BaseModel):
 	_screenshot_watchdog: Any | None = PrivateAttr(default=None)
 	_permissions_watchdog: Any | None = PrivateAttr(default=None)
 	_recording_watchdog: Any | None = PrivateAttr(default=None)
+	_resource_blocking_watchdog: Any | None = PrivateAttr(default=None)
 
 	_cloud_browser_client: CloudBrowserClient = PrivateAttr(default_factory=lambda: CloudBrowserClient())
 	_demo_mode: 'DemoMode | None' = PrivateAttr(default=None)
@@ -513,6 +520,7 @@ class BrowserSession(BaseModel):
 		self._screenshot_watchdog = None
 		self._permissions_watchdog = None
 		self._recording_watchdog = None
+		self._resource_blocking_watchdog = None
 		if self._demo_mode:
 			self._demo_mode.reset()
 			self._demo_mode = None
@@ -1360,6 +1368,7 @@ class BrowserSession(BaseModel):
 		from browser_use.browser.watchdogs.permissions_watchdog import PermissionsWatchdog
 		from browser_use.browser.watchdogs.popups_watchdog import PopupsWatchdog
 		from browser_use.browser.watchdogs.recording_watchdog import RecordingWatchdog
+		from browser_use.browser.watchdogs.resource_blocking_watchdog import ResourceBlockingWatchdog
 		from browser_use.browser.watchdogs.screenshot_watchdog import ScreenshotWatchdog
 		from browser_use.browser.watchdogs.security_watchdog import SecurityWatchdog
 		from browser_use.browser.watchdogs.storage_state_watchdog import StorageStateWatchdog
@@ -1420,6 +1429,12 @@ class BrowserSession(BaseModel):
 		# SecurityWatchdog only handles security policy enforcement
 		self._security_watchdog.attach_to_session()
 
+		# Initialize ResourceBlockingWatchdog conditionally (blocks images, fonts, trackers, etc. before they are requested)
+		if self.browser_profile.block_resources or self.browser_profile.block_resources_overrides:
+			ResourceBlockingWatchdog.model_rebuild()
+			self._resource_blocking_watchdog = ResourceBlockingWatchdog(event_bus=self.event_bus, browser_session=self)
+			self._resource_blocking_watchdog.attach_to_session()
+
 		# Initialize AboutBlankWatchdog (handles about:blank pages and Vector AI Agent loading animation on first load)
 		AboutBlankWatchdog.model_rebuild()
 		self._aboutblank_watchdog = AboutBlankWatchdog(event_bus=self.event_bus, browser_session=self)
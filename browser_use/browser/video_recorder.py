@@ -1,17 +1,21 @@
 """Video Recording Service for Browser Use Sessions."""
 
 import base64
+import io
 import logging
 import math
-import subprocess
+import queue
+import threading
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
+from PIL import Image
+
 from browser_use.browser.profile import ViewportSize
 
 try:
 	import imageio.v2 as iio  # type: ignore[import-not-found]
-	import imageio_ffmpeg  # type: ignore[import-not-found]
 	import numpy as np  # type: ignore[import-not-found]
 	from imageio.core.format import Format  # type: ignore[import-not-found]
 
@@ -29,16 +33,29 @@ def _get_padded_size(size: ViewportSize, macro_block_size: int = 16) -> Viewport
 	return ViewportSize(width=width, height=height)
 
 
+@dataclass
+class VideoRecorderStats:
+	"""Frame counters of a video recording."""
+
+	frames_received: int = 0
+	frames_encoded: int = 0
+	frames_dropped: int = 0
+	"""Frames discarded because the encoder could not keep up (the oldest queued frame is dropped)"""
+	frames_failed: int = 0
+
+
 class VideoRecorderService:
 	"""
 	Handles the video encoding process for a browser session using imageio.
 
-	This service captures individual frames from the CDP screencast, decodes them,
-	and appends them to a video file using a pip-installable ffmpeg backend.
-	It automatically resizes frames to match the target video dimensions.
+	This service captures individual frames from the CDP screencast and appends them to a video
+	file using a pip-installable ffmpeg backend. `add_frame` only queues the frame: decoding,
+	resizing/padding (PIL) and encoding happen in a dedicated encoder thread that feeds a single
+	persistent ffmpeg process, so recording never blocks the event loop. When the encoder falls
+	behind, the bounded queue drops the oldest frames.
 	"""
 
-	def __init__(self, output_path: Path, size: ViewportSize, framerate: int):
+	def __init__(self, output_path: Path, size: ViewportSize, framerate: int, max_queued_frames: int = 60):
 		"""
 		Initializes the video recorder.
 
@@ -46,6 +63,7 @@ class VideoRecorderService:
 		    output_path: The full path where the video will be saved.
 		    size: A ViewportSize object specifying the width and height of the video.
 		    framerate: The desired framerate for the output video.
+		    max_queued_frames: Frames buffered for the encoder before the oldest ones get dropped.
 		"""
 		self.output_path = output_path
 		self.size = size
@@ -53,6 +71,10 @@ class VideoRecorderService:
 		self._writer: Optional['Format.Writer'] = None
 		self._is_active = False
 		self.padded_size = _get_padded_size(self.size)
+		self.stats = VideoRecorderStats()
+		self._frames: queue.Queue[str] = queue.Queue(maxsize=max(1, max_queued_frames))
+		self._encoder_thread: threading.Thread | None = None
+		self._stop_encoding = threading.Event()
 
 	def start(self) -> None:
 		"""
@@ -79,6 +101,8 @@ class VideoRecorderService:
 				macro_block_size=None,
 			)
 			self._is_active = True
+			self._encoder_thread = threading.Thread(target=self._encode_frames, name='video-recorder-encoder', daemon=True)
+			self._encoder_thread.start()
 			logger.debug(f'Video recorder started. Output will be saved to {self.output_path}')
 		except Exception as e:
 			logger.error(f'Failed to initialize video writer: {e}')
@@ -86,8 +110,10 @@ class VideoRecorderService:
 
 	def add_frame(self, frame_data_b64: str) -> None:
 		"""
-		Decodes a base64-encoded PNG frame, resizes it, pads it to be codec-compatible,
-		and appends it to the video.
+		Queues a base64-encoded PNG frame for the encoder thread, without blocking.
+
+		If the queue is full the oldest queued frame is dropped, so the video stays
+		close to real time instead of lagging further and further behind.
 
 		Args:
 		    frame_data_b64: A base64-encoded string of the PNG frame data.
@@ -95,53 +121,57 @@ class VideoRecorderService:
 		if not self._is_active or not self._writer:
 			return
 
-		try:
-			frame_bytes = base64.b64decode(frame_data_b64)
-
-			# Build a filter chain for ffmpeg:
-			# 1. scale: Resizes the frame to the user-specified dimensions.
-			# 2. pad: Adds black bars to meet codec's macro-block requirements,
-			#    centering the original content.
-			vf_chain = (
-				f'scale={self.size["width"]}:{self.size["height"]},'
-				f'pad={self.padded_size["width"]}:{self.padded_size["height"]}:(ow-iw)/2:(oh-ih)/2:color=black'
-			)
+		self.stats.frames_received += 1
+		while True:
+			try:
+				self._frames.put_nowait(frame_data_b64)
+				return
+			except queue.Full:
+				try:
+					self._frames.get_nowait()
+					self.stats.frames_dropped += 1
+				except queue.Empty:
+					pass
+
+	def _encode_frames(self) -> None:
+		"""Encoder thread: takes frames off the queue and appends them to the video until stopped and drained."""
+		while True:
+			try:
+				frame_data_b64 = self._frames.get(timeout=0.1)
+			except queue.Empty:
+				if self._stop_encoding.is_set():
+					return
+				continue
+			try:
+				self._encode_frame(frame_data_b64)
+				self.stats.frames_encoded += 1
+			except Exception as e:
+				self.stats.frames_failed += 1
+				logger.warning(f'Could not process and add video frame: {e}')
+
+	def _encode_frame(self, frame_data_b64: str) -> None:
+		"""
+		Decodes a PNG frame, resizes it, pads it to be codec-compatible and appends it to the video.
+		"""
+		assert self._writer is not None
+		frame_bytes = base64.b64decode(frame_data_b64)
 
-			output_pix_fmt = 'rgb24'
-			command = [
-				imageio_ffmpeg.get_ffmpeg_exe(),
-				'-f',
-				'image2pipe',  # Input format from a pipe
-				'-c:v',
-				'png',  # Specify input codec is PNG
-				'-i',
-				'-',  # Input from stdin
-				'-vf',
-				vf_chain,  # Video filter for resizing and padding
-				'-f',
-				'rawvideo',  # Output format is raw video
-				'-pix_fmt',
-				output_pix_fmt,  # Output pixel format
-				'-',  # Output to stdout
-			]
-
-			# Execute ffmpeg as a subprocess
-			proc = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-			out, err = proc.communicate(input=frame_bytes)
-
-			if proc.returncode != 0:
-				err_msg = err.decode(errors='ignore').strip()
-				if 'deprecated pixel format used' not in err_msg.lower():
-					raise OSError(f'ffmpeg error during resizing/padding: {err_msg}')
-				else:
-					logger.debug(f'ffmpeg warning during resizing/padding: {err_msg}')
-
-			# Convert the raw output bytes to a numpy array with the padded dimensions
-			img_array = np.frombuffer(out, dtype=np.uint8).reshape((self.padded_size['height'], self.padded_size['width'], 3))
-
-			self._writer.append_data(img_array)
-		except Exception as e:
-			logger.warning(f'Could not process and add video frame: {e}')
+		with Image.open(io.BytesIO(frame_bytes)) as image:
+			frame = image.convert('RGB')
+
+		# Resize the frame to the user-specified dimensions
+		width, height = self.size['width'], self.size['height']
+		if frame.size != (width, height):
+			frame = frame.resize((width, height), Image.Resampling.BILINEAR)
+
+		# Add black bars to meet the codec's macro-block requirements, centering the original content
+		padded_width, padded_height = self.padded_size['width'], self.padded_size['height']
+		if (padded_width, padded_height) != (width, height):
+			padded = Image.new('RGB', (padded_width, padded_height), color='black')
+			padded.paste(frame, ((padded_width - width) // 2, (padded_height - height) // 2))
+			frame = padded
+
+		self._writer.append_data(np.asarray(frame))
 
 	def stop_and_save(self) -> None:
 		"""
@@ -152,9 +182,19 @@ class VideoRecorderService:
 		if not self._is_active or not self._writer:
 			return
 
+		# stop accepting frames, then let the encoder thread finish the queued ones
+		self._is_active = False
+		if self._encoder_thread is not None:
+			self._stop_encoding.set()
+			self._encoder_thread.join()
+			self._encoder_thread = None
+
 		try:
 			self._writer.close()
-			logger.info(f'📹 Video recording saved successfully to: {self.output_path}')
+			logger.info(
+				f'📹 Video recording saved successfully to: {self.output_path} '
+				f'({self.stats.frames_encoded} frames encoded, {self.stats.frames_dropped} dropped)'
+			)
 		except Exception as e:
 			logger.error(f'Failed to finalize and save video: {e}')
 		finally:
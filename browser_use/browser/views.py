@@ -108,6 +108,7 @@ class BrowserStateSummary:
 	pending_network_requests: list[NetworkRequest] = field(default_factory=list)  # Currently loading network requests
 	pagination_buttons: list[PaginationButton] = field(default_factory=list)  # Detected pagination buttons
 	closed_popup_messages: list[str] = field(default_factory=list)  # Messages from auto-closed JavaScript dialogs
+	state_timings: dict[str, float] = field(default_factory=dict, repr=False)  # Per-phase capture timings in ms
 
 
 @dataclass
@@ -21,6 +21,14 @@ from browser_use.browser.events import (
 	UploadFileEvent,
 	WaitEvent,
 )
+from browser_use.browser.keyboard import (
+	ENTER_KEY_EVENTS,
+	FRAMEWORK_EVENTS_JS,
+	TypingMode,
+	char_key_events,
+	dispatch_key_events_pipelined,
+	insert_text,
+)
 from browser_use.browser.views import BrowserError, URLNotAllowedError
 from browser_use.browser.watchdog_base import BaseWatchdog
 from browser_use.dom.service import EnhancedDOMTreeNode
@@ -280,7 +288,7 @@ class DefaultActionWatchdog(BaseWatchdog):
 			# Check if this is index 0 or a falsy index - type to the page (whatever has focus)
 			if not element_node.backend_node_id or element_node.backend_node_id == 0:
 				# Type to the page without focusing any specific element
-				await self._type_to_page(event.text)
+				await self._type_to_page(event.text, typing_mode=event.typing_mode)
 				# Log with sensitive data protection
 				if event.is_sensitive:
 					if event.sensitive_key_name:
@@ -298,6 +306,7 @@ class DefaultActionWatchdog(BaseWatchdog):
 						event.text,
 						clear=event.clear or (not event.text),
 						is_sensitive=event.is_sensitive,
+						typing_mode=event.typing_mode,
 					)
 					# Log with sensitive data protection
 					if event.is_sensitive:
@@ -316,7 +325,7 @@ class DefaultActionWatchdog(BaseWatchdog):
 						await asyncio.wait_for(self._click_element_node_impl(element_node), timeout=10.0)
 					except Exception as e:
 						pass
-					await self._type_to_page(event.text)
+					await self._type_to_page(event.text, typing_mode=event.typing_mode)
 					# Log with sensitive data protection
 					if event.is_sensitive:
 						if event.sensitive_key_name:
@@ -853,7 +862,7 @@ class DefaultActionWatchdog(BaseWatchdog):
 				long_term_memory=f'Failed to click at coordinates ({coordinate_x}, {coordinate_y}). The coordinates may be outside viewport or the page may have changed.',
 			)
 
-	async def _type_to_page(self, text: str):
+	async def _type_to_page(self, text: str, typing_mode: TypingMode | None = None):
 		"""
 		Type text to the page (whatever element currently has focus).
 		This is used when index is 0 or when an element can't be found.
@@ -862,6 +871,15 @@ class DefaultActionWatchdog(BaseWatchdog):
 			# Get CDP client and session
 			cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=None, focus=True)
 
+			typing_mode = typing_mode or self.browser_session.browser_profile.typing_mode
+			if typing_mode == 'fast':
+				await insert_text(cdp_session.cdp_client, cdp_session.session_id, text)
+				return
+			if typing_mode == 'pipelined':
+				key_events = [params for char in text for params in self._key_events_for_char(char)]
+				await dispatch_key_events_pipelined(cdp_session.cdp_client, cdp_session.session_id, key_events)
+				return
+
 			# Type the text character by character to the focused element
 			for char in text:
 				# Handle newline characters as Enter key
@@ -925,6 +943,13 @@ class DefaultActionWatchdog(BaseWatchdog):
 		except Exception as e:
 			raise Exception(f'Failed to type to page: {str(e)}')
 
+	def _key_events_for_char(self, char: str) -> tuple[DispatchKeyEventParameters, ...]:
+		"""keyDown/char/keyUp events that type one character, newlines are typed as Enter."""
+		if char == '\n':
+			return ENTER_KEY_EVENTS
+		modifiers, vk_code, base_key = self._get_char_modifiers_and_vk(char)
+		return char_key_events(char, base_key, self._get_key_code_for_char(base_key), modifiers, vk_code)
+
 	def _get_char_modifiers_and_vk(self, char: str) -> tuple[int, int, str]:
 		"""Get modifiers, virtual key code, and base key for a character.
 
@@ -1442,12 +1467,18 @@ class DefaultActionWatchdog(BaseWatchdog):
 			raise
 
 	async def _input_text_element_node_impl(
-		self, element_node: EnhancedDOMTreeNode, text: str, clear: bool = True, is_sensitive: bool = False
+		self,
+		element_node: EnhancedDOMTreeNode,
+		text: str,
+		clear: bool = True,
+		is_sensitive: bool = False,
+		typing_mode: TypingMode | None = None,
 	) -> dict | None:
 		"""
 		Input text into an element using pure CDP with improved focus fallbacks.
 
 		For date/time inputs, uses direct value assignment instead of typing.
+		typing_mode overrides the profile's typing_mode for this call.
 		"""
 
 		try:
@@ -1540,99 +1571,39 @@ class DefaultActionWatchdog(BaseWatchdog):
 				if not cleared_successfully:
 					self.logger.warning('⚠️ Text field clearing failed, typing may append to existing text')
 
-			# Step 4: Type the text character by character using proper human-like key events
+			# Step 4: Type the text, by default character by character using proper human-like key events
 			# This emulates exactly how a human would type, which modern websites expect
+			typing_mode = typing_mode or self.browser_session.browser_profile.typing_mode
 			if is_sensitive:
 				# Note: sensitive_key_name is not passed to this low-level method,
 				# but we could extend the signature if needed for more granular logging
-				self.logger.debug('🎯 Typing <sensitive> character by character')
+				self.logger.debug(f'🎯 Typing <sensitive> ({typing_mode} typing)')
 			else:
-				self.logger.debug(f'🎯 Typing text character by character: "{text}"')
-
-			for i, char in enumerate(text):
-				# Handle newline characters as Enter key
-				if char == '\n':
-					# Send proper Enter key sequence
-					await cdp_session.cdp_client.send.Input.dispatchKeyEvent(
-						params={
-							'type': 'keyDown',
-							'key': 'Enter',
-							'code': 'Enter',
-							'windowsVirtualKeyCode': 13,
-						},
-						session_id=cdp_session.session_id,
-					)
-
-					# Small delay to emulate human typing speed
-					await asyncio.sleep(0.001)
+				self.logger.debug(f'🎯 Typing text ({typing_mode} typing): "{text}"')
 
-					# Send char event with carriage return
-					await cdp_session.cdp_client.send.Input.dispatchKeyEvent(
-						params={
-							'type': 'char',
-							'text': '\r',
-							'key': 'Enter',
-						},
-						session_id=cdp_session.session_id,
-					)
-
-					# Send keyUp event
-					await cdp_session.cdp_client.send.Input.dispatchKeyEvent(
-						params={
-							'type': 'keyUp',
-							'key': 'Enter',
-							'code': 'Enter',
-							'windowsVirtualKeyCode': 13,
-						},
-						session_id=cdp_session.session_id,
-					)
-				else:
-					# Handle regular characters
-					# Get proper modifiers, VK code, and base key for the character
-					modifiers, vk_code, base_key = self._get_char_modifiers_and_vk(char)
-					key_code = self._get_key_code_for_char(base_key)
-
-					# self.logger.debug(f'🎯 Typing character {i + 1}/{len(text)}: "{char}" (base_key: {base_key}, code: {key_code}, modifiers: {modifiers}, vk: {vk_code})')
+			if typing_mode == 'fast':
+				await insert_text(cdp_session.cdp_client, cdp_session.session_id, text)
+			elif typing_mode == 'pipelined':
+				key_events = [params for char in text for params in self._key_events_for_char(char)]
+				await dispatch_key_events_pipelined(cdp_session.cdp_client, cdp_session.session_id, key_events)
+			else:
+				for char in text:
+					key_down, key_char, key_up = self._key_events_for_char(char)
 
 					# Step 1: Send keyDown event (NO text parameter)
-					await cdp_session.cdp_client.send.Input.dispatchKeyEvent(
-						params={
-							'type': 'keyDown',
-							'key': base_key,
-							'code': key_code,
-							'modifiers': modifiers,
-							'windowsVirtualKeyCode': vk_code,
-						},
-						session_id=cdp_session.session_id,
-					)
+					await cdp_session.cdp_client.send.Input.dispatchKeyEvent(params=key_down, session_id=cdp_session.session_id)
 
 					# Small delay to emulate human typing speed
-					await asyncio.sleep(0.005)
+					await asyncio.sleep(0.001 if char == '\n' else 0.005)
 
 					# Step 2: Send char event (WITH text parameter) - this is crucial for text input
-					await cdp_session.cdp_client.send.Input.dispatchKeyEvent(
-						params={
-							'type': 'char',
-							'text': char,
-							'key': char,
-						},
-						session_id=cdp_session.session_id,
-					)
+					await cdp_session.cdp_client.send.Input.dispatchKeyEvent(params=key_char, session_id=cdp_session.session_id)
 
 					# Step 3: Send keyUp event (NO text parameter)
-					await cdp_session.cdp_client.send.Input.dispatchKeyEvent(
-						params={
-							'type': 'keyUp',
-							'key': base_key,
-							'code': key_code,
-							'modifiers': modifiers,
-							'windowsVirtualKeyCode': vk_code,
-						},
-						session_id=cdp_session.session_id,
-					)
+					await cdp_session.cdp_client.send.Input.dispatchKeyEvent(params=key_up, session_id=cdp_session.session_id)
 
-				# Small delay between characters to look human (realistic typing speed)
-				await asyncio.sleep(0.001)
+					# Small delay between characters to look human (realistic typing speed)
+					await asyncio.sleep(0.001)
 
 			# Step 4: Trigger framework-aware DOM events after typing completion
 			# Modern JavaScript frameworks (React, Vue, Angular) rely on these events
@@ -1658,93 +1629,11 @@ class DefaultActionWatchdog(BaseWatchdog):
 			cdp_session: CDP session for the element's context
 		"""
 		try:
-			# Execute JavaScript to trigger comprehensive event sequence
-			framework_events_script = """
-			function() {
-				// Find the target element (available as 'this' when using objectId)
-				const element = this;
-				if (!element) return false;
-
-				// Ensure element is focused
-				element.focus();
-
-				// Comprehensive event sequence for maximum framework compatibility
-				const events = [
-					// Input event - primary event for React controlled components
-					{ type: 'input', bubbles: true, cancelable: true },
-					// Change event - important for form validation and Vue v-model
-					{ type: 'change', bubbles: true, cancelable: true },
-					// Blur event - triggers validation in many frameworks
-					{ type: 'blur', bubbles: true, cancelable: true }
-				];
-
-				let success = true;
-
-				events.forEach(eventConfig => {
-					try {
-						const event = new Event(eventConfig.type, {
-							bubbles: eventConfig.bubbles,
-							cancelable: eventConfig.cancelable
-						});
-
-						// Special handling for InputEvent (more specific than Event)
-						if (eventConfig.type === 'input') {
-							const inputEvent = new InputEvent('input', {
-								bubbles: true,
-								cancelable: true,
-								data: element.value,
-								inputType: 'insertText'
-							});
-							element.dispatchEvent(inputEvent);
-						} else {
-							element.dispatchEvent(event);
-						}
-					} catch (e) {
-						success = false;
-						console.warn('Framework event dispatch failed:', eventConfig.type, e);
-					}
-				});
-
-				// Special React synthetic event handling
-				// React uses internal fiber properties for event system
-				if (element._reactInternalFiber || element._reactInternalInstance || element.__reactInternalInstance) {
-					try {
-						// Trigger React's synthetic event system
-						const syntheticInputEvent = new InputEvent('input', {
-							bubbles: true,
-							cancelable: true,
-							data: element.value
-						});
-
-						// Force React to process this as a synthetic event
-						Object.defineProperty(syntheticInputEvent, 'isTrusted', { value: true });
-						element.dispatchEvent(syntheticInputEvent);
-					} catch (e) {
-						console.warn('React synthetic event failed:', e);
-					}
-				}
-
-				// Special Vue reactivity trigger
-				// Vue uses __vueParentComponent or __vue__ for component access
-				if (element.__vue__ || element._vnode || element.__vueParentComponent) {
-					try {
-						// Vue often needs explicit input event with proper timing
-						const vueEvent = new Event('input', { bubbles: true });
-						setTimeout(() => element.dispatchEvent(vueEvent), 0);
-					} catch (e) {
-						console.warn('Vue reactivity trigger failed:', e);
-					}
-				}
-
-				return success;
-			}
-			"""
-
 			# Execute the framework events script
 			result = await cdp_session.cdp_client.send.Runtime.callFunctionOn(
 				params={
 					'objectId': object_id,
-					'functionDeclaration': framework_events_script,
+					'functionDeclaration': FRAMEWORK_EVENTS_JS,
 					'returnByValue': True,
 				},
 				session_id=cdp_session.session_id,
@@ -1,15 +1,21 @@
 """DOM watchdog for browser DOM tree management using CDP."""
 
 import asyncio
+import json
 import time
-from typing import TYPE_CHECKING
+from collections.abc import Awaitable
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from pydantic import PrivateAttr
 
 from browser_use.browser.events import (
 	BrowserErrorEvent,
 	BrowserStateRequestEvent,
+	NavigationCompleteEvent,
 	ScreenshotEvent,
 	TabCreatedEvent,
 )
+from browser_use.browser.network_tracker import AD_AND_TRACKING_PATTERNS, NetworkActivityTracker
 from browser_use.browser.watchdog_base import BaseWatchdog
 from browser_use.dom.service import DomService
 from browser_use.dom.views import (
@@ -20,8 +26,14 @@ from browser_use.observability import observe_debug
 from browser_use.utils import create_task_with_error_handling, time_execution_async
 
 if TYPE_CHECKING:
+	from cdp_use.cdp.page.commands import GetLayoutMetricsReturns
+
 	from browser_use.browser.views import BrowserStateSummary, NetworkRequest, PageInfo, PaginationButton
 
+T = TypeVar('T')
+
+_AD_AND_TRACKING_PATTERNS_JS = json.dumps(list(AD_AND_TRACKING_PATTERNS))
+
 
 class DOMWatchdog(BaseWatchdog):
 	"""Handles DOM tree building, serialization, and element access via CDP.
@@ -31,24 +43,117 @@ class DOMWatchdog(BaseWatchdog):
 	helper methods for other watchdogs.
 	"""
 
-	LISTENS_TO = [TabCreatedEvent, BrowserStateRequestEvent]
+	LISTENS_TO = [TabCreatedEvent, BrowserStateRequestEvent, NavigationCompleteEvent]
 	EMITS = [BrowserErrorEvent]
 
 	# Public properties for other watchdogs
 	selector_map: dict[int, EnhancedDOMTreeNode] | None = None
 	current_dom_state: SerializedDOMState | None = None
 	enhanced_dom_tree: EnhancedDOMTreeNode | None = None
+	# Bumped whenever the DOM tree is rebuilt (picking up DOM mutations), the cache is cleared or a navigation completes
+	dom_version: int = 0
+
+	# dom_version the cached enhanced_dom_tree was built at, it is stale once dom_version moves on
+	_enhanced_dom_tree_version: int = PrivateAttr(default=-1)
+	# extract_links -> (markdown, content stats) converted from the enhanced DOM tree of the current dom_version
+	_markdown_cache: dict[bool, tuple[str, dict[str, Any]]] = PrivateAttr(default_factory=dict)
 
 	# Internal DOM service
 	_dom_service: DomService | None = None
 
+	# Network activity from CDP events (pipelined_state_capture only)
+	_network_tracker: NetworkActivityTracker | None = None
+
 	# Network tracking - maps request_id to (url, start_time, method, resource_type)
 	_pending_requests: dict[str, tuple[str, float, str, str | None]] = {}
 
 	async def on_TabCreatedEvent(self, event: TabCreatedEvent) -> None:
 		# self.logger.debug('Setting up init scripts in browser')
+		# Start tracking network activity early, so requests already in flight at the first state request are known
+		if self.browser_session.browser_profile.pipelined_state_capture and self.browser_session._cdp_client_root is not None:
+			self._get_network_tracker(self.browser_session._cdp_client_root)
 		return None
 
+	async def on_NavigationCompleteEvent(self, event: NavigationCompleteEvent) -> None:
+		# the cached DOM tree and markdown describe the previous page now
+		self._bump_dom_version()
+
+	def _bump_dom_version(self) -> None:
+		self.dom_version += 1
+		self._markdown_cache.clear()
+
+	@property
+	def has_current_dom_tree(self) -> bool:
+		"""Whether the cached enhanced DOM tree was built at the current dom_version."""
+		return self.enhanced_dom_tree is not None and self._enhanced_dom_tree_version == self.dom_version
+
+	def get_cached_markdown(self, extract_links: bool) -> tuple[str, dict[str, Any]] | None:
+		"""Get the markdown extracted from the current DOM tree, if it was already converted."""
+		if not self.has_current_dom_tree:
+			return None
+		cached = self._markdown_cache.get(extract_links)
+		if cached is None:
+			return None
+		content, stats = cached
+		return content, dict(stats)
+
+	def cache_markdown(self, extract_links: bool, content: str, stats: dict[str, Any]) -> None:
+		"""Cache the markdown extracted from the current DOM tree until the next DOM version."""
+		if self.has_current_dom_tree:
+			self._markdown_cache[extract_links] = (content, dict(stats))
+
+	def _get_network_tracker(self, cdp_client: Any) -> NetworkActivityTracker:
+		"""Get the network activity tracker, subscribing it to the client's Network events on first use."""
+		if self._network_tracker is None:
+			self._network_tracker = NetworkActivityTracker()
+		self._network_tracker.register_handlers(cdp_client)
+		return self._network_tracker
+
+	async def _wait_for_network_idle(self) -> list['NetworkRequest']:
+		"""Wait until the focused page's network is idle (at most `wait_for_network_idle_page_load_time` seconds).
+
+		Replaces the JavaScript pending request check and the fixed stability sleep of the non-pipelined capture.
+
+		Returns:
+			The requests that were still loading before the wait
+		"""
+		cdp_session = await self.browser_session.get_or_create_cdp_session(focus=True)
+		tracker = self._get_network_tracker(cdp_session.cdp_client)
+
+		pending_requests = tracker.get_pending_requests(cdp_session.session_id)
+		if pending_requests:
+			timeout = self.browser_session.browser_profile.wait_for_network_idle_page_load_time
+			is_idle = await tracker.wait_for_idle(cdp_session.session_id, timeout=timeout)
+			self.logger.debug(
+				f'🔍 {len(pending_requests)} pending requests, network {"idle" if is_idle else f"still busy after {timeout}s"}'
+			)
+		return pending_requests
+
+	@staticmethod
+	async def _timed(coro: Awaitable[T], timings: dict[str, float], key: str) -> T:
+		"""Await a coroutine and record how long it took in `timings[key]` (ms), even if it fails."""
+		start = time.time()
+		try:
+			return await coro
+		finally:
+			timings[key] = (time.time() - start) * 1000
+
+	def _log_state_timings(self, timings: dict[str, float], pipelined: bool) -> None:
+		"""Log the per-phase timing breakdown of a browser state request as a single multi-line message."""
+		timing_lines = [
+			f'⏱️ Total browser state time: {timings.get("total_ms", 0):.2f}ms ({"pipelined" if pipelined else "sequential"})',
+			'📊 Timing breakdown:',
+			f'  ├─ network_wait: {timings.get("network_wait_ms", 0):.2f}ms',
+			f'  ├─ capture (parallel): {timings.get("capture_ms", 0):.2f}ms',
+		]
+		if 'dom_build_ms' in timings:
+			timing_lines.append(f'  │  ├─ dom_build: {timings["dom_build_ms"]:.2f}ms')
+		if 'screenshot_ms' in timings:
+			timing_lines.append(f'  │  └─ screenshot: {timings["screenshot_ms"]:.2f}ms')
+		timing_lines.append(f'  ├─ highlights: {timings.get("highlights_ms", 0):.2f}ms')
+		timing_lines.append(f'  └─ title_and_page_info: {timings.get("page_info_ms", 0):.2f}ms')
+		self.logger.debug('\n'.join(timing_lines))
+
 	def _get_recent_events_str(self, limit: int = 10) -> str | None:
 		"""Get the most recent events from the event bus as JSON.
 
@@ -58,8 +163,6 @@ class DOMWatchdog(BaseWatchdog):
 		Returns:
 			JSON string of recent events or None if not available
 		"""
-		import json
-
 		try:
 			# Get all events from history, sorted by creation time (most recent first)
 			all_events = sorted(
@@ -104,7 +207,8 @@ class DOMWatchdog(BaseWatchdog):
 			cdp_session = await self.browser_session.get_or_create_cdp_session(focus=True)
 
 			# Use performance API to get pending requests
-			js_code = """
+			js_code = (
+				"""
 (function() {
 	const now = performance.now();
 	const resources = performance.getEntriesByType('resource');
@@ -113,23 +217,10 @@ class DOMWatchdog(BaseWatchdog):
 	// Check document readyState
 	const docLoading = document.readyState !== 'complete';
 
-	// Common ad/tracking domains and patterns to filter out
-	const adDomains = [
-		// Standard ad/tracking networks
-		'doubleclick.net', 'googlesyndication.com', 'googletagmanager.com',
-		'facebook.net', 'analytics', 'ads', 'tracking', 'pixel',
-		'hotjar.com', 'clarity.ms', 'mixpanel.com', 'segment.com',
-		// Analytics platforms
-		'demdex.net', 'omtrdc.net', 'adobedtm.com', 'ensighten.com',
-		'newrelic.com', 'nr-data.net', 'google-analytics.com',
-		// Social media trackers
-		'connect.facebook.net', 'platform.twitter.com', 'platform.linkedin.com',
-		// CDN/image hosts (usually not critical for functionality)
-		'.cloudfront.net/image/', '.akamaized.net/image/',
-		// Common tracking paths
-		'/tracker/', '/collector/', '/beacon/', '/telemetry/', '/log/',
-		'/events/', '/eventBatch', '/track.', '/metrics/'
-	];
+	// Common ad/tracking domains and patterns to filter out (network_tracker.AD_AND_TRACKING_PATTERNS)
+	const adDomains = """
+				+ _AD_AND_TRACKING_PATTERNS_JS
+				+ """;
 
 	// Get resources that are still loading (responseEnd is 0)
 	let totalResourcesChecked = 0;
@@ -193,6 +284,7 @@ class DOMWatchdog(BaseWatchdog):
 	};
 })()
 """
+			)
 
 			result = await cdp_session.cdp_client.send.Runtime.evaluate(
 				params={'expression': js_code, 'returnByValue': True}, session_id=cdp_session.session_id
@@ -253,6 +345,9 @@ class DOMWatchdog(BaseWatchdog):
 		from browser_use.browser.views import BrowserStateSummary, PageInfo
 
 		self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: STARTING browser state request')
+		pipelined = self.browser_session.browser_profile.pipelined_state_capture
+		timings: dict[str, float] = {}
+		start_total = time.time()
 		page_url = await self.browser_session.get_current_page_url()
 		self.logger.debug(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Got page URL: {page_url}')
 
@@ -265,7 +360,15 @@ class DOMWatchdog(BaseWatchdog):
 
 		# Check for pending network requests BEFORE waiting (so we can see what's loading)
 		pending_requests_before_wait = []
-		if not not_a_meaningful_website:
+		start_network_wait = time.time()
+		if pipelined:
+			# event-driven: pending requests come from Network events and we only wait as long as they keep loading
+			if not not_a_meaningful_website:
+				try:
+					pending_requests_before_wait = await self._wait_for_network_idle()
+				except Exception as e:
+					self.logger.debug(f'Failed to wait for network idle: {e}')
+		elif not not_a_meaningful_website:
 			try:
 				pending_requests_before_wait = await self._get_pending_network_requests()
 				if pending_requests_before_wait:
@@ -274,7 +377,7 @@ class DOMWatchdog(BaseWatchdog):
 				self.logger.debug(f'Failed to get pending requests before wait: {e}')
 		pending_requests = pending_requests_before_wait
 		# Wait for page stability using browser profile settings (main branch pattern)
-		if not not_a_meaningful_website:
+		if not not_a_meaningful_website and not pipelined:
 			self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: ⏳ Waiting for page stability...')
 			try:
 				if pending_requests_before_wait:
@@ -286,6 +389,8 @@ class DOMWatchdog(BaseWatchdog):
 					f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Network waiting failed: {e}, continuing anyway...'
 				)
 
+		timings['network_wait_ms'] = (time.time() - start_network_wait) * 1000
+
 		# Get tabs info once at the beginning for all paths
 		self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: Getting tabs info...')
 		tabs_info = await self.browser_session.get_tabs()
@@ -352,6 +457,12 @@ class DOMWatchdog(BaseWatchdog):
 			# Execute DOM building and screenshot capture in parallel
 			dom_task = None
 			screenshot_task = None
+			page_info_task = None
+			start_capture = time.time()
+
+			# the DOM capture also fetches the title and layout metrics, make sure we don't pick up a stale one
+			if self._dom_service is not None:
+				self._dom_service.last_page_capture = None
 
 			# Start DOM building task if requested
 			if event.include_dom:
@@ -364,7 +475,7 @@ class DOMWatchdog(BaseWatchdog):
 				)
 
 				dom_task = create_task_with_error_handling(
-					self._build_dom_tree_without_highlights(previous_state),
+					self._timed(self._build_dom_tree_without_highlights(previous_state), timings, 'dom_build_ms'),
 					name='build_dom_tree',
 					logger_instance=self.logger,
 					suppress_exceptions=True,
@@ -374,12 +485,21 @@ class DOMWatchdog(BaseWatchdog):
 			if event.include_screenshot:
 				self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: 📸 Starting clean screenshot task...')
 				screenshot_task = create_task_with_error_handling(
-					self._capture_clean_screenshot(),
+					self._timed(self._capture_clean_screenshot(), timings, 'screenshot_ms'),
 					name='capture_screenshot',
 					logger_instance=self.logger,
 					suppress_exceptions=True,
 				)
 
+			# Without a DOM capture to piggyback on, fetch the page metrics alongside the screenshot
+			if pipelined and not event.include_dom:
+				page_info_task = create_task_with_error_handling(
+					asyncio.wait_for(self._get_page_info(), timeout=1.0),
+					name='get_page_info',
+					logger_instance=self.logger,
+					suppress_exceptions=True,
+				)
+
 			# Wait for both tasks to complete
 			content = None
 			screenshot_b64 = None
@@ -401,8 +521,10 @@ class DOMWatchdog(BaseWatchdog):
 				except Exception as e:
 					self.logger.warning(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Clean screenshot failed: {e}')
 					screenshot_b64 = None
+			timings['capture_ms'] = (time.time() - start_capture) * 1000
 
 			# Add browser-side highlights for user visibility
+			start_highlights = time.time()
 			if content and content.selector_map and self.browser_session.browser_profile.dom_highlight_elements:
 				try:
 					self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: 🎨 Adding browser-side highlights...')
@@ -412,31 +534,50 @@ class DOMWatchdog(BaseWatchdog):
 					)
 				except Exception as e:
 					self.logger.warning(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Browser highlighting failed: {e}')
+			timings['highlights_ms'] = (time.time() - start_highlights) * 1000
 
 			# Ensure we have valid content
 			if not content:
 				content = SerializedDOMState(_root=None, selector_map={})
 
 			# Tabs info already fetched at the beginning
+			start_page_info = time.time()
+
+			# In pipelined mode the DOM capture already fetched the title and layout metrics
+			title = None
+			page_info = None
+			capture = self._dom_service.last_page_capture if pipelined and self._dom_service is not None else None
+			if capture is not None and capture.target_id == self.browser_session.agent_focus_target_id:
+				title = capture.title or None
+				if capture.layout_metrics:
+					page_info = self._page_info_from_layout_metrics(capture.layout_metrics)
+			elif page_info_task is not None:
+				try:
+					page_info = await page_info_task
+				except Exception as e:
+					self.logger.debug(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Failed to get page info from CDP: {e}')
 
 			# Get target title safely
-			try:
-				self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: Getting page title...')
-				title = await asyncio.wait_for(self.browser_session.get_current_page_title(), timeout=1.0)
-				self.logger.debug(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Got title: {title}')
-			except Exception as e:
-				self.logger.debug(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Failed to get title: {e}')
-				title = 'Page'
+			if title is None:
+				try:
+					self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: Getting page title...')
+					title = await asyncio.wait_for(self.browser_session.get_current_page_title(), timeout=1.0)
+					self.logger.debug(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Got title: {title}')
+				except Exception as e:
+					self.logger.debug(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Failed to get title: {e}')
+					title = 'Page'
 
 			# Get comprehensive page info from CDP with timeout
-			try:
-				self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: Getting page info from CDP...')
-				page_info = await asyncio.wait_for(self._get_page_info(), timeout=1.0)
-				self.logger.debug(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Got page info from CDP: {page_info}')
-			except Exception as e:
-				self.logger.debug(
-					f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Failed to get page info from CDP: {e}, using fallback'
-				)
+			if page_info is None and page_info_task is None:
+				try:
+					self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: Getting page info from CDP...')
+					page_info = await asyncio.wait_for(self._get_page_info(), timeout=1.0)
+					self.logger.debug(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Got page info from CDP: {page_info}')
+				except Exception as e:
+					self.logger.debug(
+						f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Failed to get page info from CDP: {e}, using fallback'
+					)
+			if page_info is None:
 				# Fallback to default viewport dimensions
 				viewport = self.browser_session.browser_profile.viewport or {'width': 1280, 'height': 720}
 				page_info = PageInfo(
@@ -451,6 +592,7 @@ class DOMWatchdog(BaseWatchdog):
 					pixels_left=0,
 					pixels_right=0,
 				)
+			timings['page_info_ms'] = (time.time() - start_page_info) * 1000
 
 			# Check for PDF viewer
 			is_pdf_viewer = page_url.endswith('.pdf') or '/pdf/' in page_url
@@ -485,7 +627,10 @@ class DOMWatchdog(BaseWatchdog):
 				pending_network_requests=pending_requests,
 				pagination_buttons=pagination_buttons_data,
 				closed_popup_messages=self.browser_session._closed_popup_messages.copy(),
+				state_timings=timings,
 			)
+			timings['total_ms'] = (time.time() - start_total) * 1000
+			self._log_state_timings(timings, pipelined)
 
 			# Cache the state
 			self.browser_session._cached_browser_state_summary = browser_state
@@ -547,6 +692,13 @@ class DOMWatchdog(BaseWatchdog):
 					paint_order_filtering=self.browser_session.browser_profile.paint_order_filtering,
 					max_iframes=self.browser_session.browser_profile.max_iframes,
 					max_iframe_depth=self.browser_session.browser_profile.max_iframe_depth,
+					max_concurrent_iframe_fetches=self.browser_session.browser_profile.max_concurrent_iframe_fetches,
+					iframe_fetch_timeout=self.browser_session.browser_profile.iframe_fetch_timeout,
+					incremental_dom=self.browser_session.browser_profile.incremental_dom,
+					max_incremental_mutations=self.browser_session.browser_profile.incremental_dom_max_mutations,
+					# the cached tree is patched in place by DOM mutations, so it and its markdown are no longer current
+					on_dom_mutation=self._bump_dom_version,
+					pipelined_state_capture=self.browser_session.browser_profile.pipelined_state_capture,
 				)
 
 			# Get serialized DOM tree using the service
@@ -555,6 +707,8 @@ class DOMWatchdog(BaseWatchdog):
 			self.current_dom_state, self.enhanced_dom_tree, timing_info = await self._dom_service.get_serialized_dom_tree(
 				previous_cached_state=previous_state,
 			)
+			self._bump_dom_version()
+			self._enhanced_dom_tree_version = self.dom_version
 			end = time.time()
 			total_time_ms = (end - start) * 1000
 			self.logger.debug(
@@ -750,8 +904,6 @@ class DOMWatchdog(BaseWatchdog):
 			PageInfo with all viewport, page dimensions, and scroll information
 		"""
 
-		from browser_use.browser.views import PageInfo
-
 		# get_or_create_cdp_session() handles focus validation automatically
 		cdp_session = await self.browser_session.get_or_create_cdp_session(
 			target_id=self.browser_session.agent_focus_target_id, focus=True
@@ -761,6 +913,12 @@ class DOMWatchdog(BaseWatchdog):
 		metrics = await asyncio.wait_for(
 			cdp_session.cdp_client.send.Page.getLayoutMetrics(session_id=cdp_session.session_id), timeout=10.0
 		)
+		return self._page_info_from_layout_metrics(metrics)
+
+	@staticmethod
+	def _page_info_from_layout_metrics(metrics: 'GetLayoutMetricsReturns') -> 'PageInfo':
+		"""Compute viewport, page dimensions and scroll information from CDP layout metrics."""
+		from browser_use.browser.views import PageInfo
 
 		# Extract different viewport types
 		layout_viewport = metrics.get('layoutViewport', {})
@@ -770,7 +928,7 @@ class DOMWatchdog(BaseWatchdog):
 		content_size = metrics.get('contentSize', {})
 
 		# Calculate device pixel ratio to convert between device pixels and CSS pixels
-		# This matches the approach in dom/service.py _get_viewport_ratio method
+		# This matches the approach in dom/service.py DomService._device_pixel_ratio
 		css_width = css_visual_viewport.get('clientWidth', css_layout_viewport.get('clientWidth', 1280.0))
 		device_width = visual_viewport.get('clientWidth', css_width)
 		device_pixel_ratio = device_width / css_width if css_width > 0 else 1.0
@@ -798,7 +956,7 @@ class DOMWatchdog(BaseWatchdog):
 		pixels_left = scroll_x
 		pixels_right = max(0, page_width - viewport_width - scroll_x)
 
-		page_info = PageInfo(
+		return PageInfo(
 			viewport_width=viewport_width,
 			viewport_height=viewport_height,
 			page_width=page_width,
@@ -811,8 +969,6 @@ class DOMWatchdog(BaseWatchdog):
 			pixels_right=pixels_right,
 		)
 
-		return page_info
-
 	# ========== Public Helper Methods ==========
 
 	async def get_element_by_index(self, index: int) -> EnhancedDOMTreeNode | None:
@@ -834,6 +990,7 @@ class DOMWatchdog(BaseWatchdog):
 		self.selector_map = None
 		self.current_dom_state = None
 		self.enhanced_dom_tree = None
+		self._bump_dom_version()
 		# Keep the DOM service instance to reuse its CDP client connection
 
 	def is_file_input(self, element: EnhancedDOMTreeNode) -> bool:
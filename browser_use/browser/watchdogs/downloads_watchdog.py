@@ -1,9 +1,12 @@
 """Downloads watchdog for monitoring and handling file downloads."""
 
 import asyncio
+import base64
+import contextlib
 import json
 import os
 import tempfile
+from collections.abc import Callable
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, ClassVar
 from urllib.parse import urlparse
@@ -20,6 +23,7 @@ from browser_use.browser.events import (
 	BrowserStateRequestEvent,
 	BrowserStoppedEvent,
 	FileDownloadedEvent,
+	FileDownloadProgressEvent,
 	NavigationCompleteEvent,
 	TabClosedEvent,
 	TabCreatedEvent,
@@ -28,7 +32,58 @@ from browser_use.browser.watchdog_base import BaseWatchdog
 from browser_use.utils import create_task_with_error_handling
 
 if TYPE_CHECKING:
-	pass
+	from browser_use.browser.session import CDPSession
+
+# Streamed downloads are read from the browser in chunks of this size, so memory use doesn't grow with the file size
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# A FileDownloadProgressEvent is dispatched at most once per this many received bytes
+DOWNLOAD_PROGRESS_INTERVAL = 5 * 1024 * 1024
+# Timeouts for opening the response stream and for each chunk read, the total download time is not limited
+DOWNLOAD_STREAM_OPEN_TIMEOUT = 30.0
+DOWNLOAD_CHUNK_READ_TIMEOUT = 30.0
+
+
+async def save_cdp_stream_to_file(
+	cdp_client: Any,
+	session_id: str | None,
+	handle: str,
+	path: str,
+	chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+	on_progress: Callable[[int], None] | None = None,
+) -> int:
+	"""Copy a CDP `IO` stream to a file chunk by chunk and close the stream, returns the number of bytes written.
+
+	The data is written to `<path>.part` first and only renamed to `path` once the whole stream was read,
+	so a failed download never leaves a truncated file behind.
+	"""
+	part_path = f'{path}.part'
+	received = 0
+	try:
+		async with await anyio.open_file(part_path, 'wb') as f:
+			while True:
+				chunk = await asyncio.wait_for(
+					cdp_client.send.IO.read(params={'handle': handle, 'size': chunk_size}, session_id=session_id),
+					timeout=DOWNLOAD_CHUNK_READ_TIMEOUT,
+				)
+				data = base64.b64decode(chunk['data']) if chunk.get('base64Encoded') else chunk['data'].encode()
+				if data:
+					await f.write(data)
+					received += len(data)
+					if on_progress:
+						on_progress(received)
+				if chunk.get('eof'):
+					break
+		os.replace(part_path, path)
+		return received
+	except BaseException:
+		with contextlib.suppress(FileNotFoundError):
+			os.remove(part_path)
+		raise
+	finally:
+		try:
+			await cdp_client.send.IO.close(params={'handle': handle}, session_id=session_id)
+		except Exception:
+			pass  # the stream is released with the target anyway
 
 
 class DownloadsWatchdog(BaseWatchdog):
@@ -47,6 +102,7 @@ class DownloadsWatchdog(BaseWatchdog):
 	# Events this watchdog emits
 	EMITS: ClassVar[list[type[BaseEvent[Any]]]] = [
 		FileDownloadedEvent,
+		FileDownloadProgressEvent,
 	]
 
 	# Private state
@@ -543,84 +599,37 @@ class DownloadsWatchdog(BaseWatchdog):
 
 			self.logger.debug(f'[DownloadsWatchdog] Downloading from: {url[:100]}...')
 
-			# Download using JavaScript fetch to leverage browser cache
-			escaped_url = json.dumps(url)
+			download_path = os.path.join(downloads_dir, final_filename)
+			download_result = await self._download_to_file(temp_session, url, download_path)
+			if download_result is None:
+				self.logger.warning(f'[DownloadsWatchdog] No data received when downloading from {url}')
+				return None
 
-			result = await asyncio.wait_for(
-				temp_session.cdp_client.send.Runtime.evaluate(
-					params={
-						'expression': f"""
-				(async () => {{
-					try {{
-						const response = await fetch({escaped_url}, {{
-							cache: 'force-cache'
-						}});
-						if (!response.ok) {{
-							throw new Error(`HTTP error! status: ${{response.status}}`);
-						}}
-						const blob = await response.blob();
-						const arrayBuffer = await blob.arrayBuffer();
-						const uint8Array = new Uint8Array(arrayBuffer);
-
-						return {{
-							data: Array.from(uint8Array),
-							responseSize: uint8Array.length
-						}};
-					}} catch (error) {{
-						throw new Error(`Fetch failed: ${{error.message}}`);
-					}}
-				}})()
-				""",
-						'awaitPromise': True,
-						'returnByValue': True,
-					},
-					session_id=temp_session.session_id,
-				),
-				timeout=15.0,  # 15 second timeout
-			)
+			actual_size, _ = download_result
+			self.logger.debug(f'[DownloadsWatchdog] File written: {download_path} ({actual_size} bytes)')
 
-			download_result = result.get('result', {}).get('value', {})
+			# Determine file type
+			file_ext = Path(final_filename).suffix.lower().lstrip('.')
+			mime_type = content_type or f'application/{file_ext}'
 
-			if download_result and download_result.get('data') and len(download_result['data']) > 0:
-				download_path = os.path.join(downloads_dir, final_filename)
+			# Store URL->path mapping for this session
+			self._session_pdf_urls[url] = download_path
 
-				# Save the file asynchronously
-				async with await anyio.open_file(download_path, 'wb') as f:
-					await f.write(bytes(download_result['data']))
-
-				# Verify file was written successfully
-				if os.path.exists(download_path):
-					actual_size = os.path.getsize(download_path)
-					self.logger.debug(f'[DownloadsWatchdog] File written: {download_path} ({actual_size} bytes)')
-
-					# Determine file type
-					file_ext = Path(final_filename).suffix.lower().lstrip('.')
-					mime_type = content_type or f'application/{file_ext}'
-
-					# Store URL->path mapping for this session
-					self._session_pdf_urls[url] = download_path
-
-					# Emit file downloaded event
-					self.logger.debug(f'[DownloadsWatchdog] Dispatching FileDownloadedEvent for {final_filename}')
-					self.event_bus.dispatch(
-						FileDownloadedEvent(
-							url=url,
-							path=download_path,
-							file_name=final_filename,
-							file_size=actual_size,
-							file_type=file_ext if file_ext else None,
-							mime_type=mime_type,
-							auto_download=True,
-						)
-					)
+			# Emit file downloaded event
+			self.logger.debug(f'[DownloadsWatchdog] Dispatching FileDownloadedEvent for {final_filename}')
+			self.event_bus.dispatch(
+				FileDownloadedEvent(
+					url=url,
+					path=download_path,
+					file_name=final_filename,
+					file_size=actual_size,
+					file_type=file_ext if file_ext else None,
+					mime_type=mime_type,
+					auto_download=True,
+				)
+			)
 
-					return download_path
-				else:
-					self.logger.error(f'[DownloadsWatchdog] Failed to write file: {download_path}')
-					return None
-			else:
-				self.logger.warning(f'[DownloadsWatchdog] No data received when downloading from {url}')
-				return None
+			return download_path
 
 		except TimeoutError:
 			self.logger.warning(f'[DownloadsWatchdog] Download timed out: {url[:80]}...')
@@ -1178,102 +1187,39 @@ class DownloadsWatchdog(BaseWatchdog):
 
 			self.logger.debug(f'[DownloadsWatchdog] Starting PDF download from: {pdf_url[:100]}...')
 
-			# Download using JavaScript fetch to leverage browser cache
 			try:
-				# Properly escape the URL to prevent JavaScript injection
-				escaped_pdf_url = json.dumps(pdf_url)
+				download_path = os.path.join(downloads_dir, final_filename)
+				download_result = await self._download_to_file(temp_session, pdf_url, download_path)
+				if download_result is None:
+					self.logger.warning(f'[DownloadsWatchdog] No data received when downloading PDF from {pdf_url}')
+					return None
 
-				result = await asyncio.wait_for(
-					temp_session.cdp_client.send.Runtime.evaluate(
-						params={
-							'expression': f"""
-					(async () => {{
-						try {{
-							// Use fetch with cache: 'force-cache' to prioritize cached version
-							const response = await fetch({escaped_pdf_url}, {{
-								cache: 'force-cache'
-							}});
-							if (!response.ok) {{
-								throw new Error(`HTTP error! status: ${{response.status}}`);
-							}}
-							const blob = await response.blob();
-							const arrayBuffer = await blob.arrayBuffer();
-							const uint8Array = new Uint8Array(arrayBuffer);
-							
-							// Check if served from cache
-							const fromCache = response.headers.has('age') || 
-											 !response.headers.has('date');
-											 
-							return {{ 
-								data: Array.from(uint8Array),
-								fromCache: fromCache,
-								responseSize: uint8Array.length,
-								transferSize: response.headers.get('content-length') || 'unknown'
-							}};
-						}} catch (error) {{
-							throw new Error(`Fetch failed: ${{error.message}}`);
-						}}
-					}})()
-					""",
-							'awaitPromise': True,
-							'returnByValue': True,
-						},
-						session_id=temp_session.session_id,
-					),
-					timeout=10.0,  # 10 second timeout for download operation
+				response_size, from_cache = download_result
+				cache_status = 'from cache' if from_cache else 'from network'
+				self.logger.debug(
+					f'[DownloadsWatchdog] ✅ Auto-downloaded PDF ({cache_status}, {response_size:,} bytes): {download_path}'
 				)
-				download_result = result.get('result', {}).get('value', {})
-
-				if download_result and download_result.get('data') and len(download_result['data']) > 0:
-					# Ensure downloads directory exists
-					downloads_dir = str(self.browser_session.browser_profile.downloads_path)
-					os.makedirs(downloads_dir, exist_ok=True)
-					download_path = os.path.join(downloads_dir, final_filename)
 
-					# Save the PDF asynchronously
-					async with await anyio.open_file(download_path, 'wb') as f:
-						await f.write(bytes(download_result['data']))
+				# Store URL->path mapping for this session
+				self._session_pdf_urls[pdf_url] = download_path
 
-					# Verify file was written successfully
-					if os.path.exists(download_path):
-						actual_size = os.path.getsize(download_path)
-						self.logger.debug(
-							f'[DownloadsWatchdog] PDF file written successfully: {download_path} ({actual_size} bytes)'
-						)
-					else:
-						self.logger.error(f'[DownloadsWatchdog] ❌ Failed to write PDF file to: {download_path}')
-						return None
-
-					# Log cache information
-					cache_status = 'from cache' if download_result.get('fromCache') else 'from network'
-					response_size = download_result.get('responseSize', 0)
-					self.logger.debug(
-						f'[DownloadsWatchdog] ✅ Auto-downloaded PDF ({cache_status}, {response_size:,} bytes): {download_path}'
-					)
-
-					# Store URL->path mapping for this session
-					self._session_pdf_urls[pdf_url] = download_path
-
-					# Emit file downloaded event
-					self.logger.debug(f'[DownloadsWatchdog] Dispatching FileDownloadedEvent for {final_filename}')
-					self.event_bus.dispatch(
-						FileDownloadedEvent(
-							url=pdf_url,
-							path=download_path,
-							file_name=final_filename,
-							file_size=response_size,
-							file_type='pdf',
-							mime_type='application/pdf',
-							from_cache=download_result.get('fromCache', False),
-							auto_download=True,
-						)
+				# Emit file downloaded event
+				self.logger.debug(f'[DownloadsWatchdog] Dispatching FileDownloadedEvent for {final_filename}')
+				self.event_bus.dispatch(
+					FileDownloadedEvent(
+						url=pdf_url,
+						path=download_path,
+						file_name=final_filename,
+						file_size=response_size,
+						file_type='pdf',
+						mime_type='application/pdf',
+						from_cache=from_cache,
+						auto_download=True,
 					)
+				)
 
-					# No need to detach - session is cached
-					return download_path
-				else:
-					self.logger.warning(f'[DownloadsWatchdog] No data received when downloading PDF from {pdf_url}')
-					return None
+				# No need to detach - session is cached
+				return download_path
 
 			except Exception as e:
 				self.logger.warning(f'[DownloadsWatchdog] Failed to auto-download PDF from {pdf_url}: {type(e).__name__}: {e}')
@@ -1286,6 +1232,117 @@ class DownloadsWatchdog(BaseWatchdog):
 			self.logger.error(f'[DownloadsWatchdog] Error in PDF download: {type(e).__name__}: {e}')
 			return None
 
+	async def _download_to_file(self, cdp_session: 'CDPSession', url: str, download_path: str) -> tuple[int, bool] | None:
+		"""Download a url with the page's cookies and cache, returns (file size, served from cache) or None on failure.
+
+		Streams the response to disk through Network.loadNetworkResource, falls back to fetching it in the page.
+		"""
+		try:
+			download_result = await self._stream_download_to_file(cdp_session, url, download_path)
+			if download_result is not None:
+				return download_result
+		except Exception as e:
+			self.logger.debug(f'[DownloadsWatchdog] Streaming download failed, fetching in page instead: {type(e).__name__}: {e}')
+		# e.g. blob: urls are only reachable from inside the page
+		return await self._fetch_download_in_page(cdp_session, url, download_path)
+
+	async def _stream_download_to_file(self, cdp_session: 'CDPSession', url: str, download_path: str) -> tuple[int, bool] | None:
+		"""Load a url through the browser's network stack and copy the response stream to disk in fixed size chunks."""
+		cdp_client = cdp_session.cdp_client
+		frame_tree = await cdp_client.send.Page.getFrameTree(session_id=cdp_session.session_id)
+		result = await asyncio.wait_for(
+			cdp_client.send.Network.loadNetworkResource(
+				params={
+					'frameId': frame_tree['frameTree']['frame']['id'],
+					'url': url,
+					'options': {'disableCache': False, 'includeCredentials': True},
+				},
+				session_id=cdp_session.session_id,
+			),
+			timeout=DOWNLOAD_STREAM_OPEN_TIMEOUT,
+		)
+		resource = result['resource']
+		stream = resource.get('stream')
+		status = int(resource.get('httpStatusCode') or 0)
+		if not resource.get('success') or not stream or status >= 400:
+			self.logger.debug(
+				f'[DownloadsWatchdog] Could not load {url[:100]} as a stream: '
+				f'{resource.get("netErrorName") or f"HTTP status {status}"}'
+			)
+			if stream:
+				await cdp_client.send.IO.close(params={'handle': stream}, session_id=cdp_session.session_id)
+			return None
+
+		headers = {name.lower(): value for name, value in (resource.get('headers') or {}).items()}
+		content_length = headers.get('content-length', '')
+		total_bytes = int(content_length) if content_length.isdigit() else None
+		from_cache = 'age' in headers or 'date' not in headers
+		next_progress = DOWNLOAD_PROGRESS_INTERVAL
+
+		def on_progress(received: int) -> None:
+			nonlocal next_progress
+			if received < next_progress:
+				return
+			next_progress = received + DOWNLOAD_PROGRESS_INTERVAL
+			self.event_bus.dispatch(
+				FileDownloadProgressEvent(url=url, path=download_path, received_bytes=received, total_bytes=total_bytes)
+			)
+
+		file_size = await save_cdp_stream_to_file(
+			cdp_client, cdp_session.session_id, stream, download_path, on_progress=on_progress
+		)
+		if file_size == 0:
+			os.remove(download_path)
+			return None
+		return file_size, from_cache
+
+	async def _fetch_download_in_page(self, cdp_session: 'CDPSession', url: str, download_path: str) -> tuple[int, bool] | None:
+		"""Fallback: fetch the url with JavaScript in the page and transfer the body base64 encoded in one piece."""
+		result = await asyncio.wait_for(
+			cdp_session.cdp_client.send.Runtime.evaluate(
+				params={
+					'expression': f"""
+			(async () => {{
+				// Use fetch with cache: 'force-cache' to prioritize cached version
+				const response = await fetch({json.dumps(url)}, {{
+					cache: 'force-cache'
+				}});
+				if (!response.ok) {{
+					throw new Error(`HTTP error! status: ${{response.status}}`);
+				}}
+				const blob = await response.blob();
+				const dataUrl = await new Promise((resolve, reject) => {{
+					const reader = new FileReader();
+					reader.onload = () => resolve(reader.result);
+					reader.onerror = () => reject(reader.error);
+					reader.readAsDataURL(blob);
+				}});
+
+				// Check if served from cache
+				const fromCache = response.headers.has('age') || !response.headers.has('date');
+
+				return {{
+					data: dataUrl.slice(dataUrl.indexOf(',') + 1),
+					fromCache: fromCache
+				}};
+			}})()
+			""",
+					'awaitPromise': True,
+					'returnByValue': True,
+				},
+				session_id=cdp_session.session_id,
+			),
+			timeout=30.0,
+		)
+		download_result = result.get('result', {}).get('value') or {}
+		if not download_result.get('data'):
+			return None
+
+		data = base64.b64decode(download_result['data'])
+		async with await anyio.open_file(download_path, 'wb') as f:
+			await f.write(data)
+		return len(data), download_result.get('fromCache', False)
+
 	@staticmethod
 	async def _get_unique_filename(directory: str, filename: str) -> str:
 		"""Generate a unique filename for downloads by appending (1), (2), etc., if a file already exists."""
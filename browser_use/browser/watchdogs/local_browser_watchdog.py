@@ -1,11 +1,16 @@
 """Local browser watchdog for managing browser subprocess lifecycle."""
 
 import asyncio
+import atexit
+import logging
 import os
 import shutil
 import tempfile
+from collections import deque
+from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, ClassVar
+from urllib.parse import urlparse
 
 import psutil
 from bubus import BaseEvent
@@ -23,6 +28,294 @@ from browser_use.observability import observe_debug
 if TYPE_CHECKING:
 	pass
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass(eq=False)
+class PooledBrowser:
+	"""A pre-launched local browser of a LocalBrowserPool, with its own temporary user data dir."""
+
+	process: psutil.Process
+	cdp_url: str
+	user_data_dir: Path
+	uses: int = 0
+
+
+class LocalBrowserPool:
+	"""Warm pool of pre-launched local browsers with identical launch args (browser_pool_size).
+
+	Launching Chromium takes a few seconds, which dominates short agent tasks. The pool keeps `size` browsers launched
+	in the background: checkout() hands out a ready browser (or waits for the next one) and immediately starts launching
+	its replacement. release() takes the browser back after the session is done with it:
+
+	- after max_uses sessions, when it uses more than max_memory_mb, or when the reset fails the browser is recycled:
+	  killed, its temporary user data dir deleted, and a fresh one launched,
+	- otherwise it is reset for the next session (tabs closed, cookies, cache and site storage cleared) and put back.
+
+	max_uses=1 (the default) never reuses a browser, every session gets a browser that has only ever seen it.
+	"""
+
+	def __init__(
+		self,
+		browser_path: str,
+		launch_args: list[str],
+		size: int,
+		max_uses: int = 1,
+		max_memory_mb: float | None = None,
+	):
+		self.browser_path = browser_path
+		self.launch_args = launch_args
+		self.size = size
+		self.max_uses = max_uses
+		self.max_memory_mb = max_memory_mb
+		self._loop = asyncio.get_running_loop()
+		self._ready: deque[PooledBrowser] = deque()
+		self._ready_changed = asyncio.Condition()
+		self._launching: set[asyncio.Task[None]] = set()
+		self._launch_errors: deque[BaseException] = deque()
+		self._browsers: set[PooledBrowser] = set()  # all browsers started by the pool, ready or checked out
+		self._waiting = 0  # checkouts waiting for a browser
+		self._reusable_out = 0  # checked out browsers that will come back to the pool
+		self._closed = False
+
+	@property
+	def ready_count(self) -> int:
+		return len(self._ready)
+
+	async def checkout(self) -> PooledBrowser:
+		"""Get a ready browser from the pool, waiting for one to finish launching if none is ready."""
+		if self._closed:
+			raise RuntimeError('LocalBrowserPool is closed')
+
+		self._waiting += 1
+		try:
+			while True:
+				self._fill()
+				async with self._ready_changed:
+					await self._ready_changed.wait_for(lambda: bool(self._ready or self._launch_errors))
+					if self._ready:
+						browser = self._ready.popleft()
+					else:
+						raise self._launch_errors.popleft()
+				if browser.process.is_running():
+					break
+				await self._discard(browser)
+
+			browser.uses += 1
+			if browser.uses < self.max_uses:
+				self._reusable_out += 1
+			return browser
+		finally:
+			self._waiting -= 1
+			self._fill()
+
+	async def release(self, browser: PooledBrowser) -> None:
+		"""Take back a checked out browser: reset it for the next session, or recycle it."""
+		if browser.uses < self.max_uses:
+			self._reusable_out -= 1
+
+		reason = None
+		if self._closed:
+			reason = 'pool closed'
+		elif browser.uses >= self.max_uses:
+			reason = f'used {browser.uses} times'
+		elif not browser.process.is_running():
+			reason = 'process exited'
+		elif self.max_memory_mb is not None and (memory_mb := self._memory_mb(browser)) > self.max_memory_mb:
+			reason = f'using {memory_mb:.0f}MB of memory'
+		elif self._missing() <= 0:
+			reason = 'pool is full'
+		elif not await self._reset(browser):
+			reason = 'reset failed'
+
+		if reason is not None:
+			logger.debug(f'♻️ Recycling pooled browser pid={browser.process.pid} ({reason})')
+			await self._discard(browser)
+			self._fill()
+			return
+
+		async with self._ready_changed:
+			self._ready.append(browser)
+			self._ready_changed.notify_all()
+
+	async def close(self) -> None:
+		"""Kill the ready browsers, browsers still checked out are killed when they are released."""
+		self._closed = True
+		for task in list(self._launching):
+			task.cancel()
+		while self._ready:
+			await self._discard(self._ready.popleft())
+
+	def kill_all(self) -> None:
+		"""Synchronously kill every browser of the pool (at interpreter exit, or when the event loop is gone)."""
+		self._closed = True
+		for browser in list(self._browsers):
+			try:
+				browser.process.kill()
+			except psutil.Error:
+				pass
+			shutil.rmtree(browser.user_data_dir, ignore_errors=True)
+		self._browsers.clear()
+		self._ready.clear()
+
+	def _fill(self) -> None:
+		"""Launch browsers in the background until the pool and the waiting checkouts are covered."""
+		if self._closed:
+			return
+		for _ in range(self._missing()):
+			task = asyncio.create_task(self._launch_into_pool())
+			self._launching.add(task)
+			task.add_done_callback(self._launching.discard)
+
+	def _missing(self) -> int:
+		"""Number of browsers to launch to cover the waiting checkouts and keep `size` browsers in the pool."""
+		available = len(self._ready) + len(self._launching)
+		if self.max_uses > 1:
+			# Browsers handed to the waiting checkouts come back, they count towards the pool size
+			return max(self.size - self._reusable_out - available, self._waiting - available)
+		return self.size + self._waiting - available
+
+	async def _launch_into_pool(self) -> None:
+		browser, error = None, None
+		try:
+			browser = await self._launch()
+		except Exception as e:
+			logger.warning(f'⚠️ Failed to pre-launch pooled browser: {type(e).__name__}: {e}')
+			error = e
+		async with self._ready_changed:
+			# No longer launching as soon as the browser is ready, not when the done callback runs
+			self._launching.discard(asyncio.current_task())  # type: ignore[arg-type]
+			if browser is not None:
+				self._ready.append(browser)
+			elif self._waiting:
+				self._launch_errors.append(error)
+			self._ready_changed.notify_all()
+
+	async def _launch(self) -> PooledBrowser:
+		user_data_dir = Path(tempfile.mkdtemp(prefix='browser-use-user-data-dir-'))
+		debug_port = LocalBrowserWatchdog._find_free_port()
+		process = None
+		try:
+			# The output of long-lived pooled browsers is never read, so it must not fill up a pipe
+			subprocess = await asyncio.create_subprocess_exec(
+				self.browser_path,
+				*self.launch_args,
+				f'--user-data-dir={user_data_dir}',
+				f'--remote-debugging-port={debug_port}',
+				stdout=asyncio.subprocess.DEVNULL,
+				stderr=asyncio.subprocess.DEVNULL,
+			)
+			process = psutil.Process(subprocess.pid)
+			cdp_url = await LocalBrowserWatchdog._wait_for_cdp_url(debug_port)
+		except BaseException:
+			if process is not None:
+				await LocalBrowserWatchdog._cleanup_process(process)
+			shutil.rmtree(user_data_dir, ignore_errors=True)
+			raise
+
+		browser = PooledBrowser(process=process, cdp_url=cdp_url, user_data_dir=user_data_dir)
+		self._browsers.add(browser)
+		logger.debug(f'🏊 Pre-launched pooled browser pid={process.pid} listening on CDP port :{debug_port}')
+		return browser
+
+	async def _discard(self, browser: PooledBrowser) -> None:
+		self._browsers.discard(browser)
+		await LocalBrowserWatchdog._cleanup_process(browser.process)
+		shutil.rmtree(browser.user_data_dir, ignore_errors=True)
+
+	@staticmethod
+	def _memory_mb(browser: PooledBrowser) -> float:
+		"""Resident memory of the browser and all its renderer/GPU/utility processes."""
+		total = 0
+		try:
+			processes = [browser.process, *browser.process.children(recursive=True)]
+		except psutil.Error:
+			return 0.0
+		for process in processes:
+			try:
+				total += process.memory_info().rss
+			except psutil.Error:
+				pass
+		return total / 1024 / 1024
+
+	async def _reset(self, browser: PooledBrowser) -> bool:
+		"""Bring a used browser back to a blank state: one about:blank tab, no cookies, cache or site storage."""
+		import httpx
+		from cdp_use import CDPClient
+
+		try:
+			async with httpx.AsyncClient() as http_client:
+				version_info = await http_client.get(f'{browser.cdp_url.rstrip("/")}/json/version')
+			client = CDPClient(version_info.json()['webSocketDebuggerUrl'])
+			await client.start()
+			try:
+				targets = (await client.send.Target.getTargets())['targetInfos']
+				blank_tab = await client.send.Target.createTarget(params={'url': 'about:blank'})
+				cookies = (await client.send.Storage.getCookies())['cookies']
+
+				# Site storage (localStorage, IndexedDB, service workers, ...) can only be cleared per origin: clear it for
+				# every origin the last session had open or got cookies from
+				origins = set()
+				for target in targets:
+					parsed = urlparse(target['url'])
+					if parsed.scheme in ('http', 'https') and parsed.netloc:
+						origins.add(f'{parsed.scheme}://{parsed.netloc}')
+				for cookie in cookies:
+					domain = cookie['domain'].lstrip('.')
+					origins.update((f'https://{domain}', f'http://{domain}'))
+
+				for target in targets:
+					if target['type'] == 'page' and target['targetId'] != blank_tab['targetId']:
+						await client.send.Target.closeTarget(params={'targetId': target['targetId']})
+				await client.send.Storage.clearCookies()
+				for origin in origins:
+					await client.send.Storage.clearDataForOrigin(params={'origin': origin, 'storageTypes': 'all'})
+				session = await client.send.Target.attachToTarget(params={'targetId': blank_tab['targetId'], 'flatten': True})
+				await client.send.Network.clearBrowserCache(session_id=session['sessionId'])
+				await client.send.Target.detachFromTarget(params={'sessionId': session['sessionId']})
+			finally:
+				await client.stop()
+			return True
+		except Exception as e:
+			logger.debug(f'Failed to reset pooled browser pid={browser.process.pid}: {type(e).__name__}: {e}')
+			return False
+
+
+# Browser pools of this process, keyed by browser executable, launch args (without --user-data-dir) and pool settings
+_browser_pools: dict[tuple[str, tuple[str, ...], int, int, float | None], LocalBrowserPool] = {}
+
+
+def get_browser_pool(
+	browser_path: str,
+	launch_args: list[str],
+	size: int,
+	max_uses: int = 1,
+	max_memory_mb: float | None = None,
+) -> LocalBrowserPool:
+	"""Get the pool of browsers launched with these args, shared by all sessions of the process using the same profile."""
+	key = (browser_path, tuple(launch_args), size, max_uses, max_memory_mb)
+	pool = _browser_pools.get(key)
+	if pool is not None and pool._loop is not asyncio.get_running_loop():
+		# Pools (and their background launches) belong to the event loop that created them
+		pool.kill_all()
+		pool = None
+	if pool is None:
+		pool = _browser_pools[key] = LocalBrowserPool(browser_path, launch_args, size, max_uses, max_memory_mb)
+	return pool
+
+
+async def close_browser_pools() -> None:
+	"""Kill the ready browsers of all pools, e.g. when a worker process is done running agents."""
+	for pool in list(_browser_pools.values()):
+		await pool.close()
+	_browser_pools.clear()
+
+
+@atexit.register
+def _kill_pooled_browsers() -> None:
+	for pool in list(_browser_pools.values()):
+		pool.kill_all()
+
 
 class LocalBrowserWatchdog(BaseWatchdog):
 	"""Manages local browser subprocess lifecycle."""
@@ -42,6 +335,8 @@ class LocalBrowserWatchdog(BaseWatchdog):
 	_owns_browser_resources: bool = PrivateAttr(default=True)
 	_temp_dirs_to_cleanup: list[Path] = PrivateAttr(default_factory=list)
 	_original_user_data_dir: str | None = PrivateAttr(default=None)
+	_browser_pool: LocalBrowserPool | None = PrivateAttr(default=None)
+	_pooled_browser: PooledBrowser | None = PrivateAttr(default=None)
 
 	@observe_debug(ignore_input=True, ignore_output=True, name='browser_launch_event')
 	async def on_BrowserLaunchEvent(self, event: BrowserLaunchEvent) -> BrowserLaunchResult:
@@ -50,6 +345,19 @@ class LocalBrowserWatchdog(BaseWatchdog):
 		try:
 			self.logger.debug('[LocalBrowserWatchdog] Received BrowserLaunchEvent, launching local browser...')
 
+			if self.browser_session.browser_profile.browser_pool_size:
+				if self._can_use_browser_pool():
+					self._browser_pool = await self._get_browser_pool()
+					self._pooled_browser = await self._browser_pool.checkout()
+					self.logger.debug(
+						f'[LocalBrowserWatchdog] 🏊 Checked out pooled browser_pid= {self._pooled_browser.process.pid} '
+						f'(use {self._pooled_browser.uses}/{self._browser_pool.max_uses}, {self._browser_pool.ready_count} ready)'
+					)
+					return BrowserLaunchResult(cdp_url=self._pooled_browser.cdp_url)
+				self.logger.debug(
+					'[LocalBrowserWatchdog] browser_pool_size is ignored for persistent user_data_dir profiles, launching a new browser'
+				)
+
 			# self.logger.debug('[LocalBrowserWatchdog] Calling _launch_browser...')
 			process, cdp_url = await self._launch_browser()
 			self._subprocess = process
@@ -64,6 +372,11 @@ class LocalBrowserWatchdog(BaseWatchdog):
 		"""Kill the local browser subprocess."""
 		self.logger.debug('[LocalBrowserWatchdog] Killing local browser process')
 
+		if self._pooled_browser and self._browser_pool:
+			# Pooled browsers go back to the pool, which resets or recycles them
+			await self._browser_pool.release(self._pooled_browser)
+			self._pooled_browser = None
+
 		if self._subprocess:
 			await self._cleanup_process(self._subprocess)
 			self._subprocess = None
@@ -82,7 +395,7 @@ class LocalBrowserWatchdog(BaseWatchdog):
 
 	async def on_BrowserStopEvent(self, event: BrowserStopEvent) -> None:
 		"""Listen for BrowserStopEvent and dispatch BrowserKillEvent without awaiting it."""
-		if self.browser_session.is_local and self._subprocess:
+		if self.browser_session.is_local and (self._subprocess or self._pooled_browser):
 			self.logger.debug('[LocalBrowserWatchdog] BrowserStopEvent received, dispatching BrowserKillEvent')
 			# Dispatch BrowserKillEvent without awaiting so it gets processed after all BrowserStopEvent handlers
 			self.event_bus.dispatch(BrowserKillEvent())
@@ -117,24 +430,7 @@ class LocalBrowserWatchdog(BaseWatchdog):
 					'User data dir must be set somewhere in launch args to a non-default path, otherwise Chrome will not let us attach via CDP'
 				)
 
-				# Get browser executable
-				# Priority: custom executable > fallback paths > playwright subprocess
-				if profile.executable_path:
-					browser_path = profile.executable_path
-					self.logger.debug(f'[LocalBrowserWatchdog] 📦 Using custom local browser executable_path= {browser_path}')
-				else:
-					# self.logger.debug('[LocalBrowserWatchdog] 🔍 Looking for local browser binary path...')
-					# Try fallback paths first (system browsers preferred)
-					browser_path = self._find_installed_browser_path()
-					if not browser_path:
-						self.logger.error(
-							'[LocalBrowserWatchdog] ⚠️ No local browser binary found, installing browser using playwright subprocess...'
-						)
-						browser_path = await self._install_browser_with_playwright()
-
-				self.logger.debug(f'[LocalBrowserWatchdog] 📦 Found local browser installed at executable_path= {browser_path}')
-				if not browser_path:
-					raise RuntimeError('No local Chrome/Chromium install found, and failed to install with playwright')
+				browser_path = await self._get_browser_path()
 
 				# Launch browser subprocess directly
 				self.logger.debug(f'[LocalBrowserWatchdog] 🚀 Launching browser subprocess with {len(launch_args)} args...')
@@ -214,6 +510,48 @@ class LocalBrowserWatchdog(BaseWatchdog):
 			profile.user_data_dir = self._original_user_data_dir
 		raise RuntimeError(f'Failed to launch browser after {max_retries} attempts')
 
+	def _can_use_browser_pool(self) -> bool:
+		"""Pooled browsers start from a blank temporary profile, so only profiles without a user data dir can use them."""
+		user_data_dir = self.browser_session.browser_profile.user_data_dir
+		if not user_data_dir or 'browser-use-user-data-dir-' not in str(user_data_dir).lower():
+			return False
+		# Temp dirs of copied Chrome profiles have content, the empty ones are created for profiles without user_data_dir
+		return not any(path.is_file() for path in Path(user_data_dir).rglob('*'))
+
+	async def _get_browser_pool(self) -> LocalBrowserPool:
+		profile = self.browser_session.browser_profile
+		launch_args = [arg for arg in profile.get_args() if not arg.startswith('--user-data-dir=')]
+		return get_browser_pool(
+			await self._get_browser_path(),
+			launch_args,
+			size=profile.browser_pool_size,
+			max_uses=profile.browser_pool_max_uses,
+			max_memory_mb=profile.browser_pool_max_memory_mb,
+		)
+
+	async def _get_browser_path(self) -> str:
+		"""Get the browser executable.
+
+		Priority: custom executable > fallback paths > playwright subprocess
+		"""
+		profile = self.browser_session.browser_profile
+		if profile.executable_path:
+			browser_path = str(profile.executable_path)
+			self.logger.debug(f'[LocalBrowserWatchdog] 📦 Using custom local browser executable_path= {browser_path}')
+		else:
+			# Try fallback paths first (system browsers preferred)
+			browser_path = self._find_installed_browser_path()
+			if not browser_path:
+				self.logger.error(
+					'[LocalBrowserWatchdog] ⚠️ No local browser binary found, installing browser using playwright subprocess...'
+				)
+				browser_path = await self._install_browser_with_playwright()
+
+		self.logger.debug(f'[LocalBrowserWatchdog] 📦 Found local browser installed at executable_path= {browser_path}')
+		if not browser_path:
+			raise RuntimeError('No local Chrome/Chromium install found, and failed to install with playwright')
+		return browser_path
+
 	@staticmethod
 	def _find_installed_browser_path() -> str | None:
 		"""Try to find browser executable from common fallback locations.
@@ -446,6 +784,8 @@ class LocalBrowserWatchdog(BaseWatchdog):
 		"""Get the browser process ID."""
 		if self._subprocess:
 			return self._subprocess.pid
+		if self._pooled_browser:
+			return self._pooled_browser.process.pid
 		return None
 
 	@staticmethod
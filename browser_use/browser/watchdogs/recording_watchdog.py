@@ -97,6 +97,8 @@ class RecordingWatchdog(BaseWatchdog):
 	def on_screencastFrame(self, event: ScreencastFrameEvent, session_id: str | None) -> None:
 		"""
 		Synchronous handler for incoming screencast frames.
+
+		Only queues the frame, decoding and encoding happen on the recorder's encoder thread.
 		"""
 
 		if not self._recorder:
@@ -0,0 +1,158 @@
+"""Resource blocking watchdog for keeping the browser from fetching resources the agent never uses."""
+
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import ClassVar
+from urllib.parse import urlparse
+
+from bubus import BaseEvent
+from pydantic import PrivateAttr
+
+from browser_use.browser.events import (
+	BrowserStopEvent,
+	NavigationCompleteEvent,
+	NavigationStartedEvent,
+	TabClosedEvent,
+	TabCreatedEvent,
+)
+from browser_use.browser.network_tracker import AD_AND_TRACKING_DOMAINS
+from browser_use.browser.profile import BlockableResource
+from browser_use.browser.watchdog_base import BaseWatchdog
+from browser_use.utils import match_url_with_domain_pattern
+
+# File extensions of the blockable resource types (Network.setBlockedURLs only matches URLs, not resource types)
+RESOURCE_FILE_EXTENSIONS: dict[str, tuple[str, ...]] = {
+	'image': ('png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'bmp', 'ico', 'svg'),
+	'media': ('mp4', 'webm', 'ogg', 'ogv', 'mp3', 'wav', 'm4a', 'm4v', 'mov', 'flac', 'aac'),
+	'font': ('woff', 'woff2', 'ttf', 'otf', 'eot'),
+	'stylesheet': ('css',),
+}
+
+# Typical transfer size of one request per CDP resource type (rounded HTTP Archive medians), blocked requests are
+# never sent so the bytes they would have cost can only be estimated
+ESTIMATED_BYTES_PER_REQUEST: dict[str, int] = {
+	'Image': 15_000,
+	'Media': 300_000,
+	'Font': 25_000,
+	'Stylesheet': 10_000,
+	'Script': 20_000,
+}
+DEFAULT_ESTIMATED_BYTES_PER_REQUEST = 2_000
+
+
+@lru_cache(maxsize=128)
+def blocked_url_patterns(resources: tuple[BlockableResource, ...], page_host: str = '') -> tuple[str, ...]:
+	"""Network.setBlockedURLs wildcard patterns for the resources to block on a page of page_host.
+
+	Trackers are matched by host (and subdomains), except the page's own site: first-party requests are never
+	blocked as trackers.
+	"""
+	patterns: list[str] = []
+	for resource in dict.fromkeys(resources):
+		if resource == 'tracker':
+			for domain in AD_AND_TRACKING_DOMAINS:
+				if page_host == domain or page_host.endswith('.' + domain):
+					continue
+				patterns += [f'*://{domain}/*', f'*://*.{domain}/*']
+		else:
+			for extension in RESOURCE_FILE_EXTENSIONS[resource]:
+				patterns += [f'*.{extension}', f'*.{extension}?*']
+	return tuple(patterns)
+
+
+@dataclass
+class ResourceBlockingStats:
+	"""Requests the browser didn't send because of block_resources."""
+
+	blocked_requests: dict[str, int] = field(default_factory=dict)  # per CDP resource type (Image, Font, Script, ...)
+
+	@property
+	def total_blocked_requests(self) -> int:
+		return sum(self.blocked_requests.values())
+
+	@property
+	def estimated_bytes_saved(self) -> int:
+		return sum(
+			count * ESTIMATED_BYTES_PER_REQUEST.get(resource_type, DEFAULT_ESTIMATED_BYTES_PER_REQUEST)
+			for resource_type, count in self.blocked_requests.items()
+		)
+
+
+class ResourceBlockingWatchdog(BaseWatchdog):
+	"""Blocks images, media, fonts, stylesheets and ad/tracking requests before they are made (block_resources).
+
+	Uses Network.setBlockedURLs, so requests are refused inside the browser without pausing every request on a CDP
+	round-trip (and without competing with the Fetch handler of proxy authentication). The blocked URL patterns are
+	set per tab whenever it navigates, following block_resources_overrides for the page's site.
+	"""
+
+	LISTENS_TO: ClassVar[list[type[BaseEvent]]] = [
+		TabCreatedEvent,
+		NavigationStartedEvent,
+		NavigationCompleteEvent,
+		TabClosedEvent,
+		BrowserStopEvent,
+	]
+	EMITS: ClassVar[list[type[BaseEvent]]] = []
+
+	# target_id -> blocked URL patterns currently set on the tab
+	_applied_patterns: dict[str, tuple[str, ...]] = PrivateAttr(default_factory=dict)
+
+	async def on_TabCreatedEvent(self, event: TabCreatedEvent) -> None:
+		await self._apply_blocking(event.target_id, event.url)
+
+	async def on_NavigationStartedEvent(self, event: NavigationStartedEvent) -> None:
+		"""Set the patterns of the destination site before the page starts loading."""
+		await self._apply_blocking(event.target_id, event.url)
+
+	async def on_NavigationCompleteEvent(self, event: NavigationCompleteEvent) -> None:
+		"""Catch redirects to another site, later requests of the page follow that site's overrides."""
+		await self._apply_blocking(event.target_id, event.url)
+
+	async def on_TabClosedEvent(self, event: TabClosedEvent) -> None:
+		self._applied_patterns.pop(event.target_id, None)
+
+	async def on_BrowserStopEvent(self, event: BrowserStopEvent) -> None:
+		stats = self.stats
+		if stats.total_blocked_requests:
+			self.logger.info(
+				f'🚫 Blocked {stats.total_blocked_requests} requests (~{stats.estimated_bytes_saved / 1_000_000:.1f}MB saved): '
+				+ ', '.join(f'{resource_type}={count}' for resource_type, count in sorted(stats.blocked_requests.items()))
+			)
+		self._applied_patterns.clear()
+
+	@property
+	def stats(self) -> ResourceBlockingStats:
+		"""Counters of the requests blocked so far in this session."""
+		dom_watchdog = self.browser_session._dom_watchdog
+		tracker = dom_watchdog._network_tracker if dom_watchdog is not None else None
+		return ResourceBlockingStats(blocked_requests=dict(tracker.blocked_requests) if tracker is not None else {})
+
+	def resources_for_url(self, url: str) -> Sequence[BlockableResource]:
+		"""The resources to block on a page, the first block_resources_overrides pattern matching the URL wins."""
+		profile = self.browser_session.browser_profile
+		for domain_pattern, resources in profile.block_resources_overrides.items():
+			if match_url_with_domain_pattern(url, domain_pattern):
+				return resources
+		return profile.block_resources
+
+	async def _apply_blocking(self, target_id: str, url: str) -> None:
+		page_host = (urlparse(url).hostname or '').lower()
+		patterns = blocked_url_patterns(tuple(self.resources_for_url(url)), page_host)
+		if self._applied_patterns.get(target_id) == patterns:
+			return
+
+		try:
+			cdp_session = await self.browser_session.get_or_create_cdp_session(target_id, focus=False)
+			# Blocked requests are reported as loadingFailed events, counted by the DOM watchdog's network tracker
+			if self.browser_session._dom_watchdog is not None:
+				self.browser_session._dom_watchdog._get_network_tracker(cdp_session.cdp_client)
+			await cdp_session.cdp_client.send.Network.enable(session_id=cdp_session.session_id)
+			await cdp_session.cdp_client.send.Network.setBlockedURLs(
+				params={'urls': list(patterns)}, session_id=cdp_session.session_id
+			)
+			self._applied_patterns[target_id] = patterns
+			self.logger.debug(f'🚫 Blocking {len(patterns)} URL patterns on tab #{target_id[-4:]} ({page_host or url})')
+		except Exception as e:
+			self.logger.debug(f'Failed to set blocked URLs on tab #{target_id[-4:]}: {type(e).__name__}: {e}')
@@ -11,6 +11,7 @@ from browser_use.browser.events import (
 	TabCreatedEvent,
 )
 from browser_use.browser.watchdog_base import BaseWatchdog
+from browser_use.domain_policy import DomainListMatcher, get_domain_list_matcher, is_root_domain
 
 if TYPE_CHECKING:
 	pass
@@ -104,11 +105,7 @@ class SecurityWatchdog(BaseWatchdog):
 		Returns:
 			True if it's a simple root domain, False otherwise
 		"""
-		# Skip if it contains wildcards or protocol
-		if '*' in domain or '://' in domain:
-			return False
-
-		return domain.count('.') == 1
+		return is_root_domain(domain)
 
 	def _log_glob_warning(self) -> None:
 		"""Log a warning about glob patterns in allowed_domains."""
@@ -200,7 +197,7 @@ class SecurityWatchdog(BaseWatchdog):
 		):
 			return True
 
-		# Check allowed domains (fast path for sets, slow path for lists with patterns)
+		# Check allowed domains (exact hostnames for sets, compiled patterns for lists)
 		if self.browser_session.browser_profile.allowed_domains:
 			allowed_domains = self.browser_session.browser_profile.allowed_domains
 
@@ -209,13 +206,10 @@ class SecurityWatchdog(BaseWatchdog):
 				host_variant, host_alt = self._get_domain_variants(host)
 				return host_variant in allowed_domains or host_alt in allowed_domains
 			else:
-				# Slow path: O(n) pattern matching for lists
-				for pattern in allowed_domains:
-					if self._is_url_match(url, host, parsed.scheme, pattern):
-						return True
-				return False
+				# Compiled pattern matching for lists (exact hosts, *.domain suffixes, globs)
+				return self._get_list_matcher(allowed_domains).matches(url, host, parsed.scheme)
 
-		# Check prohibited domains (fast path for sets, slow path for lists with patterns)
+		# Check prohibited domains (exact hostnames for sets, compiled patterns for lists)
 		if self.browser_session.browser_profile.prohibited_domains:
 			prohibited_domains = self.browser_session.browser_profile.prohibited_domains
 
@@ -224,56 +218,14 @@ class SecurityWatchdog(BaseWatchdog):
 				host_variant, host_alt = self._get_domain_variants(host)
 				return host_variant not in prohibited_domains and host_alt not in prohibited_domains
 			else:
-				# Slow path: O(n) pattern matching for lists
-				for pattern in prohibited_domains:
-					if self._is_url_match(url, host, parsed.scheme, pattern):
-						return False
-				return True
+				# Compiled pattern matching for lists (exact hosts, *.domain suffixes, globs)
+				return not self._get_list_matcher(prohibited_domains).matches(url, host, parsed.scheme)
 
 		return True
 
-	def _is_url_match(self, url: str, host: str, scheme: str, pattern: str) -> bool:
-		"""Check if a URL matches a pattern."""
-
-		# Full URL for matching (scheme + host)
-		full_url_pattern = f'{scheme}://{host}'
-
-		# Handle glob patterns
-		if '*' in pattern:
+	def _get_list_matcher(self, patterns: list[str]) -> DomainListMatcher:
+		"""Get the compiled matcher of a domain list (built once per distinct list content)."""
+		matcher = get_domain_list_matcher(tuple(patterns))
+		if matcher.has_globs:
 			self._log_glob_warning()
-			import fnmatch
-
-			# Check if pattern matches the host
-			if pattern.startswith('*.'):
-				# Pattern like *.example.com should match subdomains and main domain
-				domain_part = pattern[2:]  # Remove *.
-				if host == domain_part or host.endswith('.' + domain_part):
-					# Only match http/https URLs for domain-only patterns
-					if scheme in ['http', 'https']:
-						return True
-			elif pattern.endswith('/*'):
-				# Pattern like brave://* or http*://example.com/*
-				if fnmatch.fnmatch(url, pattern):
-					return True
-			else:
-				# Use fnmatch for other glob patterns
-				if fnmatch.fnmatch(
-					full_url_pattern if '://' in pattern else host,
-					pattern,
-				):
-					return True
-		else:
-			# Exact match
-			if '://' in pattern:
-				# Full URL pattern
-				if url.startswith(pattern):
-					return True
-			else:
-				# Domain-only pattern (case-insensitive comparison)
-				if host.lower() == pattern.lower():
-					return True
-				# If pattern is a root domain, also check www subdomain
-				if self._is_root_domain(pattern) and host.lower() == f'www.{pattern.lower()}':
-					return True
-
-		return False
+		return matcher
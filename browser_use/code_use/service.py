@@ -654,6 +654,9 @@ class CodeAgent:
 		except Exception as log_e:
 			logger.error(f'Failed to log telemetry event: {log_e}', exc_info=True)
 
+		# Finish writing the stored screenshots before the history is read
+		await self.screenshot_service.flush()
+
 		# Store history data in session for history property
 		self.session._complete_history = self.complete_history
 		self.session._usage_summary = self.usage_summary
@@ -1420,6 +1423,7 @@ __code_exec_coro__ = __code_exec__()
 
 	async def close(self) -> None:
 		"""Close the browser session."""
+		await self.screenshot_service.flush()
 		if self.browser_session:
 			# Check if we should close the browser based on keep_alive setting
 			if not self.browser_session.browser_profile.keep_alive:
@@ -1,15 +1,18 @@
 """
 Enhanced snapshot processing for browser-use DOM tree extraction.
 
-This module provides stateless functions for parsing Chrome DevTools Protocol (CDP) DOMSnapshot data
+This module parses Chrome DevTools Protocol (CDP) DOMSnapshot data into a columnar, lazily resolved lookup
 to extract visibility, clickability, cursor styles, and other layout information.
 """
 
+from array import array
+from collections.abc import Iterator, Mapping
+
 from cdp_use.cdp.domsnapshot.commands import CaptureSnapshotReturns
 from cdp_use.cdp.domsnapshot.types import (
+	DocumentSnapshot,
 	LayoutTreeSnapshot,
 	NodeTreeSnapshot,
-	RareBooleanData,
 )
 
 from browser_use.dom.views import DOMRect, EnhancedSnapshotNode
@@ -30,11 +33,6 @@ REQUIRED_COMPUTED_STYLES = [
 ]
 
 
-def _parse_rare_boolean_data(rare_data: RareBooleanData, index: int) -> bool | None:
-	"""Parse rare boolean data from snapshot - returns True if index is in the rare data."""
-	return index in rare_data['index']
-
-
 def _parse_computed_styles(strings: list[str], style_indices: list[int]) -> dict[str, str]:
 	"""Parse computed styles from layout tree using string indices."""
 	styles = {}
@@ -44,118 +42,175 @@ def _parse_computed_styles(strings: list[str], style_indices: list[int]) -> dict
 	return styles
 
 
-def build_snapshot_lookup(
-	snapshot: CaptureSnapshotReturns,
-	device_pixel_ratio: float = 1.0,
-) -> dict[int, EnhancedSnapshotNode]:
-	"""Build a lookup table of backend node ID to enhanced snapshot data with everything calculated upfront."""
-	snapshot_lookup: dict[int, EnhancedSnapshotNode] = {}
-
-	if not snapshot['documents']:
-		return snapshot_lookup
-
-	strings = snapshot['strings']
-
-	for document in snapshot['documents']:
+def _pack_rects(rects: list[list[float]]) -> tuple[array, array]:
+	"""Pack a list of CDP rectangles into a flat float column plus a per-rect validity mask.
+
+	Rect `i` lives at `values[4 * i : 4 * i + 4]`; `present[i]` is 0 when CDP sent an empty/short rect.
+	"""
+	values = array('d', bytes(8 * 4 * len(rects)))
+	present = array('b', bytes(len(rects)))
+	for i, rect in enumerate(rects):
+		if rect and len(rect) >= 4:
+			offset = 4 * i
+			values[offset] = rect[0]
+			values[offset + 1] = rect[1]
+			values[offset + 2] = rect[2]
+			values[offset + 3] = rect[3]
+			present[i] = 1
+	return values, present
+
+
+class SnapshotColumns:
+	"""Columnar view of a single `DOMSnapshot.captureSnapshot` document.
+
+	The CDP arrays are kept as packed `array` columns (or the original lists where they are already compact),
+	rare-boolean fields are turned into sets once, and the node -> layout index mapping is precomputed,
+	so that resolving one node is O(1) and nothing is allocated for nodes that are never looked at.
+	"""
+
+	__slots__ = (
+		'strings',
+		'layout_index',
+		'clickable',
+		'has_clickable',
+		'bounds',
+		'bounds_present',
+		'client_rects',
+		'client_rects_present',
+		'scroll_rects',
+		'scroll_rects_present',
+		'styles',
+		'paint_orders',
+		'stacking_contexts',
+	)
+
+	def __init__(self, document: DocumentSnapshot, strings: list[str]):
 		nodes: NodeTreeSnapshot = document['nodes']
-		layout: LayoutTreeSnapshot = document['layout']
+		layout: LayoutTreeSnapshot = document['layout'] or {}  # type: ignore[assignment]
 
-		# Build backend node id to snapshot index lookup
-		backend_node_to_snapshot_index = {}
-		if 'backendNodeId' in nodes:
-			for i, backend_node_id in enumerate(nodes['backendNodeId']):
-				backend_node_to_snapshot_index[backend_node_id] = i
+		self.strings = strings
 
-		# PERFORMANCE: Pre-build layout index map to eliminate O(n²) double lookups
+		# snapshot index -> layout index (-1 when the node has no layout object)
 		# Preserve original behavior: use FIRST occurrence for duplicates
-		layout_index_map = {}
-		if layout and 'nodeIndex' in layout:
+		node_count = len(nodes.get('backendNodeId', []))
+		self.layout_index = array('i', [-1]) * node_count
+		if 'nodeIndex' in layout:
 			for layout_idx, node_index in enumerate(layout['nodeIndex']):
-				if node_index not in layout_index_map:  # Only store first occurrence
-					layout_index_map[node_index] = layout_idx
-
-		# Build snapshot lookup for each backend node id
-		for backend_node_id, snapshot_index in backend_node_to_snapshot_index.items():
-			is_clickable = None
-			if 'isClickable' in nodes:
-				is_clickable = _parse_rare_boolean_data(nodes['isClickable'], snapshot_index)
-
-			# Find corresponding layout node
-			cursor_style = None
-			is_visible = None
-			bounding_box = None
-			computed_styles = {}
-
-			# Look for layout tree node that corresponds to this snapshot node
-			paint_order = None
-			client_rects = None
-			scroll_rects = None
-			stacking_contexts = None
-			if snapshot_index in layout_index_map:
-				layout_idx = layout_index_map[snapshot_index]
-				if layout_idx < len(layout.get('bounds', [])):
-					# Parse bounding box
-					bounds = layout['bounds'][layout_idx]
-					if len(bounds) >= 4:
-						# IMPORTANT: CDP coordinates are in device pixels, convert to CSS pixels
-						# by dividing by the device pixel ratio
-						raw_x, raw_y, raw_width, raw_height = bounds[0], bounds[1], bounds[2], bounds[3]
-
-						# Apply device pixel ratio scaling to convert device pixels to CSS pixels
-						bounding_box = DOMRect(
-							x=raw_x / device_pixel_ratio,
-							y=raw_y / device_pixel_ratio,
-							width=raw_width / device_pixel_ratio,
-							height=raw_height / device_pixel_ratio,
-						)
-
-					# Parse computed styles for this layout node
-					if layout_idx < len(layout.get('styles', [])):
-						style_indices = layout['styles'][layout_idx]
-						computed_styles = _parse_computed_styles(strings, style_indices)
-						cursor_style = computed_styles.get('cursor')
-
-					# Extract paint order if available
-					if layout_idx < len(layout.get('paintOrders', [])):
-						paint_order = layout.get('paintOrders', [])[layout_idx]
-
-					# Extract client rects if available
-					client_rects_data = layout.get('clientRects', [])
-					if layout_idx < len(client_rects_data):
-						client_rect_data = client_rects_data[layout_idx]
-						if client_rect_data and len(client_rect_data) >= 4:
-							client_rects = DOMRect(
-								x=client_rect_data[0],
-								y=client_rect_data[1],
-								width=client_rect_data[2],
-								height=client_rect_data[3],
-							)
-
-					# Extract scroll rects if available
-					scroll_rects_data = layout.get('scrollRects', [])
-					if layout_idx < len(scroll_rects_data):
-						scroll_rect_data = scroll_rects_data[layout_idx]
-						if scroll_rect_data and len(scroll_rect_data) >= 4:
-							scroll_rects = DOMRect(
-								x=scroll_rect_data[0],
-								y=scroll_rect_data[1],
-								width=scroll_rect_data[2],
-								height=scroll_rect_data[3],
-							)
-
-					# Extract stacking contexts if available
-					if layout_idx < len(layout.get('stackingContexts', [])):
-						stacking_contexts = layout.get('stackingContexts', {}).get('index', [])[layout_idx]
-
-			snapshot_lookup[backend_node_id] = EnhancedSnapshotNode(
-				is_clickable=is_clickable,
-				cursor_style=cursor_style,
-				bounds=bounding_box,
-				clientRects=client_rects,
-				scrollRects=scroll_rects,
-				computed_styles=computed_styles if computed_styles else None,
-				paint_order=paint_order,
-				stacking_contexts=stacking_contexts,
-			)
-
-	return snapshot_lookup
+				if node_index < node_count and self.layout_index[node_index] == -1:
+					self.layout_index[node_index] = layout_idx
+
+		# PERFORMANCE: rare boolean data is a sorted list of indices, turn it into a set once (O(1) membership)
+		self.has_clickable = 'isClickable' in nodes
+		self.clickable: frozenset[int] = frozenset(nodes['isClickable']['index']) if self.has_clickable else frozenset()
+
+		self.bounds, self.bounds_present = _pack_rects(layout.get('bounds', []))
+		self.client_rects, self.client_rects_present = _pack_rects(layout.get('clientRects', []))
+		self.scroll_rects, self.scroll_rects_present = _pack_rects(layout.get('scrollRects', []))
+		self.styles: list[list[int]] = layout.get('styles', [])
+		self.paint_orders = array('q', layout.get('paintOrders', []))
+		self.stacking_contexts = layout.get('stackingContexts', {})
+
+	def _rect(self, values: array, present: array, layout_idx: int, scale: float = 1.0) -> DOMRect | None:
+		if layout_idx >= len(present) or not present[layout_idx]:
+			return None
+		offset = 4 * layout_idx
+		return DOMRect(
+			x=values[offset] / scale,
+			y=values[offset + 1] / scale,
+			width=values[offset + 2] / scale,
+			height=values[offset + 3] / scale,
+		)
+
+	def build_node(self, snapshot_index: int, device_pixel_ratio: float) -> EnhancedSnapshotNode:
+		"""Materialize the `EnhancedSnapshotNode` for one snapshot node index."""
+		is_clickable = snapshot_index in self.clickable if self.has_clickable else None
+
+		cursor_style = None
+		bounding_box = None
+		computed_styles = {}
+		paint_order = None
+		client_rects = None
+		scroll_rects = None
+		stacking_contexts = None
+
+		layout_idx = self.layout_index[snapshot_index] if snapshot_index < len(self.layout_index) else -1
+		if layout_idx != -1 and layout_idx < len(self.bounds_present):
+			# IMPORTANT: CDP coordinates are in device pixels, convert to CSS pixels
+			# by dividing by the device pixel ratio
+			bounding_box = self._rect(self.bounds, self.bounds_present, layout_idx, device_pixel_ratio)
+
+			if layout_idx < len(self.styles):
+				computed_styles = _parse_computed_styles(self.strings, self.styles[layout_idx])
+				cursor_style = computed_styles.get('cursor')
+
+			if layout_idx < len(self.paint_orders):
+				paint_order = self.paint_orders[layout_idx]
+
+			client_rects = self._rect(self.client_rects, self.client_rects_present, layout_idx)
+			scroll_rects = self._rect(self.scroll_rects, self.scroll_rects_present, layout_idx)
+
+			stacking_context_indices = self.stacking_contexts.get('index', [])
+			if layout_idx < len(self.stacking_contexts) and layout_idx < len(stacking_context_indices):
+				stacking_contexts = stacking_context_indices[layout_idx]
+
+		return EnhancedSnapshotNode(
+			is_clickable=is_clickable,
+			cursor_style=cursor_style,
+			bounds=bounding_box,
+			clientRects=client_rects,
+			scrollRects=scroll_rects,
+			computed_styles=computed_styles if computed_styles else None,
+			paint_order=paint_order,
+			stacking_contexts=stacking_contexts,
+		)
+
+
+class SnapshotLookup(Mapping[int, EnhancedSnapshotNode]):
+	"""Backend node ID -> `EnhancedSnapshotNode`, resolved lazily from `SnapshotColumns`.
+
+	Nodes are materialized on first access and memoized, so repeated lookups return the same object
+	(callers rely on mutating e.g. `bounds` in place).
+	"""
+
+	def __init__(self, snapshot: CaptureSnapshotReturns, device_pixel_ratio: float = 1.0):
+		self.device_pixel_ratio = device_pixel_ratio
+		self.columns: list[SnapshotColumns] = []
+		# backend node id -> (document index, snapshot index); later documents win, same as the eager dict did
+		self._locations: dict[int, tuple[int, int]] = {}
+		self._nodes: dict[int, EnhancedSnapshotNode] = {}
+
+		strings = snapshot['strings']
+		for document in snapshot['documents']:
+			doc_idx = len(self.columns)
+			self.columns.append(SnapshotColumns(document, strings))
+			for snapshot_index, backend_node_id in enumerate(document['nodes'].get('backendNodeId', [])):
+				self._locations[backend_node_id] = (doc_idx, snapshot_index)
+
+	def __getitem__(self, backend_node_id: int) -> EnhancedSnapshotNode:
+		node = self._nodes.get(backend_node_id)
+		if node is None:
+			doc_idx, snapshot_index = self._locations[backend_node_id]
+			node = self.columns[doc_idx].build_node(snapshot_index, self.device_pixel_ratio)
+			self._nodes[backend_node_id] = node
+		return node
+
+	def __contains__(self, backend_node_id: object) -> bool:
+		return backend_node_id in self._locations
+
+	def __iter__(self) -> Iterator[int]:
+		return iter(self._locations)
+
+	def __len__(self) -> int:
+		return len(self._locations)
+
+
+def build_snapshot_lookup(
+	snapshot: CaptureSnapshotReturns,
+	device_pixel_ratio: float = 1.0,
+) -> SnapshotLookup:
+	"""Build a lookup table of backend node ID to enhanced snapshot data.
+
+	Only the columnar index is built upfront (linear in the snapshot size); the per-node
+	`EnhancedSnapshotNode` objects are created on first access.
+	"""
+	return SnapshotLookup(snapshot, device_pixel_ratio)
@@ -5,16 +5,21 @@ This module provides a unified interface for extracting clean markdown from brow
 used by both the tools service and page actor.
 """
 
+import logging
 import re
 from typing import TYPE_CHECKING, Any
 
 from browser_use.dom.serializer.html_serializer import HTMLSerializer
+from browser_use.dom.serializer.markdown_serializer import MarkdownSerializer
 from browser_use.dom.service import DomService
+from browser_use.dom.views import EnhancedDOMTreeNode
 
 if TYPE_CHECKING:
 	from browser_use.browser.session import BrowserSession
 	from browser_use.browser.watchdogs.dom_watchdog import DOMWatchdog
 
+logger = logging.getLogger(__name__)
+
 
 async def extract_clean_markdown(
 	browser_session: 'BrowserSession | None' = None,
@@ -34,12 +39,14 @@ async def extract_clean_markdown(
 	    extract_links: Whether to preserve links in markdown
 
 	Returns:
-	    tuple: (clean_markdown_content, content_statistics)
+	    tuple: (clean_markdown_content, content_statistics). original_html_chars is 0 when the tree was converted
+	    directly (without serializing it to HTML), dom_nodes is the number of nodes converted in that case.
 
 	Raises:
 	    ValueError: If neither browser_session nor (dom_service + target_id) are provided
 	"""
 	# Validate input parameters
+	dom_watchdog: DOMWatchdog | None = None
 	if browser_session is not None:
 		if dom_service is not None or target_id is not None:
 			raise ValueError('Cannot specify both browser_session and dom_service/target_id')
@@ -47,6 +54,14 @@ async def extract_clean_markdown(
 		enhanced_dom_tree = await _get_enhanced_dom_tree_from_browser_session(browser_session)
 		current_url = await browser_session.get_current_page_url()
 		method = 'enhanced_dom_tree'
+
+		# Markdown is cached per DOM version, paging through a long page converts it only once
+		dom_watchdog = browser_session._dom_watchdog
+		cached = dom_watchdog.get_cached_markdown(extract_links) if dom_watchdog is not None else None
+		if cached is not None:
+			content, stats = cached
+			stats['from_cache'] = True
+			return content, stats
 	elif dom_service is not None and target_id is not None:
 		# DOM service path (page actor)
 		# Lazy fetch all_frames inside get_dom_tree if needed (for cross-origin iframes)
@@ -56,28 +71,8 @@ async def extract_clean_markdown(
 	else:
 		raise ValueError('Must provide either browser_session or both dom_service and target_id')
 
-	# Use the HTML serializer with the enhanced DOM tree
-	html_serializer = HTMLSerializer(extract_links=extract_links)
-	page_html = html_serializer.serialize(enhanced_dom_tree)
-
-	original_html_length = len(page_html)
-
-	# Use markdownify for clean markdown conversion
-	from markdownify import markdownify as md
-
-	content = md(
-		page_html,
-		heading_style='ATX',  # Use # style headings
-		strip=['script', 'style'],  # Remove these tags
-		bullets='-',  # Use - for unordered lists
-		code_language='',  # Don't add language to code blocks
-		escape_asterisks=False,  # Don't escape asterisks (cleaner output)
-		escape_underscores=False,  # Don't escape underscores (cleaner output)
-		escape_misc=False,  # Don't escape other characters (cleaner output)
-		autolinks=False,  # Don't convert URLs to <> format
-		default_title=False,  # Don't add default title attributes
-		keep_inline_images_in=[],  # Don't keep inline images in any tags (we already filter base64 in HTML)
-	)
+	# Convert the enhanced DOM tree to markdown (directly, or through HTML + markdownify if that fails)
+	content, source_stats = dom_tree_to_markdown(enhanced_dom_tree, extract_links=extract_links)
 
 	initial_markdown_length = len(content)
 
@@ -92,7 +87,7 @@ async def extract_clean_markdown(
 	# Content statistics
 	stats = {
 		'method': method,
-		'original_html_chars': original_html_length,
+		**source_stats,
 		'initial_markdown_chars': initial_markdown_length,
 		'filtered_chars_removed': chars_filtered,
 		'final_filtered_chars': final_filtered_length,
@@ -102,9 +97,63 @@ async def extract_clean_markdown(
 	if current_url:
 		stats['url'] = current_url
 
+	if dom_watchdog is not None:
+		dom_watchdog.cache_markdown(extract_links, content, stats)
+
 	return content, stats
 
 
+def dom_tree_to_markdown(
+	enhanced_dom_tree: EnhancedDOMTreeNode, extract_links: bool = False, converter: str = 'dom'
+) -> tuple[str, dict[str, Any]]:
+	"""Convert an enhanced DOM tree to (unfiltered) markdown.
+
+	The 'dom' converter walks the tree directly (MarkdownSerializer), 'markdownify' serializes the tree to HTML and
+	converts that with markdownify. Both give the same markdown, the direct conversion is used unless it fails.
+
+	Returns:
+	    tuple: (markdown, stats about the converted source: original_html_chars, and dom_nodes for the direct conversion)
+	"""
+	if converter == 'dom':
+		markdown_serializer = MarkdownSerializer(extract_links=extract_links)
+		try:
+			content = markdown_serializer.serialize(enhanced_dom_tree)
+			# No HTML is serialized, original_html_chars is kept for callers of the stats
+			return content, {'original_html_chars': 0, 'dom_nodes': markdown_serializer.node_count}
+		except (AttributeError, IndexError, KeyError, TypeError, ValueError) as e:
+			# unexpected node data, markdownify parses the serialized HTML instead
+			logger.warning(f'Direct DOM to markdown conversion failed, falling back to markdownify: {type(e).__name__}: {e}')
+
+	# Use the HTML serializer with the enhanced DOM tree
+	html_serializer = HTMLSerializer(extract_links=extract_links)
+	page_html = html_serializer.serialize(enhanced_dom_tree)
+
+	# Use markdownify for clean markdown conversion
+	from markdownify import markdownify as md
+
+	content = md(
+		page_html,
+		heading_style='ATX',  # Use # style headings
+		strip=['script', 'style'],  # Remove these tags
+		bullets='-',  # Use - for unordered lists
+		code_language='',  # Don't add language to code blocks
+		escape_asterisks=False,  # Don't escape asterisks (cleaner output)
+		escape_underscores=False,  # Don't escape underscores (cleaner output)
+		escape_misc=False,  # Don't escape other characters (cleaner output)
+		autolinks=False,  # Don't convert URLs to <> format
+		default_title=False,  # Don't add default title attributes
+		keep_inline_images_in=[],  # Don't keep inline images in any tags (we already filter base64 in HTML)
+	)
+	return content, {'original_html_chars': len(page_html)}
+
+
+def describe_content_source(stats: dict[str, Any]) -> str:
+	"""Describe what the markdown was converted from, for the content stats shown to the LLM."""
+	if 'dom_nodes' in stats:
+		return f'{stats["dom_nodes"]:,} DOM nodes'
+	return f'{stats.get("original_html_chars", 0):,} HTML chars'
+
+
 async def _get_enhanced_dom_tree_from_browser_session(browser_session: 'BrowserSession'):
 	"""Get enhanced DOM tree from browser session via DOMWatchdog."""
 	# Get the enhanced DOM tree from DOMWatchdog
@@ -112,11 +161,11 @@ async def _get_enhanced_dom_tree_from_browser_session(browser_session: 'BrowserS
 	dom_watchdog: DOMWatchdog | None = browser_session._dom_watchdog
 	assert dom_watchdog is not None, 'DOMWatchdog not available'
 
-	# Use cached enhanced DOM tree if available, otherwise build it
-	if dom_watchdog.enhanced_dom_tree is not None:
+	# Use cached enhanced DOM tree if it is still current, otherwise build it
+	if dom_watchdog.has_current_dom_tree:
 		return dom_watchdog.enhanced_dom_tree
 
-	# Build the enhanced DOM tree if not cached
+	# Build the enhanced DOM tree if not cached (or cached before a navigation)
 	await dom_watchdog._build_dom_tree_without_highlights()
 	enhanced_dom_tree = dom_watchdog.enhanced_dom_tree
 	assert enhanced_dom_tree is not None, 'Enhanced DOM tree not available'
@@ -127,6 +176,39 @@ async def _get_enhanced_dom_tree_from_browser_session(browser_session: 'BrowserS
 # Legacy aliases removed - all code now uses the unified extract_clean_markdown function
 
 
+def find_chunk_end(content: str, max_chars: int) -> int:
+	"""Find where to cut content to at most max_chars, preferring a paragraph, then a sentence break near the limit."""
+	if len(content) <= max_chars:
+		return len(content)
+
+	# Look for paragraph break within last 500 chars of limit
+	paragraph_break = content.rfind('\n\n', max_chars - 500, max_chars)
+	if paragraph_break > 0:
+		return paragraph_break
+
+	# Look for sentence break within last 200 chars of limit
+	sentence_break = content.rfind('.', max_chars - 200, max_chars)
+	if sentence_break > 0:
+		return sentence_break + 1
+
+	return max_chars
+
+
+def split_markdown_chunks(content: str, max_chars: int, max_chunks: int | None = None) -> list[tuple[int, str]]:
+	"""Split markdown into chunks of at most max_chars at natural break points.
+
+	Returns:
+	    list of (start_char, chunk) tuples, stops after max_chunks chunks (the rest of the content is not returned)
+	"""
+	chunks: list[tuple[int, str]] = []
+	start = 0
+	while start < len(content) and (max_chunks is None or len(chunks) < max_chunks):
+		end = start + find_chunk_end(content[start : start + max_chars + 1], max_chars)
+		chunks.append((start, content[start:end]))
+		start = end
+	return chunks
+
+
 def _preprocess_markdown_content(content: str, max_newlines: int = 3) -> tuple[str, int]:
 	"""
 	Light preprocessing of markdown output - minimal cleanup with JSON blob removal.
@@ -0,0 +1,344 @@
+"""
+Incremental DOM tracking for browser-use DOM tree extraction.
+
+Keeps the enhanced DOM tree from the last full build in sync with the page by applying CDP `DOM.*` mutation
+events (attribute/text changes, inserted/removed children) to it, so the next step can skip `DOM.getDocument`
+and only re-attach fresh layout and AX data. Anything that can't be patched safely (navigation, shadow root
+changes, nodes we never saw, too many mutations) marks the tree as invalid and forces a full rebuild.
+"""
+
+import logging
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from cdp_use.cdp.dom.types import Node
+from cdp_use.cdp.target import SessionID, TargetID
+
+from browser_use.dom.views import EnhancedDOMTreeNode
+
+NodeFactory = Callable[[Node, TargetID, SessionID | None], EnhancedDOMTreeNode]
+
+
+class DOMMutationTracker:
+	"""Patches a cached `EnhancedDOMTreeNode` tree from CDP DOM mutation events.
+
+	Lifecycle per full build:
+		1. `begin_build()` before `DOM.getDocument` is sent - events are buffered from here on
+		2. `track()` once the new tree is built - buffered events are replayed onto it
+		3. event handlers patch the tree live until the next step
+		4. `can_reuse()` tells the DomService whether it can refresh the cached tree instead of rebuilding it
+	"""
+
+	def __init__(
+		self,
+		logger: logging.Logger,
+		node_factory: NodeFactory,
+		max_mutations: int = 500,
+		on_mutation: Callable[[], None] | None = None,
+	):
+		self.logger = logger
+		self.node_factory = node_factory
+		self.max_mutations = max_mutations
+		self.on_mutation = on_mutation
+		"""Called after a live mutation event was applied to the cached tree (it patched or invalidated it)"""
+
+		self.root: EnhancedDOMTreeNode | None = None
+		self.target_id: TargetID | None = None
+		self.session_id: SessionID | None = None
+
+		self.mutation_count = 0
+		"""Number of mutation events applied since the tree was last built or refreshed"""
+		self.dirty_node_ids: set[int] = set()
+		"""Node ids touched by mutations since the tree was last built or refreshed"""
+		self.nodes_without_snapshot = 0
+		"""Tracked nodes without snapshot data at the last build/refresh, more on refresh means we missed a removal"""
+		self.untracked_snapshot_nodes = 0
+		"""Snapshot nodes not in the tracked tree at the last build/refresh, more on refresh means we missed an insertion"""
+
+		self._nodes: dict[int, EnhancedDOMTreeNode] = {}
+		self._invalid_reason: str | None = None
+		self._buffer: list[tuple[str, Any]] | None = None
+		self._registered_client: Any = None
+
+	# ========== Lifecycle ==========
+
+	def register_handlers(self, cdp_client: Any) -> None:
+		"""Subscribe to DOM mutation events on a CDP client (once per client)."""
+		if self._registered_client is cdp_client:
+			return
+
+		cdp_client.register.DOM.attributeModified(self.on_attribute_modified)
+		cdp_client.register.DOM.attributeRemoved(self.on_attribute_removed)
+		cdp_client.register.DOM.characterDataModified(self.on_character_data_modified)
+		cdp_client.register.DOM.childNodeInserted(self.on_child_node_inserted)
+		cdp_client.register.DOM.childNodeRemoved(self.on_child_node_removed)
+		cdp_client.register.DOM.childNodeCountUpdated(self.on_child_node_count_updated)
+		cdp_client.register.DOM.documentUpdated(self.on_document_updated)
+		cdp_client.register.DOM.setChildNodes(self.on_set_child_nodes)
+		cdp_client.register.DOM.shadowRootPushed(self.on_shadow_root_pushed)
+		cdp_client.register.DOM.shadowRootPopped(self.on_shadow_root_popped)
+		self._registered_client = cdp_client
+
+	def begin_build(self, target_id: TargetID, session_id: SessionID) -> None:
+		"""Drop the cached tree and start buffering events for the tree that is about to be fetched."""
+		self.reset()
+		self.target_id = target_id
+		self.session_id = session_id
+		self._buffer = []
+
+	def track(self, root: EnhancedDOMTreeNode, snapshot_node_count: int) -> None:
+		"""Start tracking a freshly built tree and replay the events received while it was being built.
+
+		Args:
+			root: Root of the freshly built enhanced DOM tree
+			snapshot_node_count: Number of nodes in the DOM snapshot the tree was built from
+		"""
+		self.root = root
+		self._nodes = {}
+		self.nodes_without_snapshot = 0
+
+		for node in self._iter_subtree(root):
+			if node.target_id != self.target_id:
+				# cross-origin iframe content comes from another target and has its own node ids and layout
+				self.invalidate('tree contains cross-origin iframe content')
+			self._nodes[node.node_id] = node
+			if node.snapshot_node is None:
+				self.nodes_without_snapshot += 1
+		self.untracked_snapshot_nodes = snapshot_node_count - (len(self._nodes) - self.nodes_without_snapshot)
+
+		buffered, self._buffer = self._buffer or [], None
+		for method, event in buffered:
+			self._apply(method, event, replay=True)
+
+		self.logger.debug(
+			f'🔁 DOMMutationTracker: tracking {len(self._nodes)} nodes, replayed {len(buffered)} buffered mutation events'
+		)
+
+	def is_consistent(self, nodes_without_snapshot: int, untracked_snapshot_nodes: int) -> bool:
+		"""Check the refreshed tree against a new snapshot, catching mutations that never reached us as events."""
+		if nodes_without_snapshot > self.nodes_without_snapshot or untracked_snapshot_nodes > self.untracked_snapshot_nodes:
+			self.invalidate(
+				f'tree drifted from snapshot ({nodes_without_snapshot - self.nodes_without_snapshot} stale nodes, '
+				f'{untracked_snapshot_nodes - self.untracked_snapshot_nodes} untracked nodes)'
+			)
+			return False
+		return True
+
+	def mark_refreshed(self, nodes_without_snapshot: int, untracked_snapshot_nodes: int) -> None:
+		"""Reset the mutation counters after the cached tree was refreshed with new layout data."""
+		self.mutation_count = 0
+		self.dirty_node_ids = set()
+		self.nodes_without_snapshot = nodes_without_snapshot
+		self.untracked_snapshot_nodes = untracked_snapshot_nodes
+
+	def reset(self) -> None:
+		"""Forget the cached tree (the next step will do a full rebuild)."""
+		self.root = None
+		self.target_id = None
+		self.session_id = None
+		self.mutation_count = 0
+		self.dirty_node_ids = set()
+		self.nodes_without_snapshot = 0
+		self.untracked_snapshot_nodes = 0
+		self._nodes = {}
+		self._invalid_reason = None
+		self._buffer = None
+
+	def invalidate(self, reason: str) -> None:
+		"""Mark the cached tree as unusable, the next step will do a full rebuild."""
+		if self._invalid_reason is None:
+			self.logger.debug(f'🔁 DOMMutationTracker: cached DOM tree invalidated ({reason}), next step does a full rebuild')
+			self._invalid_reason = reason
+
+	def can_reuse(self, target_id: TargetID, session_id: SessionID) -> bool:
+		"""Whether the cached tree can be refreshed in place for this target instead of being rebuilt."""
+		return (
+			self.root is not None
+			and self._buffer is None
+			and self._invalid_reason is None
+			and self.target_id == target_id
+			and self.session_id == session_id
+		)
+
+	# ========== CDP event handlers ==========
+
+	def on_attribute_modified(self, event: Any, session_id: SessionID | None = None) -> None:
+		self._handle('attributeModified', event, session_id)
+
+	def on_attribute_removed(self, event: Any, session_id: SessionID | None = None) -> None:
+		self._handle('attributeRemoved', event, session_id)
+
+	def on_character_data_modified(self, event: Any, session_id: SessionID | None = None) -> None:
+		self._handle('characterDataModified', event, session_id)
+
+	def on_child_node_inserted(self, event: Any, session_id: SessionID | None = None) -> None:
+		self._handle('childNodeInserted', event, session_id)
+
+	def on_child_node_removed(self, event: Any, session_id: SessionID | None = None) -> None:
+		self._handle('childNodeRemoved', event, session_id)
+
+	def on_child_node_count_updated(self, event: Any, session_id: SessionID | None = None) -> None:
+		self._handle('childNodeCountUpdated', event, session_id)
+
+	def on_document_updated(self, event: Any, session_id: SessionID | None = None) -> None:
+		self._handle('documentUpdated', event, session_id)
+
+	def on_set_child_nodes(self, event: Any, session_id: SessionID | None = None) -> None:
+		self._handle('setChildNodes', event, session_id)
+
+	def on_shadow_root_pushed(self, event: Any, session_id: SessionID | None = None) -> None:
+		self._handle('shadowRootPushed', event, session_id)
+
+	def on_shadow_root_popped(self, event: Any, session_id: SessionID | None = None) -> None:
+		self._handle('shadowRootPopped', event, session_id)
+
+	def _handle(self, method: str, event: Any, session_id: SessionID | None) -> None:
+		if self.session_id is None or session_id != self.session_id:
+			return
+
+		if self._buffer is not None:
+			self._buffer.append((method, event))
+			return
+
+		if self.root is None or self._invalid_reason is not None:
+			return
+
+		self._apply(method, event, replay=False)
+		if self.on_mutation is not None:
+			self.on_mutation()
+
+	# ========== Patching ==========
+
+	def _apply(self, method: str, event: Any, replay: bool) -> None:
+		"""Apply one mutation event to the cached tree.
+
+		During replay the tree may already reflect the event (it happened before `DOM.getDocument` answered),
+		so unknown node ids are skipped instead of invalidating the tree and inserts are de-duplicated.
+		"""
+		if self._invalid_reason is not None:
+			return
+
+		self.mutation_count += 1
+		if self.mutation_count > self.max_mutations:
+			self.invalidate(f'more than {self.max_mutations} mutations')
+			return
+
+		if method == 'documentUpdated':
+			self.invalidate('document updated')
+		elif method in ('shadowRootPushed', 'shadowRootPopped', 'setChildNodes'):
+			self.invalidate(f'{method} event')
+		elif method == 'childNodeCountUpdated':
+			# children of this node were never sent to us, so we can't know what was inserted
+			if event['nodeId'] in self._nodes or not replay:
+				self.invalidate('child node count updated')
+		elif method in ('attributeModified', 'attributeRemoved', 'characterDataModified'):
+			node = self._nodes.get(event['nodeId'])
+			if node is None:
+				if not replay:
+					self.invalidate(f'{method} for unknown node {event["nodeId"]}')
+				return
+			if method == 'attributeModified':
+				# copy-on-write: earlier states (history, previous selector maps) may still reference the old dict
+				node.attributes = {**node.attributes, event['name']: event['value']}
+				node._element_hash = None
+			elif method == 'attributeRemoved':
+				node.attributes = {k: v for k, v in node.attributes.items() if k != event['name']}
+				node._element_hash = None
+			else:
+				node.node_value = event['characterData']
+			self.dirty_node_ids.add(node.node_id)
+		elif method == 'childNodeRemoved':
+			self._remove_child(event['parentNodeId'], event['nodeId'], replay)
+		elif method == 'childNodeInserted':
+			self._insert_child(event['parentNodeId'], event['previousNodeId'], event['node'], replay)
+
+	def _remove_child(self, parent_node_id: int, node_id: int, replay: bool) -> None:
+		parent = self._nodes.get(parent_node_id)
+		node = self._nodes.get(node_id)
+		if parent is None or node is None or node.parent_node is not parent or not parent.children_nodes:
+			if not replay:
+				self.invalidate(f'removal of unknown node {node_id}')
+			return
+
+		parent.children_nodes = [child for child in parent.children_nodes if child is not node]
+		for removed in self._iter_subtree(node):
+			self._nodes.pop(removed.node_id, None)
+		self.dirty_node_ids.add(parent_node_id)
+
+	def _insert_child(self, parent_node_id: int, previous_node_id: int, payload: Node, replay: bool) -> None:
+		parent = self._nodes.get(parent_node_id)
+		if parent is None:
+			if not replay:
+				self.invalidate(f'insertion into unknown node {parent_node_id}')
+			return
+		if payload['nodeId'] in self._nodes:
+			if not replay:
+				self.invalidate(f'node {payload["nodeId"]} inserted twice')
+			return
+		if not self._is_complete_payload(payload):
+			# iframes, shadow roots and partially sent subtrees need a proper getDocument
+			self.invalidate('inserted subtree is incomplete')
+			return
+
+		node = self._build_subtree(payload, parent)
+
+		children = list(parent.children_nodes or [])
+		position = 0
+		if previous_node_id:
+			for i, child in enumerate(children):
+				if child.node_id == previous_node_id:
+					position = i + 1
+					break
+			else:
+				self.invalidate(f'insertion after unknown node {previous_node_id}')
+				return
+		children.insert(position, node)
+		parent.children_nodes = children
+		self.dirty_node_ids.add(parent_node_id)
+
+	def _build_subtree(self, payload: Node, parent: EnhancedDOMTreeNode) -> EnhancedDOMTreeNode:
+		assert self.target_id is not None
+		node = self.node_factory(payload, self.target_id, parent.session_id)
+		node.parent_node = parent
+		self._nodes[node.node_id] = node
+		self.dirty_node_ids.add(node.node_id)
+
+		stack = [(payload, node)]
+		while stack:
+			current_payload, current = stack.pop()
+			if current_payload.get('children'):
+				current.children_nodes = []
+				for child_payload in current_payload['children']:
+					child = self.node_factory(child_payload, self.target_id, parent.session_id)
+					child.parent_node = current
+					current.children_nodes.append(child)
+					self._nodes[child.node_id] = child
+					self.dirty_node_ids.add(child.node_id)
+					stack.append((child_payload, child))
+		return node
+
+	@staticmethod
+	def _is_complete_payload(payload: Node) -> bool:
+		stack = [payload]
+		while stack:
+			current = stack.pop()
+			if current.get('contentDocument') or current.get('shadowRoots') or current.get('frameId'):
+				return False
+			children = current.get('children') or []
+			if current.get('childNodeCount', 0) > len(children):
+				return False
+			stack.extend(children)
+		return True
+
+	@staticmethod
+	def _iter_subtree(root: EnhancedDOMTreeNode) -> Iterator[EnhancedDOMTreeNode]:
+		stack = [root]
+		while stack:
+			node = stack.pop()
+			yield node
+			if node.content_document:
+				stack.append(node.content_document)
+			if node.shadow_roots:
+				stack.extend(node.shadow_roots)
+			if node.children_nodes:
+				stack.extend(node.children_nodes)
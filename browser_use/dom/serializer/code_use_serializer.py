@@ -1,6 +1,7 @@
 # @file purpose: Ultra-compact serializer optimized for code-use agents
 # Focuses on minimal token usage while preserving essential interactive context
 
+from browser_use.dom.serializer.writer import TreeWriter
 from browser_use.dom.utils import cap_text_length
 from browser_use.dom.views import (
 	EnhancedDOMTreeNode,
@@ -59,7 +60,13 @@ class DOMCodeAgentSerializer:
 	"""Optimized DOM serializer for code-use agents - balances token efficiency with context."""
 
 	@staticmethod
-	def serialize_tree(node: SimplifiedNode | None, include_attributes: list[str], depth: int = 0) -> str:
+	def serialize_tree(
+		node: SimplifiedNode | None,
+		include_attributes: list[str],
+		depth: int = 0,
+		max_chars: int | None = None,
+		max_tokens: int | None = None,
+	) -> str:
 		"""
 		Serialize DOM tree with smart token optimization.
 
@@ -68,19 +75,28 @@ class DOMCodeAgentSerializer:
 		- Show div/span/p elements with useful attributes or text
 		- Show all interactive + semantic elements
 		- Inline text up to 80 chars for better context
+		- Stop early once the optional `max_chars` / `max_tokens` budget is used up
 		"""
-		if not node:
-			return ''
+		writer = TreeWriter('  ', max_chars=max_chars, max_tokens=max_tokens)  # Use 2 spaces instead of tabs for compactness
+		DOMCodeAgentSerializer._write_tree(node, include_attributes, depth, writer)
+		return writer.getvalue()
+
+	@staticmethod
+	def _write_tree(node: SimplifiedNode | None, include_attributes: list[str], depth: int, writer: TreeWriter) -> None:
+		"""Write the lines of a subtree to the writer."""
+		if not node or writer.truncated:
+			return
 
 		# Skip excluded/hidden nodes
 		if hasattr(node, 'excluded_by_parent') and node.excluded_by_parent:
-			return DOMCodeAgentSerializer._serialize_children(node, include_attributes, depth)
+			DOMCodeAgentSerializer._write_children(node, include_attributes, depth, writer)
+			return
 
 		if not node.should_display:
-			return DOMCodeAgentSerializer._serialize_children(node, include_attributes, depth)
+			DOMCodeAgentSerializer._write_children(node, include_attributes, depth, writer)
+			return
 
-		formatted_text = []
-		depth_str = '  ' * depth  # Use 2 spaces instead of tabs for compactness
+		depth_str = writer.indent(depth)
 
 		if node.original_node.node_type == NodeType.ELEMENT_NODE:
 			tag = node.original_node.tag_name.lower()
@@ -88,11 +104,13 @@ class DOMCodeAgentSerializer:
 
 			# Skip invisible (except iframes)
 			if not is_visible and tag not in ['iframe', 'frame']:
-				return DOMCodeAgentSerializer._serialize_children(node, include_attributes, depth)
+				DOMCodeAgentSerializer._write_children(node, include_attributes, depth, writer)
+				return
 
 			# Special handling for iframes
 			if tag in ['iframe', 'frame']:
-				return DOMCodeAgentSerializer._serialize_iframe(node, include_attributes, depth)
+				DOMCodeAgentSerializer._write_iframe(node, include_attributes, depth, writer)
+				return
 
 			# Build minimal attributes
 			attributes_str = DOMCodeAgentSerializer._build_minimal_attributes(node.original_node)
@@ -105,11 +123,13 @@ class DOMCodeAgentSerializer:
 
 			# Skip non-semantic, non-interactive containers without attributes
 			if not is_interactive and not is_semantic and not has_useful_attrs and not has_text:
-				return DOMCodeAgentSerializer._serialize_children(node, include_attributes, depth)
+				DOMCodeAgentSerializer._write_children(node, include_attributes, depth, writer)
+				return
 
 			# Collapse pointless wrappers
 			if tag in {'div', 'span'} and not has_useful_attrs and not has_text and len(node.children) == 1:
-				return DOMCodeAgentSerializer._serialize_children(node, include_attributes, depth)
+				DOMCodeAgentSerializer._write_children(node, include_attributes, depth, writer)
+				return
 
 			# Build element
 			line = f'{depth_str}<{tag}'
@@ -124,13 +144,11 @@ class DOMCodeAgentSerializer:
 			else:
 				line += '>'
 
-			formatted_text.append(line)
+			writer.write(line)
 
 			# Children (only if no inline text)
 			if node.children and not inline_text:
-				children_text = DOMCodeAgentSerializer._serialize_children(node, include_attributes, depth + 1)
-				if children_text:
-					formatted_text.append(children_text)
+				DOMCodeAgentSerializer._write_children(node, include_attributes, depth + 1, writer)
 
 		elif node.original_node.node_type == NodeType.TEXT_NODE:
 			# Handled inline with parent
@@ -139,22 +157,16 @@ class DOMCodeAgentSerializer:
 		elif node.original_node.node_type == NodeType.DOCUMENT_FRAGMENT_NODE:
 			# Shadow DOM - minimal marker
 			if node.children:
-				formatted_text.append(f'{depth_str}#shadow')
-				children_text = DOMCodeAgentSerializer._serialize_children(node, include_attributes, depth + 1)
-				if children_text:
-					formatted_text.append(children_text)
-
-		return '\n'.join(formatted_text)
+				writer.write(f'{depth_str}#shadow')
+				DOMCodeAgentSerializer._write_children(node, include_attributes, depth + 1, writer)
 
 	@staticmethod
-	def _serialize_children(node: SimplifiedNode, include_attributes: list[str], depth: int) -> str:
-		"""Serialize children."""
-		children_output = []
+	def _write_children(node: SimplifiedNode, include_attributes: list[str], depth: int, writer: TreeWriter) -> None:
+		"""Write children."""
 		for child in node.children:
-			child_text = DOMCodeAgentSerializer.serialize_tree(child, include_attributes, depth)
-			if child_text:
-				children_output.append(child_text)
-		return '\n'.join(children_output)
+			if writer.truncated:
+				return
+			DOMCodeAgentSerializer._write_tree(child, include_attributes, depth, writer)
 
 	@staticmethod
 	def _build_minimal_attributes(node: EnhancedDOMTreeNode) -> str:
@@ -203,10 +215,9 @@ class DOMCodeAgentSerializer:
 		return cap_text_length(combined, 40)
 
 	@staticmethod
-	def _serialize_iframe(node: SimplifiedNode, include_attributes: list[str], depth: int) -> str:
+	def _write_iframe(node: SimplifiedNode, include_attributes: list[str], depth: int, writer: TreeWriter) -> None:
 		"""Handle iframe minimally."""
-		formatted_text = []
-		depth_str = '  ' * depth
+		depth_str = writer.indent(depth)
 		tag = node.original_node.tag_name.lower()
 
 		# Minimal iframe marker
@@ -215,11 +226,11 @@ class DOMCodeAgentSerializer:
 		if attributes_str:
 			line += f' {attributes_str}'
 		line += '>'
-		formatted_text.append(line)
+		writer.write(line)
 
 		# Iframe content
 		if node.original_node.content_document:
-			formatted_text.append(f'{depth_str}  #iframe-content')
+			writer.write(f'{depth_str}  #iframe-content')
 
 			# Find and serialize body content only
 			for child_node in node.original_node.content_document.children_nodes or []:
@@ -227,19 +238,17 @@ class DOMCodeAgentSerializer:
 					for html_child in child_node.children:
 						if html_child.tag_name.lower() == 'body':
 							for body_child in html_child.children:
-								DOMCodeAgentSerializer._serialize_document_node(
-									body_child, formatted_text, include_attributes, depth + 2
-								)
+								DOMCodeAgentSerializer._serialize_document_node(body_child, writer, include_attributes, depth + 2)
 							break
 
-		return '\n'.join(formatted_text)
-
 	@staticmethod
 	def _serialize_document_node(
-		dom_node: EnhancedDOMTreeNode, output: list[str], include_attributes: list[str], depth: int
+		dom_node: EnhancedDOMTreeNode, writer: TreeWriter, include_attributes: list[str], depth: int
 	) -> None:
 		"""Serialize document node without SimplifiedNode wrapper."""
-		depth_str = '  ' * depth
+		if writer.truncated:
+			return
+		depth_str = writer.indent(depth)
 
 		if dom_node.node_type == NodeType.ELEMENT_NODE:
 			tag = dom_node.tag_name.lower()
@@ -257,7 +266,7 @@ class DOMCodeAgentSerializer:
 			if not is_interactive and not is_semantic and not attributes_str:
 				# Skip but process children
 				for child in dom_node.children:
-					DOMCodeAgentSerializer._serialize_document_node(child, output, include_attributes, depth)
+					DOMCodeAgentSerializer._serialize_document_node(child, writer, include_attributes, depth)
 				return
 
 			# Build element
@@ -279,9 +288,9 @@ class DOMCodeAgentSerializer:
 			else:
 				line += '>'
 
-			output.append(line)
+			writer.write(line)
 
 			# Process non-text children
 			for child in dom_node.children:
 				if child.node_type != NodeType.TEXT_NODE:
-					DOMCodeAgentSerializer._serialize_document_node(child, output, include_attributes, depth + 1)
+					DOMCodeAgentSerializer._serialize_document_node(child, writer, include_attributes, depth + 1)
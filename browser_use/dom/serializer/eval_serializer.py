@@ -1,6 +1,7 @@
 # @file purpose: Concise evaluation serializer for DOM trees - optimized for LLM query writing
 
 
+from browser_use.dom.serializer.writer import TreeWriter
 from browser_use.dom.utils import cap_text_length
 from browser_use.dom.views import (
 	EnhancedDOMTreeNode,
@@ -113,7 +114,13 @@ class DOMEvalSerializer:
 	"""Ultra-concise DOM serializer for quick LLM query writing."""
 
 	@staticmethod
-	def serialize_tree(node: SimplifiedNode | None, include_attributes: list[str], depth: int = 0) -> str:
+	def serialize_tree(
+		node: SimplifiedNode | None,
+		include_attributes: list[str],
+		depth: int = 0,
+		max_chars: int | None = None,
+		max_tokens: int | None = None,
+	) -> str:
 		"""
 		Serialize complete DOM tree structure for LLM understanding.
 
@@ -122,20 +129,29 @@ class DOMEvalSerializer:
 		- Non-interactive elements show just tag name
 		- Interactive elements show full attributes + [index]
 		- Self-closing tags only (no closing tags)
+		- Stop early once the optional `max_chars` / `max_tokens` budget is used up
 		"""
-		if not node:
-			return ''
+		writer = TreeWriter('\t', max_chars=max_chars, max_tokens=max_tokens)
+		DOMEvalSerializer._write_tree(node, include_attributes, depth, writer)
+		return writer.getvalue()
+
+	@staticmethod
+	def _write_tree(node: SimplifiedNode | None, include_attributes: list[str], depth: int, writer: TreeWriter) -> None:
+		"""Write the lines of a subtree to the writer."""
+		if not node or writer.truncated:
+			return
 
 		# Skip excluded nodes but process children
 		if hasattr(node, 'excluded_by_parent') and node.excluded_by_parent:
-			return DOMEvalSerializer._serialize_children(node, include_attributes, depth)
+			DOMEvalSerializer._write_children(node, include_attributes, depth, writer)
+			return
 
 		# Skip nodes marked as should_display=False
 		if not node.should_display:
-			return DOMEvalSerializer._serialize_children(node, include_attributes, depth)
+			DOMEvalSerializer._write_children(node, include_attributes, depth, writer)
+			return
 
-		formatted_text = []
-		depth_str = depth * '\t'
+		depth_str = writer.indent(depth)
 
 		if node.original_node.node_type == NodeType.ELEMENT_NODE:
 			tag = node.original_node.tag_name.lower()
@@ -146,11 +162,13 @@ class DOMEvalSerializer:
 
 			# Skip invisible elements UNLESS they're containers or iframes (which might have visible children)
 			if not is_visible and tag not in container_tags and tag not in ['iframe', 'frame']:
-				return DOMEvalSerializer._serialize_children(node, include_attributes, depth)
+				DOMEvalSerializer._write_children(node, include_attributes, depth, writer)
+				return
 
 			# Special handling for iframes - show them with their content
 			if tag in ['iframe', 'frame']:
-				return DOMEvalSerializer._serialize_iframe(node, include_attributes, depth)
+				DOMEvalSerializer._write_iframe(node, include_attributes, depth, writer)
+				return
 
 			# Skip SVG elements entirely - they're just decorative graphics with no interaction value
 			# Show the <svg> tag itself to indicate graphics, but don't recurse into children
@@ -164,11 +182,12 @@ class DOMEvalSerializer:
 				if attributes_str:
 					line += f' {attributes_str}'
 				line += ' /> <!-- SVG content collapsed -->'
-				return line
+				writer.write(line)
+				return
 
 			# Skip SVG child elements entirely (path, rect, g, circle, etc.)
 			if tag in SVG_ELEMENTS:
-				return ''
+				return
 
 			# Build compact attributes string
 			attributes_str = DOMEvalSerializer._build_compact_attributes(node.original_node)
@@ -208,13 +227,11 @@ class DOMEvalSerializer:
 			else:
 				line += ' />'
 
-			formatted_text.append(line)
+			writer.write(line)
 
 			# Process children (always for containers, only if no inline_text for others)
 			if has_children and (is_container or not inline_text):
-				children_text = DOMEvalSerializer._serialize_children(node, include_attributes, depth + 1)
-				if children_text:
-					formatted_text.append(children_text)
+				DOMEvalSerializer._write_children(node, include_attributes, depth + 1, writer)
 
 		elif node.original_node.node_type == NodeType.TEXT_NODE:
 			# Text nodes are handled inline with their parent
@@ -223,17 +240,12 @@ class DOMEvalSerializer:
 		elif node.original_node.node_type == NodeType.DOCUMENT_FRAGMENT_NODE:
 			# Shadow DOM - just show children directly with minimal marker
 			if node.children:
-				formatted_text.append(f'{depth_str}#shadow')
-				children_text = DOMEvalSerializer._serialize_children(node, include_attributes, depth + 1)
-				if children_text:
-					formatted_text.append(children_text)
-
-		return '\n'.join(formatted_text)
+				writer.write(f'{depth_str}#shadow')
+				DOMEvalSerializer._write_children(node, include_attributes, depth + 1, writer)
 
 	@staticmethod
-	def _serialize_children(node: SimplifiedNode, include_attributes: list[str], depth: int) -> str:
-		"""Helper to serialize all children of a node."""
-		children_output = []
+	def _write_children(node: SimplifiedNode, include_attributes: list[str], depth: int, writer: TreeWriter) -> None:
+		"""Helper to write all children of a node."""
 
 		# Check if parent is a list container (ul, ol)
 		is_list_container = node.original_node.node_type == NodeType.ELEMENT_NODE and node.original_node.tag_name.lower() in [
@@ -249,6 +261,9 @@ class DOMEvalSerializer:
 		total_links_skipped = 0
 
 		for child in node.children:
+			if writer.truncated:
+				return
+
 			# Get tag name for this child
 			current_tag = None
 			if child.original_node.node_type == NodeType.ELEMENT_NODE:
@@ -272,31 +287,24 @@ class DOMEvalSerializer:
 				# Reset counter when we hit a non-link element
 				# But first add truncation message if we skipped links
 				if total_links_skipped > 0:
-					depth_str = depth * '\t'
-					children_output.append(f'{depth_str}... ({total_links_skipped} more links in this list)')
+					writer.write(f'{writer.indent(depth)}... ({total_links_skipped} more links in this list)')
 					total_links_skipped = 0
 				consecutive_link_count = 0
 
-			child_text = DOMEvalSerializer.serialize_tree(child, include_attributes, depth)
-			if child_text:
-				children_output.append(child_text)
+			DOMEvalSerializer._write_tree(child, include_attributes, depth, writer)
 
 		# Add truncation message if we skipped items at the end
 		if is_list_container and li_count > max_list_items:
-			depth_str = depth * '\t'
-			children_output.append(
-				f'{depth_str}... ({li_count - max_list_items} more items in this list (truncated) use evaluate to get more.'
+			writer.write(
+				f'{writer.indent(depth)}... ({li_count - max_list_items} more items in this list (truncated) use evaluate to get more.'
 			)
 
 		# Add truncation message for links if we skipped any at the end
 		if total_links_skipped > 0:
-			depth_str = depth * '\t'
-			children_output.append(
-				f'{depth_str}... ({total_links_skipped} more links in this list) (truncated) use evaluate to get more.'
+			writer.write(
+				f'{writer.indent(depth)}... ({total_links_skipped} more links in this list) (truncated) use evaluate to get more.'
 			)
 
-		return '\n'.join(children_output)
-
 	@staticmethod
 	def _build_compact_attributes(node: EnhancedDOMTreeNode) -> str:
 		"""Build ultra-compact attributes string with only key attributes."""
@@ -358,10 +366,9 @@ class DOMEvalSerializer:
 		return cap_text_length(combined, 80)
 
 	@staticmethod
-	def _serialize_iframe(node: SimplifiedNode, include_attributes: list[str], depth: int) -> str:
+	def _write_iframe(node: SimplifiedNode, include_attributes: list[str], depth: int, writer: TreeWriter) -> None:
 		"""Handle iframe serialization with content document."""
-		formatted_text = []
-		depth_str = depth * '\t'
+		depth_str = writer.indent(depth)
 		tag = node.original_node.tag_name.lower()
 
 		# Build minimal iframe marker with key attributes
@@ -377,12 +384,12 @@ class DOMEvalSerializer:
 				line += f' scroll="{scroll_text}"'
 
 		line += ' />'
-		formatted_text.append(line)
+		writer.write(line)
 
 		# If iframe has content document, serialize its content
 		if node.original_node.content_document:
 			# Add marker for iframe content
-			formatted_text.append(f'{depth_str}\t#iframe-content')
+			writer.write(f'{depth_str}\t#iframe-content')
 
 			# Process content document children
 			for child_node in node.original_node.content_document.children_nodes or []:
@@ -394,21 +401,19 @@ class DOMEvalSerializer:
 							for body_child in html_child.children:
 								# Recursively process body children (iframe content)
 								DOMEvalSerializer._serialize_document_node(
-									body_child, formatted_text, include_attributes, depth + 2, is_iframe_content=True
+									body_child, writer, include_attributes, depth + 2, is_iframe_content=True
 								)
 							break  # Stop after processing body
 				else:
 					# Not an html element - serialize directly
 					DOMEvalSerializer._serialize_document_node(
-						child_node, formatted_text, include_attributes, depth + 1, is_iframe_content=True
+						child_node, writer, include_attributes, depth + 1, is_iframe_content=True
 					)
 
-		return '\n'.join(formatted_text)
-
 	@staticmethod
 	def _serialize_document_node(
 		dom_node: EnhancedDOMTreeNode,
-		output: list[str],
+		writer: TreeWriter,
 		include_attributes: list[str],
 		depth: int,
 		is_iframe_content: bool = True,
@@ -419,7 +424,9 @@ class DOMEvalSerializer:
 			is_iframe_content: If True, be more permissive with visibility checks since
 				iframe content might not have snapshot data from parent page.
 		"""
-		depth_str = depth * '\t'
+		if writer.truncated:
+			return
+		depth_str = writer.indent(depth)
 
 		if dom_node.node_type == NodeType.ELEMENT_NODE:
 			tag = dom_node.tag_name.lower()
@@ -445,7 +452,7 @@ class DOMEvalSerializer:
 				# Skip but process children
 				for child in dom_node.children:
 					DOMEvalSerializer._serialize_document_node(
-						child, output, include_attributes, depth, is_iframe_content=is_iframe_content
+						child, writer, include_attributes, depth, is_iframe_content=is_iframe_content
 					)
 				return
 
@@ -468,11 +475,11 @@ class DOMEvalSerializer:
 			else:
 				line += ' />'
 
-			output.append(line)
+			writer.write(line)
 
 			# Process non-text children
 			for child in dom_node.children:
 				if child.node_type != NodeType.TEXT_NODE:
 					DOMEvalSerializer._serialize_document_node(
-						child, output, include_attributes, depth + 1, is_iframe_content=is_iframe_content
+						child, writer, include_attributes, depth + 1, is_iframe_content=is_iframe_content
 					)
@@ -0,0 +1,577 @@
+# @file purpose: Converts enhanced DOM trees directly to Markdown, without the HTML string round trip
+
+import re
+
+from browser_use.dom.views import EnhancedDOMTreeNode, NodeType
+
+# Same rules and options as markdownify(HTMLSerializer(...).serialize(tree), heading_style='ATX', bullets='-',
+# code_language='', escape_*=False, autolinks=False, default_title=False, keep_inline_images_in=[]) in markdown_extractor
+
+re_line_with_content = re.compile(r'^(.*)', flags=re.MULTILINE)
+re_whitespace = re.compile(r'[\t ]+')
+re_all_whitespace = re.compile(r'[\t \r\n]+')
+re_newline_whitespace = re.compile(r'[\t \r\n]*[\r\n][\t \r\n]*')
+re_html_heading = re.compile(r'h(\d+)')
+re_pre_lstrip = re.compile(r'^[ \n]*\n')
+re_pre_rstrip = re.compile(r'[ \n]*$')
+re_backtick_runs = re.compile(r'`+')
+
+# Elements HTMLSerializer leaves out entirely
+SKIPPED_TAGS = frozenset({'style', 'script', 'head', 'meta', 'link', 'title'})
+# Elements HTMLSerializer writes as self-closing tags, their children are dropped
+VOID_TAGS = frozenset(
+	{'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param', 'source', 'track', 'wbr'}
+)
+# Not void for HTMLSerializer, but closed right away by the HTML parser: their children end up as following siblings
+PARSER_EMPTY_TAGS = frozenset(
+	{'frame', 'image', 'keygen', 'menuitem', 'basefont', 'bgsound', 'command', 'isindex', 'nextid', 'spacer'}
+)
+BLOCK_TAGS = frozenset(
+	{
+		'p',
+		'blockquote',
+		'article',
+		'div',
+		'section',
+		'ol',
+		'ul',
+		'li',
+		'dl',
+		'dt',
+		'dd',
+		'table',
+		'thead',
+		'tbody',
+		'tfoot',
+		'tr',
+		'td',
+		'th',
+	}
+)
+NOFORMAT_TAGS = frozenset({'pre', 'code', 'kbd', 'samp'})
+
+# A content item: merged text, or an element/shadow root rendered as a tag
+Item = str | EnhancedDOMTreeNode
+
+
+def _is_heading(name: str | None) -> bool:
+	return name is not None and re_html_heading.match(name) is not None
+
+
+def _remove_whitespace_inside(name: str | None) -> bool:
+	return name is not None and (name in BLOCK_TAGS or _is_heading(name))
+
+
+def _remove_whitespace_outside(name: str | None) -> bool:
+	return _remove_whitespace_inside(name) or name == 'pre'
+
+
+def _chomp(text: str) -> tuple[str, str, str]:
+	prefix = ' ' if text and text[0] == ' ' else ''
+	suffix = ' ' if text and text[-1] == ' ' else ''
+	return prefix, suffix, text.strip()
+
+
+def _split_newlines(text: str) -> tuple[str, str, str]:
+	"""Split text into (leading newlines, content, trailing newlines)."""
+	content = text.lstrip('\n')
+	leading = text[: len(text) - len(content)]
+	stripped = content.rstrip('\n')
+	return leading, stripped, content[len(stripped) :]
+
+
+class _Frame:
+	"""An element being converted: its content items and where it sits in its parent."""
+
+	__slots__ = ('node', 'name', 'items', 'index', 'parent')
+
+	def __init__(self, node: EnhancedDOMTreeNode | None, name: str, items: list[Item], index: int, parent: '_Frame | None'):
+		self.node = node
+		self.name = name
+		self.items = items
+		self.index = index
+		self.parent = parent
+
+	def attr(self, key: str) -> str | None:
+		if self.node is None or self.node.node_type != NodeType.ELEMENT_NODE:
+			return None
+		return self.node.attributes.get(key) if self.node.attributes else None
+
+	def previous_tags(self) -> list[str]:
+		"""Names of the preceding sibling elements, nearest first."""
+		if self.parent is None:
+			return []
+		siblings = self.parent.items
+		return [_item_name(siblings[i]) for i in range(self.index - 1, -1, -1) if not isinstance(siblings[i], str)]  # type: ignore[misc]
+
+
+class _Conversion:
+	"""An element on the conversion stack: the markdown of the children converted so far."""
+
+	__slots__ = ('frame', 'parent_tags', 'child_tags', 'remove_inside', 'child_strings', 'position')
+
+	def __init__(self, frame: _Frame, parent_tags: frozenset[str]):
+		name = frame.name
+		child_tags = parent_tags | {name}
+		if _is_heading(name) or name in ('td', 'th'):
+			child_tags = child_tags | {'_inline'}
+		if name in NOFORMAT_TAGS:
+			child_tags = child_tags | {'_noformat'}
+		self.frame = frame
+		self.parent_tags = parent_tags
+		self.child_tags = child_tags
+		self.remove_inside = _remove_whitespace_inside(name)
+		self.child_strings: list[str] = []
+		self.position = 0
+
+
+def _item_name(item: Item) -> str | None:
+	if isinstance(item, str):
+		return None
+	if item.node_type == NodeType.DOCUMENT_FRAGMENT_NODE:
+		return 'template'
+	return item.tag_name
+
+
+class MarkdownSerializer:
+	"""Converts enhanced DOM trees to Markdown in one pass over the tree.
+
+	Produces the Markdown that markdownify produces for the HTML of HTMLSerializer (with the options used by
+	extract_clean_markdown), including shadow DOM content and iframe content documents, without building the HTML
+	string and parsing it again.
+	"""
+
+	def __init__(self, extract_links: bool = False):
+		"""Initialize the Markdown serializer.
+
+		Args:
+			extract_links: If True, links keep their href. If False, links are converted to their text.
+		"""
+		self.extract_links = extract_links
+		self.node_count = 0
+		self._converters = {
+			'a': self._convert_a,
+			'b': self._convert_strong,
+			'strong': self._convert_strong,
+			'em': self._convert_em,
+			'i': self._convert_em,
+			'del': self._convert_del,
+			's': self._convert_del,
+			'sub': self._convert_plain_inline,
+			'sup': self._convert_plain_inline,
+			'code': self._convert_code,
+			'kbd': self._convert_code,
+			'samp': self._convert_code,
+			'blockquote': self._convert_blockquote,
+			'br': self._convert_br,
+			'div': self._convert_div,
+			'article': self._convert_div,
+			'section': self._convert_div,
+			'dl': self._convert_div,
+			'dd': self._convert_dd,
+			'dt': self._convert_dt,
+			'hr': self._convert_hr,
+			'img': self._convert_img,
+			'video': self._convert_video,
+			'ul': self._convert_list,
+			'ol': self._convert_list,
+			'list': self._convert_list,
+			'li': self._convert_li,
+			'p': self._convert_p,
+			'pre': self._convert_pre,
+			'q': self._convert_q,
+			'table': self._convert_table,
+			'caption': self._convert_caption,
+			'figcaption': self._convert_figcaption,
+			'td': self._convert_td,
+			'th': self._convert_td,
+			'tr': self._convert_tr,
+		}
+
+	def serialize(self, node: EnhancedDOMTreeNode) -> str:
+		"""Convert an enhanced DOM tree node and its descendants to Markdown.
+
+		Args:
+			node: The enhanced DOM tree node to convert (usually the document root)
+
+		Returns:
+			Markdown string of the node and its descendants
+		"""
+		items: list[Item] = []
+		self._add_item(items, node)
+		return self._process_tag(_Frame(None, '[document]', items, 0, None), frozenset()).strip('\n')
+
+	# --- content items --------------------------------------------------
+
+	def _is_skipped(self, node: EnhancedDOMTreeNode, tag_name: str) -> bool:
+		if tag_name in SKIPPED_TAGS:
+			return True
+		if tag_name == 'code' and node.attributes:
+			# hidden code tags often contain JSON state for SPAs
+			style = node.attributes.get('style', '')
+			if 'display:none' in style.replace(' ', '') or 'display: none' in style:
+				return True
+			element_id = node.attributes.get('id', '')
+			if 'bpr-guid' in element_id or 'data' in element_id or 'state' in element_id:
+				return True
+		if tag_name == 'img' and node.attributes:
+			# base64 inline images are usually placeholders or tracking pixels
+			if node.attributes.get('src', '').startswith('data:image/'):
+				return True
+		return False
+
+	def _add_item(self, items: list[Item], node: EnhancedDOMTreeNode) -> None:
+		"""Append what node contributes to a list of content items, merging adjacent text like an HTML parser would."""
+		self.node_count += 1
+		node_type = node.node_type
+		if node_type == NodeType.TEXT_NODE:
+			if node.node_value:
+				if items and isinstance(items[-1], str):
+					items[-1] += node.node_value
+				else:
+					items.append(node.node_value)
+		elif node_type == NodeType.ELEMENT_NODE:
+			tag_name = node.tag_name
+			if self._is_skipped(node, tag_name):
+				return
+			items.append(node)
+			if tag_name in PARSER_EMPTY_TAGS:
+				for child in self._element_children(node, tag_name):
+					self._add_item(items, child)
+		elif node_type == NodeType.DOCUMENT_FRAGMENT_NODE:
+			items.append(node)
+		elif node_type == NodeType.DOCUMENT_NODE:
+			for child in node.children_and_shadow_roots:
+				self._add_item(items, child)
+
+	@staticmethod
+	def _element_children(node: EnhancedDOMTreeNode, tag_name: str) -> list[EnhancedDOMTreeNode]:
+		if tag_name in VOID_TAGS:
+			return []
+		if tag_name in ('iframe', 'frame') and node.content_document:
+			return node.content_document.children_nodes or []
+		# shadow roots first (declarative shadow DOM), then light DOM children
+		return (node.shadow_roots or []) + node.children
+
+	def _items(self, node: EnhancedDOMTreeNode, name: str) -> list[Item]:
+		items: list[Item] = []
+		if node.node_type == NodeType.DOCUMENT_FRAGMENT_NODE:
+			children = node.children
+		elif name in PARSER_EMPTY_TAGS:
+			return items  # its children were added after it, as siblings
+		else:
+			children = self._element_children(node, name)
+		for child in children:
+			self._add_item(items, child)
+		return items
+
+	def _find_all(self, frame: _Frame, names: tuple[str, ...]) -> list[_Frame]:
+		"""All descendant elements of frame with one of the names, in document order (pre-order walk)."""
+		found: list[_Frame] = []
+		node_count = self.node_count  # lookups don't count as converted nodes
+		stack = [frame]
+		while stack:
+			current = stack.pop()
+			children = []
+			for index, item in enumerate(current.items):
+				if isinstance(item, str):
+					continue
+				name = _item_name(item)
+				assert name is not None
+				child = _Frame(item, name, self._items(item, name), index, current)
+				if name in names:
+					found.append(child)
+				children.append(child)
+			stack.extend(reversed(children))
+		self.node_count = node_count
+		return found
+
+	# --- conversion -----------------------------------------------------
+
+	def _process_tag(self, frame: _Frame, parent_tags: frozenset[str]) -> str:
+		"""Convert frame and its descendants, children before parents, with an explicit stack (pages can be very deep)."""
+		stack = [_Conversion(frame, parent_tags)]
+		while True:
+			conversion = stack[-1]
+			items = conversion.frame.items
+			last = len(items) - 1
+			child: _Conversion | None = None
+			while conversion.position <= last:
+				index = conversion.position
+				item = items[index]
+				conversion.position += 1
+				if not isinstance(item, str):
+					child_name = _item_name(item)
+					assert child_name is not None
+					child_frame = _Frame(item, child_name, self._items(item, child_name), index, conversion.frame)
+					child = _Conversion(child_frame, conversion.child_tags)
+					break
+				if not item.strip():
+					# whitespace next to the boundaries of block elements is not content
+					if conversion.remove_inside and (index == 0 or index == last):
+						continue
+					if (index > 0 and _remove_whitespace_outside(_item_name(items[index - 1]))) or (
+						index < last and _remove_whitespace_outside(_item_name(items[index + 1]))
+					):
+						continue
+				text = self._process_text(item, index, conversion.frame, conversion.child_tags)
+				if text:
+					conversion.child_strings.append(text)
+			if child is not None:
+				stack.append(child)
+				continue
+
+			stack.pop()
+			text = self._convert_tag(conversion)
+			if not stack:
+				return text
+			if text:
+				stack[-1].child_strings.append(text)
+
+	def _convert_tag(self, conversion: '_Conversion') -> str:
+		frame, parent_tags = conversion.frame, conversion.parent_tags
+		name = frame.name
+		if name == 'pre' or 'pre' in parent_tags:
+			# Inside <pre> blocks, do not collapse newlines
+			text = ''.join(conversion.child_strings)
+		else:
+			# Collapse newlines at child element boundaries (to at most 2)
+			updated = ['']
+			for child_string in conversion.child_strings:
+				leading, content, trailing = _split_newlines(child_string)
+				if updated[-1] and leading:
+					previous_trailing = updated.pop()
+					leading = '\n' * min(2, max(len(previous_trailing), len(leading)))
+				updated.extend((leading, content, trailing))
+			text = ''.join(updated)
+
+		converter = self._converters.get(name)
+		if converter is not None:
+			return converter(frame, text, parent_tags)
+		if _is_heading(name):
+			return self._convert_heading(frame, text, parent_tags)
+		return text
+
+	def _process_text(self, text: str, index: int, frame: _Frame, parent_tags: frozenset[str]) -> str:
+		if 'pre' not in parent_tags:
+			text = re_newline_whitespace.sub('\n', text)
+			text = re_whitespace.sub(' ', text)
+
+		items = frame.items
+		remove_inside = _remove_whitespace_inside(frame.name)
+		previous_name = _item_name(items[index - 1]) if index > 0 else None
+		next_name = _item_name(items[index + 1]) if index < len(items) - 1 else None
+		if _remove_whitespace_outside(previous_name) or (remove_inside and index == 0):
+			text = text.lstrip(' \t\r\n')
+		if _remove_whitespace_outside(next_name) or (remove_inside and index == len(items) - 1):
+			text = text.rstrip()
+		return text
+
+	# --- element converters -----------------------------------------------
+
+	def _inline(self, markup: str, text: str, parent_tags: frozenset[str]) -> str:
+		if '_noformat' in parent_tags:
+			return text
+		prefix, suffix, text = _chomp(text)
+		if not text:
+			return ''
+		return f'{prefix}{markup}{text}{markup}{suffix}'
+
+	def _convert_strong(self, frame: _Frame, text: str, parent_tags: frozenset[str]) -> str:
+		return self._inline('**', text, parent_tags)
+
+	def _convert_em(self, frame: _Frame, text: str, parent_tags: frozenset[str]) -> str:
+		return self._inline('*', text, parent_tags)
+
+	def _convert_del(self, frame: _Frame, text: str, parent_tags: frozenset[str]) -> str:
+		return self._inline('~~', text, parent_tags)
+
+	def _convert_plain_inline(self, frame: _Frame, text: str, parent_tags: frozenset[str]) -> str:
+		return self._inline('', text, parent_tags)
+
+	def _convert_a(self, frame: _Frame, text: str, parent_tags: frozenset[str]) -> str:
+		if '_noformat' in parent_tags:
+			return text
+		prefix, suffix, text = _chomp(text)
+		if not text:
+			return ''
+		href = frame.attr('href') if self.extract_links else None
+		if not href:
+			return text
+		title = frame.attr('title')
+		title_part = ' "%s"' % title.replace('"', r'\"') if title else ''
+		return f'{prefix}[{text}]({href}{title_part}){suffix}'
+
+	def _convert_code(self, frame: _Frame, text: str, parent_tags: frozenset[str]) -> str:
+		if '_noformat' in parent_tags:
+			return text
+		prefix, suffix, text = _chomp(text)
+		if not text:
+			return ''
+		max_backticks = max((len(run) for run in re_backtick_runs.findall(text)), default=0)
+		delimiter = '`' * (max_backticks + 1)
+		if max_backticks > 0:
+			text = ' ' + text + ' '
+		return f'{prefix}{delimiter}{text}{delimiter}{suffix}'
+
+	def _convert_blockquote(self, frame: _Frame, text: str, parent_tags: frozenset[str]) -> str:
+		text = (text or '').strip(' \t\r\n')
+		if '_inline' in parent_tags:
+			return ' ' + text + ' '
+		if not text:
+			return '\n'
+		text = re_line_with_content.sub(lambda match: '> ' + match.group(1) if match.group(1) else '>', text)
+		return '\n' + text + '\n\n'
+
+	def _convert_br(self, frame: _Frame, text: str, parent_tags: frozenset[str]) -> str:
+		if '_inline' in parent_tags:
+			return text + ' ' if text else ' '
+		return '  \n' + text
+
+	def _convert_div(self, frame: _Frame, text: str, parent_tags: frozenset[str]) -> str:
+		if '_inline' in parent_tags:
+			return ' ' + text.strip() + ' '
+		text = text.strip()
+		return f'\n\n{text}\n\n' if text else ''
+
+	def _convert_dd(self, frame: _Frame, text: str, parent_tags: frozenset[str]) -> str:
+		text = (text or '').strip()
+		if '_inline' in parent_tags:
+			return ' ' + text + ' '
+		if not text:
+			return '\n'
+		text = re_line_with_content.sub(lambda match: '    ' + match.group(1) if match.group(1) else '', text)
+		return ':' + text[1:] + '\n'
+
+	def _convert_dt(self, frame: _Frame, text: str, parent_tags: frozenset[str]) -> str:
+		text = re_all_whitespace.sub(' ', (text or '').strip())
+		if '_inline' in parent_tags:
+			return ' ' + text + ' '
+		if not text:
+			return '\n'
+		return f'\n\n{text}\n'
+
+	def _convert_heading(self, frame: _Frame, text: str, parent_tags: frozenset[str]) -> str:
+		if '_inline' in parent_tags:
+			return text
+		match = re_html_heading.match(frame.name)
+		assert match is not None
+		level = max(1, min(6, int(match.group(1))))
+		text = re_all_whitespace.sub(' ', text.strip())
+		return f'\n\n{"#" * level} {text}\n\n'
+
+	def _convert_hr(self, frame: _Frame, text: str, parent_tags: frozenset[str]) -> str:
+		return '\n\n---\n\n'
+
+	def _convert_img(self, frame: _Frame, text: str, parent_tags: frozenset[str]) -> str:
+		alt = frame.attr('alt') or ''
+		if '_inline' in parent_tags:
+			return alt
+		src = frame.attr('src') or ''
+		title = frame.attr('title') or ''
+		title_part = ' "%s"' % title.replace('"', r'\"') if title else ''
+		return f'![{alt}]({src}{title_part})'
+
+	def _convert_video(self, frame: _Frame, text: str, parent_tags: frozenset[str]) -> str:
+		if '_inline' in parent_tags:
+			return text
+		src = frame.attr('src') or ''
+		if not src:
+			sources = [source for source in self._find_all(frame, ('source',)) if source.attr('src') is not None]
+			if sources:
+				src = sources[0].attr('src') or ''
+		poster = frame.attr('poster') or ''
+		if src and poster:
+			return f'[![{text}]({poster})]({src})'
+		if src:
+			return f'[{text}]({src})'
+		if poster:
+			return f'![{text}]({poster})'
+		return text
+
+	def _convert_list(self, frame: _Frame, text: str, parent_tags: frozenset[str]) -> str:
+		before_paragraph = False
+		if frame.parent is not None:
+			siblings = frame.parent.items
+			for sibling in siblings[frame.index + 1 :]:
+				if isinstance(sibling, str) and not sibling.strip():
+					continue
+				before_paragraph = _item_name(sibling) not in ('ul', 'ol')
+				break
+		if 'li' in parent_tags:
+			# remove trailing newline if we're in a nested list
+			return '\n' + text.rstrip()
+		return '\n\n' + text + ('\n' if before_paragraph else '')
+
+	def _convert_li(self, frame: _Frame, text: str, parent_tags: frozenset[str]) -> str:
+		text = (text or '').strip()
+		if not text:
+			return '\n'
+		parent = frame.parent
+		if parent is not None and parent.name == 'ol':
+			start_attr = parent.attr('start')
+			start = int(start_attr) if start_attr and start_attr.isnumeric() else 1
+			bullet = f'{start + frame.previous_tags().count("li")}. '
+		else:
+			bullet = '- '
+		indent = ' ' * len(bullet)
+		text = re_line_with_content.sub(lambda match: indent + match.group(1) if match.group(1) else '', text)
+		return bullet + text[len(bullet) :] + '\n'
+
+	def _convert_p(self, frame: _Frame, text: str, parent_tags: frozenset[str]) -> str:
+		if '_inline' in parent_tags:
+			return ' ' + text.strip(' \t\r\n') + ' '
+		text = text.strip(' \t\r\n')
+		return f'\n\n{text}\n\n' if text else ''
+
+	def _convert_pre(self, frame: _Frame, text: str, parent_tags: frozenset[str]) -> str:
+		if not text:
+			return ''
+		text = re_pre_rstrip.sub('', re_pre_lstrip.sub('', text))
+		return f'\n\n```\n{text}\n```\n\n'
+
+	def _convert_q(self, frame: _Frame, text: str, parent_tags: frozenset[str]) -> str:
+		return '"' + text + '"'
+
+	def _convert_table(self, frame: _Frame, text: str, parent_tags: frozenset[str]) -> str:
+		return '\n\n' + text.strip() + '\n\n'
+
+	def _convert_caption(self, frame: _Frame, text: str, parent_tags: frozenset[str]) -> str:
+		return text.strip() + '\n\n'
+
+	def _convert_figcaption(self, frame: _Frame, text: str, parent_tags: frozenset[str]) -> str:
+		return '\n\n' + text.strip() + '\n\n'
+
+	@staticmethod
+	def _colspan(frame: _Frame) -> int:
+		colspan = frame.attr('colspan')
+		return max(1, min(1000, int(colspan))) if colspan is not None and colspan.isdigit() else 1
+
+	def _convert_td(self, frame: _Frame, text: str, parent_tags: frozenset[str]) -> str:
+		return ' ' + text.strip().replace('\n', ' ') + ' |' * self._colspan(frame)
+
+	def _convert_tr(self, frame: _Frame, text: str, parent_tags: frozenset[str]) -> str:
+		cells = self._find_all(frame, ('td', 'th'))
+		parent = frame.parent
+		assert parent is not None
+		is_first_row = not frame.previous_tags()
+		is_headrow = all(cell.name == 'th' for cell in cells) or (
+			parent.name == 'thead' and len(self._find_all(parent, ('tr',))) == 1
+		)
+		is_head_row_missing = (is_first_row and parent.name != 'tbody') or (
+			is_first_row
+			and parent.name == 'tbody'
+			and parent.parent is not None
+			and len(self._find_all(parent.parent, ('thead',))) < 1
+		)
+		full_colspan = sum(self._colspan(cell) for cell in cells)
+		overline = ''
+		underline = ''
+		if is_headrow and is_first_row:
+			underline += '| ' + ' | '.join(['---'] * full_colspan) + ' |' + '\n'
+		elif is_head_row_missing or (
+			is_first_row and (parent.name == 'table' or (parent.name == 'tbody' and not parent.previous_tags()))
+		):
+			overline += '| ' + ' | '.join([''] * full_colspan) + ' |' + '\n'
+			overline += '| ' + ' | '.join(['---'] * full_colspan) + ' |' + '\n'
+		return overline + '|' + text + '\n' + underline
@@ -1,5 +1,7 @@
 from collections import defaultdict
 from dataclasses import dataclass
+from math import floor
+from typing import Literal
 
 from browser_use.dom.views import SimplifiedNode
 
@@ -35,7 +37,7 @@ class Rect:
 class RectUnionPure:
 	"""
 	Maintains a *disjoint* set of rectangles.
-	No external dependencies - fine for a few thousand rectangles.
+	No external dependencies - fine for a few thousand rectangles, see RectUnionGrid for larger pages.
 	"""
 
 	__slots__ = ('_rects',)
@@ -128,13 +130,129 @@ class RectUnionPure:
 		return True
 
 
+class RectUnionGrid(RectUnionPure):
+	"""
+	Same union as RectUnionPure, with the stored rectangles bucketed in a uniform grid.
+
+	contains/add only split against the rectangles registered in the grid cells the query touches, instead of
+	against every stored rectangle. Rectangles are registered in every cell their closed bounds touch, so all
+	rectangles that can intersect or contain a query are found and the results are identical to RectUnionPure.
+	Exact (float) coordinates are kept, cells only decide which rectangles are looked at.
+	"""
+
+	__slots__ = ('_cell_size', '_cells', '_large')
+
+	# rectangles touching more cells than this (page backgrounds, full-height containers) are checked for every query
+	MAX_CELLS_PER_RECT = 64
+
+	def __init__(self, cell_size: float = 256.0):
+		super().__init__()
+		self._cell_size = cell_size
+		self._cells: dict[tuple[int, int], list[int]] = {}
+		self._large: list[int] = []
+
+	def _cell_range(self, r: Rect) -> tuple[int, int, int, int]:
+		size = self._cell_size
+		return floor(r.x1 / size), floor(r.y1 / size), floor(r.x2 / size), floor(r.y2 / size)
+
+	def _candidates(self, r: Rect) -> list[Rect]:
+		"""Stored rectangles that may intersect or contain r, in insertion order."""
+		cx1, cy1, cx2, cy2 = self._cell_range(r)
+		if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > len(self._rects):
+			return self._rects  # looking at the cells would cost more than checking everything
+
+		indices = set(self._large)
+		cells = self._cells
+		for cx in range(cx1, cx2 + 1):
+			for cy in range(cy1, cy2 + 1):
+				bucket = cells.get((cx, cy))
+				if bucket:
+					indices.update(bucket)
+		rects = self._rects
+		return [rects[i] for i in sorted(indices)]
+
+	def _covered(self, r: Rect, candidates: list[Rect]) -> bool:
+		area = r.area()
+		if area > 0:
+			# the stored rectangles are disjoint, so their overlaps with r add up to the covered area. If that is
+			# clearly less than r's area, r isn't covered and we can skip splitting it into (possibly many) pieces.
+			covered_area = 0.0
+			for s in candidates:
+				if r.intersects(s):
+					covered_area += (min(r.x2, s.x2) - max(r.x1, s.x1)) * (min(r.y2, s.y2) - max(r.y1, s.y1))
+			if covered_area < area * (1 - 1e-9):
+				return False
+
+		stack = [r]
+		for s in candidates:
+			new_stack = []
+			for piece in stack:
+				if s.contains(piece):
+					continue
+				if piece.intersects(s):
+					new_stack.extend(self._split_diff(piece, s))
+				else:
+					new_stack.append(piece)
+			if not new_stack:
+				return True
+			stack = new_stack
+		return False
+
+	def _insert(self, r: Rect) -> None:
+		index = len(self._rects)
+		self._rects.append(r)
+		cx1, cy1, cx2, cy2 = self._cell_range(r)
+		if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > self.MAX_CELLS_PER_RECT:
+			self._large.append(index)
+			return
+		cells = self._cells
+		for cx in range(cx1, cx2 + 1):
+			for cy in range(cy1, cy2 + 1):
+				bucket = cells.get((cx, cy))
+				if bucket is None:
+					cells[(cx, cy)] = [index]
+				else:
+					bucket.append(index)
+
+	def contains(self, r: Rect) -> bool:
+		if not self._rects:
+			return False
+		return self._covered(r, self._candidates(r))
+
+	def add(self, r: Rect) -> bool:
+		candidates = self._candidates(r) if self._rects else []
+		if candidates and self._covered(r, candidates):
+			return False
+
+		pending = [r]
+		for s in candidates:
+			new_pending = []
+			for piece in pending:
+				if piece.intersects(s):
+					new_pending.extend(self._split_diff(piece, s))
+				else:
+					new_pending.append(piece)
+			pending = new_pending
+
+		for piece in pending:
+			self._insert(piece)
+		return True
+
+
+RECT_UNION_ENGINES: dict[str, type[RectUnionPure]] = {
+	'pure': RectUnionPure,
+	'grid': RectUnionGrid,
+}
+
+
 class PaintOrderRemover:
 	"""
 	Calculates which elements should be removed based on the paint order parameter.
 	"""
 
-	def __init__(self, root: SimplifiedNode):
+	def __init__(self, root: SimplifiedNode, engine: Literal['pure', 'grid'] = 'grid'):
 		self.root = root
+		self.engine = engine
 
 	def calculate_paint_order(self) -> None:
 		all_simplified_nodes_with_paint_order: list[SimplifiedNode] = []
@@ -158,7 +276,7 @@ class PaintOrderRemover:
 			if node.original_node.snapshot_node and node.original_node.snapshot_node.paint_order is not None:
 				grouped_by_paint_order[node.original_node.snapshot_node.paint_order].append(node)
 
-		rect_union = RectUnionPure()
+		rect_union = RECT_UNION_ENGINES[self.engine]()
 
 		for paint_order, nodes in sorted(grouped_by_paint_order.items(), key=lambda x: -x[0]):
 			rects_to_add = []
@@ -4,19 +4,22 @@ from typing import Any
 
 from browser_use.dom.serializer.clickable_elements import ClickableElementDetector
 from browser_use.dom.serializer.paint_order import PaintOrderRemover
+from browser_use.dom.serializer.writer import TreeWriter
 from browser_use.dom.utils import cap_text_length
 from browser_use.dom.views import (
 	DOMRect,
 	DOMSelectorMap,
 	EnhancedDOMTreeNode,
 	NodeType,
-	PropagatingBounds,
 	SerializedDOMState,
 	SimplifiedNode,
 )
 
 DISABLED_ELEMENTS = {'style', 'script', 'head', 'meta', 'link', 'title'}
 
+# Roles that keep an element even when it is contained in a propagating parent (see bounding box filtering)
+INTERACTIVE_ROLES = {'button', 'link', 'checkbox', 'radio', 'tab', 'menuitem', 'option'}
+
 # SVG child elements to skip (decorative only, no interaction value)
 SVG_ELEMENTS = {
 	'path',
@@ -76,6 +79,8 @@ class DOMTreeSerializer:
 		# Bounding box filtering configuration
 		self.enable_bbox_filtering = enable_bbox_filtering
 		self.containment_threshold = containment_threshold or self.DEFAULT_CONTAINMENT_THRESHOLD
+		# PROPAGATING_ELEMENTS compiled to (tag, role) keys for O(1) lookups
+		self._propagating_keys = frozenset((pattern.get('tag'), pattern.get('role')) for pattern in self.PROPAGATING_ELEMENTS)
 		# Paint order filtering configuration
 		self.paint_order_filtering = paint_order_filtering
 		# Session ID for session-specific exclude attribute
@@ -657,12 +662,19 @@ class DOMTreeSerializer:
 			self._assign_interactive_indices_and_mark_new_nodes(child)
 
 	def _apply_bounding_box_filtering(self, node: SimplifiedNode | None) -> SimplifiedNode | None:
-		"""Filter children contained within propagating parent bounds."""
+		"""Filter children contained within propagating parent bounds.
+
+		Bounds propagate to ALL descendants until overridden by a nested propagating element, so every node is
+		only checked against its nearest propagating ancestor. The tree is walked once to group the nodes by that
+		ancestor, then the containment checks run in one batch per group.
+		"""
 		if not node:
 			return None
 
-		# Start with no active bounds
-		self._filter_tree_recursive(node, active_bounds=None, depth=0)
+		for parent_bounds, members in self._group_by_propagating_parent(node):
+			for child in self._contained_nodes(parent_bounds, members):
+				if self._should_exclude_contained_child(child):
+					child.excluded_by_parent = True
 
 		# Log statistics
 		excluded_count = self._count_excluded_nodes(node)
@@ -673,120 +685,79 @@ class DOMTreeSerializer:
 
 		return node
 
-	def _filter_tree_recursive(self, node: SimplifiedNode, active_bounds: PropagatingBounds | None = None, depth: int = 0):
-		"""
-		Recursively filter tree with bounding box propagation.
-		Bounds propagate to ALL descendants until overridden.
-		"""
-
-		# Check if this node should be excluded by active bounds
-		if active_bounds and self._should_exclude_child(node, active_bounds):
-			node.excluded_by_parent = True
-			# Important: Still check if this node starts NEW propagation
-
-		# Check if this node starts new propagation (even if excluded!)
-		new_bounds = None
-		tag = node.original_node.tag_name.lower()
-		role = node.original_node.attributes.get('role') if node.original_node.attributes else None
-		attributes = {
-			'tag': tag,
-			'role': role,
-		}
-		# Check if this element matches any propagating element pattern
-		if self._is_propagating_element(attributes):
-			# This node propagates bounds to ALL its descendants
-			if node.original_node.snapshot_node and node.original_node.snapshot_node.bounds:
-				new_bounds = PropagatingBounds(
-					tag=tag,
-					bounds=node.original_node.snapshot_node.bounds,
-					node_id=node.original_node.node_id,
-					depth=depth,
-				)
-
-		# Propagate to ALL children
-		# Use new_bounds if this node starts propagation, otherwise continue with active_bounds
-		propagate_bounds = new_bounds if new_bounds else active_bounds
-
-		for child in node.children:
-			self._filter_tree_recursive(child, propagate_bounds, depth + 1)
+	def _group_by_propagating_parent(self, root: SimplifiedNode) -> list[tuple[DOMRect, list[SimplifiedNode]]]:
+		"""Map every propagating element (with bounds) to the descendants it may exclude.
 
-	def _should_exclude_child(self, node: SimplifiedNode, active_bounds: PropagatingBounds) -> bool:
+		Text nodes and nodes without bounds are never excluded, so they are left out of the groups.
+		A propagating element is itself checked against the previous bounds before it starts its own group.
 		"""
-		Determine if child should be excluded based on propagating bounds.
+		groups: list[tuple[DOMRect, list[SimplifiedNode]]] = []
+		stack: list[tuple[SimplifiedNode, list[SimplifiedNode] | None]] = [(root, None)]
+		while stack:
+			node, group = stack.pop()
+			original = node.original_node
+			bounds = original.snapshot_node.bounds if original.snapshot_node else None
+			if bounds is not None:
+				if group is not None and original.node_type != NodeType.TEXT_NODE:
+					group.append(node)
+				role = original.attributes.get('role') if original.attributes else None
+				if self._is_propagating(original.tag_name, role):
+					group = []
+					groups.append((bounds, group))
+			stack.extend((child, group) for child in reversed(node.children))
+		return groups
+
+	def _contained_nodes(self, parent: DOMRect, nodes: list[SimplifiedNode]) -> list[SimplifiedNode]:
+		"""Nodes whose bounds lie within the parent bounds for at least `containment_threshold` of their area."""
+		threshold = self.containment_threshold
+		parent_x1, parent_y1 = parent.x, parent.y
+		parent_x2, parent_y2 = parent.x + parent.width, parent.y + parent.height
+		contained = []
+		for node in nodes:
+			child = node.original_node.snapshot_node.bounds  # type: ignore[union-attr]  # grouped nodes have bounds
+			child_area = child.width * child.height
+			if child_area == 0:
+				continue  # Zero-area element
+			x_overlap = max(0, min(child.x + child.width, parent_x2) - max(child.x, parent_x1))
+			y_overlap = max(0, min(child.y + child.height, parent_y2) - max(child.y, parent_y1))
+			if x_overlap * y_overlap / child_area >= threshold:
+				contained.append(node)
+		return contained
+
+	def _should_exclude_contained_child(self, node: SimplifiedNode) -> bool:
 		"""
-
-		# Never exclude text nodes - we always want to preserve text content
-		if node.original_node.node_type == NodeType.TEXT_NODE:
-			return False
-
-		# Get child bounds
-		if not node.original_node.snapshot_node or not node.original_node.snapshot_node.bounds:
-			return False  # No bounds = can't determine containment
-
-		child_bounds = node.original_node.snapshot_node.bounds
-
-		# Check containment with configured threshold
-		if not self._is_contained(child_bounds, active_bounds.bounds, self.containment_threshold):
-			return False  # Not sufficiently contained
-
-		# EXCEPTION RULES - Keep these even if contained:
-
-		child_tag = node.original_node.tag_name.lower()
-		child_role = node.original_node.attributes.get('role') if node.original_node.attributes else None
-		child_attributes = {
-			'tag': child_tag,
-			'role': child_role,
-		}
+		Determine if a child contained in propagating bounds should be excluded (exception rules).
+		"""
+		child_tag = node.original_node.tag_name
+		attributes = node.original_node.attributes or {}
+		role = attributes.get('role')
 
 		# 1. Never exclude form elements (they need individual interaction)
-		if child_tag in ['input', 'select', 'textarea', 'label']:
+		if child_tag in ('input', 'select', 'textarea', 'label'):
 			return False
 
 		# 2. Keep if child is also a propagating element
 		# (might have stopPropagation, e.g., button in button)
-		if self._is_propagating_element(child_attributes):
+		if self._is_propagating(child_tag, role):
 			return False
 
 		# 3. Keep if has explicit onclick handler
-		if node.original_node.attributes and 'onclick' in node.original_node.attributes:
+		if 'onclick' in attributes:
 			return False
 
 		# 4. Keep if has aria-label suggesting it's independently interactive
-		if node.original_node.attributes:
-			aria_label = node.original_node.attributes.get('aria-label')
-			if aria_label and aria_label.strip():
-				# Has meaningful aria-label, likely interactive
-				return False
+		aria_label = attributes.get('aria-label')
+		if aria_label and aria_label.strip():
+			# Has meaningful aria-label, likely interactive
+			return False
 
 		# 5. Keep if has role suggesting interactivity
-		if node.original_node.attributes:
-			role = node.original_node.attributes.get('role')
-			if role in ['button', 'link', 'checkbox', 'radio', 'tab', 'menuitem', 'option']:
-				return False
+		if role in INTERACTIVE_ROLES:
+			return False
 
 		# Default: exclude this child
 		return True
 
-	def _is_contained(self, child: DOMRect, parent: DOMRect, threshold: float) -> bool:
-		"""
-		Check if child is contained within parent bounds.
-
-		Args:
-			threshold: Percentage (0.0-1.0) of child that must be within parent
-		"""
-		# Calculate intersection
-		x_overlap = max(0, min(child.x + child.width, parent.x + parent.width) - max(child.x, parent.x))
-		y_overlap = max(0, min(child.y + child.height, parent.y + parent.height) - max(child.y, parent.y))
-
-		intersection_area = x_overlap * y_overlap
-		child_area = child.width * child.height
-
-		if child_area == 0:
-			return False  # Zero-area element
-
-		containment_ratio = intersection_area / child_area
-		return containment_ratio >= threshold
-
 	def _count_excluded_nodes(self, node: SimplifiedNode, count: int = 0) -> int:
 		"""Count how many nodes were excluded (for debugging)."""
 		if hasattr(node, 'excluded_by_parent') and node.excluded_by_parent:
@@ -795,47 +766,49 @@ class DOMTreeSerializer:
 			count = self._count_excluded_nodes(child, count)
 		return count
 
-	def _is_propagating_element(self, attributes: dict[str, str | None]) -> bool:
-		"""
-		Check if an element should propagate bounds based on attributes.
-		If the element satisfies one of the patterns, it propagates bounds to all its children.
-		"""
-		keys_to_check = ['tag', 'role']
-		for pattern in self.PROPAGATING_ELEMENTS:
-			# Check if the element satisfies the pattern
-			check = [pattern.get(key) is None or pattern.get(key) == attributes.get(key) for key in keys_to_check]
-			if all(check):
-				return True
+	def _is_propagating(self, tag: str | None, role: str | None) -> bool:
+		"""Lookup of (tag, role) in the compiled PROPAGATING_ELEMENTS, a None in a pattern matches anything."""
+		keys = self._propagating_keys
+		return (tag, role) in keys or (tag, None) in keys or (None, role) in keys or (None, None) in keys
 
-		return False
+	@staticmethod
+	def serialize_tree(
+		node: SimplifiedNode | None,
+		include_attributes: list[str],
+		depth: int = 0,
+		max_chars: int | None = None,
+		max_tokens: int | None = None,
+	) -> str:
+		"""Serialize the optimized tree to string format.
+
+		With `max_chars` / `max_tokens` the traversal stops as soon as the budget is used up,
+		the result is the exact prefix of the full serialization.
+		"""
+		writer = TreeWriter('\t', max_chars=max_chars, max_tokens=max_tokens)
+		DOMTreeSerializer._write_tree(node, include_attributes, depth, writer)
+		return writer.getvalue()
 
 	@staticmethod
-	def serialize_tree(node: SimplifiedNode | None, include_attributes: list[str], depth: int = 0) -> str:
-		"""Serialize the optimized tree to string format."""
-		if not node:
-			return ''
+	def _write_tree(node: SimplifiedNode | None, include_attributes: list[str], depth: int, writer: TreeWriter) -> None:
+		"""Write the lines of a subtree to the writer."""
+		if not node or writer.truncated:
+			return
 
 		# Skip rendering excluded nodes, but process their children
 		if hasattr(node, 'excluded_by_parent') and node.excluded_by_parent:
-			formatted_text = []
 			for child in node.children:
-				child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, depth)
-				if child_text:
-					formatted_text.append(child_text)
-			return '\n'.join(formatted_text)
+				DOMTreeSerializer._write_tree(child, include_attributes, depth, writer)
+			return
 
-		formatted_text = []
-		depth_str = depth * '\t'
+		depth_str = writer.indent(depth)
 		next_depth = depth
 
 		if node.original_node.node_type == NodeType.ELEMENT_NODE:
 			# Skip displaying nodes marked as should_display=False
 			if not node.should_display:
 				for child in node.children:
-					child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, depth)
-					if child_text:
-						formatted_text.append(child_text)
-				return '\n'.join(formatted_text)
+					DOMTreeSerializer._write_tree(child, include_attributes, depth, writer)
+				return
 
 			# Special handling for SVG elements - show the tag but collapse children
 			if node.original_node.tag_name.lower() == 'svg':
@@ -859,9 +832,9 @@ class DOMTreeSerializer:
 				if attributes_html_str:
 					line += f' {attributes_html_str}'
 				line += ' /> <!-- SVG content collapsed -->'
-				formatted_text.append(line)
+				writer.write(line)
 				# Don't process children for SVG
-				return '\n'.join(formatted_text)
+				return
 
 			# Add element if clickable, scrollable, or iframe
 			is_any_scrollable = node.original_node.is_actually_scrollable or node.original_node.is_scrollable
@@ -955,26 +928,24 @@ class DOMTreeSerializer:
 					if scroll_info_text:
 						line += f' ({scroll_info_text})'
 
-				formatted_text.append(line)
+				writer.write(line)
 
 		elif node.original_node.node_type == NodeType.DOCUMENT_FRAGMENT_NODE:
 			# Shadow DOM representation - show clearly to LLM
 			if node.original_node.shadow_root_type and node.original_node.shadow_root_type.lower() == 'closed':
-				formatted_text.append(f'{depth_str}Closed Shadow')
+				writer.write(f'{depth_str}Closed Shadow')
 			else:
-				formatted_text.append(f'{depth_str}Open Shadow')
+				writer.write(f'{depth_str}Open Shadow')
 
 			next_depth += 1
 
 			# Process shadow DOM children
 			for child in node.children:
-				child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, next_depth)
-				if child_text:
-					formatted_text.append(child_text)
+				DOMTreeSerializer._write_tree(child, include_attributes, next_depth, writer)
 
 			# Close shadow DOM indicator
 			if node.children:  # Only show close if we had content
-				formatted_text.append(f'{depth_str}Shadow End')
+				writer.write(f'{depth_str}Shadow End')
 
 		elif node.original_node.node_type == NodeType.TEXT_NODE:
 			# Include visible text
@@ -986,16 +957,12 @@ class DOMTreeSerializer:
 				and len(node.original_node.node_value.strip()) > 1
 			):
 				clean_text = node.original_node.node_value.strip()
-				formatted_text.append(f'{depth_str}{clean_text}')
+				writer.write(f'{depth_str}{clean_text}')
 
 		# Process children (for non-shadow elements)
 		if node.original_node.node_type != NodeType.DOCUMENT_FRAGMENT_NODE:
 			for child in node.children:
-				child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, next_depth)
-				if child_text:
-					formatted_text.append(child_text)
-
-		return '\n'.join(formatted_text)
+				DOMTreeSerializer._write_tree(child, include_attributes, next_depth, writer)
 
 	@staticmethod
 	def _build_attributes_string(node: EnhancedDOMTreeNode, include_attributes: list[str], text: str) -> str:
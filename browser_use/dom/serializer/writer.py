@@ -0,0 +1,60 @@
+# @file purpose: Streaming line writer shared by the DOM tree serializers
+
+# Rough chars-per-token ratio used to turn a token budget into a character budget
+CHARS_PER_TOKEN = 4
+
+
+class TreeWriter:
+	"""Collects the serialized lines of a DOM tree in a single buffer.
+
+	The serializers used to return a string per subtree that every parent re-joined with '\\n', copying the text
+	once per nesting level. Instead they now append their lines to one writer during a single traversal and the
+	output is joined once at the end.
+
+	With a `max_chars` / `max_tokens` budget the writer stops accepting lines once the budget is used up and
+	the serializers stop walking the tree. The result is always the exact prefix of the unbounded output.
+	"""
+
+	__slots__ = ('_indent_unit', '_indents', '_lines', '_chars', '_max_chars', 'truncated')
+
+	def __init__(self, indent_unit: str = '\t', max_chars: int | None = None, max_tokens: int | None = None):
+		self._indent_unit = indent_unit
+		self._indents: list[str] = ['']
+		self._lines: list[str] = []
+		self._chars = 0
+		if max_tokens is not None:
+			token_chars = max_tokens * CHARS_PER_TOKEN
+			max_chars = token_chars if max_chars is None else min(max_chars, token_chars)
+		self._max_chars = max(0, max_chars) if max_chars is not None else None
+		self.truncated = False
+		"""Set once the budget is used up, serializers check it to stop the traversal early"""
+
+	def indent(self, depth: int) -> str:
+		"""Indentation prefix for a nesting depth (cached, every depth is built only once)."""
+		indents = self._indents
+		while len(indents) <= depth:
+			indents.append(indents[-1] + self._indent_unit)
+		return indents[depth]
+
+	def write(self, line: str) -> None:
+		"""Append one line, cutting it off when it doesn't fit in the budget anymore."""
+		if self.truncated:
+			return
+		# each line after the first is preceded by a newline
+		cost = len(line) + 1 if self._lines else len(line)
+		if self._max_chars is not None and self._chars + cost > self._max_chars:
+			self.truncated = True
+			remaining = self._max_chars - self._chars
+			if remaining > 0:
+				# the separating newline counts too, an empty remainder still keeps it like a plain slice would
+				self._lines.append(line[: remaining - 1] if self._lines else line[:remaining])
+				self._chars = self._max_chars
+			return
+		self._lines.append(line)
+		self._chars += cost
+
+	def getvalue(self) -> str:
+		return '\n'.join(self._lines)
+
+	def __len__(self) -> int:
+		return self._chars
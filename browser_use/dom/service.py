@@ -1,24 +1,29 @@
 import asyncio
 import logging
 import time
-from typing import TYPE_CHECKING
+from collections.abc import Callable, Mapping
+from typing import TYPE_CHECKING, Any
 
 from cdp_use.cdp.accessibility.commands import GetFullAXTreeReturns
 from cdp_use.cdp.accessibility.types import AXNode
 from cdp_use.cdp.dom.types import Node
-from cdp_use.cdp.target import TargetID
+from cdp_use.cdp.page.commands import GetLayoutMetricsReturns
+from cdp_use.cdp.target import SessionID, TargetID
 
 from browser_use.dom.enhanced_snapshot import (
 	REQUIRED_COMPUTED_STYLES,
 	build_snapshot_lookup,
 )
+from browser_use.dom.mutation_tracker import DOMMutationTracker
 from browser_use.dom.serializer.serializer import DOMTreeSerializer
 from browser_use.dom.views import (
 	DOMRect,
 	EnhancedAXNode,
 	EnhancedAXProperty,
 	EnhancedDOMTreeNode,
+	EnhancedSnapshotNode,
 	NodeType,
+	PageCapture,
 	SerializedDOMState,
 	TargetAllTrees,
 )
@@ -26,10 +31,13 @@ from browser_use.observability import observe_debug
 from browser_use.utils import create_task_with_error_handling
 
 if TYPE_CHECKING:
-	from browser_use.browser.session import BrowserSession
+	from browser_use.browser.session import BrowserSession, CDPSession
 
 # Note: iframe limits are now configurable via BrowserProfile.max_iframes and BrowserProfile.max_iframe_depth
 
+# How a node on the construction stack of _construct_enhanced_tree relates to its host node
+_ROOT, _CHILD, _SHADOW_ROOT, _CONTENT_DOCUMENT, _FINISH = range(5)
+
 
 class DomService:
 	"""
@@ -50,6 +58,12 @@ class DomService:
 		paint_order_filtering: bool = True,
 		max_iframes: int = 100,
 		max_iframe_depth: int = 5,
+		max_concurrent_iframe_fetches: int = 4,
+		iframe_fetch_timeout: float = 5.0,
+		incremental_dom: bool = False,
+		max_incremental_mutations: int = 500,
+		on_dom_mutation: Callable[[], None] | None = None,
+		pipelined_state_capture: bool = False,
 	):
 		self.browser_session = browser_session
 		self.logger = logger or browser_session.logger
@@ -57,6 +71,21 @@ class DomService:
 		self.paint_order_filtering = paint_order_filtering
 		self.max_iframes = max_iframes
 		self.max_iframe_depth = max_iframe_depth
+		self.iframe_fetch_timeout = iframe_fetch_timeout
+		# shared by all iframe depths, only held while a cross-origin iframe's trees are fetched
+		self._iframe_fetch_semaphore = asyncio.Semaphore(max_concurrent_iframe_fetches)
+		self.incremental_dom = incremental_dom
+		self.pipelined_state_capture = pipelined_state_capture
+		self._mutation_tracker: DOMMutationTracker | None = None
+		self.last_page_capture: PageCapture | None = None
+		"""Title and layout metrics captured with the last DOM tree of a page, reused for the browser state"""
+		if incremental_dom:
+			self._mutation_tracker = DOMMutationTracker(
+				logger=self.logger,
+				node_factory=self._create_enhanced_node,
+				max_mutations=max_incremental_mutations,
+				on_mutation=on_dom_mutation,
+			)
 
 	async def __aenter__(self):
 		return self
@@ -92,35 +121,178 @@ class DomService:
 		)
 		return enhanced_ax_node
 
-	async def _get_viewport_ratio(self, target_id: TargetID) -> float:
-		"""Get viewport dimensions, device pixel ratio, and scroll position using CDP."""
-		cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=False)
+	@staticmethod
+	def _create_enhanced_node(node: Node, target_id: TargetID, session_id: SessionID | None) -> EnhancedDOMTreeNode:
+		"""Create an enhanced node from CDP DOM node data only (AX, snapshot and layout data are attached by the caller)."""
+		# To make attributes more readable
+		attributes: dict[str, str] = {}
+		if 'attributes' in node and node['attributes']:
+			for i in range(0, len(node['attributes']), 2):
+				attributes[node['attributes'][i]] = node['attributes'][i + 1]
+
+		return EnhancedDOMTreeNode(
+			node_id=node['nodeId'],
+			backend_node_id=node['backendNodeId'],
+			node_type=NodeType(node['nodeType']),
+			node_name=node['nodeName'],
+			node_value=node['nodeValue'],
+			attributes=attributes,
+			is_scrollable=node.get('isScrollable', None),
+			frame_id=node.get('frameId', None),
+			session_id=session_id,
+			target_id=target_id,
+			content_document=None,
+			shadow_root_type=node.get('shadowRootType', None) or None,
+			shadow_roots=None,
+			parent_node=None,
+			children_nodes=None,
+			ax_node=None,
+			snapshot_node=None,
+			is_visible=None,
+			absolute_position=None,
+		)
 
-		try:
-			# Get the layout metrics which includes the visual viewport
-			metrics = await cdp_session.cdp_client.send.Page.getLayoutMetrics(session_id=cdp_session.session_id)
+	@staticmethod
+	def _get_absolute_position(snapshot_data: EnhancedSnapshotNode | None, total_frame_offset: DOMRect) -> DOMRect | None:
+		"""Translate the snapshot bounds of a node by the accumulated offset of its parent frames."""
+		if not snapshot_data or not snapshot_data.bounds:
+			return None
+		return DOMRect(
+			x=snapshot_data.bounds.x + total_frame_offset.x,
+			y=snapshot_data.bounds.y + total_frame_offset.y,
+			width=snapshot_data.bounds.width,
+			height=snapshot_data.bounds.height,
+		)
 
-			visual_viewport = metrics.get('visualViewport', {})
+	def _get_child_frame_context(
+		self,
+		dom_tree_node: EnhancedDOMTreeNode,
+		html_frames: list[EnhancedDOMTreeNode],
+		total_frame_offset: DOMRect,
+	) -> tuple[list[EnhancedDOMTreeNode], DOMRect]:
+		"""Get the HTML frames and frame offset to use for the children of a node.
+
+		HTML frame nodes are added to the frame list and shift the offset by their scroll position,
+		IFRAME/FRAME nodes are added and shift the offset by their bounds.
+		For all other nodes the given list and offset are returned as they are (they are never modified in place).
+		"""
+		snapshot_data = dom_tree_node.snapshot_node
+		is_html_frame = (
+			dom_tree_node.node_type == NodeType.ELEMENT_NODE
+			and dom_tree_node.node_name == 'HTML'
+			and dom_tree_node.frame_id is not None
+		)
+		node_name = dom_tree_node.node_name.upper()
+		is_iframe = (
+			(node_name == 'IFRAME' or node_name == 'FRAME') and snapshot_data is not None and snapshot_data.bounds is not None
+		)
+		if not is_html_frame and not is_iframe:
+			return html_frames, total_frame_offset
 
-			# IMPORTANT: Use CSS viewport instead of device pixel viewport
-			# This fixes the coordinate mismatch on high-DPI displays
-			css_visual_viewport = metrics.get('cssVisualViewport', {})
-			css_layout_viewport = metrics.get('cssLayoutViewport', {})
+		# to get rid of the pointer references
+		total_frame_offset = DOMRect(
+			total_frame_offset.x, total_frame_offset.y, total_frame_offset.width, total_frame_offset.height
+		)
+		updated_html_frames = html_frames.copy()
+
+		# Check if this is an HTML frame node and add it to the list
+		if is_html_frame:
+			updated_html_frames.append(dom_tree_node)
+
+			# and adjust the total frame offset by scroll
+			if snapshot_data and snapshot_data.scrollRects:
+				total_frame_offset.x -= snapshot_data.scrollRects.x
+				total_frame_offset.y -= snapshot_data.scrollRects.y
+				# DEBUG: Log iframe scroll information
+				self.logger.debug(
+					f'🔍 DEBUG: HTML frame scroll - scrollY={snapshot_data.scrollRects.y}, scrollX={snapshot_data.scrollRects.x}, frameId={dom_tree_node.frame_id}, nodeId={dom_tree_node.node_id}'
+				)
+
+		# Calculate new iframe offset for content documents, accounting for iframe scroll
+		if is_iframe:
+			updated_html_frames.append(dom_tree_node)
+
+			total_frame_offset.x += snapshot_data.bounds.x  # type: ignore[union-attr]
+			total_frame_offset.y += snapshot_data.bounds.y  # type: ignore[union-attr]
 
-			# Use CSS pixels (what JavaScript sees) instead of device pixels
-			width = css_visual_viewport.get('clientWidth', css_layout_viewport.get('clientWidth', 1920.0))
+		return updated_html_frames, total_frame_offset
 
-			# Calculate device pixel ratio
-			device_width = visual_viewport.get('clientWidth', width)
-			css_width = css_visual_viewport.get('clientWidth', width)
-			device_pixel_ratio = device_width / css_width if css_width > 0 else 1.0
+	async def _get_layout_metrics(self, target_id: TargetID) -> GetLayoutMetricsReturns | None:
+		"""Get the layout metrics (viewports, content size and scroll position) of a target using CDP."""
+		cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=False)
 
-			return float(device_pixel_ratio)
+		try:
+			return await cdp_session.cdp_client.send.Page.getLayoutMetrics(session_id=cdp_session.session_id)
 		except Exception as e:
 			self.logger.debug(f'Viewport size detection failed: {e}')
-			# Fallback to default viewport size
+			return None
+
+	@staticmethod
+	def _device_pixel_ratio(metrics: GetLayoutMetricsReturns | None) -> float:
+		"""Device pixel ratio from layout metrics, 1.0 if they are unavailable."""
+		if not metrics:
 			return 1.0
 
+		visual_viewport = metrics.get('visualViewport', {})
+
+		# IMPORTANT: Use CSS viewport instead of device pixel viewport
+		# This fixes the coordinate mismatch on high-DPI displays
+		css_visual_viewport = metrics.get('cssVisualViewport', {})
+		css_layout_viewport = metrics.get('cssLayoutViewport', {})
+
+		# Use CSS pixels (what JavaScript sees) instead of device pixels
+		width = css_visual_viewport.get('clientWidth', css_layout_viewport.get('clientWidth', 1920.0))
+
+		# Calculate device pixel ratio
+		device_width = visual_viewport.get('clientWidth', width)
+		css_width = css_visual_viewport.get('clientWidth', width)
+		device_pixel_ratio = device_width / css_width if css_width > 0 else 1.0
+
+		return float(device_pixel_ratio)
+
+	async def _evaluate_page_state(self, cdp_session: 'CDPSession') -> dict[str, Any]:
+		"""Get the document title and the actual scroll positions of same-origin iframes in one evaluate call."""
+		start = time.time()
+		try:
+			result = await cdp_session.cdp_client.send.Runtime.evaluate(
+				params={
+					'expression': """
+					(() => {
+						const scrollData = {};
+						const iframes = document.querySelectorAll('iframe');
+						iframes.forEach((iframe, index) => {
+							try {
+								const doc = iframe.contentDocument || iframe.contentWindow.document;
+								if (doc) {
+									scrollData[index] = {
+										scrollTop: doc.documentElement.scrollTop || doc.body.scrollTop || 0,
+										scrollLeft: doc.documentElement.scrollLeft || doc.body.scrollLeft || 0
+									};
+								}
+							} catch (e) {
+								// Cross-origin iframe, can't access
+							}
+						});
+						return {title: document.title, iframeScroll: scrollData};
+					})()
+					""",
+					'returnByValue': True,
+				},
+				session_id=cdp_session.session_id,
+			)
+		except Exception as e:
+			self.logger.debug(f'Failed to evaluate page title and iframe scroll positions: {type(e).__name__}: {e}')
+			return {}
+		value = result.get('result', {}).get('value') or {}
+		for idx, scroll_data in (value.get('iframeScroll') or {}).items():
+			self.logger.debug(
+				f'🔍 DEBUG: Iframe {idx} actual scroll position - scrollTop={scroll_data.get("scrollTop", 0)}, scrollLeft={scroll_data.get("scrollLeft", 0)}'
+			)
+		return {
+			'title': value.get('title'),
+			'duration_ms': (time.time() - start) * 1000,
+		}
+
 	@classmethod
 	def is_element_visible_according_to_all_parents(
 		cls, node: EnhancedDOMTreeNode, html_frames: list[EnhancedDOMTreeNode]
@@ -163,7 +335,7 @@ class DomService:
 			):
 				iframe_bounds = frame.snapshot_node.bounds
 
-				# negate the values added in `_construct_enhanced_node`
+				# negate the values added in `_construct_enhanced_tree`
 				current_bounds.x += iframe_bounds.x
 				current_bounds.y += iframe_bounds.y
 
@@ -245,58 +417,13 @@ class DomService:
 
 		return {'nodes': merged_nodes}
 
-	async def _get_all_trees(self, target_id: TargetID) -> TargetAllTrees:
-		cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=False)
+	async def _get_all_trees(self, target_id: TargetID, include_dom_tree: bool = True) -> TargetAllTrees:
+		"""Fetch snapshot, DOM, AX tree and device pixel ratio for a target in parallel.
 
-		# Wait for the page to be ready first
-		try:
-			ready_state = await cdp_session.cdp_client.send.Runtime.evaluate(
-				params={'expression': 'document.readyState'}, session_id=cdp_session.session_id
-			)
-		except Exception as e:
-			pass  # Page might not be ready yet
-		# DEBUG: Log before capturing snapshot
-		self.logger.debug(f'🔍 DEBUG: Capturing DOM snapshot for target {target_id}')
-
-		# Get actual scroll positions for all iframes before capturing snapshot
-		start_iframe_scroll = time.time()
-		iframe_scroll_positions = {}
-		try:
-			scroll_result = await cdp_session.cdp_client.send.Runtime.evaluate(
-				params={
-					'expression': """
-					(() => {
-						const scrollData = {};
-						const iframes = document.querySelectorAll('iframe');
-						iframes.forEach((iframe, index) => {
-							try {
-								const doc = iframe.contentDocument || iframe.contentWindow.document;
-								if (doc) {
-									scrollData[index] = {
-										scrollTop: doc.documentElement.scrollTop || doc.body.scrollTop || 0,
-										scrollLeft: doc.documentElement.scrollLeft || doc.body.scrollLeft || 0
-									};
-								}
-							} catch (e) {
-								// Cross-origin iframe, can't access
-							}
-						});
-						return scrollData;
-					})()
-					""",
-					'returnByValue': True,
-				},
-				session_id=cdp_session.session_id,
-			)
-			if scroll_result and 'result' in scroll_result and 'value' in scroll_result['result']:
-				iframe_scroll_positions = scroll_result['result']['value']
-				for idx, scroll_data in iframe_scroll_positions.items():
-					self.logger.debug(
-						f'🔍 DEBUG: Iframe {idx} actual scroll position - scrollTop={scroll_data.get("scrollTop", 0)}, scrollLeft={scroll_data.get("scrollLeft", 0)}'
-					)
-		except Exception as e:
-			self.logger.debug(f'Failed to get iframe scroll positions: {e}')
-		iframe_scroll_ms = (time.time() - start_iframe_scroll) * 1000
+		With `include_dom_tree=False` the (expensive) `DOM.getDocument` call is skipped and `dom_tree` is None,
+		used by the incremental mode which keeps its own patched copy of the DOM structure.
+		"""
+		cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=target_id, focus=False)
 
 		# Define CDP request factories to avoid duplication
 		def create_snapshot_request():
@@ -316,15 +443,35 @@ class DomService:
 				params={'depth': -1, 'pierce': True}, session_id=cdp_session.session_id
 			)
 
+		page_state: dict[str, Any] = {}
+		page_evaluate_task = None
+		if self.pipelined_state_capture:
+			# Page title and iframe scroll positions come from one evaluate that runs alongside the tree requests,
+			# it is optional so it neither fails nor retries the capture
+			page_evaluate_task = create_task_with_error_handling(
+				self._evaluate_page_state(cdp_session), name='evaluate_page_state'
+			)
+		else:
+			# Wait for the page to be ready first
+			try:
+				await cdp_session.cdp_client.send.Runtime.evaluate(
+					params={'expression': 'document.readyState'}, session_id=cdp_session.session_id
+				)
+			except Exception:
+				pass  # Page might not be ready yet
+			# Get actual scroll positions for all iframes before capturing snapshot
+			page_state = await self._evaluate_page_state(cdp_session)
+
 		start_cdp_calls = time.time()
 
 		# Create initial tasks
 		tasks = {
 			'snapshot': create_task_with_error_handling(create_snapshot_request(), name='get_snapshot'),
-			'dom_tree': create_task_with_error_handling(create_dom_tree_request(), name='get_dom_tree'),
 			'ax_tree': create_task_with_error_handling(self._get_ax_tree_for_all_frames(target_id), name='get_ax_tree'),
-			'device_pixel_ratio': create_task_with_error_handling(self._get_viewport_ratio(target_id), name='get_viewport_ratio'),
+			'layout_metrics': create_task_with_error_handling(self._get_layout_metrics(target_id), name='get_layout_metrics'),
 		}
+		if include_dom_tree:
+			tasks['dom_tree'] = create_task_with_error_handling(create_dom_tree_request(), name='get_dom_tree')
 
 		# Wait for all tasks with timeout
 		done, pending = await asyncio.wait(tasks.values(), timeout=10.0)
@@ -337,14 +484,17 @@ class DomService:
 			# Retry mapping for pending tasks
 			retry_map = {
 				tasks['snapshot']: lambda: create_task_with_error_handling(create_snapshot_request(), name='get_snapshot_retry'),
-				tasks['dom_tree']: lambda: create_task_with_error_handling(create_dom_tree_request(), name='get_dom_tree_retry'),
 				tasks['ax_tree']: lambda: create_task_with_error_handling(
 					self._get_ax_tree_for_all_frames(target_id), name='get_ax_tree_retry'
 				),
-				tasks['device_pixel_ratio']: lambda: create_task_with_error_handling(
-					self._get_viewport_ratio(target_id), name='get_viewport_ratio_retry'
+				tasks['layout_metrics']: lambda: create_task_with_error_handling(
+					self._get_layout_metrics(target_id), name='get_layout_metrics_retry'
 				),
 			}
+			if include_dom_tree:
+				retry_map[tasks['dom_tree']] = lambda: create_task_with_error_handling(
+					create_dom_tree_request(), name='get_dom_tree_retry'
+				)
 
 			# Create new tasks only for the ones that didn't complete
 			for key, task in tasks.items():
@@ -377,12 +527,20 @@ class DomService:
 			raise TimeoutError(f'CDP requests failed or timed out: {", ".join(failed)}')
 
 		snapshot = results['snapshot']
-		dom_tree = results['dom_tree']
+		dom_tree = results.get('dom_tree')
 		ax_tree = results['ax_tree']
-		device_pixel_ratio = results['device_pixel_ratio']
+		layout_metrics = results['layout_metrics']
+		device_pixel_ratio = self._device_pixel_ratio(layout_metrics)
 		end_cdp_calls = time.time()
 		cdp_calls_ms = (end_cdp_calls - start_cdp_calls) * 1000
 
+		if page_evaluate_task is not None:
+			try:
+				page_state = await asyncio.wait_for(page_evaluate_task, timeout=1.0)
+			except TimeoutError:
+				self.logger.debug('Timed out evaluating page title and iframe scroll positions')
+		iframe_scroll_ms = page_state.get('duration_ms', 0.0)
+
 		# Calculate total time for _get_all_trees and overhead
 		start_snapshot_processing = time.time()
 
@@ -413,6 +571,8 @@ class DomService:
 			dom_tree=dom_tree,
 			ax_tree=ax_tree,
 			device_pixel_ratio=device_pixel_ratio,
+			title=page_state.get('title'),
+			layout_metrics=layout_metrics,
 			cdp_timing={
 				'iframe_scroll_detection_ms': iframe_scroll_ms,
 				'cdp_parallel_calls_ms': cdp_calls_ms,
@@ -444,14 +604,29 @@ class DomService:
 		timing_info: dict[str, float] = {}
 		timing_start_total = time.time()
 
+		# Start buffering DOM mutation events before DOM.getDocument is sent, so none are lost while the tree is built
+		tracker = self._mutation_tracker if iframe_depth == 0 else None
+		if tracker is not None:
+			cdp_session = await self.browser_session.get_or_create_cdp_session(target_id, focus=False)
+			tracker.register_handlers(cdp_session.cdp_client)
+			tracker.begin_build(target_id, cdp_session.session_id)
+
 		# Get all trees from CDP (snapshot, DOM, AX, viewport ratio)
 		start_get_trees = time.time()
-		trees = await self._get_all_trees(target_id)
+		if iframe_depth > 0:
+			# cross-origin iframe: bounded concurrency and a per-frame timeout, so one slow frame can't stall the step
+			async with self._iframe_fetch_semaphore:
+				trees = await asyncio.wait_for(self._get_all_trees(target_id), timeout=self.iframe_fetch_timeout)
+		else:
+			trees = await self._get_all_trees(target_id)
 		get_trees_ms = (time.time() - start_get_trees) * 1000
+		if iframe_depth == 0:
+			self.last_page_capture = PageCapture(target_id=target_id, title=trees.title, layout_metrics=trees.layout_metrics)
 		timing_info.update(trees.cdp_timing)
 		timing_info['get_all_trees_total_ms'] = get_trees_ms
 
 		dom_tree = trees.dom_tree
+		assert dom_tree is not None, 'DOM tree was not fetched'
 		ax_tree = trees.ax_tree
 		snapshot = trees.snapshot
 		device_pixel_ratio = trees.device_pixel_ratio
@@ -463,296 +638,355 @@ class DomService:
 		}
 		timing_info['build_ax_lookup_ms'] = (time.time() - start_ax) * 1000
 
-		enhanced_dom_tree_node_lookup: dict[int, EnhancedDOMTreeNode] = {}
-		""" NodeId (NOT backend node id) -> enhanced dom tree node"""  # way to get the parent/content node
-
 		# Parse snapshot data with everything calculated upfront
 		start_snapshot = time.time()
 		snapshot_lookup = build_snapshot_lookup(snapshot, device_pixel_ratio)
 		timing_info['build_snapshot_lookup_ms'] = (time.time() - start_snapshot) * 1000
 
-		async def _construct_enhanced_node(
-			node: Node,
-			html_frames: list[EnhancedDOMTreeNode] | None,
-			total_frame_offset: DOMRect | None,
-			all_frames: dict | None,
-		) -> EnhancedDOMTreeNode:
-			"""
-			Recursively construct enhanced DOM tree nodes.
-
-			Args:
-				node: The DOM node to construct
-				html_frames: List of HTML frame nodes encountered so far
-				total_frame_offset: Accumulated coordinate translation from parent iframes (includes scroll corrections)
-				all_frames: Pre-fetched frame hierarchy to avoid redundant CDP calls
-			"""
-
-			# Initialize lists if not provided
-			if html_frames is None:
-				html_frames = []
-
-			# to get rid of the pointer references
-			if total_frame_offset is None:
-				total_frame_offset = DOMRect(x=0.0, y=0.0, width=0.0, height=0.0)
-			else:
-				total_frame_offset = DOMRect(
-					total_frame_offset.x, total_frame_offset.y, total_frame_offset.width, total_frame_offset.height
-				)
+		# Resolve the session once per target, all nodes of the tree share it
+		try:
+			session_id = (await self.browser_session.get_or_create_cdp_session(target_id, focus=False)).session_id
+		except ValueError:
+			# Target may have detached during DOM construction
+			session_id = None
+
+		# Build the enhanced DOM tree in one synchronous pass, cross-origin iframes are collected and loaded concurrently afterwards
+		# Note: all_frames stays None and is only fetched if/when a cross-origin iframe is encountered
+		start_construct = time.time()
+		enhanced_dom_tree_node, cross_origin_iframes = self._construct_enhanced_tree(
+			dom_tree['root'],
+			target_id,
+			session_id,
+			ax_tree_lookup,
+			snapshot_lookup,
+			initial_html_frames or [],
+			initial_total_frame_offset or DOMRect(x=0.0, y=0.0, width=0.0, height=0.0),
+			iframe_depth,
+		)
+		if cross_origin_iframes:
+			await self._load_cross_origin_iframes(cross_origin_iframes, all_frames, iframe_depth)
+		timing_info['construct_enhanced_tree_ms'] = (time.time() - start_construct) * 1000
+
+		if tracker is not None:
+			tracker.track(enhanced_dom_tree_node, snapshot_node_count=len(snapshot_lookup))
+
+		# Calculate total time for get_dom_tree
+		total_get_dom_tree_ms = (time.time() - timing_start_total) * 1000
+		timing_info['get_dom_tree_total_ms'] = total_get_dom_tree_ms
+
+		# Calculate overhead in get_dom_tree (time not accounted for by sub-operations)
+		tracked_sub_operations_ms = (
+			timing_info.get('get_all_trees_total_ms', 0)
+			+ timing_info.get('build_ax_lookup_ms', 0)
+			+ timing_info.get('build_snapshot_lookup_ms', 0)
+			+ timing_info.get('construct_enhanced_tree_ms', 0)
+		)
+		get_dom_tree_overhead_ms = total_get_dom_tree_ms - tracked_sub_operations_ms
+		if get_dom_tree_overhead_ms > 0.1:
+			timing_info['get_dom_tree_overhead_ms'] = get_dom_tree_overhead_ms
+
+		return enhanced_dom_tree_node, timing_info
+
+	def _construct_enhanced_tree(
+		self,
+		root: Node,
+		target_id: TargetID,
+		session_id: SessionID | None,
+		ax_tree_lookup: dict[int, AXNode],
+		snapshot_lookup: Mapping[int, EnhancedSnapshotNode],
+		html_frames: list[EnhancedDOMTreeNode],
+		total_frame_offset: DOMRect,
+		iframe_depth: int,
+	) -> tuple[EnhancedDOMTreeNode, list[tuple[EnhancedDOMTreeNode, DOMRect]]]:
+		"""Construct the enhanced DOM tree from the CDP DOM tree with an explicit stack (no recursion limit on deep pages).
+
+		Nodes are created depth-first in document order (content document, shadow roots, then children), so a node's
+		parent always exists before it. Visibility is set once a node's whole subtree is built, like the recursive
+		construction did (it translates the snapshot bounds of nodes inside iframes in place).
+
+		Returns the root and the cross-origin iframes whose content should be loaded, with the frame offset of their content.
+		"""
+		# NodeId (NOT backend node id) -> enhanced dom tree node, to get the parent/content node
+		node_lookup: dict[int, EnhancedDOMTreeNode] = {}
+		cross_origin_iframes: list[tuple[EnhancedDOMTreeNode, DOMRect]] = []
+		root_holder: list[EnhancedDOMTreeNode] = []
+
+		# (cdp node, html frames, frame offset, host node, relation to the host)
+		# a _FINISH entry instead holds the built node as host, and the frames/offset used for its subtree
+		stack: list[tuple[Node, list[EnhancedDOMTreeNode], DOMRect, EnhancedDOMTreeNode | None, int]] = [
+			(root, html_frames, total_frame_offset, None, _ROOT)
+		]
+		while stack:
+			node, frames, offset, host, relation = stack.pop()
+
+			if relation == _FINISH:
+				assert host is not None
+				self._finish_enhanced_node(host, node, frames, offset, iframe_depth, cross_origin_iframes)
+				continue
 
 			# memoize the mf (I don't know if some nodes are duplicated)
-			if node['nodeId'] in enhanced_dom_tree_node_lookup:
-				return enhanced_dom_tree_node_lookup[node['nodeId']]
+			dom_tree_node = node_lookup.get(node['nodeId'])
+			if dom_tree_node is None:
+				dom_tree_node = self._create_enhanced_node(node, target_id, session_id)
 
-			ax_node = ax_tree_lookup.get(node['backendNodeId'])
-			if ax_node:
-				enhanced_ax_node = self._build_enhanced_ax_node(ax_node)
-			else:
-				enhanced_ax_node = None
+				ax_node = ax_tree_lookup.get(node['backendNodeId'])
+				if ax_node:
+					dom_tree_node.ax_node = self._build_enhanced_ax_node(ax_node)
 
-			# To make attributes more readable
-			attributes: dict[str, str] | None = None
-			if 'attributes' in node and node['attributes']:
-				attributes = {}
-				for i in range(0, len(node['attributes']), 2):
-					attributes[node['attributes'][i]] = node['attributes'][i + 1]
+				# Get snapshot data and calculate absolute position
+				snapshot_data = snapshot_lookup.get(node['backendNodeId'], None)
+				dom_tree_node.snapshot_node = snapshot_data
+				dom_tree_node.absolute_position = self._get_absolute_position(snapshot_data, offset)
 
-			shadow_root_type = None
-			if 'shadowRootType' in node and node['shadowRootType']:
-				try:
-					shadow_root_type = node['shadowRootType']
-				except ValueError:
-					pass
+				node_lookup[node['nodeId']] = dom_tree_node
 
-			# Get snapshot data and calculate absolute position
-			snapshot_data = snapshot_lookup.get(node['backendNodeId'], None)
-			absolute_position = None
-			if snapshot_data and snapshot_data.bounds:
-				absolute_position = DOMRect(
-					x=snapshot_data.bounds.x + total_frame_offset.x,
-					y=snapshot_data.bounds.y + total_frame_offset.y,
-					width=snapshot_data.bounds.width,
-					height=snapshot_data.bounds.height,
-				)
+				if 'parentId' in node and node['parentId']:
+					dom_tree_node.parent_node = node_lookup[node['parentId']]  # parents should always be in the lookup
 
-			try:
-				session = await self.browser_session.get_or_create_cdp_session(target_id, focus=False)
-				session_id = session.session_id
-			except ValueError:
-				# Target may have detached during DOM construction
-				session_id = None
-
-			dom_tree_node = EnhancedDOMTreeNode(
-				node_id=node['nodeId'],
-				backend_node_id=node['backendNodeId'],
-				node_type=NodeType(node['nodeType']),
-				node_name=node['nodeName'],
-				node_value=node['nodeValue'],
-				attributes=attributes or {},
-				is_scrollable=node.get('isScrollable', None),
-				frame_id=node.get('frameId', None),
-				session_id=session_id,
-				target_id=target_id,
-				content_document=None,
-				shadow_root_type=shadow_root_type,
-				shadow_roots=None,
-				parent_node=None,
-				children_nodes=None,
-				ax_node=enhanced_ax_node,
-				snapshot_node=snapshot_data,
-				is_visible=None,
-				absolute_position=absolute_position,
-			)
+				# Collect HTML frame nodes and adjust the total frame offset by iframe position and scroll
+				child_frames, child_offset = self._get_child_frame_context(dom_tree_node, frames, offset)
 
-			enhanced_dom_tree_node_lookup[node['nodeId']] = dom_tree_node
+				# pushed in reverse: popped after the subtree is done, then children, shadow roots and content document
+				stack.append((node, child_frames, child_offset, dom_tree_node, _FINISH))
 
-			if 'parentId' in node and node['parentId']:
-				dom_tree_node.parent_node = enhanced_dom_tree_node_lookup[
-					node['parentId']
-				]  # parents should always be in the lookup
+				if 'children' in node and node['children']:
+					dom_tree_node.children_nodes = []
+					# Skip shadow roots - they should only be in shadow_roots list
+					shadow_root_node_ids = {shadow_root['nodeId'] for shadow_root in node.get('shadowRoots') or []}
+					for child in reversed(node['children']):
+						if child['nodeId'] not in shadow_root_node_ids:
+							stack.append((child, child_frames, child_offset, dom_tree_node, _CHILD))
 
-			# Check if this is an HTML frame node and add it to the list
-			updated_html_frames = html_frames.copy()
-			if node['nodeType'] == NodeType.ELEMENT_NODE.value and node['nodeName'] == 'HTML' and node.get('frameId') is not None:
-				updated_html_frames.append(dom_tree_node)
+				if 'shadowRoots' in node and node['shadowRoots']:
+					dom_tree_node.shadow_roots = []
+					for shadow_root in reversed(node['shadowRoots']):
+						stack.append((shadow_root, child_frames, child_offset, dom_tree_node, _SHADOW_ROOT))
+
+				if 'contentDocument' in node and node['contentDocument']:
+					stack.append((node['contentDocument'], child_frames, child_offset, dom_tree_node, _CONTENT_DOCUMENT))
+
+			if relation == _CHILD:
+				host.children_nodes.append(dom_tree_node)  # type: ignore[union-attr]
+			elif relation == _SHADOW_ROOT:
+				host.shadow_roots.append(dom_tree_node)  # type: ignore[union-attr]
+				# forcefully set the parent node to the shadow root node (helps traverse the tree)
+				dom_tree_node.parent_node = host
+			elif relation == _CONTENT_DOCUMENT:
+				host.content_document = dom_tree_node  # type: ignore[union-attr]
+				# forcefully set the parent node to the content document node (helps traverse the tree)
+				dom_tree_node.parent_node = host
+			else:
+				root_holder.append(dom_tree_node)
 
-				# and adjust the total frame offset by scroll
-				if snapshot_data and snapshot_data.scrollRects:
-					total_frame_offset.x -= snapshot_data.scrollRects.x
-					total_frame_offset.y -= snapshot_data.scrollRects.y
-					# DEBUG: Log iframe scroll information
-					self.logger.debug(
-						f'🔍 DEBUG: HTML frame scroll - scrollY={snapshot_data.scrollRects.y}, scrollX={snapshot_data.scrollRects.x}, frameId={node.get("frameId")}, nodeId={node["nodeId"]}'
-					)
+		return root_holder[0], cross_origin_iframes
 
-			# Calculate new iframe offset for content documents, accounting for iframe scroll
+	def _finish_enhanced_node(
+		self,
+		dom_tree_node: EnhancedDOMTreeNode,
+		node: Node,
+		html_frames: list[EnhancedDOMTreeNode],
+		total_frame_offset: DOMRect,
+		iframe_depth: int,
+		cross_origin_iframes: list[tuple[EnhancedDOMTreeNode, DOMRect]],
+	) -> None:
+		"""Set the visibility of a node after its subtree was built and check whether it is a cross-origin iframe to load."""
+		# Set visibility using the collected HTML frames
+		dom_tree_node.is_visible = self.is_element_visible_according_to_all_parents(dom_tree_node, html_frames)
+
+		# DEBUG: Log visibility info for form elements in iframes
+		if dom_tree_node.tag_name and dom_tree_node.tag_name.upper() in ['INPUT', 'SELECT', 'TEXTAREA', 'LABEL']:
+			attrs = dom_tree_node.attributes or {}
+			elem_id = attrs.get('id', '')
+			elem_name = attrs.get('name', '')
 			if (
-				(node['nodeName'].upper() == 'IFRAME' or node['nodeName'].upper() == 'FRAME')
-				and snapshot_data
-				and snapshot_data.bounds
+				'city' in elem_id.lower()
+				or 'city' in elem_name.lower()
+				or 'state' in elem_id.lower()
+				or 'state' in elem_name.lower()
+				or 'zip' in elem_id.lower()
+				or 'zip' in elem_name.lower()
 			):
-				if snapshot_data.bounds:
-					updated_html_frames.append(dom_tree_node)
+				self.logger.debug(
+					f"🔍 DEBUG: Form element {dom_tree_node.tag_name} id='{elem_id}' name='{elem_name}' - visible={dom_tree_node.is_visible}, bounds={dom_tree_node.snapshot_node.bounds if dom_tree_node.snapshot_node else 'NO_SNAPSHOT'}"
+				)
 
-					total_frame_offset.x += snapshot_data.bounds.x
-					total_frame_offset.y += snapshot_data.bounds.y
+		# handle cross origin iframe (load the DOM tree of its target after the construction pass if it exists in iframes)
+		# only do this if the iframe is visible (otherwise it's not worth it)
+		if not (
+			# TODO: hacky way to disable cross origin iframes for now
+			self.cross_origin_iframes and node['nodeName'].upper() == 'IFRAME' and node.get('contentDocument', None) is None
+		):  # None meaning there is no content
+			return
+
+		# Check iframe depth to prevent infinite recursion
+		if iframe_depth >= self.max_iframe_depth:
+			self.logger.debug(
+				f'Skipping iframe at depth {iframe_depth} to prevent infinite recursion (max depth: {self.max_iframe_depth})'
+			)
+			return
+
+		# First check if the iframe element itself is visible
+		if not dom_tree_node.is_visible:
+			self.logger.debug('Skipping invisible cross-origin iframe')
+			return
+
+		# Check iframe dimensions
+		if not dom_tree_node.snapshot_node or not dom_tree_node.snapshot_node.bounds:
+			self.logger.debug('Skipping cross-origin iframe: no bounds available')
+			return
+
+		# Only process if iframe is at least 50px in both dimensions
+		width, height = dom_tree_node.snapshot_node.bounds.width, dom_tree_node.snapshot_node.bounds.height
+		if width >= 50 and height >= 50:
+			self.logger.debug(f'Processing cross-origin iframe: visible=True, width={width}, height={height}')
+			cross_origin_iframes.append((dom_tree_node, total_frame_offset))
+		else:
+			self.logger.debug(f'Skipping small cross-origin iframe: width={width}, height={height} (needs >= 50px)')
+
+	async def _load_cross_origin_iframes(
+		self, iframes: list[tuple[EnhancedDOMTreeNode, DOMRect]], all_frames: dict | None, iframe_depth: int
+	) -> None:
+		"""Build the DOM trees of cross-origin iframe targets concurrently and attach them as the iframes' content documents.
+
+		Frames whose target can't be found, that time out or fail are skipped (their content document stays empty).
+		"""
+		# Lazy fetch all_frames only when actually needed (for cross-origin iframes)
+		if all_frames is None:
+			all_frames, _ = await self.browser_session.get_all_frames()
 
-			if 'contentDocument' in node and node['contentDocument']:
-				dom_tree_node.content_document = await _construct_enhanced_node(
-					node['contentDocument'], updated_html_frames, total_frame_offset, all_frames
+		if len(iframes) > self.max_iframes:
+			self.logger.warning(
+				f'⚠️ Limiting processing of {len(iframes)} cross-origin iframes to only first {self.max_iframes} to prevent crashes!'
+			)
+			iframes = iframes[: self.max_iframes]
+
+		async def load_iframe(iframe_node: EnhancedDOMTreeNode, total_frame_offset: DOMRect) -> None:
+			# Use pre-fetched all_frames to find the iframe's target (no redundant CDP call)
+			iframe_target = None
+			frame_info = all_frames.get(iframe_node.frame_id) if iframe_node.frame_id else None
+			if frame_info and frame_info.get('frameTargetId'):
+				iframe_target = self.browser_session.session_manager.get_target(frame_info['frameTargetId'])
+			# if target actually exists in one of the frames, just build the dom tree for it
+			if not iframe_target:
+				return
+
+			self.logger.debug(f'Getting content document for iframe {iframe_node.frame_id} at depth {iframe_depth + 1}')
+			try:
+				content_document, _ = await self.get_dom_tree(
+					target_id=iframe_target.target_id,
+					all_frames=all_frames,
+					# TODO: experiment with this values -> not sure whether the whole cross origin iframe should be ALWAYS included as soon as some part of it is visible or not.
+					# Current config: if the cross origin iframe is AT ALL visible, then just include everything inside of it!
+					# initial_html_frames=updated_html_frames,
+					initial_total_frame_offset=total_frame_offset,
+					iframe_depth=iframe_depth + 1,
 				)
-				dom_tree_node.content_document.parent_node = dom_tree_node
-				# forcefully set the parent node to the content document node (helps traverse the tree)
+			except TimeoutError:
+				self.logger.debug(
+					f'Skipping cross-origin iframe {iframe_node.frame_id}: DOM not fetched within {self.iframe_fetch_timeout}s'
+				)
+				return
+			except Exception as e:
+				self.logger.debug(f'Skipping cross-origin iframe {iframe_node.frame_id}: {type(e).__name__}: {e}')
+				return
+			iframe_node.content_document = content_document
+			content_document.parent_node = iframe_node
 
-			if 'shadowRoots' in node and node['shadowRoots']:
-				dom_tree_node.shadow_roots = []
-				for shadow_root in node['shadowRoots']:
-					shadow_root_node = await _construct_enhanced_node(
-						shadow_root, updated_html_frames, total_frame_offset, all_frames
-					)
-					# forcefully set the parent node to the shadow root node (helps traverse the tree)
-					shadow_root_node.parent_node = dom_tree_node
-					dom_tree_node.shadow_roots.append(shadow_root_node)
-
-			if 'children' in node and node['children']:
-				dom_tree_node.children_nodes = []
-				# Build set of shadow root node IDs to filter them out from children
-				shadow_root_node_ids = set()
-				if 'shadowRoots' in node and node['shadowRoots']:
-					for shadow_root in node['shadowRoots']:
-						shadow_root_node_ids.add(shadow_root['nodeId'])
+		await asyncio.gather(*(load_iframe(iframe_node, offset) for iframe_node, offset in iframes))
 
-				for child in node['children']:
-					# Skip shadow roots - they should only be in shadow_roots list
-					if child['nodeId'] in shadow_root_node_ids:
-						continue
-					dom_tree_node.children_nodes.append(
-						await _construct_enhanced_node(child, updated_html_frames, total_frame_offset, all_frames)
-					)
+	def _rebind_enhanced_node(
+		self,
+		root: EnhancedDOMTreeNode,
+		ax_tree_lookup: dict[int, AXNode],
+		snapshot_lookup: Mapping[int, EnhancedSnapshotNode],
+		html_frames: list[EnhancedDOMTreeNode],
+		total_frame_offset: DOMRect,
+		stats: dict[str, int],
+	) -> None:
+		"""Attach fresh AX, snapshot, position and visibility data to an existing enhanced node and its subtree.
+
+		Walks the tree with an explicit stack in the order of `_construct_enhanced_tree` (content document, shadow roots,
+		then children), and like it sets visibility once a node's whole subtree was visited.
+		"""
+		# (node, html frames, frame offset, finished) - a finished entry holds the frames/offset used for its subtree
+		stack: list[tuple[EnhancedDOMTreeNode, list[EnhancedDOMTreeNode], DOMRect, bool]] = [
+			(root, html_frames, total_frame_offset, False)
+		]
+		while stack:
+			node, frames, offset, finished = stack.pop()
+			if finished:
+				node.is_visible = self.is_element_visible_according_to_all_parents(node, frames)
+				continue
 
-			# Set visibility using the collected HTML frames
-			dom_tree_node.is_visible = self.is_element_visible_according_to_all_parents(dom_tree_node, updated_html_frames)
-
-			# DEBUG: Log visibility info for form elements in iframes
-			if dom_tree_node.tag_name and dom_tree_node.tag_name.upper() in ['INPUT', 'SELECT', 'TEXTAREA', 'LABEL']:
-				attrs = dom_tree_node.attributes or {}
-				elem_id = attrs.get('id', '')
-				elem_name = attrs.get('name', '')
-				if (
-					'city' in elem_id.lower()
-					or 'city' in elem_name.lower()
-					or 'state' in elem_id.lower()
-					or 'state' in elem_name.lower()
-					or 'zip' in elem_id.lower()
-					or 'zip' in elem_name.lower()
-				):
-					self.logger.debug(
-						f"🔍 DEBUG: Form element {dom_tree_node.tag_name} id='{elem_id}' name='{elem_name}' - visible={dom_tree_node.is_visible}, bounds={dom_tree_node.snapshot_node.bounds if dom_tree_node.snapshot_node else 'NO_SNAPSHOT'}"
-					)
+			ax_node = ax_tree_lookup.get(node.backend_node_id)
+			node.ax_node = self._build_enhanced_ax_node(ax_node) if ax_node else None
 
-			# handle cross origin iframe (just recursively call the main function with the proper target if it exists in iframes)
-			# only do this if the iframe is visible (otherwise it's not worth it)
+			snapshot_data = snapshot_lookup.get(node.backend_node_id, None)
+			node.snapshot_node = snapshot_data
+			node.absolute_position = self._get_absolute_position(snapshot_data, offset)
+			if snapshot_data is None:
+				stats['nodes_without_snapshot'] += 1
+			else:
+				stats['nodes_with_snapshot'] += 1
+
+			child_frames, child_offset = self._get_child_frame_context(node, frames, offset)
+
+			# pushed in reverse: popped after the subtree is done, then children, shadow roots and content document
+			stack.append((node, child_frames, child_offset, True))
+			for child in reversed((node.shadow_roots or []) + (node.children_nodes or [])):
+				stack.append((child, child_frames, child_offset, False))
+			if node.content_document:
+				stack.append((node.content_document, child_frames, child_offset, False))
+
+	async def _refresh_dom_tree(self, target_id: TargetID) -> tuple[EnhancedDOMTreeNode, dict[str, float]] | None:
+		"""Refresh the DOM tree kept up to date by the mutation tracker instead of rebuilding it.
+
+		Skips `DOM.getDocument` and node construction, only the snapshot, AX tree and viewport are fetched again
+		(CDP can't capture layout for a subtree). Returns None if the cached tree can't be used anymore.
+		"""
+		tracker = self._mutation_tracker
+		assert tracker is not None and tracker.root is not None and tracker.session_id is not None
+
+		timing_info: dict[str, float] = {}
+		timing_start_total = time.time()
+		mutation_count, dirty_count = tracker.mutation_count, len(tracker.dirty_node_ids)
+
+		start_get_trees = time.time()
+		trees = await self._get_all_trees(target_id, include_dom_tree=False)
+		self.last_page_capture = PageCapture(target_id=target_id, title=trees.title, layout_metrics=trees.layout_metrics)
+		timing_info.update(trees.cdp_timing)
+		timing_info['get_all_trees_total_ms'] = (time.time() - start_get_trees) * 1000
+
+		# mutations received while waiting for CDP may have invalidated the tree
+		if not tracker.can_reuse(target_id, tracker.session_id):
+			return None
+
+		start_ax = time.time()
+		ax_tree_lookup: dict[int, AXNode] = {
+			ax_node['backendDOMNodeId']: ax_node for ax_node in trees.ax_tree['nodes'] if 'backendDOMNodeId' in ax_node
+		}
+		timing_info['build_ax_lookup_ms'] = (time.time() - start_ax) * 1000
+
+		start_snapshot = time.time()
+		snapshot_lookup = build_snapshot_lookup(trees.snapshot, trees.device_pixel_ratio)
+		timing_info['build_snapshot_lookup_ms'] = (time.time() - start_snapshot) * 1000
 
-			if (
-				# TODO: hacky way to disable cross origin iframes for now
-				self.cross_origin_iframes and node['nodeName'].upper() == 'IFRAME' and node.get('contentDocument', None) is None
-			):  # None meaning there is no content
-				# Check iframe depth to prevent infinite recursion
-				if iframe_depth >= self.max_iframe_depth:
-					self.logger.debug(
-						f'Skipping iframe at depth {iframe_depth} to prevent infinite recursion (max depth: {self.max_iframe_depth})'
-					)
-				else:
-					# Check if iframe is visible and large enough (>= 50px in both dimensions)
-					should_process_iframe = False
-
-					# First check if the iframe element itself is visible
-					if dom_tree_node.is_visible:
-						# Check iframe dimensions
-						if dom_tree_node.snapshot_node and dom_tree_node.snapshot_node.bounds:
-							bounds = dom_tree_node.snapshot_node.bounds
-							width = bounds.width
-							height = bounds.height
-
-							# Only process if iframe is at least 50px in both dimensions
-							if width >= 50 and height >= 50:
-								should_process_iframe = True
-								self.logger.debug(f'Processing cross-origin iframe: visible=True, width={width}, height={height}')
-							else:
-								self.logger.debug(
-									f'Skipping small cross-origin iframe: width={width}, height={height} (needs >= 50px)'
-								)
-						else:
-							self.logger.debug('Skipping cross-origin iframe: no bounds available')
-					else:
-						self.logger.debug('Skipping invisible cross-origin iframe')
-
-					if should_process_iframe:
-						# Lazy fetch all_frames only when actually needed (for cross-origin iframes)
-						if all_frames is None:
-							all_frames, _ = await self.browser_session.get_all_frames()
-
-						# Use pre-fetched all_frames to find the iframe's target (no redundant CDP call)
-						frame_id = node.get('frameId', None)
-						if frame_id:
-							frame_info = all_frames.get(frame_id)
-							iframe_document_target = None
-							if frame_info and frame_info.get('frameTargetId'):
-								iframe_target_id = frame_info['frameTargetId']
-								iframe_target = self.browser_session.session_manager.get_target(iframe_target_id)
-								if iframe_target:
-									iframe_document_target = {
-										'targetId': iframe_target.target_id,
-										'url': iframe_target.url,
-										'title': iframe_target.title,
-										'type': iframe_target.target_type,
-									}
-						else:
-							iframe_document_target = None
-						# if target actually exists in one of the frames, just recursively build the dom tree for it
-						if iframe_document_target:
-							self.logger.debug(
-								f'Getting content document for iframe {node.get("frameId", None)} at depth {iframe_depth + 1}'
-							)
-							content_document, _ = await self.get_dom_tree(
-								target_id=iframe_document_target['targetId'],
-								all_frames=all_frames,
-								# TODO: experiment with this values -> not sure whether the whole cross origin iframe should be ALWAYS included as soon as some part of it is visible or not.
-								# Current config: if the cross origin iframe is AT ALL visible, then just include everything inside of it!
-								# initial_html_frames=updated_html_frames,
-								initial_total_frame_offset=total_frame_offset,
-								iframe_depth=iframe_depth + 1,
-							)
-
-							dom_tree_node.content_document = content_document
-							dom_tree_node.content_document.parent_node = dom_tree_node
-
-			return dom_tree_node
-
-		# Build enhanced DOM tree recursively
-		# Note: all_frames stays None and will be lazily fetched inside _construct_enhanced_node
-		# only if/when a cross-origin iframe is encountered
 		start_construct = time.time()
-		enhanced_dom_tree_node = await _construct_enhanced_node(
-			dom_tree['root'], initial_html_frames, initial_total_frame_offset, all_frames
+		stats = {'nodes_with_snapshot': 0, 'nodes_without_snapshot': 0}
+		self._rebind_enhanced_node(
+			tracker.root, ax_tree_lookup, snapshot_lookup, [], DOMRect(x=0.0, y=0.0, width=0.0, height=0.0), stats
 		)
 		timing_info['construct_enhanced_tree_ms'] = (time.time() - start_construct) * 1000
 
-		# Calculate total time for get_dom_tree
-		total_get_dom_tree_ms = (time.time() - timing_start_total) * 1000
-		timing_info['get_dom_tree_total_ms'] = total_get_dom_tree_ms
-
-		# Calculate overhead in get_dom_tree (time not accounted for by sub-operations)
-		tracked_sub_operations_ms = (
-			timing_info.get('get_all_trees_total_ms', 0)
-			+ timing_info.get('build_ax_lookup_ms', 0)
-			+ timing_info.get('build_snapshot_lookup_ms', 0)
-			+ timing_info.get('construct_enhanced_tree_ms', 0)
-		)
-		get_dom_tree_overhead_ms = total_get_dom_tree_ms - tracked_sub_operations_ms
-		if get_dom_tree_overhead_ms > 0.1:
-			timing_info['get_dom_tree_overhead_ms'] = get_dom_tree_overhead_ms
+		nodes_without_snapshot = stats['nodes_without_snapshot']
+		untracked_snapshot_nodes = len(snapshot_lookup) - stats['nodes_with_snapshot']
+		if not tracker.is_consistent(nodes_without_snapshot, untracked_snapshot_nodes):
+			return None
+		tracker.mark_refreshed(nodes_without_snapshot, untracked_snapshot_nodes)
 
-		return enhanced_dom_tree_node, timing_info
+		self.logger.debug(f'🔁 Refreshed cached DOM tree incrementally ({mutation_count} mutations, {dirty_count} dirty nodes)')
+		timing_info['get_dom_tree_total_ms'] = (time.time() - timing_start_total) * 1000
+		return tracker.root, timing_info
 
 	@observe_debug(ignore_input=True, ignore_output=True, name='get_serialized_dom_tree')
 	async def get_serialized_dom_tree(
@@ -771,12 +1005,24 @@ class DomService:
 
 		session_id = self.browser_session.id
 
-		# Build DOM tree (includes CDP calls for snapshot, DOM, AX tree)
-		# Note: all_frames is fetched lazily inside get_dom_tree only if cross-origin iframes need it
-		enhanced_dom_tree, dom_tree_timing = await self.get_dom_tree(
-			target_id=self.browser_session.agent_focus_target_id,
-			all_frames=None,  # Lazy - will fetch if needed
-		)
+		# In incremental mode, refresh the tree patched from DOM mutation events if it is still in sync with the page
+		refreshed = None
+		tracker = self._mutation_tracker
+		if tracker is not None and tracker.session_id is not None:
+			target_id = self.browser_session.agent_focus_target_id
+			cdp_session = await self.browser_session.get_or_create_cdp_session(target_id, focus=False)
+			if tracker.can_reuse(target_id, cdp_session.session_id):
+				refreshed = await self._refresh_dom_tree(target_id)
+
+		if refreshed is not None:
+			enhanced_dom_tree, dom_tree_timing = refreshed
+		else:
+			# Build DOM tree (includes CDP calls for snapshot, DOM, AX tree)
+			# Note: all_frames is fetched lazily inside get_dom_tree only if cross-origin iframes need it
+			enhanced_dom_tree, dom_tree_timing = await self.get_dom_tree(
+				target_id=self.browser_session.agent_focus_target_id,
+				all_frames=None,  # Lazy - will fetch if needed
+			)
 
 		# Add sub-timings from DOM tree construction
 		timing_info.update(dom_tree_timing)
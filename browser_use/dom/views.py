@@ -8,6 +8,7 @@ from cdp_use.cdp.accessibility.types import AXPropertyName
 from cdp_use.cdp.dom.commands import GetDocumentReturns
 from cdp_use.cdp.dom.types import ShadowRootType
 from cdp_use.cdp.domsnapshot.commands import CaptureSnapshotReturns
+from cdp_use.cdp.page.commands import GetLayoutMetricsReturns
 from cdp_use.cdp.target.types import SessionID, TargetID, TargetInfo
 from uuid_extensions import uuid7str
 
@@ -144,20 +145,22 @@ class CurrentPageTargets:
 @dataclass
 class TargetAllTrees:
 	snapshot: CaptureSnapshotReturns
-	dom_tree: GetDocumentReturns
+	dom_tree: GetDocumentReturns | None
 	ax_tree: GetFullAXTreeReturns
 	device_pixel_ratio: float
 	cdp_timing: dict[str, float]
+	title: str | None = None
+	layout_metrics: GetLayoutMetricsReturns | None = None
 
 
 @dataclass(slots=True)
-class PropagatingBounds:
-	"""Track bounds that propagate from parent elements to filter children."""
+class PageCapture:
+	"""Page level data fetched together with the DOM trees of a page, so the browser state needs no extra CDP calls."""
 
-	tag: str  # The tag that started propagation ('a' or 'button')
-	bounds: 'DOMRect'  # The bounding box
-	node_id: int  # Node ID for debugging
-	depth: int  # How deep in tree this started (for debugging)
+	target_id: TargetID
+	title: str | None
+	"""`document.title` at capture time (fresher than the cached target info)"""
+	layout_metrics: GetLayoutMetricsReturns | None
 
 
 @dataclass(slots=True)
@@ -391,6 +394,11 @@ class EnhancedDOMTreeNode:
 
 	uuid: str = field(default_factory=uuid7str)
 
+	# Memoized identity hashes (see `__hash__` / `parent_branch_hash`), filled lazily once per tree build
+	_branch_path: str | None = field(default=None, repr=False, compare=False)
+	_element_hash: int | None = field(default=None, repr=False, compare=False)
+	_parent_branch_hash: int | None = field(default=None, repr=False, compare=False)
+
 	@property
 	def parent(self) -> 'EnhancedDOMTreeNode | None':
 		return self.parent_node
@@ -760,46 +768,60 @@ class EnhancedDOMTreeNode:
 		"""
 		Hash the element based on its parent branch path and attributes.
 
+		The value is memoized on the node, the branch path is derived from the (memoized) parent path,
+		so hashing every node of a tree is linear instead of walking the parent chain each time.
+
 		TODO: migrate this to use only backendNodeId + current SessionId
 		"""
-
-		# Get parent branch path
-		parent_branch_path = self._get_parent_branch_path()
-		parent_branch_path_string = '/'.join(parent_branch_path)
+		if self._element_hash is not None:
+			return self._element_hash
 
 		attributes_string = ''.join(
 			f'{k}={v}' for k, v in sorted((k, v) for k, v in self.attributes.items() if k in STATIC_ATTRIBUTES)
 		)
 
 		# Combine both for final hash
-		combined_string = f'{parent_branch_path_string}|{attributes_string}'
-		element_hash = hashlib.sha256(combined_string.encode()).hexdigest()
-
-		# Convert to int for __hash__ return type - use first 16 chars and convert from hex to int
-		return int(element_hash[:16], 16)
+		combined_string = f'{self._get_parent_branch_path_string()}|{attributes_string}'
+		self._element_hash = _sha256_to_int(combined_string)
+		return self._element_hash
 
 	def parent_branch_hash(self) -> int:
 		"""
 		Hash the element based on its parent branch path and attributes.
 		"""
-		parent_branch_path = self._get_parent_branch_path()
-		parent_branch_path_string = '/'.join(parent_branch_path)
-		element_hash = hashlib.sha256(parent_branch_path_string.encode()).hexdigest()
-
-		return int(element_hash[:16], 16)
+		if self._parent_branch_hash is None:
+			self._parent_branch_hash = _sha256_to_int(self._get_parent_branch_path_string())
+		return self._parent_branch_hash
 
 	def _get_parent_branch_path(self) -> list[str]:
 		"""Get the parent branch path as a list of tag names from root to current element."""
-		parents: list['EnhancedDOMTreeNode'] = []
-		current_element: 'EnhancedDOMTreeNode | None' = self
+		path = self._get_parent_branch_path_string()
+		return path.split('/') if path else []
 
-		while current_element is not None:
-			if current_element.node_type == NodeType.ELEMENT_NODE:
-				parents.append(current_element)
-			current_element = current_element.parent_node
+	def _get_parent_branch_path_string(self) -> str:
+		"""Get the '/'-joined tag names of all element ancestors (including self), memoized on every node along the way."""
+		if self._branch_path is not None:
+			return self._branch_path
+
+		# Walk up only until the first ancestor that already knows its path, then fill in top-down (no recursion)
+		uncached: list[EnhancedDOMTreeNode] = []
+		current: EnhancedDOMTreeNode | None = self
+		while current is not None and current._branch_path is None:
+			uncached.append(current)
+			current = current.parent_node
+
+		path = current._branch_path if current is not None else ''
+		for node in reversed(uncached):
+			if node.node_type == NodeType.ELEMENT_NODE:
+				path = f'{path}/{node.tag_name}' if path else node.tag_name
+			node._branch_path = path
 
-		parents.reverse()
-		return [parent.tag_name for parent in parents]
+		return path
+
+
+def _sha256_to_int(value: str) -> int:
+	# Convert to int for __hash__ return type - use first 16 chars and convert from hex to int
+	return int(hashlib.sha256(value.encode()).hexdigest()[:16], 16)
 
 
 DOMSelectorMap = dict[int, EnhancedDOMTreeNode]
@@ -812,12 +834,32 @@ class SerializedDOMState:
 
 	selector_map: DOMSelectorMap
 
+	_element_hash_index: dict[int, int] | None = field(default=None, repr=False, compare=False)
+	"""element_hash -> selector_map index, built on first lookup (see `find_element_by_hash`)"""
+
+	def find_element_by_hash(self, element_hash: int) -> tuple[int, EnhancedDOMTreeNode] | None:
+		"""Find the (index, element) in the selector map whose `element_hash` matches, in O(1) after the first call."""
+		if self._element_hash_index is None:
+			self._element_hash_index = {}
+			for index, element in self.selector_map.items():
+				# keep the first match, same as a linear scan over the selector map would
+				self._element_hash_index.setdefault(element.element_hash, index)
+
+		index = self._element_hash_index.get(element_hash)
+		if index is None or index not in self.selector_map:
+			return None
+		return index, self.selector_map[index]
+
 	@observe_debug(ignore_input=True, ignore_output=True, name='llm_representation')
 	def llm_representation(
 		self,
 		include_attributes: list[str] | None = None,
+		max_chars: int | None = None,
 	) -> str:
-		"""Kinda ugly, but leaving this as an internal method because include_attributes are a parameter on the agent, so we need to leave it as a 2 step process"""
+		"""Kinda ugly, but leaving this as an internal method because include_attributes are a parameter on the agent, so we need to leave it as a 2 step process
+
+		With `max_chars` serialization stops once that many characters are written (same as slicing the full output).
+		"""
 		from browser_use.dom.serializer.serializer import DOMTreeSerializer
 
 		if not self._root:
@@ -825,7 +867,7 @@ class SerializedDOMState:
 
 		include_attributes = include_attributes or DEFAULT_INCLUDE_ATTRIBUTES
 
-		return DOMTreeSerializer.serialize_tree(self._root, include_attributes)
+		return DOMTreeSerializer.serialize_tree(self._root, include_attributes, max_chars=max_chars)
 
 	@observe_debug(ignore_input=True, ignore_output=True, name='eval_representation')
 	def eval_representation(
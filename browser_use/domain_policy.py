@@ -0,0 +1,243 @@
+"""
+Compiled domain pattern matching, shared by the SecurityWatchdog and the Registry action filters.
+
+allowed_domains / prohibited_domains, the `domains` of registered actions and the domain keys of `sensitive_data` are
+lists of patterns that used to be matched one by one (with fnmatch) against every URL. They are now compiled once per
+distinct list:
+
+- exact hosts go into a hash set,
+- `*.example.com` patterns go into a trie of reversed domain labels (com -> example), so a host is looked up in as many
+  steps as it has labels, however many patterns there are,
+- the remaining globs are combined into one regex,
+- verdicts are cached per (scheme, host) in a small LRU, agents keep visiting the same few hosts.
+
+The two pattern dialects keep their exact semantics:
+
+- `UrlPatternMatcher`: `match_url_with_domain_pattern()`, used for action domains and sensitive_data. No scheme means
+  https only, unsafe globs (*.*.example.com, example.*, g*e.com) never match.
+- `DomainListMatcher`: allowed_domains / prohibited_domains of the SecurityWatchdog. Domains match any scheme (root
+  domains also match www.), *.example.com matches http(s) only, patterns with a scheme are URL prefixes or URL globs.
+"""
+
+import fnmatch
+import logging
+import re
+from collections import OrderedDict
+from collections.abc import Iterable
+from functools import lru_cache
+from urllib.parse import urlparse
+
+from browser_use.utils import build_trie_regex, is_new_tab_page
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a suffix in the reversed label trie (None can't collide with a label, empty labels included)
+_SUFFIX_END = None
+
+_GLOB_CHARS = ('*', '?', '[')
+
+
+def is_root_domain(domain: str) -> bool:
+	"""Check if a domain is a simple root domain (domain.tld), without wildcards or scheme"""
+	if '*' in domain or '://' in domain:
+		return False
+	return domain.count('.') == 1
+
+
+def _glob_regex(patterns: list[str]) -> re.Pattern[str] | None:
+	"""One regex matching a whole string against any of the fnmatch patterns"""
+	if not patterns:
+		return None
+	return re.compile('|'.join(fnmatch.translate(pattern) for pattern in dict.fromkeys(patterns)))
+
+
+def _cache_verdict(cache: OrderedDict, key: tuple[str, str], verdict: bool, max_size: int) -> None:
+	cache[key] = verdict
+	if len(cache) > max_size:
+		cache.popitem(last=False)
+
+
+class _HostIndex:
+	"""Exact hosts, suffixes (the suffix itself and its subdomains) and host globs"""
+
+	def __init__(self) -> None:
+		self.match_all = False
+		self.exact: set[str] = set()
+		self.suffixes: dict = {}
+		self.globs: list[str] = []
+		self.glob_regex: re.Pattern[str] | None = None
+
+	def add_suffix(self, suffix: str) -> None:
+		node = self.suffixes
+		for label in reversed(suffix.split('.')):
+			node = node.setdefault(label, {})
+		node[_SUFFIX_END] = True
+
+	def compile(self) -> None:
+		self.glob_regex = _glob_regex(self.globs)
+
+	def matches(self, host: str) -> bool:
+		if self.match_all or host in self.exact:
+			return True
+		if self.suffixes:
+			node = self.suffixes
+			for label in reversed(host.split('.')):
+				node = node.get(label)
+				if node is None:
+					break
+				if _SUFFIX_END in node:
+					return True
+		return self.glob_regex is not None and self.glob_regex.match(host) is not None
+
+
+class UrlPatternMatcher:
+	"""Compiled `match_url_with_domain_pattern()` over a list of patterns: a URL matches if any pattern matches it"""
+
+	def __init__(self, patterns: Iterable[str], cache_size: int = 1024):
+		self.patterns = tuple(patterns)
+		self._cache_size = cache_size
+		self._verdicts: OrderedDict[tuple[str, str], bool] = OrderedDict()
+		# Patterns grouped by their scheme glob ('https' when the pattern has no scheme)
+		self._hosts_by_scheme: dict[str, _HostIndex] = {}
+		self._unsafe_pattern_errors: list[str] = []
+
+		for pattern in self.patterns:
+			self._add_pattern(pattern.lower())
+		for index in self._hosts_by_scheme.values():
+			index.compile()
+
+	def _add_pattern(self, pattern: str) -> None:
+		if '://' in pattern:
+			scheme_pattern, pattern_domain = pattern.split('://', 1)
+		else:
+			scheme_pattern, pattern_domain = 'https', pattern  # Default to matching only https for security
+
+		# Ports are stripped from patterns, only the hostname of URLs is compared
+		if ':' in pattern_domain and not pattern_domain.startswith(':'):
+			pattern_domain = pattern_domain.split(':', 1)[0]
+
+		index = self._hosts_by_scheme.setdefault(scheme_pattern, _HostIndex())
+		if pattern_domain == '*':
+			index.match_all = True
+			return
+		index.exact.add(pattern_domain)
+		if '*' not in pattern_domain:
+			return
+
+		# Unsafe glob patterns never match
+		if pattern_domain.count('*.') > 1 or pattern_domain.count('.*') > 1:
+			self._unsafe_pattern_errors.append(f'⛔️ Multiple wildcards in pattern=[{pattern}] are not supported')
+		elif pattern_domain.endswith('.*'):
+			self._unsafe_pattern_errors.append(f'⛔️ Wildcard TLDs like in pattern=[{pattern}] are not supported for security')
+		elif '*' in pattern_domain.replace('*.', ''):
+			self._unsafe_pattern_errors.append(f'⛔️ Only *.domain style patterns are supported, ignoring pattern=[{pattern}]')
+		elif pattern_domain.startswith('*.') and not any(char in pattern_domain[2:] for char in _GLOB_CHARS):
+			# *.google.com also matches bare google.com
+			index.add_suffix(pattern_domain[2:])
+		else:
+			if pattern_domain.startswith('*.'):
+				index.globs.append(pattern_domain[2:])
+			index.globs.append(pattern_domain)
+
+	def matches(self, url: str, log_warnings: bool = False) -> bool:
+		"""Check if the URL matches any of the patterns (new tab pages never match, handle them at the callsite)"""
+		try:
+			if is_new_tab_page(url):
+				return False
+
+			parsed_url = urlparse(url)
+			scheme = parsed_url.scheme.lower() if parsed_url.scheme else ''
+			domain = parsed_url.hostname.lower() if parsed_url.hostname else ''
+			if not scheme or not domain:
+				return False
+
+			key = (scheme, domain)
+			verdict = self._verdicts.get(key)
+			if verdict is not None:
+				self._verdicts.move_to_end(key)
+				return verdict
+
+			if log_warnings:
+				for error in self._unsafe_pattern_errors:
+					logger.error(error)
+			verdict = any(
+				fnmatch.fnmatch(scheme, scheme_pattern) and index.matches(domain)
+				for scheme_pattern, index in self._hosts_by_scheme.items()
+			)
+			_cache_verdict(self._verdicts, key, verdict, self._cache_size)
+			return verdict
+		except Exception as e:
+			logger.error(f'⛔️ Error matching URL {url} with patterns {list(self.patterns)}: {type(e).__name__}: {e}')
+			return False
+
+
+class DomainListMatcher:
+	"""Compiled allowed_domains / prohibited_domains list: a URL matches if any pattern matches it"""
+
+	def __init__(self, patterns: Iterable[str], cache_size: int = 4096):
+		self.patterns = tuple(patterns)
+		self.has_globs = False
+		self._cache_size = cache_size
+		self._verdicts: OrderedDict[tuple[str, str], bool] = OrderedDict()
+		self._any_scheme_hosts = _HostIndex()  # example.com (+ www.example.com) and host globs
+		self._web_hosts = _HostIndex()  # *.example.com, http(s) URLs only
+
+		scheme_host_globs: list[str] = []  # http*://example.com, matched against scheme://host
+		url_globs: list[str] = []  # brave://*, http*://example.com/*, matched against the whole URL
+		url_prefixes: list[str] = []  # https://example.com/path, exact URL prefix
+		for pattern in self.patterns:
+			if '*' in pattern:
+				self.has_globs = True
+				if pattern.startswith('*.'):
+					self._web_hosts.add_suffix(pattern[2:])
+				elif pattern.endswith('/*'):
+					url_globs.append(pattern)
+				elif '://' in pattern:
+					scheme_host_globs.append(pattern)
+				else:
+					self._any_scheme_hosts.globs.append(pattern)
+			elif '://' in pattern:
+				url_prefixes.append(pattern)
+			else:
+				# Domain-only patterns are case-insensitive, root domains also match their www subdomain
+				self._any_scheme_hosts.exact.add(pattern.lower())
+				if is_root_domain(pattern):
+					self._any_scheme_hosts.exact.add(f'www.{pattern.lower()}')
+
+		self._any_scheme_hosts.compile()
+		self._scheme_host_regex = _glob_regex(scheme_host_globs)
+		self._url_regex = _glob_regex(url_globs)
+		self._url_prefix_regex = re.compile(build_trie_regex(url_prefixes)) if url_prefixes else None
+
+	def matches(self, url: str, host: str, scheme: str) -> bool:
+		"""Check if the URL (with its parsed hostname and scheme) matches any of the patterns"""
+		if self._url_prefix_regex is not None and self._url_prefix_regex.match(url) is not None:
+			return True
+		if self._url_regex is not None and self._url_regex.match(url) is not None:
+			return True
+
+		key = (scheme, host)
+		verdict = self._verdicts.get(key)
+		if verdict is not None:
+			self._verdicts.move_to_end(key)
+			return verdict
+
+		verdict = (
+			self._any_scheme_hosts.matches(host)
+			or (scheme in ('http', 'https') and self._web_hosts.matches(host))
+			or (self._scheme_host_regex is not None and self._scheme_host_regex.match(f'{scheme}://{host}') is not None)
+		)
+		_cache_verdict(self._verdicts, key, verdict, self._cache_size)
+		return verdict
+
+
+@lru_cache(maxsize=256)
+def get_url_pattern_matcher(patterns: tuple[str, ...]) -> UrlPatternMatcher:
+	"""Compiled `match_url_with_domain_pattern()` matcher, built once per distinct tuple of patterns"""
+	return UrlPatternMatcher(patterns)
+
+
+@lru_cache(maxsize=16)
+def get_domain_list_matcher(patterns: tuple[str, ...]) -> DomainListMatcher:
+	"""Compiled allowed_domains / prohibited_domains matcher, built once per distinct tuple of patterns"""
+	return DomainListMatcher(patterns)
@@ -1,5 +1,5 @@
 import json
-from typing import overload
+from typing import cast, overload
 
 from anthropic.types import (
 	Base64ImageSourceParam,
@@ -23,6 +23,9 @@ from browser_use.llm.messages import (
 
 NonSystemMessage = UserMessage | AssistantMessage
 
+# Anthropic only caches prompts of at least 1024 tokens, shorter prefixes don't get their own cache breakpoint
+MIN_CACHE_PREFIX_CHARS = 4096
+
 
 class AnthropicMessageSerializer:
 	"""Serializer for converting between custom message types and Anthropic message param types."""
@@ -131,6 +134,41 @@ class AnthropicMessageSerializer:
 
 		return serialized_blocks
 
+	@staticmethod
+	def _add_prefix_cache_breakpoint(
+		content: str | list[TextBlockParam | ImageBlockParam], prefix_length: int, cached_prefix_length: int | None = None
+	) -> str | list[TextBlockParam | ImageBlockParam]:
+		"""Split the first text block at prefix_length and cache the prefix, which stays unchanged in the next request.
+
+		The block is also split at cached_prefix_length, where the previous request's breakpoint was: cache hits are
+		only looked up at block boundaries.
+		"""
+		if prefix_length < MIN_CACHE_PREFIX_CHARS:
+			return content
+		blocks: list[TextBlockParam | ImageBlockParam] = (
+			[TextBlockParam(text=content, type='text')] if isinstance(content, str) else list(content)
+		)
+		if not blocks or blocks[0]['type'] != 'text':
+			return content
+		first = cast(TextBlockParam, blocks[0])
+		text = first['text']
+		if len(text) <= prefix_length:
+			return content
+		prefix_blocks: list[TextBlockParam] = []
+		start = 0
+		if cached_prefix_length and MIN_CACHE_PREFIX_CHARS <= cached_prefix_length < prefix_length:
+			prefix_blocks.append(TextBlockParam(text=text[:cached_prefix_length], type='text'))
+			start = cached_prefix_length
+		prefix_blocks.append(
+			TextBlockParam(
+				text=text[start:prefix_length], type='text', cache_control=CacheControlEphemeralParam(type='ephemeral')
+			)
+		)
+		rest_block = TextBlockParam(text=text[prefix_length:], type='text')
+		if first.get('cache_control'):
+			rest_block['cache_control'] = first['cache_control']
+		return [*prefix_blocks, rest_block, *blocks[1:]]
+
 	@staticmethod
 	def _serialize_tool_calls_to_content(tool_calls, use_cache: bool = False) -> list[ToolUseBlockParam]:
 		"""Convert tool calls to Anthropic's ToolUseBlockParam format."""
@@ -179,6 +217,10 @@ class AnthropicMessageSerializer:
 		"""
 		if isinstance(message, UserMessage):
 			content = AnthropicMessageSerializer._serialize_content(message.content, use_cache=message.cache)
+			if message.cache and message.cache_prefix_length:
+				content = AnthropicMessageSerializer._add_prefix_cache_breakpoint(
+					content, message.cache_prefix_length, message.cached_prefix_length
+				)
 			return MessageParam(role='user', content=content)
 
 		elif isinstance(message, SystemMessage):
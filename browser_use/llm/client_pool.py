@@ -0,0 +1,242 @@
+"""
+Shared pool of long-lived LLM SDK clients.
+
+The chat models used to build a fresh SDK client (and with it a fresh httpx connection pool) on every `ainvoke`,
+paying a new TLS handshake per agent step. The pool caches one client per provider and connection config, so
+connections are kept alive and reused across steps, agents and chat model instances.
+
+Clients are cached per event loop (httpx connections are bound to the loop that opened them) and are closed
+when the last agent using the loop's pool shuts down, see `LLMClientPool.retain()` / `LLMClientPool.release()`.
+"""
+
+import asyncio
+import hashlib
+import importlib.util
+import inspect
+import logging
+import os
+import weakref
+from collections.abc import Callable, Hashable, Mapping
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# params that must never be kept around in plain text as part of a cache key
+_SECRET_PARAMS = {'api_key', 'auth_token', 'aws_access_key', 'aws_secret_key', 'aws_session_token'}
+
+# env vars httpx picks proxies up from (trust_env=True), a changed proxy needs a new connection pool
+_PROXY_ENV_VARS = ('HTTP_PROXY', 'HTTPS_PROXY', 'ALL_PROXY', 'NO_PROXY', 'http_proxy', 'https_proxy', 'all_proxy', 'no_proxy')
+
+# HTTP/2 needs the optional `h2` package (pip install httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+
+@dataclass
+class ClientPoolStats:
+	"""Connection reuse statistics for one provider."""
+
+	clients_created: int = 0
+	clients_reused: int = 0
+	clients_closed: int = 0
+	requests: int = 0
+
+	@property
+	def requests_per_client(self) -> float:
+		"""Average number of requests sent over each client's connection pool."""
+		return self.requests / self.clients_created if self.clients_created else 0.0
+
+
+@dataclass
+class _PooledClient:
+	client: Any
+	provider: str
+	owns_http_client: bool
+	key_objects: tuple[Any, ...]
+	"""Kept so objects fingerprinted by id() stay alive (and their id unique) while the client is cached"""
+
+
+@dataclass
+class _LoopClients:
+	clients: dict[Hashable, _PooledClient] = field(default_factory=dict)
+	users: int = 0
+
+
+def _fingerprint(value: Any) -> Hashable:
+	"""Turn a client parameter into a hashable, comparable cache key component."""
+	if value is None or isinstance(value, (str, int, float, bool, bytes)):
+		return value
+	if isinstance(value, httpx.URL):
+		return str(value)
+	if isinstance(value, httpx.Timeout):
+		return ('timeout', value.connect, value.read, value.write, value.pool)
+	if isinstance(value, Mapping):
+		return tuple(sorted((str(k), _fingerprint(v)) for k, v in value.items()))
+	if isinstance(value, (list, tuple, set, frozenset)):
+		return tuple(_fingerprint(v) for v in value)
+	# http clients, credentials objects, sentinels, ...: only identical objects can share a client
+	return ('object', id(value))
+
+
+def _hash_secret(value: Any) -> str:
+	return hashlib.sha256(str(value).encode()).hexdigest()
+
+
+class LLMClientPool:
+	"""Caches LLM SDK clients by (provider, connection params) so their connection pools are reused."""
+
+	def __init__(
+		self,
+		max_connections: int = 100,
+		max_keepalive_connections: int = 20,
+		keepalive_expiry: float = 60.0,
+		http2: bool = HTTP2_AVAILABLE,
+	):
+		self.limits = httpx.Limits(
+			max_connections=max_connections,
+			max_keepalive_connections=max_keepalive_connections,
+			keepalive_expiry=keepalive_expiry,
+		)
+		self.http2 = http2
+		self._loops: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopClients] = weakref.WeakKeyDictionary()
+		self._no_loop = _LoopClients()
+		self._stats: dict[str, ClientPoolStats] = {}
+
+	def _loop_clients(self) -> _LoopClients:
+		try:
+			loop = asyncio.get_running_loop()
+		except RuntimeError:
+			return self._no_loop
+		loop_clients = self._loops.get(loop)
+		if loop_clients is None:
+			loop_clients = self._loops[loop] = _LoopClients()
+		return loop_clients
+
+	def _provider_stats(self, provider: str) -> ClientPoolStats:
+		stats = self._stats.get(provider)
+		if stats is None:
+			stats = self._stats[provider] = ClientPoolStats()
+		return stats
+
+	@staticmethod
+	def make_key(provider: str, client_class: Any, params: Mapping[str, Any]) -> Hashable:
+		"""Build the cache key for a client: provider, SDK class, connection params (secrets hashed) and proxy env."""
+		key_params = tuple(
+			sorted(
+				(name, _hash_secret(value) if name in _SECRET_PARAMS else _fingerprint(value)) for name, value in params.items()
+			)
+		)
+		proxy_env = tuple((name, os.environ[name]) for name in _PROXY_ENV_VARS if name in os.environ)
+		return (provider, _fingerprint(client_class), key_params, proxy_env)
+
+	def get_client(
+		self,
+		provider: str,
+		client_class: Callable[..., T],
+		params: Mapping[str, Any],
+		factory: Callable[[], T] | None = None,
+	) -> T:
+		"""Return the pooled client for these params, creating it on first use.
+
+		Args:
+			provider: Provider name, used for the cache key and the statistics
+			client_class: SDK client class, called with `params` plus a pooled `http_client` unless `factory` is given
+			params: Every parameter that affects the client (base url, api key, timeout, headers, ...)
+			factory: Custom client constructor for SDKs that don't take an httpx `http_client`
+		"""
+		loop_clients = self._loop_clients()
+		key = self.make_key(provider, client_class, params)
+		stats = self._provider_stats(provider)
+
+		pooled = loop_clients.clients.get(key)
+		if pooled is not None:
+			stats.clients_reused += 1
+			return pooled.client
+
+		if factory is not None:
+			client = factory()
+		else:
+			client = client_class(**self.with_http_client(provider, dict(params)))
+		# a user supplied http client belongs to the user, we must not close it
+		loop_clients.clients[key] = _PooledClient(
+			client=client, provider=provider, owns_http_client='http_client' not in params, key_objects=(client_class, params)
+		)
+		stats.clients_created += 1
+		logger.debug(f'🔌 Created pooled {provider} LLM client ({len(loop_clients.clients)} pooled clients)')
+		return client
+
+	def http_client_kwargs(self, provider: str) -> dict[str, Any]:
+		"""httpx client settings for pooled clients: bounded keep-alive pool, HTTP/2 (if available) and request stats."""
+		stats = self._provider_stats(provider)
+
+		async def count_request(request: httpx.Request) -> None:
+			stats.requests += 1
+
+		return {
+			'limits': self.limits,
+			'http2': self.http2,
+			'follow_redirects': True,
+			'event_hooks': {'request': [count_request]},
+		}
+
+	def create_http_client(self, provider: str, **kwargs: Any) -> httpx.AsyncClient:
+		"""Create an httpx client for a pooled SDK client, `kwargs` override the pool defaults."""
+		return httpx.AsyncClient(**{**self.http_client_kwargs(provider), **kwargs})
+
+	def with_http_client(self, provider: str, params: dict[str, Any], **http_client_kwargs: Any) -> dict[str, Any]:
+		"""Add a pooled http client to SDK client params, unless the user passed their own `http_client`."""
+		if params.get('http_client') is not None:
+			return params
+		return {**params, 'http_client': self.create_http_client(provider, **http_client_kwargs)}
+
+	def get_stats(self) -> dict[str, ClientPoolStats]:
+		"""Connection reuse statistics per provider."""
+		return dict(self._stats)
+
+	def retain(self) -> None:
+		"""Register a user (e.g. a running agent) of the current event loop's clients."""
+		self._loop_clients().users += 1
+
+	async def release(self) -> None:
+		"""Unregister a user, closing the current event loop's clients once nobody uses them anymore."""
+		loop_clients = self._loop_clients()
+		loop_clients.users = max(0, loop_clients.users - 1)
+		if loop_clients.users == 0:
+			await self.aclose()
+
+	async def aclose(self) -> None:
+		"""Close all clients pooled for the current event loop."""
+		loop_clients = self._loop_clients()
+		pooled_clients = list(loop_clients.clients.values())
+		loop_clients.clients.clear()
+
+		for pooled in pooled_clients:
+			if pooled.owns_http_client:
+				try:
+					await _close_client(pooled.client)
+				except Exception as e:
+					logger.debug(f'Failed to close pooled {pooled.provider} LLM client: {type(e).__name__}: {e}')
+			self._provider_stats(pooled.provider).clients_closed += 1
+
+
+async def _close_client(client: Any) -> None:
+	"""Close an SDK client, whichever close method flavour it has."""
+	aio = getattr(client, 'aio', None)  # google genai keeps its async client under .aio
+	for target in (client, aio):
+		if target is None:
+			continue
+		for method_name in ('aclose', 'close'):
+			close = getattr(target, method_name, None)
+			if close is None:
+				continue
+			result = close()
+			if inspect.isawaitable(result):
+				await result
+			break
+
+
+llm_client_pool = LLMClientPool()
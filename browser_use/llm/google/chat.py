@@ -13,6 +13,7 @@ from google.genai.types import MediaModality
 from pydantic import BaseModel
 
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.client_pool import llm_client_pool
 from browser_use.llm.exceptions import ModelProviderError
 from browser_use.llm.google.serializer import GoogleMessageSerializer
 from browser_use.llm.messages import BaseMessage
@@ -105,9 +106,6 @@ class ChatGoogle(BaseChatModel):
 	location: str | None = None
 	http_options: types.HttpOptions | types.HttpOptionsDict | None = None
 
-	# Internal client cache to prevent connection issues
-	_client: genai.Client | None = None
-
 	# Static
 	@property
 	def provider(self) -> str:
@@ -137,17 +135,13 @@ class ChatGoogle(BaseChatModel):
 
 	def get_client(self) -> genai.Client:
 		"""
-		Returns a genai.Client instance.
+		Returns a pooled genai.Client instance, shared by all instances with the same client parameters.
 
 		Returns:
 			genai.Client: An instance of the Google genai client.
 		"""
-		if self._client is not None:
-			return self._client
-
 		client_params = self._get_client_params()
-		self._client = genai.Client(**client_params)
-		return self._client
+		return llm_client_pool.get_client(self.provider, genai.Client, client_params, lambda: genai.Client(**client_params))
 
 	@property
 	def name(self) -> str:
@@ -139,6 +139,16 @@ class UserMessage(_MessageBase):
 	content: str | list[ContentPartTextParam | ContentPartImageParam]
 	"""The contents of the user message."""
 
+	cache_prefix_length: int | None = None
+	"""Number of leading characters of the (first) text content that stay unchanged in the next request.
+	Serializers that support prompt caching can place an additional cache breakpoint there.
+	"""
+
+	cached_prefix_length: int | None = None
+	"""The previous request's `cache_prefix_length`, if that prefix is unchanged in this request.
+	Serializers split the text there, so the prefix cached by the previous request ends on a block boundary.
+	"""
+
 	name: str | None = None
 	"""An optional name for the participant.
 
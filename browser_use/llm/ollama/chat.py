@@ -8,6 +8,7 @@ from ollama import Options
 from pydantic import BaseModel
 
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.client_pool import llm_client_pool
 from browser_use.llm.exceptions import ModelProviderError
 from browser_use.llm.messages import BaseMessage
 from browser_use.llm.ollama.serializer import OllamaMessageSerializer
@@ -49,9 +50,19 @@ class ChatOllama(BaseChatModel):
 
 	def get_client(self) -> OllamaAsyncClient:
 		"""
-		Returns an OllamaAsyncClient client.
+		Returns a pooled OllamaAsyncClient client, shared by all instances with the same client parameters.
 		"""
-		return OllamaAsyncClient(host=self.host, timeout=self.timeout, **self.client_params or {})
+		client_params = self.client_params or {}
+		return llm_client_pool.get_client(
+			self.provider,
+			OllamaAsyncClient,
+			self._get_client_params(),
+			lambda: OllamaAsyncClient(
+				host=self.host,
+				timeout=self.timeout,
+				**{**llm_client_pool.http_client_kwargs(self.provider), **client_params},
+			),
+		)
 
 	@property
 	def name(self) -> str:
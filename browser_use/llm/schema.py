@@ -2,10 +2,17 @@
 Utilities for creating optimized Pydantic schemas for LLM usage.
 """
 
+import copy
+import weakref
 from typing import Any
 
 from pydantic import BaseModel
 
+# model class -> (remove_min_items, remove_defaults) -> optimized schema
+_optimized_schema_cache: weakref.WeakKeyDictionary[type[BaseModel], dict[tuple[bool, bool], dict[str, Any]]] = (
+	weakref.WeakKeyDictionary()
+)
+
 
 class SchemaOptimizer:
 	@staticmethod
@@ -19,6 +26,9 @@ class SchemaOptimizer:
 		Create the most optimized schema by flattening all $ref/$defs while preserving
 		FULL descriptions and ALL action definitions. Also ensures OpenAI strict mode compatibility.
 
+		The schema is computed once per model class and options, every call returns a deep copy of it
+		(the providers adjust the returned schema in place).
+
 		Args:
 			model: The Pydantic model to optimize
 			remove_min_items: If True, remove minItems from the schema
@@ -27,6 +37,26 @@ class SchemaOptimizer:
 		Returns:
 			Optimized schema with all $refs resolved and strict mode compatibility
 		"""
+		model_schemas = _optimized_schema_cache.get(model)
+		if model_schemas is None:
+			model_schemas = _optimized_schema_cache[model] = {}
+
+		options = (remove_min_items, remove_defaults)
+		schema = model_schemas.get(options)
+		if schema is None:
+			schema = model_schemas[options] = SchemaOptimizer._build_optimized_json_schema(
+				model, remove_min_items=remove_min_items, remove_defaults=remove_defaults
+			)
+		return copy.deepcopy(schema)
+
+	@staticmethod
+	def _build_optimized_json_schema(
+		model: type[BaseModel],
+		*,
+		remove_min_items: bool = False,
+		remove_defaults: bool = False,
+	) -> dict[str, Any]:
+		"""Build the optimized schema for `create_optimized_json_schema` (uncached)."""
 		# Generate original schema
 		original_schema = model.model_json_schema()
 
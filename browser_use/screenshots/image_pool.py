@@ -0,0 +1,205 @@
+"""
+Shared worker pool for CPU-heavy image work (PIL decode, draw, resize, re-encode).
+
+Annotating, resizing and composing screenshots used to run directly on the event loop that drives CDP, so a large
+screenshot stalled CDP events and watchdogs while it was being processed. `image_pool.run()` runs such work on a
+bounded pool of worker threads (PIL releases the GIL while decoding, resampling and encoding) or, optionally,
+worker processes, and keeps per-operation timing and queue depth statistics.
+
+The pool is shared by all agents of the process and is shut down when the last agent using it closes, see
+`ImageWorkerPool.retain()` / `ImageWorkerPool.release()`. It is started again on the next use. Synchronous code that
+runs off the event loop (e.g. the history GIF writer) submits its work with `image_pool.submit()`.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, InvalidStateError, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import ParamSpec, TypeVar
+
+logger = logging.getLogger(__name__)
+
+P = ParamSpec('P')
+T = TypeVar('T')
+
+
+@dataclass
+class ImageOperationStats:
+	"""Timing statistics for one kind of image operation."""
+
+	calls: int = 0
+	failures: int = 0
+	total_wait_seconds: float = 0.0
+	total_run_seconds: float = 0.0
+	max_run_seconds: float = 0.0
+
+	@property
+	def average_run_seconds(self) -> float:
+		return self.total_run_seconds / self.calls if self.calls else 0.0
+
+	@property
+	def average_wait_seconds(self) -> float:
+		return self.total_wait_seconds / self.calls if self.calls else 0.0
+
+
+@dataclass
+class ImagePoolStats:
+	"""Queue depth and per-operation timing of an image worker pool."""
+
+	max_workers: int
+	pending: int
+	"""Operations submitted and not finished yet"""
+	queue_depth: int
+	"""Operations waiting for a free worker"""
+	max_queue_depth: int
+	operations: dict[str, ImageOperationStats]
+
+
+def _timed_call(func: Callable[..., T]) -> tuple[T, float, float]:
+	"""Run func in the worker, returning (result, start time, run seconds) so the caller can split wait and run time."""
+	started = time.time()
+	start = time.perf_counter()
+	result = func()
+	return result, started, time.perf_counter() - start
+
+
+class ImageWorkerPool:
+	"""Bounded pool of image workers with async wrappers, see the module docstring."""
+
+	def __init__(self, max_workers: int | None = None, use_processes: bool = False):
+		"""
+		Args:
+			max_workers: Number of workers, defaults to min(4, CPU count)
+			use_processes: Use worker processes instead of threads. Functions and arguments must then be picklable.
+		"""
+		self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+		self.use_processes = use_processes
+		self._executor: Executor | None = None
+		self._users = 0
+		self._pending = 0
+		self._stats_lock = threading.Lock()  # submit() callbacks update the counters from worker threads
+		self._max_queue_depth = 0
+		self._operations: dict[str, ImageOperationStats] = {}
+
+	def configure(self, max_workers: int | None = None, use_processes: bool | None = None) -> None:
+		"""Change the pool size or worker type (before starting agents), the running workers are shut down."""
+		if max_workers is not None:
+			if max_workers < 1:
+				raise ValueError('max_workers must be at least 1')
+			self.max_workers = max_workers
+		if use_processes is not None:
+			self.use_processes = use_processes
+		self.shutdown(wait=False)
+
+	def _get_executor(self) -> Executor:
+		if self._executor is None:
+			if self.use_processes:
+				self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+			else:
+				self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='browser_use_image')
+			logger.debug(f'🖼️ Started image worker pool ({self.max_workers} {"processes" if self.use_processes else "threads"})')
+		return self._executor
+
+	def _operation_stats(self, operation: str) -> ImageOperationStats:
+		stats = self._operations.get(operation)
+		if stats is None:
+			stats = self._operations[operation] = ImageOperationStats()
+		return stats
+
+	@property
+	def queue_depth(self) -> int:
+		"""Operations waiting for a free worker."""
+		return max(0, self._pending - self.max_workers)
+
+	def submit(self, operation: str, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> Future[T]:
+		"""Submit func(*args, **kwargs) to a worker, returning a future of its result.
+
+		Args:
+			operation: Name the timing statistics are recorded under (e.g. 'highlight_screenshot')
+			func: Synchronous function doing the image work (module level function when using processes)
+		"""
+		executor = self._get_executor()
+		stats = self._operation_stats(operation)
+		submitted = time.time()
+		with self._stats_lock:
+			self._pending += 1
+			self._max_queue_depth = max(self._max_queue_depth, self.queue_depth)
+		try:
+			timed_future = executor.submit(_timed_call, functools.partial(func, *args, **kwargs))
+		except Exception:
+			with self._stats_lock:
+				self._pending -= 1
+				stats.calls += 1
+				stats.failures += 1
+			raise
+
+		future: Future[T] = Future()
+		# Dropped once the work is done, a reference cycle between the two futures would keep results in memory
+		cancel_target = [timed_future]
+		future.add_done_callback(lambda done: done.cancelled() and cancel_target and cancel_target[0].cancel())
+
+		def on_done(timed_future: Future[tuple[T, float, float]]) -> None:
+			cancel_target.clear()
+			with self._stats_lock:
+				self._pending -= 1
+				if timed_future.cancelled():
+					future.cancel()
+					return
+				stats.calls += 1
+				error = timed_future.exception()
+				if error is None:
+					result, started, run_seconds = timed_future.result()
+					stats.total_wait_seconds += max(0.0, started - submitted)
+					stats.total_run_seconds += run_seconds
+					stats.max_run_seconds = max(stats.max_run_seconds, run_seconds)
+				else:
+					stats.failures += 1
+			try:
+				if error is None:
+					future.set_result(result)
+				else:
+					future.set_exception(error)
+			except InvalidStateError:
+				pass  # cancelled by the caller in the meantime
+
+		timed_future.add_done_callback(on_done)
+		return future
+
+	async def run(self, operation: str, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+		"""Run func(*args, **kwargs) on a worker without blocking the event loop, see submit()."""
+		return await asyncio.wrap_future(self.submit(operation, func, *args, **kwargs))
+
+	def get_stats(self) -> ImagePoolStats:
+		"""Queue depth and timing statistics per operation."""
+		return ImagePoolStats(
+			max_workers=self.max_workers,
+			pending=self._pending,
+			queue_depth=self.queue_depth,
+			max_queue_depth=self._max_queue_depth,
+			operations={name: ImageOperationStats(**vars(stats)) for name, stats in self._operations.items()},
+		)
+
+	def retain(self) -> None:
+		"""Register a user (e.g. a running agent) of the pool."""
+		self._users += 1
+
+	def release(self) -> None:
+		"""Unregister a user, shutting the workers down once nobody uses the pool anymore."""
+		self._users = max(0, self._users - 1)
+		if self._users == 0:
+			self.shutdown(wait=False)
+
+	def shutdown(self, wait: bool = True) -> None:
+		"""Stop the workers. Queued operations are cancelled, running ones finish. The pool restarts on the next run()."""
+		executor, self._executor = self._executor, None
+		if executor is not None:
+			executor.shutdown(wait=wait, cancel_futures=True)
+			logger.debug('🖼️ Shut down image worker pool')
+
+
+image_pool = ImageWorkerPool()
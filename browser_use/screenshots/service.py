@@ -2,47 +2,181 @@
 Screenshot storage service for browser-use agents.
 """
 
+import asyncio
 import base64
+import hashlib
+import io
+import json
+import logging
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Literal
 
 import anyio
 
 from browser_use.observability import observe_debug
+from browser_use.screenshots.image_pool import image_pool
+
+logger = logging.getLogger(__name__)
+
+ScreenshotFormat = Literal['png', 'webp', 'jpeg']
+
+SCREENSHOT_MEDIA_TYPES = {'.png': 'image/png', '.webp': 'image/webp', '.jpeg': 'image/jpeg', '.jpg': 'image/jpeg'}
+
+
+def transcode_screenshot(screenshot_data: bytes, image_format: ScreenshotFormat, quality: int) -> bytes:
+	"""Re-encode a PNG screenshot as WebP or JPEG (runs in the image worker pool)."""
+	from PIL import Image
+
+	with Image.open(io.BytesIO(screenshot_data)) as image:
+		output = io.BytesIO()
+		if image_format == 'jpeg':
+			image.convert('RGB').save(output, format='JPEG', quality=quality, optimize=True)
+		else:
+			image.save(output, format='WEBP', quality=quality, method=4)
+	return output.getvalue()
+
+
+@dataclass
+class ScreenshotStoreStats:
+	"""Deduplication and write statistics of a screenshot store."""
+
+	screenshots_stored: int = 0
+	screenshots_deduplicated: int = 0
+	blobs_written: int = 0
+	bytes_received: int = 0
+	"""Size of the original (PNG) screenshots"""
+	bytes_written: int = 0
+	write_batches: int = 0
 
 
 class ScreenshotService:
-	"""Simple screenshot storage service that saves screenshots to disk"""
+	"""Content-addressed screenshot store.
 
-	def __init__(self, agent_directory: str | Path):
-		"""Initialize with agent directory path"""
+	Each distinct screenshot is stored once, as screenshots/blobs/<sha256 of the PNG>.<format>, so repeated
+	screenshots (waits, failed clicks, static pages) cost no disk space or writes. Screenshots can be transcoded to
+	WebP/JPEG. Blobs and the step index (screenshots/index.jsonl, one {"step", "blob"} line per stored screenshot)
+	are written in batches by a background writer. Call `flush()` before reading stored screenshots from disk
+	directly; `get_screenshot()` also serves screenshots that are still queued.
+	"""
+
+	def __init__(
+		self,
+		agent_directory: str | Path,
+		image_format: ScreenshotFormat = 'png',
+		quality: int = 80,
+		max_batch_size: int = 16,
+	):
+		"""Initialize with agent directory path
+
+		Args:
+			agent_directory: Directory the screenshots/ folder is created in
+			image_format: Format the screenshots are stored in, 'webp'/'jpeg' are transcoded from the browser's PNG
+			quality: WebP/JPEG quality (1-100)
+			max_batch_size: Most blobs written by one background write
+		"""
+		if image_format not in ('png', 'webp', 'jpeg'):
+			raise ValueError(f'Unsupported screenshot format: {image_format}')
+		if not 1 <= quality <= 100:
+			raise ValueError('quality must be between 1 and 100')
 		self.agent_directory = Path(agent_directory) if isinstance(agent_directory, str) else agent_directory
+		self.image_format: ScreenshotFormat = image_format
+		self.quality = quality
+		self.max_batch_size = max(1, max_batch_size)
 
 		# Create screenshots subdirectory
 		self.screenshots_dir = self.agent_directory / 'screenshots'
-		self.screenshots_dir.mkdir(parents=True, exist_ok=True)
+		self.blobs_dir = self.screenshots_dir / 'blobs'
+		self.blobs_dir.mkdir(parents=True, exist_ok=True)
+		self.index_path = self.screenshots_dir / 'index.jsonl'
+
+		self.index: dict[int, Path] = {}
+		"""Step number -> blob path"""
+		self.stats = ScreenshotStoreStats()
+		self._blobs: dict[str, Path] = {}
+		self._pending_blobs: dict[Path, bytes] = {}
+		self._pending_index: list[str] = []
+		self._writer_task: asyncio.Task | None = None
 
 	@observe_debug(ignore_input=True, ignore_output=True, name='store_screenshot')
 	async def store_screenshot(self, screenshot_b64: str, step_number: int) -> str:
-		"""Store screenshot to disk and return the full path as string"""
-		screenshot_filename = f'step_{step_number}.png'
-		screenshot_path = self.screenshots_dir / screenshot_filename
-
-		# Decode base64 and save to disk
+		"""Store screenshot (once per distinct content) and return the full path of its blob as string"""
 		screenshot_data = base64.b64decode(screenshot_b64)
+		digest = hashlib.sha256(screenshot_data).hexdigest()
+		self.stats.screenshots_stored += 1
+		self.stats.bytes_received += len(screenshot_data)
+
+		blob_path = self._blobs.get(digest)
+		if blob_path is None:
+			if self.image_format != 'png':
+				screenshot_data = await image_pool.run(
+					'transcode_screenshot', transcode_screenshot, screenshot_data, self.image_format, self.quality
+				)
+			blob_path = self.blobs_dir / f'{digest}.{self.image_format}'
+			self._blobs[digest] = blob_path
+			self._pending_blobs[blob_path] = screenshot_data
+		else:
+			self.stats.screenshots_deduplicated += 1
 
-		async with await anyio.open_file(screenshot_path, 'wb') as f:
-			await f.write(screenshot_data)
+		self.index[step_number] = blob_path
+		self._pending_index.append(json.dumps({'step': step_number, 'blob': blob_path.name}) + '\n')
+		if self._writer_task is None or self._writer_task.done():
+			self._writer_task = asyncio.create_task(self._write_pending())
+		return str(blob_path)
 
-		return str(screenshot_path)
+	async def _write_pending(self) -> None:
+		"""Background writer: writes queued blobs and index lines in batches until nothing is queued."""
+		while self._pending_blobs or self._pending_index:
+			blobs = list(self._pending_blobs.items())[: self.max_batch_size]
+			index_lines, self._pending_index = self._pending_index, []
+			try:
+				await asyncio.to_thread(self._write_batch, blobs, index_lines)
+			except Exception as e:
+				logger.error(f'📸 Failed to write screenshots: {type(e).__name__}: {e}')
+				for blob_path, _ in blobs:
+					self._pending_blobs.pop(blob_path, None)
+					self._blobs = {digest: path for digest, path in self._blobs.items() if path != blob_path}
+				continue
+			for blob_path, data in blobs:
+				self._pending_blobs.pop(blob_path, None)
+				self.stats.blobs_written += 1
+				self.stats.bytes_written += len(data)
+			self.stats.write_batches += 1
+
+	def _write_batch(self, blobs: list[tuple[Path, bytes]], index_lines: list[str]) -> None:
+		for blob_path, data in blobs:
+			temp_path = blob_path.with_suffix(blob_path.suffix + '.tmp')
+			temp_path.write_bytes(data)
+			temp_path.replace(blob_path)
+		if index_lines:
+			with open(self.index_path, 'a', encoding='utf-8') as f:
+				f.writelines(index_lines)
+
+	async def flush(self) -> None:
+		"""Wait until every stored screenshot and index entry is written to disk."""
+		while self._writer_task is not None and not self._writer_task.done():
+			await self._writer_task
+		if self._pending_blobs or self._pending_index:
+			self._writer_task = asyncio.create_task(self._write_pending())
+			await self._writer_task
+
+	def get_step_path(self, step_number: int) -> str | None:
+		"""Path of the blob stored for a step."""
+		blob_path = self.index.get(step_number)
+		return str(blob_path) if blob_path is not None else None
 
 	@observe_debug(ignore_input=True, ignore_output=True, name='get_screenshot_from_disk')
 	async def get_screenshot(self, screenshot_path: str) -> str | None:
-		"""Load screenshot from disk path and return as base64"""
+		"""Load screenshot from disk path (or the write queue) and return as base64"""
 		if not screenshot_path:
 			return None
 
 		path = Path(screenshot_path)
-		if not path.exists():
+		pending = self._pending_blobs.get(path)
+		if pending is not None:
+			return base64.b64encode(pending).decode('utf-8')
+
+		if not await anyio.Path(path).exists():
 			return None
 
 		# Load from disk and encode to base64
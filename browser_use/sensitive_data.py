@@ -0,0 +1,130 @@
+"""
+Compiled sensitive data matching, shared by everything that handles `sensitive_data`.
+
+`sensitive_data` is either in the old format {key: value} or the new format {domain_pattern: {key: value}}. Masking
+secret values in prompts and history dumps used to run one `str.replace` per secret over the whole text, and the
+secrets available on a page were collected again for every action. A `SensitiveDataMatcher` is built once per
+distinct `sensitive_data` (see `get_sensitive_data_matcher()`) and provides:
+
+- `mask(text)`: replaces every secret value by its <secret>key</secret> placeholder, longer values first. With many
+  secrets this is a single regex pass; the regex is built from a trie of the values, so each position of the text
+  follows at most one path instead of trying every secret. For a few secrets, one C-level `str.replace` per secret is
+  faster than stepping the regex through the text, so those are replaced one by one (via marker characters when a
+  later value could match inside an inserted placeholder).
+- `secrets_for_url(url)`: the {key: value} secrets that may be used on a URL, cached per URL.
+"""
+
+import re
+from functools import lru_cache
+
+from browser_use.utils import build_trie_regex, is_new_tab_page, match_url_with_domain_pattern
+
+SensitiveData = dict[str, str | dict[str, str]]
+
+# Below this many secret values, replacing them one by one beats the trie regex (see tests/scripts/benchmark_sensitive_data_masking.py)
+MASK_REGEX_MIN_SECRETS = 512
+
+# Secrets are replaced by one private use character each before the final placeholders are inserted
+_MARKER_BASE = 0xF0000
+_MARKER_PATTERN = re.compile('[\U000f0000-\U000ffffd]')
+
+
+class SensitiveDataMatcher:
+	"""Compiled view of a sensitive_data dict, see the module docstring."""
+
+	def __init__(self, sensitive_data: SensitiveData, url_cache_size: int = 128):
+		self.sensitive_data = sensitive_data
+		self._url_cache_size = url_cache_size
+		self._url_secrets: dict[str, dict[str, str]] = {}
+
+		# Placeholder key for every secret value. Values of every domain are masked, the first key of a value wins.
+		self._keys_by_value: dict[str, str] = {}
+		for key_or_domain, content in sensitive_data.items():
+			if isinstance(content, dict):
+				for key, value in content.items():
+					if value:
+						self._keys_by_value.setdefault(value, key)
+			elif content:
+				self._keys_by_value.setdefault(content, key_or_domain)
+
+		self._values_longest_first = sorted(self._keys_by_value, key=len, reverse=True)
+		self._mask_pattern: re.Pattern[str] | None = None
+		if len(self._keys_by_value) >= MASK_REGEX_MIN_SECRETS or any(
+			_MARKER_PATTERN.search(value) for value in self._keys_by_value
+		):
+			self._mask_pattern = re.compile(build_trie_regex(self._values_longest_first))
+
+		# Placeholders can be inserted directly unless a value could match (part of) an inserted placeholder
+		placeholders = '\n'.join(f'<secret>{key}</secret>' for key in set(self._keys_by_value.values()))
+		self._use_markers = any('<' in value or '>' in value or value in placeholders for value in self._keys_by_value)
+
+	@property
+	def has_secrets(self) -> bool:
+		"""Whether there is any non-empty secret value to mask"""
+		return bool(self._keys_by_value)
+
+	def mask(self, text: str) -> str:
+		"""Replace all secret values in text with their <secret>key</secret> placeholders"""
+		if not self._keys_by_value or not text:
+			return text
+		keys_by_value = self._keys_by_value
+		if self._mask_pattern is not None:
+			return self._mask_pattern.sub(lambda match: f'<secret>{keys_by_value[match.group(0)]}</secret>', text)
+
+		if not self._use_markers:
+			for value in self._values_longest_first:
+				if value in text:
+					text = text.replace(value, f'<secret>{keys_by_value[value]}</secret>')
+			return text
+
+		replaced = False
+		for index, value in enumerate(self._values_longest_first):
+			if value in text:
+				text = text.replace(value, chr(_MARKER_BASE + index))
+				replaced = True
+		if not replaced:
+			return text
+		values = self._values_longest_first
+		return _MARKER_PATTERN.sub(
+			lambda match: f'<secret>{keys_by_value[values[ord(match.group(0)) - _MARKER_BASE]]}</secret>', text
+		)
+
+	def secrets_for_url(self, current_url: str | None) -> dict[str, str]:
+		"""Non-empty {key: value} secrets usable on current_url
+
+		Old format secrets are available on every page (only allowed for legacy reasons), domain scoped secrets only on
+		URLs matching their domain pattern.
+		"""
+		cache_key = current_url or ''
+		secrets = self._url_secrets.get(cache_key)
+		if secrets is None:
+			secrets = {}
+			is_real_url = bool(current_url) and not is_new_tab_page(current_url or '')
+			for domain_or_key, content in self.sensitive_data.items():
+				if isinstance(content, dict):
+					# it's a real url, check it using our custom allowed_domains scheme://*.example.com glob matching
+					if is_real_url and match_url_with_domain_pattern(current_url or '', domain_or_key):
+						secrets.update(content)
+				else:
+					secrets[domain_or_key] = content
+			secrets = {key: value for key, value in secrets.items() if value}
+			if len(self._url_secrets) >= self._url_cache_size:
+				self._url_secrets.pop(next(iter(self._url_secrets)))
+			self._url_secrets[cache_key] = secrets
+		return dict(secrets)
+
+
+def _cache_key(sensitive_data: SensitiveData) -> tuple:
+	return tuple(
+		(key, tuple(content.items()) if isinstance(content, dict) else content) for key, content in sensitive_data.items()
+	)
+
+
+@lru_cache(maxsize=16)
+def _build_matcher(key: tuple) -> SensitiveDataMatcher:
+	return SensitiveDataMatcher({k: dict(content) if isinstance(content, tuple) else content for k, content in key})
+
+
+def get_sensitive_data_matcher(sensitive_data: SensitiveData) -> SensitiveDataMatcher:
+	"""Compiled matcher for sensitive_data, built once per distinct content (a changed dict gets a new matcher)"""
+	return _build_matcher(_cache_key(sensitive_data))
@@ -3,6 +3,7 @@ import functools
 import inspect
 import logging
 import re
+from collections import OrderedDict
 from collections.abc import Callable
 from inspect import Parameter, iscoroutinefunction, signature
 from types import UnionType
@@ -15,6 +16,7 @@ from browser_use.browser import BrowserSession
 from browser_use.filesystem.file_system import FileSystem
 from browser_use.llm.base import BaseChatModel
 from browser_use.observability import observe_debug
+from browser_use.sensitive_data import get_sensitive_data_matcher
 from browser_use.telemetry.service import ProductTelemetry
 from browser_use.tools.registry.views import (
 	ActionModel,
@@ -22,12 +24,15 @@ from browser_use.tools.registry.views import (
 	RegisteredAction,
 	SpecialActionParameters,
 )
-from browser_use.utils import is_new_tab_page, match_url_with_domain_pattern, time_execution_async
+from browser_use.utils import is_new_tab_page, time_execution_async
 
 Context = TypeVar('Context')
 
 logger = logging.getLogger(__name__)
 
+# Number of distinct action sets whose ActionModel is kept by create_action_model
+ACTION_MODEL_CACHE_SIZE = 32
+
 
 class Registry(Generic[Context]):
 	"""Service for registering and managing actions"""
@@ -37,6 +42,8 @@ class Registry(Generic[Context]):
 		self.telemetry = ProductTelemetry()
 		# Create a new list to avoid mutable default argument issues
 		self.exclude_actions = list(exclude_actions) if exclude_actions is not None else []
+		# LRU cache of action set -> (ActionModel, registered actions it was built from)
+		self._action_model_cache: OrderedDict[tuple, tuple[type[ActionModel], tuple[RegisteredAction, ...]]] = OrderedDict()
 
 	def exclude_action(self, action_name: str) -> None:
 		"""Exclude an action from the registry after initialization.
@@ -431,23 +438,9 @@ class Registry(Generic[Context]):
 		# Set to track successfully replaced placeholders
 		replaced_placeholders = set()
 
-		# Process sensitive data based on format and current URL
-		applicable_secrets = {}
-
-		for domain_or_key, content in sensitive_data.items():
-			if isinstance(content, dict):
-				# New format: {domain_pattern: {key: value}}
-				# Only include secrets for domains that match the current URL
-				if current_url and not is_new_tab_page(current_url):
-					# it's a real url, check it using our custom allowed_domains scheme://*.example.com glob matching
-					if match_url_with_domain_pattern(current_url, domain_or_key):
-						applicable_secrets.update(content)
-			else:
-				# Old format: {key: value}, expose to all domains (only allowed for legacy reasons)
-				applicable_secrets[domain_or_key] = content
-
-		# Filter out empty values
-		applicable_secrets = {k: v for k, v in applicable_secrets.items() if v}
+		# Secrets usable on the current URL: old format {key: value} secrets on every page (only allowed for legacy
+		# reasons), new format {domain_pattern: {key: value}} secrets only on matching domains, empty values dropped
+		applicable_secrets = get_sensitive_data_matcher(sensitive_data).secrets_for_url(current_url)
 
 		def recursively_replace_secrets(value: str | dict | list) -> str | dict | list:
 			if isinstance(value, str):
@@ -495,9 +488,10 @@ class Registry(Generic[Context]):
 
 		Each action model contains only the specific action being used,
 		rather than all actions with most set to None.
-		"""
-		from typing import Union
 
+		Models are cached by the set of available actions, so pages with the same actions get the
+		same model class back (and with it the cached AgentOutput type and JSON schema).
+		"""
 		# Filter actions based on page_url if provided:
 		#   if page_url is None, only include actions with no filters
 		#   if page_url is provided, only include actions that match the URL
@@ -520,6 +514,24 @@ class Registry(Generic[Context]):
 			if domain_is_allowed:
 				available_actions[name] = action
 
+		# Keyed by action identity (not just name), so re-registered actions get a fresh model
+		cache_key = tuple((name, id(action)) for name, action in available_actions.items())
+		cached = self._action_model_cache.get(cache_key)
+		if cached is not None:
+			self._action_model_cache.move_to_end(cache_key)
+			return cached[0]
+
+		action_model = self._build_action_model(available_actions)
+		# keep the actions alive with the model so their ids can't be reused by other actions
+		self._action_model_cache[cache_key] = (action_model, tuple(available_actions.values()))
+		if len(self._action_model_cache) > ACTION_MODEL_CACHE_SIZE:
+			self._action_model_cache.popitem(last=False)
+		return action_model
+
+	def _build_action_model(self, available_actions: dict[str, RegisteredAction]) -> type[ActionModel]:
+		"""Build the Union of individual action models for the given actions."""
+		from typing import Union
+
 		# Create individual action models for each action
 		individual_action_models: list[type[BaseModel]] = []
 
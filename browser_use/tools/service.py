@@ -27,6 +27,7 @@ from browser_use.browser.events import (
 	UploadFileEvent,
 )
 from browser_use.browser.views import BrowserError
+from browser_use.dom.markdown_extractor import describe_content_source, find_chunk_end, split_markdown_chunks
 from browser_use.dom.service import EnhancedDOMTreeNode
 from browser_use.filesystem.file_system import FileSystem
 from browser_use.llm.base import BaseChatModel
@@ -107,9 +108,22 @@ class Tools(Generic[Context]):
 		exclude_actions: list[str] | None = None,
 		output_model: type[T] | None = None,
 		display_files_in_done_text: bool = True,
+		extract_chunk_concurrency: int = 0,
+		extract_max_chunks: int = 10,
 	):
+		if extract_chunk_concurrency < 0:
+			raise ValueError(
+				f'extract_chunk_concurrency must be >= 0 (0 disables chunked extraction), got {extract_chunk_concurrency}'
+			)
+		if extract_max_chunks < 1:
+			raise ValueError(f'extract_max_chunks must be >= 1, got {extract_max_chunks}')
+
 		self.registry = Registry[Context](exclude_actions if exclude_actions is not None else [])
 		self.display_files_in_done_text = display_files_in_done_text
+		# extract: when > 0, pages longer than one extraction window are split into chunks that are extracted
+		# concurrently (at most this many LLM calls at once) and merged, instead of paging with start_from_char
+		self.extract_chunk_concurrency = extract_chunk_concurrency
+		self.extract_max_chunks = extract_max_chunks
 		self._output_model: type[BaseModel] | None = output_model
 
 		"""Register all default browser actions"""
@@ -694,40 +708,14 @@ class Tools(Generic[Context]):
 				content = content[start_from_char:]
 				content_stats['started_from_char'] = start_from_char
 
-			# Smart truncation with context preservation
-			truncated = False
-			if len(content) > MAX_CHAR_LIMIT:
-				# Try to truncate at a natural break point (paragraph, sentence)
-				truncate_at = MAX_CHAR_LIMIT
-
-				# Look for paragraph break within last 500 chars of limit
-				paragraph_break = content.rfind('\n\n', MAX_CHAR_LIMIT - 500, MAX_CHAR_LIMIT)
-				if paragraph_break > 0:
-					truncate_at = paragraph_break
-				else:
-					# Look for sentence break within last 200 chars of limit
-					sentence_break = content.rfind('.', MAX_CHAR_LIMIT - 200, MAX_CHAR_LIMIT)
-					if sentence_break > 0:
-						truncate_at = sentence_break + 1
-
-				content = content[:truncate_at]
-				truncated = True
-				next_start = (start_from_char or 0) + truncate_at
-				content_stats['truncated_at_char'] = truncate_at
-				content_stats['next_start_char'] = next_start
-
 			# Add content statistics to the result
-			original_html_length = content_stats['original_html_chars']
+			content_source = describe_content_source(content_stats)
 			initial_markdown_length = content_stats['initial_markdown_chars']
 			chars_filtered = content_stats['filtered_chars_removed']
 
-			stats_summary = f"""Content processed: {original_html_length:,} HTML chars → {initial_markdown_length:,} initial markdown → {final_filtered_length:,} filtered markdown"""
+			stats_summary = f"""Content processed: {content_source} → {initial_markdown_length:,} initial markdown → {final_filtered_length:,} filtered markdown"""
 			if start_from_char > 0:
 				stats_summary += f' (started from char {start_from_char:,})'
-			if truncated:
-				stats_summary += f' → {len(content):,} final chars (truncated, use start_from_char={content_stats["next_start_char"]} to continue)'
-			elif chars_filtered > 0:
-				stats_summary += f' (filtered {chars_filtered:,} chars of noise)'
 
 			system_prompt = """
 You are an expert at extracting data from the markdown of a webpage.
@@ -750,9 +738,38 @@ You will be given a query and the markdown of a webpage that has been filtered t
 </output>
 """.strip()
 
+			query = sanitize_surrogates(query)
+
+			if self.extract_chunk_concurrency > 0 and len(content) > MAX_CHAR_LIMIT:
+				return await _extract_in_chunks(
+					query,
+					content,
+					MAX_CHAR_LIMIT,
+					start_from_char,
+					stats_summary,
+					system_prompt,
+					browser_session,
+					page_extraction_llm,
+					file_system,
+				)
+
+			# Smart truncation with context preservation (at a natural break point: paragraph, sentence)
+			truncated = False
+			if len(content) > MAX_CHAR_LIMIT:
+				truncate_at = find_chunk_end(content, MAX_CHAR_LIMIT)
+				content = content[:truncate_at]
+				truncated = True
+				next_start = (start_from_char or 0) + truncate_at
+				content_stats['truncated_at_char'] = truncate_at
+				content_stats['next_start_char'] = next_start
+
+			if truncated:
+				stats_summary += f' → {len(content):,} final chars (truncated, use start_from_char={content_stats["next_start_char"]} to continue)'
+			elif chars_filtered > 0:
+				stats_summary += f' (filtered {chars_filtered:,} chars of noise)'
+
 			# Sanitize surrogates from content to prevent UTF-8 encoding errors
 			content = sanitize_surrogates(content)
-			query = sanitize_surrogates(query)
 
 			prompt = f'<query>\n{query}\n</query>\n\n<content_stats>\n{stats_summary}\n</content_stats>\n\n<webpage_content>\n{content}\n</webpage_content>'
 
@@ -762,29 +779,99 @@ You will be given a query and the markdown of a webpage that has been filtered t
 					timeout=120.0,
 				)
 
-				current_url = await browser_session.get_current_page_url()
-				extracted_content = (
-					f'<url>\n{current_url}\n</url>\n<query>\n{query}\n</query>\n<result>\n{response.completion}\n</result>'
+				return await _extraction_result(query, response.completion, browser_session, file_system)
+			except Exception as e:
+				logger.debug(f'Error extracting content: {e}')
+				raise RuntimeError(str(e))
+
+		async def _extraction_result(
+			query: str, result: str, browser_session: BrowserSession, file_system: FileSystem
+		) -> ActionResult:
+			current_url = await browser_session.get_current_page_url()
+			extracted_content = f'<url>\n{current_url}\n</url>\n<query>\n{query}\n</query>\n<result>\n{result}\n</result>'
+
+			# Simple memory handling
+			MAX_MEMORY_LENGTH = 1000
+			if len(extracted_content) < MAX_MEMORY_LENGTH:
+				memory = extracted_content
+				include_extracted_content_only_once = False
+			else:
+				file_name = await file_system.save_extracted_content(extracted_content)
+				memory = f'Query: {query}\nContent in {file_name} and once in <read_state>.'
+				include_extracted_content_only_once = True
+
+			logger.info(f'📄 {memory}')
+			return ActionResult(
+				extracted_content=extracted_content,
+				include_extracted_content_only_once=include_extracted_content_only_once,
+				long_term_memory=memory,
+			)
+
+		async def _extract_in_chunks(
+			query: str,
+			content: str,
+			max_chars: int,
+			start_from_char: int,
+			stats_summary: str,
+			system_prompt: str,
+			browser_session: BrowserSession,
+			page_extraction_llm: BaseChatModel,
+			file_system: FileSystem,
+		) -> ActionResult:
+			"""Map-reduce extraction: extract from each chunk concurrently, then merge the partial answers."""
+			chunks = split_markdown_chunks(content, max_chars, max_chunks=self.extract_max_chunks)
+			covered_chars = chunks[-1][0] + len(chunks[-1][1])
+			semaphore = asyncio.Semaphore(self.extract_chunk_concurrency)
+
+			async def extract_chunk(index: int, chunk_start: int, chunk: str) -> str:
+				chunk_stats = (
+					f'{stats_summary} → chunk {index + 1}/{len(chunks)} '
+					f'(chars {start_from_char + chunk_start:,}-{start_from_char + chunk_start + len(chunk):,}), '
+					'the other chunks are extracted separately and merged afterwards'
 				)
+				prompt = f'<query>\n{query}\n</query>\n\n<content_stats>\n{chunk_stats}\n</content_stats>\n\n<webpage_content>\n{sanitize_surrogates(chunk)}\n</webpage_content>'
+				async with semaphore:
+					response = await asyncio.wait_for(
+						page_extraction_llm.ainvoke([SystemMessage(content=system_prompt), UserMessage(content=prompt)]),
+						timeout=120.0,
+					)
+				return response.completion
 
-				# Simple memory handling
-				MAX_MEMORY_LENGTH = 1000
-				if len(extracted_content) < MAX_MEMORY_LENGTH:
-					memory = extracted_content
-					include_extracted_content_only_once = False
-				else:
-					file_name = await file_system.save_extracted_content(extracted_content)
-					memory = f'Query: {query}\nContent in {file_name} and once in <read_state>.'
-					include_extracted_content_only_once = True
+			try:
+				partial_results = await asyncio.gather(
+					*(extract_chunk(index, chunk_start, chunk) for index, (chunk_start, chunk) in enumerate(chunks))
+				)
+				logger.debug(f'📄 Extracted {len(chunks)} chunks of {len(content):,} chars concurrently, merging results')
+
+				merge_stats = f'{stats_summary} → extracted in {len(chunks)} chunks'
+				if covered_chars < len(content):
+					merge_stats += f' (content truncated, use start_from_char={start_from_char + covered_chars} to continue)'
+				partial_results_text = '\n\n'.join(
+					f'<chunk_result index="{index + 1}">\n{result}\n</chunk_result>'
+					for index, result in enumerate(partial_results)
+				)
+				merge_system_prompt = """
+You are an expert at merging data extracted from consecutive chunks of the same webpage.
 
-				logger.info(f'📄 {memory}')
-				return ActionResult(
-					extracted_content=extracted_content,
-					include_extracted_content_only_once=include_extracted_content_only_once,
-					long_term_memory=memory,
+<instructions>
+- You will be given a query and the results extracted for it from each chunk of the webpage, in page order.
+- Combine them into one answer to the query: keep ALL relevant information, remove duplicates, keep the page order.
+- Ignore chunk results that only state that the information is not available in that chunk.
+- Only use information from the chunk results, do not make up information.
+</instructions>
+
+<output>
+- Do not answer in conversational format - directly output the relevant information or that the information is unavailable.
+</output>
+""".strip()
+				prompt = f'<query>\n{query}\n</query>\n\n<content_stats>\n{merge_stats}\n</content_stats>\n\n<chunk_results>\n{partial_results_text}\n</chunk_results>'
+				response = await asyncio.wait_for(
+					page_extraction_llm.ainvoke([SystemMessage(content=merge_system_prompt), UserMessage(content=prompt)]),
+					timeout=120.0,
 				)
+				return await _extraction_result(query, response.completion, browser_session, file_system)
 			except Exception as e:
-				logger.debug(f'Error extracting content: {e}')
+				logger.debug(f'Error extracting content in chunks: {e}')
 				raise RuntimeError(str(e))
 
 		@self.registry.action(
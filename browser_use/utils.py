@@ -6,12 +6,10 @@ import re
 import signal
 import time
 from collections.abc import Callable, Coroutine
-from fnmatch import fnmatch
 from functools import cache, wraps
 from pathlib import Path
 from sys import stderr
 from typing import Any, ParamSpec, TypeVar
-from urllib.parse import urlparse
 
 import httpx
 from dotenv import load_dotenv
@@ -432,6 +430,36 @@ def is_new_tab_page(url: str) -> bool:
 	return url in ('about:blank', 'chrome://new-tab-page/', 'chrome://new-tab-page', 'chrome://newtab/', 'chrome://newtab')
 
 
+_TRIE_END = ''
+
+
+def build_trie_regex(values: list[str]) -> str:
+	"""Regex matching any of the values, preferring the longest value at a position (values must be non-empty)"""
+	root: dict = {}
+	for value in values:
+		node = root
+		for char in value:
+			node = node.setdefault(char, {})
+		node[_TRIE_END] = True
+
+	def node_regex(node: dict) -> str:
+		branches = []
+		for char, child in sorted((char, child) for char, child in node.items() if char != _TRIE_END):
+			# Follow chains of single child nodes iteratively, so long values don't nest groups
+			chain = [char]
+			while len(child) == 1 and _TRIE_END not in child:
+				next_char, child = next(iter(child.items()))
+				chain.append(next_char)
+			branches.append(re.escape(''.join(chain)) + node_regex(child))
+		if not branches:
+			return ''
+		body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+		# A value ending here is only matched when no longer value continues (greedy optional group)
+		return f'(?:{body})?' if _TRIE_END in node else body
+
+	return node_regex(root)
+
+
 def match_url_with_domain_pattern(url: str, domain_pattern: str, log_warnings: bool = False) -> bool:
 	"""
 	Check if a URL matches a domain pattern. SECURITY CRITICAL.
@@ -455,83 +483,10 @@ def match_url_with_domain_pattern(url: str, domain_pattern: str, log_warnings: b
 	Returns:
 		bool: True if the URL matches the pattern, False otherwise
 	"""
-	try:
-		# Note: new tab pages should be handled at the callsite, not here
-		if is_new_tab_page(url):
-			return False
-
-		parsed_url = urlparse(url)
-
-		# Extract only the hostname and scheme components
-		scheme = parsed_url.scheme.lower() if parsed_url.scheme else ''
-		domain = parsed_url.hostname.lower() if parsed_url.hostname else ''
-
-		if not scheme or not domain:
-			return False
-
-		# Normalize the domain pattern
-		domain_pattern = domain_pattern.lower()
+	# Compiled once per pattern, shared with the Registry action filters (see browser_use/domain_policy.py)
+	from browser_use.domain_policy import get_url_pattern_matcher
 
-		# Handle pattern with scheme
-		if '://' in domain_pattern:
-			pattern_scheme, pattern_domain = domain_pattern.split('://', 1)
-		else:
-			pattern_scheme = 'https'  # Default to matching only https for security
-			pattern_domain = domain_pattern
-
-		# Handle port in pattern (we strip ports from patterns since we already
-		# extracted only the hostname from the URL)
-		if ':' in pattern_domain and not pattern_domain.startswith(':'):
-			pattern_domain = pattern_domain.split(':', 1)[0]
-
-		# If scheme doesn't match, return False
-		if not fnmatch(scheme, pattern_scheme):
-			return False
-
-		# Check for exact match
-		if pattern_domain == '*' or domain == pattern_domain:
-			return True
-
-		# Handle glob patterns
-		if '*' in pattern_domain:
-			# Check for unsafe glob patterns
-			# First, check for patterns like *.*.domain which are unsafe
-			if pattern_domain.count('*.') > 1 or pattern_domain.count('.*') > 1:
-				if log_warnings:
-					logger = logging.getLogger(__name__)
-					logger.error(f'⛔️ Multiple wildcards in pattern=[{domain_pattern}] are not supported')
-				return False  # Don't match unsafe patterns
-
-			# Check for wildcards in TLD part (example.*)
-			if pattern_domain.endswith('.*'):
-				if log_warnings:
-					logger = logging.getLogger(__name__)
-					logger.error(f'⛔️ Wildcard TLDs like in pattern=[{domain_pattern}] are not supported for security')
-				return False  # Don't match unsafe patterns
-
-			# Then check for embedded wildcards
-			bare_domain = pattern_domain.replace('*.', '')
-			if '*' in bare_domain:
-				if log_warnings:
-					logger = logging.getLogger(__name__)
-					logger.error(f'⛔️ Only *.domain style patterns are supported, ignoring pattern=[{domain_pattern}]')
-				return False  # Don't match unsafe patterns
-
-			# Special handling so that *.google.com also matches bare google.com
-			if pattern_domain.startswith('*.'):
-				parent_domain = pattern_domain[2:]
-				if domain == parent_domain or fnmatch(domain, parent_domain):
-					return True
-
-			# Normal case: match domain against pattern
-			if fnmatch(domain, pattern_domain):
-				return True
-
-		return False
-	except Exception as e:
-		logger = logging.getLogger(__name__)
-		logger.error(f'⛔️ Error matching URL {url} with pattern {domain_pattern}: {type(e).__name__}: {e}')
-		return False
+	return get_url_pattern_matcher((domain_pattern,)).matches(url, log_warnings=log_warnings)
 
 
 def merge_dicts(a: dict, b: dict, path: tuple[str, ...] = ()):
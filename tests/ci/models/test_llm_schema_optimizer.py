@@ -74,3 +74,35 @@ def test_gemini_schema_retains_required_fields():
 
 	required_fields = set(schema['required'])
 	assert {'price', 'title'}.issubset(required_fields), 'Mandatory fields must stay required for Gemini.'
+
+
+def test_action_models_and_schema_are_cached_per_action_set():
+	"""Unchanged action sets must reuse the same ActionModel, AgentOutput type and optimized schema."""
+	tools = Tools()
+
+	@tools.registry.action('Only available on example.com', domains=['example.com'])
+	async def example_only_action():
+		pass
+
+	ActionModel = tools.registry.create_action_model(page_url='https://example.com/a')
+	assert tools.registry.create_action_model(page_url='https://example.com/b') is ActionModel
+	assert tools.registry.create_action_model(page_url='https://other.com') is not ActionModel
+	assert tools.registry.create_action_model(page_url='https://other.com') is tools.registry.create_action_model()
+
+	agent_output_model = AgentOutput.type_with_custom_actions(ActionModel)
+	assert AgentOutput.type_with_custom_actions(ActionModel) is agent_output_model
+	assert AgentOutput.type_with_custom_actions_flash_mode(ActionModel) is not agent_output_model
+
+	schema = SchemaOptimizer.create_optimized_json_schema(agent_output_model)
+	assert SchemaOptimizer.create_optimized_json_schema(agent_output_model) == schema
+	assert SchemaOptimizer.create_optimized_json_schema(agent_output_model, remove_min_items=True) != schema
+	# callers get their own copy, changing it doesn't change the cached schema
+	schema['properties'].clear()
+	assert SchemaOptimizer.create_optimized_json_schema(agent_output_model)['properties']
+
+	# re-registering an action invalidates the cached model
+	@tools.registry.action('Replaced action', domains=['example.com'])
+	async def example_only_action():  # noqa: F811
+		pass
+
+	assert tools.registry.create_action_model(page_url='https://example.com/a') is not ActionModel
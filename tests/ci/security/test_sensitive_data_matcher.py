@@ -0,0 +1,82 @@
+"""
+Tests for the compiled sensitive data matcher shared by prompt filtering, history dumps and action parameters.
+"""
+
+import pytest
+
+from browser_use import sensitive_data as sensitive_data_module
+from browser_use.sensitive_data import SensitiveDataMatcher, get_sensitive_data_matcher
+
+
+@pytest.fixture(params=['replace', 'regex'])
+def matcher_factory(request, monkeypatch):
+	"""Build matchers using either the one-by-one replacement or the trie regex"""
+	if request.param == 'regex':
+		monkeypatch.setattr(sensitive_data_module, 'MASK_REGEX_MIN_SECRETS', 1)
+	return SensitiveDataMatcher
+
+
+def test_longest_value_is_masked_first(matcher_factory):
+	matcher = matcher_factory(
+		{'pin': '1234', 'card': '1234 5678 9012', 'https://*.bank.com': {'user': 'anna', 'mail': 'anna@x.io'}}
+	)
+
+	masked = matcher.mask('card 1234 5678 9012, pin 1234, login anna@x.io or anna')
+
+	assert masked == (
+		'card <secret>card</secret>, pin <secret>pin</secret>, login <secret>mail</secret> or <secret>user</secret>'
+	)
+	assert matcher.mask('nothing to hide') == 'nothing to hide'
+
+
+def test_values_inside_placeholders_are_not_masked_again(matcher_factory):
+	matcher = matcher_factory({'password': 'hunter2', 'word': 'secret', 'tag': 'a<b>'})
+
+	masked = matcher.mask('hunter2 secret a<b>')
+
+	assert masked == '<secret>password</secret> <secret>word</secret> <secret>tag</secret>'
+
+
+def test_values_of_every_domain_are_masked(matcher_factory):
+	matcher = matcher_factory(
+		{
+			'https://example.com': {'password': 'example_pass'},
+			'https://google.com': {'password': 'google_pass', 'empty': ''},
+		}
+	)
+
+	assert matcher.mask('example_pass google_pass') == '<secret>password</secret> <secret>password</secret>'
+	assert matcher.has_secrets
+	assert not SensitiveDataMatcher({'empty': ''}).has_secrets
+
+
+def test_secrets_are_scoped_to_matching_domains():
+	matcher = SensitiveDataMatcher(
+		{
+			'legacy_key': 'legacy',
+			'https://*.example.com': {'user': 'anna', 'empty': ''},
+			'https://other.com': {'token': 'abc'},
+		}
+	)
+
+	assert matcher.secrets_for_url('https://login.example.com/form') == {'legacy_key': 'legacy', 'user': 'anna'}
+	assert matcher.secrets_for_url('https://other.com') == {'legacy_key': 'legacy', 'token': 'abc'}
+	assert matcher.secrets_for_url('about:blank') == {'legacy_key': 'legacy'}
+	assert matcher.secrets_for_url(None) == {'legacy_key': 'legacy'}
+
+	# cached per URL, callers get their own copy
+	secrets = matcher.secrets_for_url('https://other.com')
+	secrets['token'] = 'changed'
+	assert matcher.secrets_for_url('https://other.com')['token'] == 'abc'
+
+
+def test_matchers_are_built_once_per_content():
+	sensitive_data: dict[str, str | dict[str, str]] = {'https://example.com': {'password': 'hunter2'}}
+
+	matcher = get_sensitive_data_matcher(sensitive_data)
+
+	assert get_sensitive_data_matcher({'https://example.com': {'password': 'hunter2'}}) is matcher
+	sensitive_data['https://example.com'] = {'password': 'hunter3'}
+	changed = get_sensitive_data_matcher(sensitive_data)
+	assert changed is not matcher
+	assert changed.mask('hunter3') == '<secret>password</secret>'
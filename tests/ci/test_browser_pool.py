@@ -0,0 +1,158 @@
+"""
+Tests for browser_pool_size: checkout, reset/recycle and refill bookkeeping of the warm pool of local browsers.
+
+Browsers are not launched, the pool's launch/reset/kill steps are replaced by fakes.
+"""
+
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+from bubus import EventBus
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.events import BrowserKillEvent, BrowserLaunchEvent
+from browser_use.browser.watchdogs import local_browser_watchdog
+from browser_use.browser.watchdogs.local_browser_watchdog import LocalBrowserPool, LocalBrowserWatchdog, PooledBrowser
+
+
+class _FakeProcess:
+	def __init__(self, pid: int, rss_mb: float = 100):
+		self.pid = pid
+		self.running = True
+		self.rss_mb = rss_mb
+
+	def is_running(self) -> bool:
+		return self.running
+
+	def children(self, recursive=False):
+		return []
+
+	def memory_info(self):
+		return SimpleNamespace(rss=int(self.rss_mb * 1024 * 1024))
+
+
+class _FakePool(LocalBrowserPool):
+	def __init__(self, size: int, max_uses: int = 1, max_memory_mb: float | None = None):
+		super().__init__('chromium', ['--headless'], size, max_uses, max_memory_mb)
+		self.launched: list[PooledBrowser] = []
+		self.discarded: list[PooledBrowser] = []
+		self.reset_ok = True
+
+	async def _launch(self) -> PooledBrowser:
+		await asyncio.sleep(0)
+		browser = PooledBrowser(
+			process=_FakeProcess(len(self.launched) + 1),  # type: ignore[arg-type]
+			cdp_url=f'http://127.0.0.1:{9000 + len(self.launched)}/',
+			user_data_dir=Path('/nonexistent'),
+		)
+		self.launched.append(browser)
+		self._browsers.add(browser)
+		return browser
+
+	async def _discard(self, browser: PooledBrowser) -> None:
+		self._browsers.discard(browser)
+		self.discarded.append(browser)
+
+	async def _reset(self, browser: PooledBrowser) -> bool:
+		return self.reset_ok
+
+
+async def _settle(pool: LocalBrowserPool) -> None:
+	if pool._launching:
+		await asyncio.wait(pool._launching)
+
+
+async def test_checkout_hands_out_a_prelaunched_browser_and_refills():
+	pool = _FakePool(size=2)
+	pool._fill()
+	await _settle(pool)
+	assert pool.ready_count == 2
+
+	browser = await pool.checkout()
+	assert browser is pool.launched[0] and browser.uses == 1
+	await _settle(pool)
+	assert pool.ready_count == 2 and len(pool.launched) == 3
+
+	# max_uses=1: a released browser is never reused
+	await pool.release(browser)
+	assert pool.discarded == [browser]
+	assert pool.ready_count == 2
+
+
+async def test_browsers_are_reset_and_reused_until_max_uses():
+	pool = _FakePool(size=1, max_uses=2)
+	browser = await pool.checkout()
+	await _settle(pool)
+	# the checked out browser comes back, so no replacement is launched
+	assert len(pool.launched) == 1 and pool.ready_count == 0
+
+	await pool.release(browser)
+	assert pool.ready_count == 1 and not pool.discarded
+
+	assert await pool.checkout() is browser
+	assert browser.uses == 2
+	await _settle(pool)
+	assert len(pool.launched) == 2  # on its last use, the replacement is launched right away
+
+	await pool.release(browser)
+	assert pool.discarded == [browser] and pool.ready_count == 1
+
+
+async def test_browsers_are_recycled_above_the_memory_threshold_or_on_failed_reset():
+	pool = _FakePool(size=1, max_uses=10, max_memory_mb=500)
+	browser = await pool.checkout()
+	browser.process.rss_mb = 800  # type: ignore[attr-defined]
+	await pool.release(browser)
+	assert pool.discarded == [browser]
+	await _settle(pool)
+	assert pool.ready_count == 1
+
+	other = await pool.checkout()
+	pool.reset_ok = False
+	await pool.release(other)
+	assert pool.discarded == [browser, other]
+
+
+async def test_dead_browsers_are_skipped_and_concurrent_checkouts_get_their_own():
+	pool = _FakePool(size=1)
+	pool._fill()
+	await _settle(pool)
+	pool.launched[0].process.running = False  # type: ignore[attr-defined]
+
+	first, second = await asyncio.gather(pool.checkout(), pool.checkout())
+	assert first is not second
+	assert pool.launched[0] in pool.discarded
+	assert first.process.is_running() and second.process.is_running()
+
+
+async def test_watchdog_checks_out_and_releases_pooled_browsers(monkeypatch):
+	pool = _FakePool(size=1, max_uses=2)
+	monkeypatch.setattr(local_browser_watchdog, 'get_browser_pool', lambda *args, **kwargs: pool)
+
+	async def get_browser_path(self):
+		return 'chromium'
+
+	monkeypatch.setattr(LocalBrowserWatchdog, '_get_browser_path', get_browser_path)
+
+	browser_session = BrowserSession(browser_profile=BrowserProfile(headless=True, user_data_dir=None, browser_pool_size=1))
+	watchdog = LocalBrowserWatchdog(browser_session=browser_session, event_bus=EventBus())
+
+	result = await watchdog.on_BrowserLaunchEvent(BrowserLaunchEvent())
+	assert result.cdp_url == pool.launched[0].cdp_url
+	assert watchdog.browser_pid == pool.launched[0].process.pid
+
+	await watchdog.on_BrowserKillEvent(BrowserKillEvent())
+	assert watchdog.browser_pid is None
+	assert pool.ready_count == 1 and not pool.discarded
+
+
+def test_profiles_with_a_user_data_dir_dont_use_the_pool(tmp_path):
+	(tmp_path / 'Default').mkdir()
+	(tmp_path / 'Default' / 'Cookies').write_text('')
+
+	persistent = BrowserSession(browser_profile=BrowserProfile(headless=True, user_data_dir=tmp_path, browser_pool_size=1))
+	blank = BrowserSession(browser_profile=BrowserProfile(headless=True, user_data_dir=None, browser_pool_size=1))
+
+	assert not LocalBrowserWatchdog(browser_session=persistent, event_bus=EventBus())._can_use_browser_pool()
+	assert LocalBrowserWatchdog(browser_session=blank, event_bus=EventBus())._can_use_browser_pool()
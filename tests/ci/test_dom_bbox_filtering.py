@@ -0,0 +1,119 @@
+"""
+Tests for bounding box filtering in DOMTreeSerializer (children contained in links/buttons are excluded).
+"""
+
+from browser_use.dom.serializer.serializer import DOMTreeSerializer
+from browser_use.dom.views import DOMRect, EnhancedDOMTreeNode, EnhancedSnapshotNode, NodeType, SimplifiedNode
+
+_next_id = iter(range(1, 10_000))
+
+
+def _node(
+	tag: str, bounds: tuple[float, float, float, float] | None, *children: SimplifiedNode, **attributes: str
+) -> SimplifiedNode:
+	snapshot = EnhancedSnapshotNode(
+		is_clickable=None,
+		cursor_style=None,
+		bounds=DOMRect(*bounds) if bounds else None,
+		clientRects=None,
+		scrollRects=None,
+		computed_styles=None,
+		paint_order=None,
+		stacking_contexts=None,
+	)
+	node_id = next(_next_id)
+	original = EnhancedDOMTreeNode(
+		node_id=node_id,
+		backend_node_id=node_id,
+		node_type=NodeType.TEXT_NODE if tag == '#text' else NodeType.ELEMENT_NODE,
+		node_name=tag.upper(),
+		node_value='text' if tag == '#text' else '',
+		attributes=attributes,
+		is_scrollable=False,
+		is_visible=True,
+		absolute_position=None,
+		target_id='target-1',
+		frame_id=None,
+		session_id=None,
+		content_document=None,
+		shadow_root_type=None,
+		shadow_roots=None,
+		parent_node=None,
+		children_nodes=[],
+		ax_node=None,
+		snapshot_node=snapshot,
+	)
+	return SimplifiedNode(original_node=original, children=list(children))
+
+
+def _filter(root: SimplifiedNode, serializer_class: type[DOMTreeSerializer] = DOMTreeSerializer) -> None:
+	serializer_class(root.original_node)._apply_bounding_box_filtering(root)
+
+
+def test_children_inside_propagating_parents_are_excluded_with_exceptions():
+	span = _node('span', (12, 12, 50, 10))
+	img = _node('img', (10, 10, 20, 20))
+	text = _node('#text', (12, 12, 30, 10))
+	overflowing = _node('div', (10, 10, 200, 20))
+	no_bounds = _node('div', None)
+	zero_area = _node('div', (10, 10, 0, 20))
+	checkbox_input = _node('input', (12, 12, 10, 10), type='checkbox')
+	labelled = _node('div', (12, 12, 10, 10), **{'aria-label': 'Close'})
+	blank_label = _node('div', (12, 12, 10, 10), **{'aria-label': ' '})
+	tab = _node('div', (12, 12, 10, 10), role='tab')
+	clickable = _node('div', (12, 12, 10, 10), onclick='go()')
+	link = _node(
+		'a',
+		(10, 10, 100, 30),
+		_node('div', (10, 10, 100, 30), span, img),
+		text,
+		overflowing,
+		no_bounds,
+		zero_area,
+		checkbox_input,
+		labelled,
+		blank_label,
+		tab,
+		clickable,
+	)
+	outside = _node('span', (500, 500, 10, 10))
+	root = _node('body', (0, 0, 1000, 1000), link, outside)
+
+	_filter(root)
+
+	excluded = [node for node in (span, img, link.children[0], blank_label) if node.excluded_by_parent]
+	assert len(excluded) == 4
+	kept = (root, link, text, overflowing, no_bounds, zero_area, checkbox_input, labelled, tab, clickable, outside)
+	assert not any(node.excluded_by_parent for node in kept)
+
+
+def test_nested_propagating_element_is_kept_and_starts_its_own_bounds():
+	inner_icon = _node('svg', (60, 12, 10, 10))
+	in_both = _node('span', (14, 14, 4, 4))
+	button = _node('div', (12, 12, 20, 20), in_both, role='button')
+	# inner_icon is inside the link but not inside the button, its nearest propagating ancestor
+	combobox = _node('span', (40, 10, 15, 15), _node('div', None, inner_icon), role='combobox')
+	link = _node('a', (10, 10, 100, 30), button, combobox)
+	root = _node('body', (0, 0, 1000, 1000), link)
+
+	_filter(root)
+
+	assert not button.excluded_by_parent and not combobox.excluded_by_parent
+	assert in_both.excluded_by_parent
+	assert not inner_icon.excluded_by_parent
+
+
+def test_propagating_elements_lookup_supports_wildcards_and_overrides():
+	serializer = DOMTreeSerializer(_node('body', None).original_node)
+	assert serializer._is_propagating('a', None) and serializer._is_propagating('a', 'presentation')
+	assert serializer._is_propagating('div', 'combobox')
+	assert not serializer._is_propagating('div', None) and not serializer._is_propagating('div', 'link')
+	assert serializer._is_propagating('span', 'button')
+
+	class LinkRoleSerializer(DOMTreeSerializer):
+		PROPAGATING_ELEMENTS = [{'tag': None, 'role': 'link'}]
+
+	span = _node('span', (12, 12, 10, 10))
+	root = _node('body', (0, 0, 1000, 1000), _node('div', (10, 10, 100, 30), span, role='link'))
+	_filter(root, LinkRoleSerializer)
+	assert span.excluded_by_parent
@@ -0,0 +1,125 @@
+"""
+Tests for DOMMutationTracker, which patches the cached DOM tree from CDP DOM mutation events (incremental_dom mode).
+"""
+
+import logging
+
+from browser_use.dom.mutation_tracker import DOMMutationTracker
+from browser_use.dom.service import DomService
+from browser_use.dom.views import EnhancedDOMTreeNode
+
+SESSION_ID = 'session-1'
+TARGET_ID = 'target-1'
+
+
+def _cdp_node(node_id: int, node_name: str, children: list[dict] | None = None, **attributes: str) -> dict:
+	node = {
+		'nodeId': node_id,
+		'backendNodeId': node_id + 1000,
+		'nodeType': 3 if node_name == '#text' else 1,
+		'nodeName': node_name,
+		'localName': node_name.lower(),
+		'nodeValue': '',
+		'attributes': [item for pair in attributes.items() for item in pair],
+		'childNodeCount': len(children or []),
+	}
+	if children:
+		node['children'] = children
+	return node
+
+
+def _build(payload: dict, parent: EnhancedDOMTreeNode | None = None) -> EnhancedDOMTreeNode:
+	node = DomService._create_enhanced_node(payload, TARGET_ID, SESSION_ID)  # type: ignore[arg-type]
+	node.parent_node = parent
+	if payload.get('children'):
+		node.children_nodes = [_build(child, node) for child in payload['children']]
+	return node
+
+
+def _tracked_tree() -> tuple[DOMMutationTracker, EnhancedDOMTreeNode]:
+	tracker = DOMMutationTracker(logging.getLogger('test'), node_factory=DomService._create_enhanced_node, max_mutations=10)
+	tracker.begin_build(TARGET_ID, SESSION_ID)
+	root = _build(
+		_cdp_node(
+			1,
+			'HTML',
+			[_cdp_node(2, 'BODY', [_cdp_node(3, 'BUTTON', id='submit'), _cdp_node(4, 'A', href='/next')])],
+		)
+	)
+	tracker.track(root, snapshot_node_count=0)
+	return tracker, root
+
+
+def _tags(node: EnhancedDOMTreeNode) -> list[str]:
+	return [child.node_name for child in node.children_nodes or []]
+
+
+def test_patches_attributes_and_children():
+	tracker, root = _tracked_tree()
+	body = root.children_nodes[0]  # type: ignore[index]
+	button = body.children_nodes[0]  # type: ignore[index]
+	old_attributes = button.attributes
+	old_hash = hash(button)
+
+	tracker.on_attribute_modified({'nodeId': 3, 'name': 'class', 'value': 'primary'}, SESSION_ID)
+	tracker.on_child_node_inserted(
+		{'parentNodeId': 2, 'previousNodeId': 3, 'node': _cdp_node(5, 'INPUT', [], type='text')}, SESSION_ID
+	)
+	tracker.on_child_node_removed({'parentNodeId': 2, 'nodeId': 4}, SESSION_ID)
+
+	# attributes are replaced, not mutated, so earlier states keep their view of the element
+	assert button.attributes == {'id': 'submit', 'class': 'primary'}
+	assert old_attributes == {'id': 'submit'}
+	assert hash(button) != old_hash
+	assert _tags(body) == ['BUTTON', 'INPUT']
+	assert body.children_nodes[1].parent_node is body  # type: ignore[index]
+	assert tracker.can_reuse(TARGET_ID, SESSION_ID)
+	assert tracker.dirty_node_ids == {2, 3, 5}
+
+
+def test_buffers_events_during_build_and_ignores_other_sessions():
+	tracker = DOMMutationTracker(logging.getLogger('test'), node_factory=DomService._create_enhanced_node)
+	tracker.begin_build(TARGET_ID, SESSION_ID)
+	# already reflected in the fetched tree, must not be inserted twice
+	tracker.on_child_node_inserted({'parentNodeId': 1, 'previousNodeId': 0, 'node': _cdp_node(2, 'BODY')}, SESSION_ID)
+	tracker.on_attribute_modified({'nodeId': 2, 'name': 'class', 'value': 'late'}, SESSION_ID)
+	tracker.on_attribute_modified({'nodeId': 2, 'name': 'class', 'value': 'other'}, 'other-session')
+	assert not tracker.can_reuse(TARGET_ID, SESSION_ID)
+
+	root = _build(_cdp_node(1, 'HTML', [_cdp_node(2, 'BODY')]))
+	tracker.track(root, snapshot_node_count=0)
+
+	assert _tags(root) == ['BODY']
+	assert root.children_nodes[0].attributes == {'class': 'late'}  # type: ignore[index]
+	assert tracker.can_reuse(TARGET_ID, SESSION_ID)
+	assert not tracker.can_reuse(TARGET_ID, 'other-session')
+
+
+def test_invalidates_on_unsafe_mutations():
+	tracker, _ = _tracked_tree()
+	tracker.on_attribute_modified({'nodeId': 99, 'name': 'class', 'value': 'x'}, SESSION_ID)
+	assert not tracker.can_reuse(TARGET_ID, SESSION_ID)
+
+	tracker, _ = _tracked_tree()
+	# a subtree CDP only partially sent can't be patched in
+	partial = _cdp_node(5, 'DIV')
+	partial['childNodeCount'] = 3
+	tracker.on_child_node_inserted({'parentNodeId': 2, 'previousNodeId': 0, 'node': partial}, SESSION_ID)
+	assert not tracker.can_reuse(TARGET_ID, SESSION_ID)
+
+	tracker, _ = _tracked_tree()
+	for i in range(11):
+		tracker.on_attribute_modified({'nodeId': 3, 'name': 'data-i', 'value': str(i)}, SESSION_ID)
+	assert not tracker.can_reuse(TARGET_ID, SESSION_ID)
+
+	tracker, _ = _tracked_tree()
+	tracker.on_document_updated({}, SESSION_ID)
+	assert not tracker.can_reuse(TARGET_ID, SESSION_ID)
+
+
+def test_detects_drift_from_snapshot():
+	tracker, _ = _tracked_tree()
+	assert tracker.is_consistent(nodes_without_snapshot=4, untracked_snapshot_nodes=0)
+	# a node appeared in the snapshot without an insertion event
+	assert not tracker.is_consistent(nodes_without_snapshot=4, untracked_snapshot_nodes=1)
+	assert not tracker.can_reuse(TARGET_ID, SESSION_ID)
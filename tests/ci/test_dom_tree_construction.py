@@ -0,0 +1,229 @@
+"""
+Tests for the enhanced DOM tree construction in DomService (deep pages, shadow roots, iframes, cross-origin iframes).
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from types import SimpleNamespace
+
+from browser_use.dom.service import DomService
+from browser_use.dom.views import DOMRect, EnhancedSnapshotNode, NodeType, TargetAllTrees
+
+VISIBLE_STYLES = {'display': 'block', 'visibility': 'visible', 'opacity': '1'}
+
+
+def _snapshot(x: float, y: float, width: float = 100, height: float = 20, **styles: str) -> EnhancedSnapshotNode:
+	return EnhancedSnapshotNode(
+		is_clickable=None,
+		cursor_style=None,
+		bounds=DOMRect(x=x, y=y, width=width, height=height),
+		clientRects=DOMRect(x=0, y=0, width=1280, height=800),
+		scrollRects=None,
+		computed_styles={**VISIBLE_STYLES, **styles},
+		paint_order=None,
+		stacking_contexts=None,
+	)
+
+
+def _element(node_id: int, name: str, parent_id: int | None = None, **extra) -> dict:
+	node = {'nodeId': node_id, 'backendNodeId': node_id + 1000, 'nodeType': 1, 'nodeName': name, 'nodeValue': '', **extra}
+	if parent_id is not None:
+		node['parentId'] = parent_id
+	return node
+
+
+def _service() -> DomService:
+	return DomService(SimpleNamespace(logger=logging.getLogger('test')))  # type: ignore[arg-type]
+
+
+def _construct(service: DomService, root: dict, snapshot_lookup: dict[int, EnhancedSnapshotNode]):
+	return service._construct_enhanced_tree(
+		root, 'target-1', 'session-1', {}, snapshot_lookup, [], DOMRect(x=0, y=0, width=0, height=0), iframe_depth=0
+	)
+
+
+def test_deep_tree_is_built_past_the_recursion_limit():
+	depth = sys.getrecursionlimit() * 3
+	document = {'nodeId': 1, 'backendNodeId': 1001, 'nodeType': 9, 'nodeName': '#document', 'nodeValue': ''}
+	html = _element(2, 'HTML', 1, frameId='main-frame')
+	document['children'] = [html]
+	parent = html
+	for node_id in range(3, depth + 3):
+		child = _element(node_id, 'DIV', parent['nodeId'])
+		parent['children'] = [child]
+		parent = child
+	snapshot_lookup = {node_id + 1000: _snapshot(0, node_id) for node_id in range(2, depth + 3)}
+
+	root, cross_origin_iframes = _construct(_service(), document, snapshot_lookup)
+
+	assert cross_origin_iframes == []
+	node, levels = root, 0
+	while node.children_nodes:
+		child = node.children_nodes[0]
+		assert child.parent_node is node
+		node, levels = child, levels + 1
+	assert levels == depth + 1
+	assert node.node_id == depth + 2 and node.is_visible
+	assert node.session_id == 'session-1' and node.target_id == 'target-1'
+
+
+def test_shadow_roots_content_documents_and_frame_offsets():
+	host_shadow = {
+		'nodeId': 5,
+		'backendNodeId': 1005,
+		'nodeType': 11,
+		'nodeName': '#document-fragment',
+		'nodeValue': '',
+		'shadowRootType': 'open',
+		'children': [_element(6, 'BUTTON', 5)],
+	}
+	inner_document = {
+		'nodeId': 8,
+		'backendNodeId': 1008,
+		'nodeType': 9,
+		'nodeName': '#document',
+		'nodeValue': '',
+		'children': [_element(9, 'HTML', 8, frameId='child-frame', children=[_element(10, 'INPUT', 9)])],
+	}
+	iframe = _element(7, 'IFRAME', 3, contentDocument=inner_document)
+	hidden = _element(11, 'SPAN', 3)
+	body = _element(
+		3, 'BODY', 2, children=[_element(4, 'DIV', 3, shadowRoots=[host_shadow], children=[host_shadow]), iframe, hidden]
+	)
+	document = {
+		'nodeId': 1,
+		'backendNodeId': 1001,
+		'nodeType': 9,
+		'nodeName': '#document',
+		'nodeValue': '',
+		'children': [_element(2, 'HTML', 1, frameId='main-frame', children=[body])],
+	}
+	snapshot_lookup = {
+		1002: _snapshot(0, 0, 1280, 800),
+		1003: _snapshot(0, 0, 1280, 800),
+		1004: _snapshot(10, 10),
+		1006: _snapshot(12, 12),
+		1007: _snapshot(200, 300, 400, 300),
+		1009: _snapshot(0, 0, 400, 300),
+		1010: _snapshot(5, 5),
+		1011: _snapshot(10, 50, display='none'),
+	}
+
+	root, _ = _construct(_service(), document, snapshot_lookup)
+
+	html = root.children_nodes[0]
+	body_node = html.children_nodes[0]
+	host, iframe_node, hidden_node = body_node.children_nodes
+	# the shadow root is only listed in shadow_roots, not as a child
+	assert host.children_nodes == []
+	assert host.shadow_roots[0].node_type == NodeType.DOCUMENT_FRAGMENT_NODE
+	assert host.shadow_roots[0].parent_node is host
+	assert host.shadow_roots[0].children_nodes[0].node_name == 'BUTTON'
+
+	assert iframe_node.content_document.parent_node is iframe_node
+	input_node = iframe_node.content_document.children_nodes[0].children_nodes[0]
+	assert input_node.node_name == 'INPUT'
+	# positions inside the iframe are translated by the iframe bounds
+	assert input_node.absolute_position == DOMRect(x=205, y=305, width=100, height=20)
+	assert input_node.is_visible and iframe_node.is_visible and host.is_visible
+	assert not hidden_node.is_visible
+
+
+def test_rebinding_fresh_layout_data_matches_construction():
+	depth = sys.getrecursionlimit() * 3
+	document = {'nodeId': 1, 'backendNodeId': 1001, 'nodeType': 9, 'nodeName': '#document', 'nodeValue': ''}
+	html = _element(2, 'HTML', 1, frameId='main-frame')
+	document['children'] = [html]
+	parent = html
+	for node_id in range(3, depth + 3):
+		child = _element(node_id, 'DIV', parent['nodeId'])
+		parent['children'] = [child]
+		parent = child
+	service = _service()
+	root, _ = _construct(service, document, {node_id + 1000: _snapshot(0, node_id) for node_id in range(2, depth + 3)})
+
+	# the layout changed: the deepest node moved and got hidden
+	snapshot_lookup = {node_id + 1000: _snapshot(0, node_id) for node_id in range(2, depth + 2)}
+	snapshot_lookup[depth + 1002] = _snapshot(50, 60, display='none')
+	stats = {'nodes_with_snapshot': 0, 'nodes_without_snapshot': 0}
+	service._rebind_enhanced_node(root, {}, snapshot_lookup, [], DOMRect(x=0, y=0, width=0, height=0), stats)
+
+	rebuilt, _ = _construct(service, document, snapshot_lookup)
+	node, expected = root, rebuilt
+	while node.children_nodes:
+		node, expected = node.children_nodes[0], expected.children_nodes[0]
+		assert node.absolute_position == expected.absolute_position and node.is_visible == expected.is_visible
+	assert node.absolute_position == DOMRect(x=50, y=60, width=100, height=20) and not node.is_visible
+	assert stats == {'nodes_with_snapshot': depth + 1, 'nodes_without_snapshot': 1}
+
+
+class FakeIframeSession:
+	"""Serves the trees of a main page with cross-origin iframes, each target answering after its own delay."""
+
+	def __init__(self, delays: dict[str, float]):
+		self.logger = logging.getLogger('test')
+		self.delays = delays
+		self.active = 0
+		self.max_active = 0
+		self.session_manager = SimpleNamespace(get_target=lambda target_id: SimpleNamespace(target_id=target_id))
+
+	async def get_or_create_cdp_session(self, target_id, focus=False):
+		return SimpleNamespace(session_id=f'session-{target_id}')
+
+	async def get_all_frames(self):
+		return {f'frame-{target_id}': {'frameTargetId': target_id} for target_id in self.delays}, {}
+
+	def document(self, target_id: str) -> dict:
+		children = [_element(2, 'HTML', 1, frameId=f'html-{target_id}')]
+		if target_id == 'main':
+			children[0]['children'] = [
+				_element(10 + i, 'IFRAME', 2, frameId=f'frame-{iframe_target}') for i, iframe_target in enumerate(self.delays)
+			]
+		return {'nodeId': 1, 'backendNodeId': 1001, 'nodeType': 9, 'nodeName': '#document', 'nodeValue': '', 'children': children}
+
+	async def get_all_trees(self, target_id, include_dom_tree=True):
+		self.active += 1
+		self.max_active = max(self.max_active, self.active)
+		try:
+			await asyncio.sleep(self.delays.get(target_id, 0))
+		finally:
+			self.active -= 1
+		return TargetAllTrees(
+			snapshot=None,  # type: ignore[arg-type]
+			dom_tree={'root': self.document(target_id)},  # type: ignore[typeddict-item]
+			ax_tree={'nodes': []},
+			device_pixel_ratio=1.0,
+			cdp_timing={},
+		)
+
+
+async def test_cross_origin_iframes_are_fetched_concurrently_with_timeouts(monkeypatch):
+	snapshot_lookup = {1002: _snapshot(0, 0, 1280, 800), **{1010 + i: _snapshot(0, 100 * i, 300, 80) for i in range(6)}}
+	monkeypatch.setattr('browser_use.dom.service.build_snapshot_lookup', lambda snapshot, device_pixel_ratio: snapshot_lookup)
+	delays = {f'iframe-{i}': 0.1 for i in range(5)}
+	delays['iframe-slow'] = 5.0
+	browser_session = FakeIframeSession(delays)
+	service = DomService(
+		browser_session,  # type: ignore[arg-type]
+		cross_origin_iframes=True,
+		max_concurrent_iframe_fetches=3,
+		iframe_fetch_timeout=0.5,
+	)
+	service._get_all_trees = browser_session.get_all_trees  # type: ignore[method-assign]
+
+	start = time.perf_counter()
+	root, _ = await service.get_dom_tree('main')
+	elapsed = time.perf_counter() - start
+
+	iframes = root.children_nodes[0].children_nodes
+	loaded = [iframe for iframe in iframes if iframe.content_document is not None]
+	assert len(loaded) == 5
+	for iframe in loaded:
+		assert iframe.content_document.parent_node is iframe
+		assert iframe.content_document.session_id == f'session-{iframe.frame_id.removeprefix("frame-")}'
+	# the slow frame is skipped after its timeout instead of stalling the whole tree
+	assert iframes[-1].content_document is None
+	assert browser_session.max_active == 3
+	assert elapsed < 1.5
@@ -0,0 +1,118 @@
+"""
+Tests for the streaming TreeWriter engine behind the DOM serializers (llm, eval and code-use representations).
+"""
+
+import random
+
+import pytest
+
+from browser_use.dom.serializer.code_use_serializer import DOMCodeAgentSerializer
+from browser_use.dom.serializer.eval_serializer import DOMEvalSerializer
+from browser_use.dom.serializer.serializer import DOMTreeSerializer
+from browser_use.dom.serializer.writer import CHARS_PER_TOKEN, TreeWriter
+from browser_use.dom.views import DEFAULT_INCLUDE_ATTRIBUTES, EnhancedDOMTreeNode, EnhancedSnapshotNode, NodeType, SimplifiedNode
+
+SERIALIZERS = [DOMTreeSerializer, DOMEvalSerializer, DOMCodeAgentSerializer]
+TAGS = ['div', 'span', 'button', 'a', 'input', 'ul', 'li', 'section', 'p', 'svg', 'h1']
+
+
+def _node(backend_node_id: int, node_type: NodeType, node_name: str, node_value: str = '', **attributes: str):
+	snapshot = EnhancedSnapshotNode(
+		is_clickable=None,
+		cursor_style=None,
+		bounds=None,
+		clientRects=None,
+		scrollRects=None,
+		computed_styles=None,
+		paint_order=None,
+		stacking_contexts=None,
+	)
+	return EnhancedDOMTreeNode(
+		node_id=backend_node_id,
+		backend_node_id=backend_node_id,
+		node_type=node_type,
+		node_name=node_name,
+		node_value=node_value,
+		attributes=attributes,
+		is_scrollable=False,
+		is_visible=True,
+		absolute_position=None,
+		target_id='target-1',
+		frame_id=None,
+		session_id=None,
+		content_document=None,
+		shadow_root_type=None,
+		shadow_roots=None,
+		parent_node=None,
+		children_nodes=[],
+		ax_node=None,
+		snapshot_node=snapshot,
+	)
+
+
+def _random_tree(rng: random.Random, depth: int = 0, counter: list[int] | None = None) -> SimplifiedNode:
+	counter = counter if counter is not None else [0]
+	counter[0] += 1
+	tag = 'html' if depth == 0 else rng.choice(TAGS)
+	attributes = {'id': f'el-{counter[0]}'} if rng.random() < 0.5 else {}
+	node = SimplifiedNode(
+		original_node=_node(counter[0], NodeType.ELEMENT_NODE, tag.upper(), **attributes),
+		children=[],
+		is_interactive=tag in ('button', 'a', 'input') or rng.random() < 0.1,
+	)
+	if depth < 8:
+		for _ in range(rng.randint(2, 4) if depth < 3 else rng.randint(0, 3)):
+			if rng.random() < 0.3:
+				counter[0] += 1
+				text = _node(counter[0], NodeType.TEXT_NODE, '#text', f'text {counter[0]}')
+				node.children.append(SimplifiedNode(original_node=text, children=[]))
+			else:
+				node.children.append(_random_tree(rng, depth + 1, counter))
+	return node
+
+
+def _deep_tree(depth: int) -> SimplifiedNode:
+	root = node = SimplifiedNode(original_node=_node(1, NodeType.ELEMENT_NODE, 'HTML'), children=[])
+	for i in range(2, depth + 2):
+		child = SimplifiedNode(original_node=_node(i, NodeType.ELEMENT_NODE, 'BUTTON'), children=[], is_interactive=True)
+		node.children.append(child)
+		node = child
+	return root
+
+
+def test_writer_caches_indents_and_cuts_at_budget():
+	writer = TreeWriter('\t')
+	assert writer.indent(3) == '\t\t\t'
+	assert writer.indent(3) is writer.indent(3)
+
+	lines = ['first line', 'second line', 'third']
+	full = '\n'.join(lines)
+	for budget in range(len(full) + 2):
+		writer = TreeWriter(max_chars=budget)
+		for line in lines:
+			writer.write(line)
+		assert writer.getvalue() == full[:budget]
+		assert writer.truncated == (budget < len(full))
+
+	writer = TreeWriter(max_chars=100, max_tokens=2)
+	writer.write('x' * 50)
+	assert writer.getvalue() == 'x' * 2 * CHARS_PER_TOKEN
+
+
+@pytest.mark.parametrize('serializer', SERIALIZERS)
+def test_budget_returns_exact_prefix(serializer):
+	root = _random_tree(random.Random(3))
+	full = serializer.serialize_tree(root, DEFAULT_INCLUDE_ATTRIBUTES)
+	assert full
+	assert serializer.serialize_tree(root, DEFAULT_INCLUDE_ATTRIBUTES, max_chars=len(full)) == full
+	for budget in (0, 1, len(full) // 3, len(full) - 1):
+		assert serializer.serialize_tree(root, DEFAULT_INCLUDE_ATTRIBUTES, max_chars=budget) == full[:budget]
+	assert serializer.serialize_tree(root, DEFAULT_INCLUDE_ATTRIBUTES, max_tokens=10) == full[: 10 * CHARS_PER_TOKEN]
+
+
+def test_deeply_nested_tree_is_indented_once_per_level():
+	output = DOMTreeSerializer.serialize_tree(_deep_tree(300), DEFAULT_INCLUDE_ATTRIBUTES)
+	lines = output.split('\n')
+	assert len(lines) == 300
+	assert lines[0] == '[2]<button />'
+	assert lines[-1] == '\t' * 299 + '[301]<button />'
@@ -0,0 +1,81 @@
+"""
+Tests for streaming downloads to disk through CDP IO stream handles (used by the PDF auto-download).
+"""
+
+import base64
+import tracemalloc
+from types import SimpleNamespace
+
+import pytest
+
+from browser_use.browser.watchdogs.downloads_watchdog import save_cdp_stream_to_file
+
+
+class FakeStreamClient:
+	"""Serves `IO.read` from an in-memory body, base64 encoded like Chrome does for binary responses."""
+
+	def __init__(self, body: bytes, fail_after_reads: int | None = None):
+		self.body = body
+		self.offset = 0
+		self.reads = 0
+		self.fail_after_reads = fail_after_reads
+		self.closed_handles: list[str] = []
+		self.send = SimpleNamespace(IO=SimpleNamespace(read=self.read, close=self.close))
+
+	async def read(self, params: dict, session_id: str | None = None) -> dict:
+		self.reads += 1
+		if self.fail_after_reads is not None and self.reads > self.fail_after_reads:
+			raise RuntimeError('Target closed')
+		chunk = self.body[self.offset : self.offset + params['size']]
+		self.offset += len(chunk)
+		return {'base64Encoded': True, 'data': base64.b64encode(chunk).decode(), 'eof': self.offset >= len(self.body)}
+
+	async def close(self, params: dict, session_id: str | None = None) -> dict:
+		self.closed_handles.append(params['handle'])
+		return {}
+
+
+async def test_stream_is_written_in_chunks_and_closed(tmp_path):
+	body = bytes(range(256)) * 1000
+	client = FakeStreamClient(body)
+	progress: list[int] = []
+	path = tmp_path / 'document.pdf'
+
+	size = await save_cdp_stream_to_file(
+		client, 'session-1', 'stream-1', str(path), chunk_size=64 * 1024, on_progress=progress.append
+	)
+
+	assert size == len(body)
+	assert path.read_bytes() == body
+	assert client.reads == 4
+	assert progress == [64 * 1024, 128 * 1024, 192 * 1024, len(body)]
+	assert client.closed_handles == ['stream-1']
+	assert list(tmp_path.iterdir()) == [path]
+
+
+async def test_failed_stream_leaves_no_partial_file(tmp_path):
+	client = FakeStreamClient(b'%PDF' * 100_000, fail_after_reads=2)
+	path = tmp_path / 'document.pdf'
+
+	with pytest.raises(RuntimeError):
+		await save_cdp_stream_to_file(client, 'session-1', 'stream-1', str(path), chunk_size=1024)
+
+	assert list(tmp_path.iterdir()) == []
+	assert client.closed_handles == ['stream-1']
+
+
+async def test_memory_use_does_not_grow_with_file_size(tmp_path):
+	chunk_size = 256 * 1024
+	body = b'\x00' * (32 * 1024 * 1024)
+	client = FakeStreamClient(body)
+
+	tracemalloc.start()
+	try:
+		await save_cdp_stream_to_file(client, 'session-1', 'stream-1', str(tmp_path / 'big.pdf'), chunk_size=chunk_size)
+		_, peak = tracemalloc.get_traced_memory()
+	finally:
+		tracemalloc.stop()
+
+	assert (tmp_path / 'big.pdf').stat().st_size == len(body)
+	# a few chunks (raw + base64) in flight at most, never the whole 32 MB body
+	assert peak < 20 * chunk_size
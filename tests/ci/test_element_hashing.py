@@ -0,0 +1,73 @@
+"""
+Tests for memoized element identity hashing on EnhancedDOMTreeNode / SerializedDOMState.
+"""
+
+import hashlib
+
+from browser_use.dom.views import EnhancedDOMTreeNode, NodeType, SerializedDOMState
+
+
+def _make_node(node_id: int, node_type: NodeType, node_name: str, parent: EnhancedDOMTreeNode | None, **attributes: str):
+	node = EnhancedDOMTreeNode(
+		node_id=node_id,
+		backend_node_id=node_id,
+		node_type=node_type,
+		node_name=node_name,
+		node_value='',
+		attributes=dict(attributes),
+		is_scrollable=None,
+		is_visible=True,
+		absolute_position=None,
+		target_id='target',
+		frame_id=None,
+		session_id=None,
+		content_document=None,
+		shadow_root_type=None,
+		shadow_roots=None,
+		parent_node=parent,
+		children_nodes=[],
+		ax_node=None,
+		snapshot_node=None,
+	)
+	if parent is not None:
+		assert parent.children_nodes is not None
+		parent.children_nodes.append(node)
+	return node
+
+
+def _expected_hash(value: str) -> int:
+	return int(hashlib.sha256(value.encode()).hexdigest()[:16], 16)
+
+
+def _build_tree():
+	document = _make_node(1, NodeType.DOCUMENT_NODE, '#document', None)
+	html = _make_node(2, NodeType.ELEMENT_NODE, 'HTML', document)
+	body = _make_node(3, NodeType.ELEMENT_NODE, 'BODY', html)
+	shadow_root = _make_node(4, NodeType.DOCUMENT_FRAGMENT_NODE, '#document-fragment', body)
+	button = _make_node(5, NodeType.ELEMENT_NODE, 'BUTTON', shadow_root, id='submit', style='color: red')
+	link = _make_node(6, NodeType.ELEMENT_NODE, 'A', body, href='/next', role='link')
+	return body, button, link
+
+
+def test_element_hash_is_stable_across_memoization():
+	"""Hashes must keep the same values that are persisted in saved histories."""
+	body, button, link = _build_tree()
+
+	# computing a deep node first fills in the ancestors on the way
+	assert hash(button) == _expected_hash('html/body/button|id=submit')
+	assert button.parent_branch_hash() == _expected_hash('html/body/button')
+	assert hash(link) == _expected_hash('html/body/a|href=/nextrole=link')
+	assert body._get_parent_branch_path() == ['html', 'body']
+
+	# memoized values are returned on repeated calls
+	assert button.element_hash == hash(button)
+	assert button.parent_branch_hash() == button.parent_branch_hash()
+
+
+def test_find_element_by_hash_uses_selector_map_index():
+	_, button, link = _build_tree()
+	state = SerializedDOMState(_root=None, selector_map={10: button, 11: link})
+
+	assert state.find_element_by_hash(link.element_hash) == (11, link)
+	assert state.find_element_by_hash(button.element_hash) == (10, button)
+	assert state.find_element_by_hash(12345) is None
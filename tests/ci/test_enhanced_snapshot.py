@@ -0,0 +1,72 @@
+"""
+Tests for the columnar snapshot lookup built from DOMSnapshot.captureSnapshot data.
+"""
+
+from browser_use.dom.enhanced_snapshot import REQUIRED_COMPUTED_STYLES, build_snapshot_lookup
+from browser_use.dom.views import DOMRect
+
+
+def _make_snapshot(node_count: int) -> dict:
+	"""Build a synthetic snapshot where every even node has a layout object and every third node is clickable."""
+	strings = ['block', 'visible', '1', 'visible', 'visible', 'visible', 'pointer', 'auto', 'static', 'none']
+	layout_nodes = [i for i in range(node_count) if i % 2 == 0]
+	return {
+		'strings': strings,
+		'documents': [
+			{
+				'nodes': {
+					'backendNodeId': [1000 + i for i in range(node_count)],
+					'isClickable': {'index': [i for i in range(node_count) if i % 3 == 0]},
+				},
+				'layout': {
+					'nodeIndex': layout_nodes,
+					'bounds': [[i * 2.0, i * 4.0, 10.0, 20.0] for i in layout_nodes],
+					'styles': [list(range(len(REQUIRED_COMPUTED_STYLES))) for _ in layout_nodes],
+					'paintOrders': [i + 1 for i in range(len(layout_nodes))],
+					'clientRects': [[] if i % 4 else [0.0, 0.0, 5.0, 5.0] for i in layout_nodes],
+					'scrollRects': [[] for _ in layout_nodes],
+					'stackingContexts': {'index': []},
+					'text': [],
+				},
+			}
+		],
+	}
+
+
+def test_snapshot_lookup_resolves_layout_and_rare_booleans():
+	lookup = build_snapshot_lookup(_make_snapshot(6), device_pixel_ratio=2.0)  # type: ignore[arg-type]
+
+	assert len(lookup) == 6
+	assert 1000 in lookup and 2000 not in lookup
+	assert lookup.get(2000) is None
+
+	node = lookup[1002]
+	assert node.is_clickable is False
+	assert node.bounds == DOMRect(x=2.0, y=4.0, width=5.0, height=10.0)  # divided by device pixel ratio
+	assert node.clientRects is None
+	assert node.scrollRects is None
+	assert node.paint_order == 2
+	assert node.cursor_style == 'pointer'
+	assert node.computed_styles and node.computed_styles['display'] == 'block'
+
+	first = lookup[1000]
+	assert first.is_clickable is True
+	assert first.clientRects == DOMRect(x=0.0, y=0.0, width=5.0, height=5.0)
+
+	# nodes without a layout object only carry node-level data
+	no_layout = lookup[1003]
+	assert no_layout.is_clickable is True
+	assert no_layout.bounds is None
+	assert no_layout.computed_styles is None
+	assert no_layout.paint_order is None
+
+
+def test_snapshot_lookup_memoizes_nodes():
+	lookup = build_snapshot_lookup(_make_snapshot(4))  # type: ignore[arg-type]
+	assert lookup[1000] is lookup[1000]
+
+
+def test_snapshot_lookup_empty_snapshot():
+	lookup = build_snapshot_lookup({'strings': [], 'documents': []})  # type: ignore[arg-type]
+	assert len(lookup) == 0
+	assert lookup.get(1) is None
@@ -0,0 +1,211 @@
+"""
+Tests for the extract action's markdown cache (per DOM version) and its concurrent chunked (map-reduce) mode.
+"""
+
+import asyncio
+import logging
+
+import pytest
+
+from browser_use.browser.events import NavigationCompleteEvent
+from browser_use.browser.session import BrowserSession
+from browser_use.browser.watchdogs.dom_watchdog import DOMWatchdog
+from browser_use.dom import markdown_extractor
+from browser_use.dom.markdown_extractor import extract_clean_markdown, split_markdown_chunks
+from browser_use.dom.mutation_tracker import DOMMutationTracker
+from browser_use.dom.service import DomService
+from browser_use.dom.views import EnhancedDOMTreeNode, NodeType
+from browser_use.filesystem.file_system import FileSystem
+from browser_use.llm.views import ChatInvokeCompletion
+from browser_use.tools.service import Tools
+from browser_use.tools.views import ExtractAction
+
+
+def _page(text: str) -> EnhancedDOMTreeNode:
+	def node(node_type: NodeType, name: str, value: str = '') -> EnhancedDOMTreeNode:
+		return EnhancedDOMTreeNode(
+			node_id=0,
+			backend_node_id=0,
+			node_type=node_type,
+			node_name=name,
+			node_value=value,
+			attributes={},
+			is_scrollable=False,
+			is_visible=True,
+			absolute_position=None,
+			target_id='target-1',
+			frame_id=None,
+			session_id=None,
+			content_document=None,
+			shadow_root_type=None,
+			shadow_roots=None,
+			parent_node=None,
+			children_nodes=[],
+			ax_node=None,
+			snapshot_node=None,
+		)
+
+	paragraph = node(NodeType.ELEMENT_NODE, 'P')
+	paragraph.children_nodes = [node(NodeType.TEXT_NODE, '#text', text)]
+	body = node(NodeType.ELEMENT_NODE, 'BODY')
+	body.children_nodes = [paragraph]
+	return body
+
+
+def _session_with_dom_watchdog() -> tuple[BrowserSession, DOMWatchdog]:
+	browser_session = BrowserSession()
+	dom_watchdog = DOMWatchdog(event_bus=browser_session.event_bus, browser_session=browser_session)
+	browser_session._dom_watchdog = dom_watchdog
+
+	async def get_current_page_url() -> str:
+		return 'https://example.com/report'
+
+	object.__setattr__(browser_session, 'get_current_page_url', get_current_page_url)
+
+	pages = iter(['First version of the page', 'Page after navigating'])
+
+	async def build_dom_tree(previous_state=None):
+		dom_watchdog.enhanced_dom_tree = _page(next(pages))
+		dom_watchdog._bump_dom_version()
+		dom_watchdog._enhanced_dom_tree_version = dom_watchdog.dom_version
+
+	object.__setattr__(dom_watchdog, '_build_dom_tree_without_highlights', build_dom_tree)
+	return browser_session, dom_watchdog
+
+
+def test_split_markdown_chunks_prefers_paragraph_breaks_and_covers_content():
+	paragraphs = [f'Paragraph {i}. ' + 'word ' * 150 for i in range(40)]
+	content = '\n\n'.join(paragraphs)
+
+	chunks = split_markdown_chunks(content, 2000)
+
+	assert ''.join(chunk for _, chunk in chunks) == content
+	assert all(len(chunk) <= 2000 for _, chunk in chunks)
+	assert all(content.startswith('\n\nParagraph', start) for start, _ in chunks[1:])
+	assert [start for start, _ in chunks] == [sum(len(chunk) for _, chunk in chunks[:i]) for i in range(len(chunks))]
+	assert len(split_markdown_chunks(content, 2000, max_chunks=3)) == 3
+
+
+async def test_markdown_is_cached_per_dom_version(monkeypatch):
+	browser_session, dom_watchdog = _session_with_dom_watchdog()
+	conversions = 0
+	serialize = markdown_extractor.MarkdownSerializer.serialize
+
+	def counting_serialize(self, node):
+		nonlocal conversions
+		conversions += 1
+		return serialize(self, node)
+
+	monkeypatch.setattr(markdown_extractor.MarkdownSerializer, 'serialize', counting_serialize)
+
+	first, stats = await extract_clean_markdown(browser_session=browser_session)
+	again, cached_stats = await extract_clean_markdown(browser_session=browser_session)
+	assert first == again == 'First version of the page'
+	assert conversions == 1
+	assert cached_stats['from_cache'] and 'from_cache' not in stats
+
+	# links are part of the cache key
+	await extract_clean_markdown(browser_session=browser_session, extract_links=True)
+	assert conversions == 2
+
+	await dom_watchdog.on_NavigationCompleteEvent(NavigationCompleteEvent(target_id='target-1', url='https://example.com/next'))
+	assert not dom_watchdog.has_current_dom_tree
+	after_navigation, _ = await extract_clean_markdown(browser_session=browser_session)
+	assert after_navigation == 'Page after navigating'
+	assert conversions == 3
+
+
+class ChunkRecordingLLM:
+	model = 'chunk-recording-llm'
+
+	def __init__(self):
+		self.active = 0
+		self.max_active = 0
+		self.prompts: list[str] = []
+
+	async def ainvoke(self, messages, output_format=None):
+		prompt = messages[-1].content
+		self.prompts.append(prompt)
+		self.active += 1
+		self.max_active = max(self.max_active, self.active)
+		try:
+			await asyncio.sleep(0.01)
+		finally:
+			self.active -= 1
+		if '<chunk_results>' in prompt:
+			return ChatInvokeCompletion(completion='merged answer', usage=None)
+		first_item = prompt.split('<webpage_content>')[1].strip().split(':')[0]
+		return ChatInvokeCompletion(completion=f'found {first_item}', usage=None)
+
+
+async def test_extract_map_reduce_over_chunks(monkeypatch, tmp_path):
+	content = '\n\n'.join(f'Item {i}: ' + 'detail ' * 60 for i in range(240))  # ~104k chars -> 4 windows of 30k
+	stats = {'original_html_chars': 0, 'initial_markdown_chars': 0, 'filtered_chars_removed': 0}
+
+	async def fake_extract_clean_markdown(browser_session=None, extract_links=False):
+		return content, {**stats, 'final_filtered_chars': len(content)}
+
+	monkeypatch.setattr(markdown_extractor, 'extract_clean_markdown', fake_extract_clean_markdown)
+	browser_session, _ = _session_with_dom_watchdog()
+	llm = ChunkRecordingLLM()
+	tools = Tools(extract_chunk_concurrency=2, extract_max_chunks=3)
+
+	result = await tools.registry.registry.actions['extract'].function(
+		params=ExtractAction(query='list all items'),
+		browser_session=browser_session,
+		page_extraction_llm=llm,
+		file_system=FileSystem(tmp_path),
+	)
+
+	chunk_prompts, merge_prompt = llm.prompts[:-1], llm.prompts[-1]
+	assert len(chunk_prompts) == 3
+	assert llm.max_active == 2
+	assert '<result>\nmerged answer\n</result>' in result.extracted_content
+	# every chunk starts at an item (paragraph break), and each chunk's answer is merged
+	assert merge_prompt.count('found Item') == 3 and 'found Item 0' in merge_prompt
+	# only 3 of the 4 windows were extracted, the merge step is told where to continue
+	covered = sum(len(chunk) for _, chunk in split_markdown_chunks(content, 30000, max_chunks=3))
+	assert f'use start_from_char={covered} to continue' in merge_prompt
+
+
+async def test_dom_mutations_invalidate_the_cached_markdown():
+	browser_session, dom_watchdog = _session_with_dom_watchdog()
+	tracker = DOMMutationTracker(
+		logging.getLogger('test'), node_factory=DomService._create_enhanced_node, on_mutation=dom_watchdog._bump_dom_version
+	)
+	tracker.begin_build('target-1', 'session-1')
+	text = {'nodeId': 3, 'backendNodeId': 1003, 'nodeType': 3, 'nodeName': '#text', 'localName': '', 'nodeValue': 'Price: 10'}
+	paragraph = {'nodeId': 2, 'backendNodeId': 1002, 'nodeType': 1, 'nodeName': 'P', 'localName': 'p', 'nodeValue': ''}
+	body = {'nodeId': 1, 'backendNodeId': 1001, 'nodeType': 1, 'nodeName': 'BODY', 'localName': 'body', 'nodeValue': ''}
+	tree = DomService._create_enhanced_node(body, 'target-1', 'session-1')  # type: ignore[arg-type]
+	tree.children_nodes = [DomService._create_enhanced_node(paragraph, 'target-1', 'session-1')]  # type: ignore[arg-type]
+	tree.children_nodes[0].children_nodes = [DomService._create_enhanced_node(text, 'target-1', 'session-1')]  # type: ignore[arg-type]
+	tree.children_nodes[0].parent_node = tree
+	tree.children_nodes[0].children_nodes[0].parent_node = tree.children_nodes[0]
+	tracker.track(tree, snapshot_node_count=0)
+
+	async def refresh_dom_tree(previous_state=None):
+		# incremental_dom refresh: the patched tree is reused
+		dom_watchdog.enhanced_dom_tree = tree
+		dom_watchdog._bump_dom_version()
+		dom_watchdog._enhanced_dom_tree_version = dom_watchdog.dom_version
+
+	object.__setattr__(dom_watchdog, '_build_dom_tree_without_highlights', refresh_dom_tree)
+
+	first, _ = await extract_clean_markdown(browser_session=browser_session)
+	assert first == 'Price: 10'
+
+	# the mutation patches the cached tree in place, the markdown converted from it must not be served again
+	tracker.on_character_data_modified({'nodeId': 3, 'characterData': 'Price: 12'}, 'session-1')
+	assert not dom_watchdog.has_current_dom_tree
+
+	after_mutation, stats = await extract_clean_markdown(browser_session=browser_session)
+	assert after_mutation == 'Price: 12'
+	assert 'from_cache' not in stats
+
+
+def test_invalid_chunk_settings_are_rejected():
+	with pytest.raises(ValueError, match='extract_max_chunks'):
+		Tools(extract_chunk_concurrency=2, extract_max_chunks=0)
+	with pytest.raises(ValueError, match='extract_chunk_concurrency'):
+		Tools(extract_chunk_concurrency=-1)
@@ -0,0 +1,180 @@
+"""
+Tests for the incrementally maintained agent history description.
+"""
+
+from browser_use.agent.message_manager.service import MessageManager
+from browser_use.agent.message_manager.views import HistoryDescriptionBuffer, HistoryItem
+from browser_use.agent.views import ActionResult, AgentStepInfo
+from browser_use.browser.views import BrowserStateSummary, TabInfo
+from browser_use.dom.views import SerializedDOMState
+from browser_use.filesystem.file_system import FileSystem
+from browser_use.llm.anthropic.serializer import MIN_CACHE_PREFIX_CHARS, AnthropicMessageSerializer
+from browser_use.llm.messages import SystemMessage, UserMessage
+
+
+def _reference_description(items: list[HistoryItem], max_history_items: int | None) -> str:
+	"""The description as it was built before it was maintained incrementally"""
+	if max_history_items is None or len(items) <= max_history_items:
+		return '\n'.join(item.to_string() for item in items)
+	omitted_count = len(items) - max_history_items
+	return '\n'.join(
+		[
+			items[0].to_string(),
+			f'<sys>[... {omitted_count} previous steps omitted...]</sys>',
+			*(item.to_string() for item in items[-(max_history_items - 1) :]),
+		]
+	)
+
+
+def _step(step: int) -> HistoryItem:
+	return HistoryItem(step_number=step, memory=f'Memory {step}', next_goal=f'Goal {step}', action_results=f'Result {step}')
+
+
+def test_items_are_rendered_once_and_match_the_full_rebuild(monkeypatch):
+	renders = 0
+	to_string = HistoryItem.to_string
+
+	def counting_to_string(self):
+		nonlocal renders
+		renders += 1
+		return to_string(self)
+
+	for max_history_items in (None, 6):
+		items = [HistoryItem(step_number=0, system_message='Agent initialized')]
+		buffer = HistoryDescriptionBuffer(max_history_items)
+		monkeypatch.setattr(HistoryItem, 'to_string', counting_to_string)
+		renders = 0
+		for step in range(1, 30):
+			items.append(_step(step))
+			buffer.sync(items)
+			buffer.sync(items)
+			monkeypatch.setattr(HistoryItem, 'to_string', to_string)
+			assert buffer.description == _reference_description(items, max_history_items)
+			monkeypatch.setattr(HistoryItem, 'to_string', counting_to_string)
+		assert renders == len(items)
+		monkeypatch.setattr(HistoryItem, 'to_string', to_string)
+
+
+def test_stable_prefix_boundary():
+	items = [HistoryItem(step_number=0, system_message='Agent initialized'), _step(1)]
+	buffer = HistoryDescriptionBuffer()
+	buffer.sync(items)
+	assert buffer.stable_prefix_length == len(buffer.description) and buffer.cached_prefix_length == 0
+
+	previous = buffer.description
+	items.append(_step(2))
+	buffer.sync(items)
+	# the whole previous description is still in place and the new one will be at the next step
+	assert buffer.cached_prefix_length == len(previous)
+	assert buffer.description[: buffer.cached_prefix_length] == previous
+	assert buffer.stable_prefix_length == len(buffer.description)
+
+	windowed_items = [HistoryItem(step_number=0, system_message='Agent initialized')] + [_step(i) for i in range(1, 8)]
+	windowed = HistoryDescriptionBuffer(max_history_items=6)
+	windowed.sync(windowed_items)
+	windowed_items.append(_step(8))
+	windowed.sync(windowed_items)
+	# only the first item stays in place when the window slides
+	assert windowed.stable_prefix_length == windowed.cached_prefix_length == len('Agent initialized')
+
+
+def test_changed_or_replaced_items_are_rendered_again():
+	items = [HistoryItem(step_number=0, system_message='Agent initialized'), _step(1)]
+	buffer = HistoryDescriptionBuffer()
+	buffer.sync(items)
+
+	items[-1] = _step(5)
+	buffer.sync(items)
+	assert buffer.description == _reference_description(items, None)
+	assert buffer.cached_prefix_length == 0
+
+	replaced = [HistoryItem(step_number=0, system_message='Agent initialized')]
+	buffer.sync(replaced)
+	assert buffer.description == 'Agent initialized'
+
+
+def test_message_manager_history_description(tmp_path):
+	manager = MessageManager(
+		task='Find the page',
+		system_message=SystemMessage(content='system'),
+		file_system=FileSystem(tmp_path),
+		max_history_items=6,
+	)
+
+	for step in range(1, 10):
+		manager._update_agent_history_description(
+			result=[ActionResult(extracted_content=f'Clicked {step}', include_in_memory=True)],
+			step_info=AgentStepInfo(step_number=step, max_steps=10),
+		)
+		if step == 4:
+			manager.add_new_task(f'Follow up {step}')
+
+	assert manager.agent_history_description == _reference_description(manager.state.agent_history_items, 6)
+	assert '<sys>[... 5 previous steps omitted...]</sys>' in manager.agent_history_description
+
+
+def test_anthropic_serializer_caches_the_stable_prefix():
+	text = 'a' * MIN_CACHE_PREFIX_CHARS + 'changing part'
+	message = UserMessage(content=text, cache=True, cache_prefix_length=MIN_CACHE_PREFIX_CHARS)
+
+	content = AnthropicMessageSerializer.serialize(message)['content']
+
+	assert isinstance(content, list) and len(content) == 2
+	prefix, rest = content
+	assert prefix['type'] == 'text' and rest['type'] == 'text'
+	assert prefix['text'] == 'a' * MIN_CACHE_PREFIX_CHARS and prefix.get('cache_control')
+	assert rest['text'] == 'changing part' and rest.get('cache_control')
+
+	# short prefixes are not worth a cache breakpoint
+	short = UserMessage(content=text, cache=True, cache_prefix_length=10)
+	assert len(AnthropicMessageSerializer.serialize(short)['content']) == 1
+
+
+def _cache_breakpoint_prefixes(blocks) -> tuple[list[str], str]:
+	"""The text up to every block boundary of the serialized state message, and up to its prefix cache breakpoint"""
+	boundaries, text = [], ''
+	for block in blocks[:-1]:
+		text += block['text']
+		boundaries.append(text)
+	breakpoint_index = next(i for i, block in enumerate(blocks) if block.get('cache_control'))
+	return boundaries, boundaries[breakpoint_index]
+
+
+def test_the_next_step_reads_the_prefix_cached_by_the_previous_step(tmp_path):
+	browser_state = BrowserStateSummary(
+		url='https://example.com',
+		title='Test',
+		tabs=[TabInfo(target_id='test-0', url='https://example.com', title='Test')],
+		dom_state=SerializedDOMState(_root=None, selector_map={}),
+	)
+
+	for max_history_items in (None, 6):
+		manager = MessageManager(
+			task='Find the page',
+			system_message=SystemMessage(content='system'),
+			file_system=FileSystem(tmp_path / str(max_history_items)),
+			max_history_items=max_history_items,
+		)
+		# a long first item, so the prefix is long enough to be cached with a window too
+		manager.state.agent_history_items[0] = HistoryItem(step_number=0, system_message='x' * MIN_CACHE_PREFIX_CHARS)
+
+		previous_breakpoint = None
+		for step in range(1, 10):
+			manager.create_state_messages(
+				browser_state,
+				result=[ActionResult(extracted_content=f'Clicked {step} ' + 'y' * 500, include_in_memory=True)],
+				step_info=AgentStepInfo(step_number=step, max_steps=10),
+				use_vision=False,
+			)
+			state_message = manager.state.history.state_message
+			assert isinstance(state_message, UserMessage)
+			blocks = AnthropicMessageSerializer.serialize(state_message)['content']
+			assert isinstance(blocks, list)
+			assert ''.join(block['text'] for block in blocks) == state_message.text
+
+			boundaries, breakpoint = _cache_breakpoint_prefixes(blocks)
+			assert breakpoint.startswith('<agent_history>\n') and '</agent_history>' not in breakpoint
+			if previous_breakpoint is not None:
+				# the prefix written at the previous step ends on one of this step's block boundaries
+				assert previous_breakpoint in boundaries
+			previous_breakpoint = breakpoint
@@ -0,0 +1,104 @@
+"""
+Tests for the streaming history GIF renderer.
+"""
+
+import base64
+import weakref
+
+from PIL import Image
+
+from browser_use.agent import gif
+from browser_use.agent.gif import create_history_gif
+from browser_use.agent.views import ActionResult, AgentHistory, AgentHistoryList, AgentOutput
+from browser_use.browser.views import PLACEHOLDER_4PX_SCREENSHOT, BrowserStateHistory
+from browser_use.screenshots.image_pool import ImageWorkerPool
+
+
+def _history(tmp_path, steps: int) -> AgentHistoryList:
+	items = []
+	for i in range(steps):
+		screenshot_path = tmp_path / f'step_{i}.png'
+		Image.new('RGB', (320, 200), (i * 20 % 255, 120, 200)).save(screenshot_path)
+		url = 'https://example.com/page'
+		if i == 1:
+			screenshot_path.write_bytes(base64.b64decode(PLACEHOLDER_4PX_SCREENSHOT))
+		if i == 2:
+			url = 'about:blank'
+		items.append(
+			AgentHistory(
+				model_output=AgentOutput(evaluation_previous_goal='ok', memory='', next_goal=f'Goal {i}', action=[]),
+				result=[ActionResult()],
+				state=BrowserStateHistory(
+					url=url, title='Page', tabs=[], interacted_element=[], screenshot_path=str(screenshot_path)
+				),
+			)
+		)
+	return AgentHistoryList(history=items)
+
+
+def test_history_gif_is_streamed_with_a_bounded_frame_window(tmp_path, monkeypatch):
+	history = _history(tmp_path, 12)
+	frame_refs: list[weakref.ref] = []
+	in_memory: list[int] = []
+	render_and_encode = gif._render_and_encode
+	write = gif._GifWriter.write
+
+	def tracking_render_and_encode(*args, **kwargs):
+		frame = render_and_encode(*args, **kwargs)
+		if frame is not None:
+			frame_refs.append(weakref.ref(frame))
+		return frame
+
+	def recording_write(self, frame):
+		in_memory.append(sum(ref() is not None for ref in frame_refs))
+		return write(self, frame)
+
+	monkeypatch.setattr(gif, '_render_and_encode', tracking_render_and_encode)
+	monkeypatch.setattr(gif._GifWriter, 'write', recording_write)
+	output_path = tmp_path / 'history.gif'
+
+	create_history_gif('Find the page', history, output_path=str(output_path), duration=500, frame_window=3)
+
+	with Image.open(output_path) as image:
+		# task frame + 12 steps without the placeholder and the new tab page
+		assert image.n_frames == 11
+		assert image.size == (320, 200)
+		assert image.info['duration'] == 500 and image.info['loop'] == 0
+		image.seek(3)
+		assert image.convert('RGB').getpixel((5, 5)) != (0, 0, 0)
+	# frames are written as they are ready, only the frame window is kept in memory
+	assert len(in_memory) == 11 and max(in_memory) <= 3
+
+
+def test_no_file_is_written_without_real_screenshots(tmp_path):
+	screenshot_path = tmp_path / 'blank.png'
+	screenshot_path.write_bytes(base64.b64decode(PLACEHOLDER_4PX_SCREENSHOT))
+	history = AgentHistoryList(
+		history=[
+			AgentHistory(
+				model_output=None,
+				result=[],
+				state=BrowserStateHistory(
+					url='about:blank', title='', tabs=[], interacted_element=[], screenshot_path=str(screenshot_path)
+				),
+			)
+		]
+	)
+	output_path = tmp_path / 'history.gif'
+
+	create_history_gif('task', history, output_path=str(output_path))
+
+	assert not output_path.exists()
+
+
+def test_frames_are_rendered_on_the_shared_image_pool(tmp_path, monkeypatch):
+	history = _history(tmp_path, 4)
+	pool = ImageWorkerPool(max_workers=2)
+	monkeypatch.setattr(gif, 'image_pool', pool)
+
+	create_history_gif('task', history, output_path=str(tmp_path / 'history.gif'), frame_window=2)
+
+	frames = pool.get_stats().operations['history_gif_frame']
+	assert frames.calls == 5 and frames.failures == 0
+	assert pool.get_stats().pending == 0
+	pool.shutdown()
@@ -0,0 +1,207 @@
+"""
+Tests for the append-only JSONL history format and its lazy loader.
+"""
+
+import json
+
+from browser_use.agent.service import Agent
+from browser_use.agent.views import (
+	ActionResult,
+	AgentHistory,
+	AgentHistoryList,
+	AgentOutput,
+	JudgementResult,
+	LazyAgentHistoryList,
+	StepMetadata,
+)
+from browser_use.browser.views import BrowserStateHistory
+from browser_use.tokens.views import UsageSummary
+from browser_use.tools.service import Tools
+
+
+def _output_model() -> type[AgentOutput]:
+	return AgentOutput.type_with_custom_actions(Tools().registry.create_action_model())
+
+
+def _item(output_model: type[AgentOutput], step: int, text: str = 'hello') -> AgentHistory:
+	model_output = output_model.model_validate(
+		{
+			'evaluation_previous_goal': 'ok',
+			'memory': '',
+			'next_goal': f'Goal {step}',
+			'action': [{'input': {'index': step, 'text': text}}],
+		}
+	)
+	return AgentHistory(
+		model_output=model_output,
+		result=[ActionResult(extracted_content=f'Typed in step {step}')],
+		state=BrowserStateHistory(url=f'https://example.com/{step}', title='Page', tabs=[], interacted_element=[None]),
+		metadata=StepMetadata(step_number=step, step_start_time=0.0, step_end_time=1.0),
+	)
+
+
+def test_jsonl_history_is_appended_and_loaded_lazily(tmp_path):
+	output_model = _output_model()
+	path = tmp_path / 'history.jsonl'
+	history = AgentHistoryList(history=[_item(output_model, 1), _item(output_model, 2)])
+
+	history.save_to_file(path)
+	AgentHistoryList.append_to_file(path, [_item(output_model, 3)])
+
+	lines = path.read_text().splitlines()
+	assert len(lines) == 3 and json.loads(lines[2])['metadata']['step_number'] == 3
+
+	lazy = LazyAgentHistoryList(path, output_model)
+	assert len(lazy) == 3
+	assert lazy[1].state.url == 'https://example.com/2'
+	assert lazy[-1].model_output is not None and lazy[-1].model_output.action[0].get_index() == 3
+	assert [item.metadata.step_number for item in lazy if item.metadata] == [1, 2, 3]
+	assert [item.state.url for item in lazy[:2]] == ['https://example.com/1', 'https://example.com/2']
+
+	# the eager loader reads the same file into a regular AgentHistoryList
+	loaded = AgentHistoryList.load_from_file(path, output_model)
+	assert isinstance(loaded, AgentHistoryList) and len(loaded) == 3
+	assert loaded.final_result() == 'Typed in step 3'
+
+
+def test_truncated_last_line_is_skipped(tmp_path):
+	output_model = _output_model()
+	path = tmp_path / 'history.jsonl'
+	AgentHistoryList(history=[_item(output_model, 1), _item(output_model, 2)]).save_to_file(path)
+	complete = path.read_bytes()
+	last_line = _item(output_model, 3).to_json_line()
+	path.write_bytes(complete + last_line[: len(last_line) // 2].encode())
+
+	lazy = LazyAgentHistoryList(path, output_model)
+
+	assert len(lazy) == 2
+	assert lazy[-1].state.url == 'https://example.com/2'
+
+
+def test_lazy_history_transform_is_applied_on_load(tmp_path):
+	output_model = _output_model()
+	path = tmp_path / 'history.jsonl'
+	AgentHistoryList(history=[_item(output_model, 1)]).save_to_file(path)
+
+	def retitle(item: AgentHistory) -> AgentHistory:
+		item.state.title = 'Changed'
+		return item
+
+	lazy = LazyAgentHistoryList(path, output_model)
+	mapped = lazy.map(retitle)
+
+	assert mapped[0].state.title == 'Changed'
+	assert lazy[0].state.title == 'Page'
+
+
+async def test_agent_persists_each_step_with_sensitive_data_filtered(tmp_path, mock_llm):
+	path = tmp_path / 'run' / 'history.jsonl'
+	agent = Agent(
+		task='test',
+		llm=mock_llm,
+		save_history_path=path,
+		sensitive_data={'password': 'hunter2'},
+	)
+	output_model = agent.AgentOutput
+
+	agent.history.add_item(_item(output_model, 1, text='hunter2'))
+	await agent._persist_history()
+	agent.history.add_item(_item(output_model, 2))
+	await agent._persist_history()
+	await agent._persist_history()
+
+	lines = path.read_text().splitlines()
+	assert len(lines) == 2
+	assert 'hunter2' not in lines[0] and '<secret>password</secret>' in lines[0]
+
+	# a new agent writing to the same path starts a new file
+	other = Agent(task='test', llm=mock_llm, save_history_path=path)
+	other.history.add_item(_item(output_model, 1))
+	await other._persist_history()
+	assert len(path.read_text().splitlines()) == 1
+
+
+def _usage(total_tokens: int) -> UsageSummary:
+	return UsageSummary(
+		total_prompt_tokens=total_tokens,
+		total_prompt_cost=0.01,
+		total_prompt_cached_tokens=0,
+		total_prompt_cached_cost=0.0,
+		total_completion_tokens=0,
+		total_completion_cost=0.0,
+		total_tokens=total_tokens,
+		total_cost=0.01,
+		entry_count=1,
+	)
+
+
+def test_usage_is_saved_as_a_record_after_the_items(tmp_path):
+	output_model = _output_model()
+	path = tmp_path / 'history.jsonl'
+	AgentHistoryList(history=[_item(output_model, 1)], usage=_usage(100)).save_to_file(path)
+	AgentHistoryList.append_to_file(path, [_item(output_model, 2)], usage=_usage(250))
+
+	lazy = LazyAgentHistoryList(path, output_model)
+	assert len(lazy) == 2 and [item.state.url for item in lazy] == ['https://example.com/1', 'https://example.com/2']
+	assert lazy.usage is not None and lazy.usage.total_tokens == 250
+	assert lazy.map(lambda item: item).usage == lazy.usage
+
+	loaded = AgentHistoryList.load_from_file(path, output_model)
+	assert len(loaded) == 2 and loaded.usage == _usage(250)
+
+	# a crash while the usage record is written leaves the items readable
+	path.write_bytes(path.read_bytes()[:-20])
+	assert LazyAgentHistoryList(path, output_model).usage == _usage(100)
+
+
+async def test_judged_run_is_loaded_back_with_its_judgement_and_usage(tmp_path, mock_llm):
+	path = tmp_path / 'history.jsonl'
+	agent = Agent(task='test', llm=mock_llm, save_history_path=path)
+	output_model = agent.AgentOutput
+
+	agent.history.add_item(_item(output_model, 1))
+	await agent._persist_history()
+	done = _item(output_model, 2)
+	done.result = [ActionResult(is_done=True, success=True, extracted_content='Done')]
+	agent.history.add_item(done)
+	await agent._persist_history()
+
+	# the judge and the usage summary come after the last step was appended, like at the end of Agent.run
+	done.result[-1].judgement = JudgementResult(reasoning='Looks right', verdict=True)
+	agent.history.usage = _usage(500)
+	await agent._persist_history(final=True)
+
+	loaded = AgentHistoryList.load_from_file(path, output_model)
+	assert len(loaded) == 2 and len(path.read_text().splitlines()) == 3
+	judgement = loaded.history[-1].result[-1].judgement
+	assert judgement is not None and judgement.verdict is True and judgement.reasoning == 'Looks right'
+	assert loaded.usage == _usage(500)
+
+	# steps of a follow-up run are appended after the usage record, the last record wins
+	agent.history.add_item(_item(output_model, 3))
+	await agent._persist_history()
+	agent.history.usage = _usage(800)
+	await agent._persist_history(final=True)
+	loaded = AgentHistoryList.load_from_file(path, output_model)
+	assert [item.metadata.step_number for item in loaded.history if item.metadata] == [1, 2, 3]
+	assert loaded.usage == _usage(800)
+
+
+async def test_load_and_rerun_streams_jsonl_history_with_variables(tmp_path, mock_llm, monkeypatch):
+	agent = Agent(task='test', llm=mock_llm)
+	path = tmp_path / 'history.jsonl'
+	AgentHistoryList(history=[_item(agent.AgentOutput, 1, text='old@example.com')]).save_to_file(path)
+	replayed: list = []
+
+	async def rerun_history(history, **kwargs):
+		replayed.append(history)
+		return []
+
+	monkeypatch.setattr(agent, 'rerun_history', rerun_history)
+
+	await agent.load_and_rerun(path, variables={'email': 'new@example.com'})
+
+	history = replayed[0]
+	assert isinstance(history, LazyAgentHistoryList)
+	action = history[0].model_output.action[0].model_dump(exclude_none=True)
+	assert action['input']['text'] == 'new@example.com'
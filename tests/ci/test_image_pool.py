@@ -0,0 +1,152 @@
+"""
+Tests for the shared image worker pool and the screenshot operations that run in it.
+"""
+
+import asyncio
+import base64
+import io
+import time
+
+import pytest
+from PIL import Image
+
+from browser_use.agent.prompts import resize_screenshot
+from browser_use.browser.python_highlights import create_highlighted_screenshot
+from browser_use.dom.views import DOMRect, EnhancedDOMTreeNode, NodeType
+from browser_use.screenshots.image_pool import ImageWorkerPool, image_pool
+
+
+def _png(width: int, height: int) -> str:
+	buffer = io.BytesIO()
+	Image.new('RGB', (width, height), (255, 255, 255)).save(buffer, format='PNG')
+	return base64.b64encode(buffer.getvalue()).decode()
+
+
+def _image(screenshot_b64: str) -> Image.Image:
+	return Image.open(io.BytesIO(base64.b64decode(screenshot_b64)))
+
+
+def _blocking(seconds: float) -> str:
+	time.sleep(seconds)
+	return 'done'
+
+
+def _fail() -> None:
+	raise ValueError('broken image')
+
+
+async def test_work_runs_off_the_event_loop_with_queue_depth_and_timing():
+	pool = ImageWorkerPool(max_workers=1)
+	ticks = 0
+
+	async def ticker():
+		nonlocal ticks
+		while True:
+			await asyncio.sleep(0.01)
+			ticks += 1
+
+	ticker_task = asyncio.create_task(ticker())
+	try:
+		results = await asyncio.gather(*(pool.run('blocking', _blocking, 0.1) for _ in range(3)))
+	finally:
+		ticker_task.cancel()
+
+	assert results == ['done'] * 3
+	# the loop kept running while the workers were busy
+	assert ticks >= 15
+	stats = pool.get_stats()
+	assert stats.max_queue_depth == 2 and stats.pending == 0 and stats.queue_depth == 0
+	blocking = stats.operations['blocking']
+	assert blocking.calls == 3 and blocking.failures == 0
+	assert blocking.max_run_seconds >= 0.1 and blocking.total_wait_seconds >= 0.2
+
+	with pytest.raises(ValueError):
+		await pool.run('broken', _fail)
+	assert pool.get_stats().operations['broken'].failures == 1
+	pool.shutdown()
+
+
+def test_submit_from_synchronous_code():
+	pool = ImageWorkerPool(max_workers=1)
+	futures = [pool.submit('blocking', _blocking, 0.05) for _ in range(3)]
+	assert [future.result() for future in futures] == ['done'] * 3
+
+	failed = pool.submit('broken', _fail)
+	with pytest.raises(ValueError):
+		failed.result()
+	stats = pool.get_stats()
+	assert stats.operations['blocking'].calls == 3 and stats.operations['broken'].failures == 1
+	assert stats.max_queue_depth == 2 and stats.pending == 0
+
+	# cancelling a queued operation keeps it from running
+	running = pool.submit('blocking', _blocking, 0.1)
+	queued = pool.submit('blocking', _blocking, 0.1)
+	assert queued.cancel()
+	assert running.result() == 'done' and queued.cancelled()
+	pool.shutdown()
+	assert pool.get_stats().operations['blocking'].calls == 4 and pool.get_stats().pending == 0
+
+
+async def test_release_shuts_the_pool_down_after_the_last_user():
+	pool = ImageWorkerPool(max_workers=2)
+	pool.retain()
+	pool.retain()
+	await pool.run('blocking', _blocking, 0)
+	executor = pool._executor
+	assert executor is not None
+
+	pool.release()
+	assert pool._executor is executor
+	pool.release()
+	assert pool._executor is None
+
+	# the pool starts again when it is used after the shutdown
+	assert await pool.run('blocking', _blocking, 0) == 'done'
+	pool.shutdown()
+
+
+async def test_highlighted_screenshot_is_drawn_in_the_pool():
+	element = EnhancedDOMTreeNode(
+		node_id=1,
+		backend_node_id=42,
+		node_type=NodeType.ELEMENT_NODE,
+		node_name='BUTTON',
+		node_value='',
+		attributes={},
+		is_scrollable=False,
+		is_visible=True,
+		absolute_position=DOMRect(x=100, y=100, width=200, height=50),
+		target_id='target-1',
+		frame_id=None,
+		session_id=None,
+		content_document=None,
+		shadow_root_type=None,
+		shadow_roots=None,
+		parent_node=None,
+		children_nodes=[],
+		ax_node=None,
+		snapshot_node=None,
+	)
+	screenshot = _png(1600, 1000)
+	calls_before = image_pool.get_stats().operations.get('highlight_screenshot')
+
+	highlighted = await create_highlighted_screenshot(screenshot, {42: element}, device_pixel_ratio=2.0)
+
+	assert highlighted != screenshot
+	image = _image(highlighted)
+	assert image.size == (1600, 1000)
+	# the dashed border is drawn in device pixels (x2)
+	assert image.convert('RGB').getpixel((200, 200)) != (255, 255, 255)
+	assert image_pool.get_stats().operations['highlight_screenshot'].calls == (calls_before.calls if calls_before else 0) + 1
+
+
+async def test_resize_screenshot_in_worker_processes():
+	pool = ImageWorkerPool(max_workers=1, use_processes=True)
+	try:
+		resized = await pool.run('resize_screenshot', resize_screenshot, _png(1920, 1080), (1400, 850))
+	finally:
+		pool.shutdown()
+
+	assert _image(resized).size == (1400, 850)
+	screenshot = _png(1400, 850)
+	assert resize_screenshot(screenshot, (1400, 850)) is screenshot
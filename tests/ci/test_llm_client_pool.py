@@ -0,0 +1,77 @@
+"""
+Tests for the shared LLM SDK client pool (browser_use.llm.client_pool).
+"""
+
+import asyncio
+
+import httpx
+from openai import AsyncOpenAI
+
+from browser_use.llm.anthropic.chat import ChatAnthropic
+from browser_use.llm.client_pool import LLMClientPool, llm_client_pool
+from browser_use.llm.openai.chat import ChatOpenAI
+
+
+async def test_chat_models_share_pooled_clients():
+	"""Instances with the same connection params reuse one SDK client, different credentials don't."""
+	first = ChatOpenAI(model='gpt-4.1-mini', api_key='key-a')
+	second = ChatOpenAI(model='gpt-4.1', api_key='key-a', temperature=0.7)
+	other_key = ChatOpenAI(model='gpt-4.1-mini', api_key='key-b')
+
+	client = first.get_client()
+	assert first.get_client() is client
+	assert second.get_client() is client
+	assert other_key.get_client() is not client
+	assert ChatAnthropic(model='claude-sonnet-4-0', api_key='key-a').get_client() is not client
+
+	# the injected http client keeps connections alive with bounded limits
+	assert isinstance(client._client, httpx.AsyncClient)
+	assert client._client._transport._pool._max_connections == llm_client_pool.limits.max_connections  # type: ignore[attr-defined]
+
+	await llm_client_pool.aclose()
+	assert client.is_closed()
+	assert first.get_client() is not client
+	await llm_client_pool.aclose()
+
+
+async def test_pool_keys_hash_secrets_and_count_reuse():
+	pool = LLMClientPool()
+	params = {'api_key': 'sk-secret', 'base_url': httpx.URL('https://example.com'), 'timeout': 30.0}
+	key = pool.make_key('openai', AsyncOpenAI, params)
+	assert 'sk-secret' not in repr(key)
+	assert key == pool.make_key('openai', AsyncOpenAI, {**params, 'base_url': 'https://example.com'})
+
+	created = []
+	for _ in range(3):
+		pool.get_client('openai', object, {'api_key': 'sk-secret'}, lambda: created.append(object()) or created[-1])
+	stats = pool.get_stats()['openai']
+	assert (len(created), stats.clients_created, stats.clients_reused) == (1, 1, 2)
+
+	pool.retain()
+	pool.retain()
+	await pool.release()
+	assert stats.clients_closed == 0  # still in use by another agent
+	await pool.release()
+	assert stats.clients_closed == 1
+
+
+async def test_user_http_client_is_not_closed():
+	pool = LLMClientPool()
+	http_client = httpx.AsyncClient()
+	params = {'api_key': 'key', 'http_client': http_client}
+	client = pool.get_client('openai', AsyncOpenAI, params)
+	assert client._client is http_client
+
+	await pool.aclose()
+	assert not http_client.is_closed
+	await http_client.aclose()
+
+
+def test_clients_are_pooled_per_event_loop():
+	model = ChatOpenAI(model='gpt-4.1-mini', api_key='key-loop')
+
+	async def get_client():
+		return model.get_client()
+
+	# httpx connections are bound to their event loop, so a new loop must get a new client
+	assert asyncio.run(get_client()) is not asyncio.run(get_client())
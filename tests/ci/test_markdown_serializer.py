@@ -0,0 +1,125 @@
+"""
+Tests for the direct DOM to markdown conversion (MarkdownSerializer) against HTMLSerializer + markdownify.
+"""
+
+import sys
+
+import pytest
+
+from browser_use.dom import markdown_extractor
+from browser_use.dom.markdown_extractor import describe_content_source, dom_tree_to_markdown
+from browser_use.dom.serializer.markdown_serializer import MarkdownSerializer
+from browser_use.dom.views import EnhancedDOMTreeNode, NodeType
+
+
+def _node(node_type: NodeType, name: str, value: str = '', children: list[EnhancedDOMTreeNode] | None = None, **attributes):
+	return EnhancedDOMTreeNode(
+		node_id=0,
+		backend_node_id=0,
+		node_type=node_type,
+		node_name=name,
+		node_value=value,
+		attributes=attributes,
+		is_scrollable=False,
+		is_visible=True,
+		absolute_position=None,
+		target_id='target-1',
+		frame_id=None,
+		session_id=None,
+		content_document=None,
+		shadow_root_type=None,
+		shadow_roots=None,
+		parent_node=None,
+		children_nodes=children or [],
+		ax_node=None,
+		snapshot_node=None,
+	)
+
+
+def _el(name: str, *children: EnhancedDOMTreeNode | str, **attributes: str) -> EnhancedDOMTreeNode:
+	nodes = [_node(NodeType.TEXT_NODE, '#text', child) if isinstance(child, str) else child for child in children]
+	return _node(NodeType.ELEMENT_NODE, name.upper(), children=nodes, **attributes)
+
+
+def _page() -> EnhancedDOMTreeNode:
+	widget = _el('div', 'Host text ')
+	widget.shadow_roots = [_node(NodeType.DOCUMENT_FRAGMENT_NODE, '#document-fragment', children=[_el('b', 'shadow content')])]
+	iframe = _el('iframe', src='/frame')
+	iframe.content_document = _node(
+		NodeType.DOCUMENT_NODE, '#document', children=[_el('html', _el('body', _el('p', 'Inside the ', _el('em', 'iframe'))))]
+	)
+	body = _el(
+		'body',
+		_el('h1', 'Title  with   spaces'),
+		_el('p', 'Some ', _el('strong', 'bold'), ' and ', _el('a', 'a link', href='/docs?a=1&b=2', title='Docs'), '.'),
+		_node(NodeType.COMMENT_NODE, '#comment', 'hidden'),
+		_el('ul', _el('li', 'first'), _el('li', 'second', _el('ol', _el('li', 'nested')))),
+		_el(
+			'table',
+			_el('thead', _el('tr', _el('th', 'Name'), _el('th', 'Price'))),
+			_el('tbody', _el('tr', _el('td', 'Widget'), _el('td', '$5', colspan='2'))),
+		),
+		_el('pre', _el('code', 'x = 1\n\nprint(x)\n', **{'class': 'language-python'})),
+		_el('blockquote', _el('p', 'quoted ', _el('code', 'inline `code`'))),
+		_el('img', src='data:image/png;base64,AAAA', alt='inline'),
+		_el('img', src='/logo.png', alt='Logo'),
+		_el('script', 'var tracking = 1;'),
+		_el('h3', 'Line', _el('br'), 'break'),
+		_el('dl', _el('dt', 'Term'), _el('dd', 'Definition')),
+		widget,
+		iframe,
+		_el('hr'),
+		'  trailing text  ',
+	)
+	return _node(NodeType.DOCUMENT_NODE, '#document', children=[_el('html', _el('head', _el('title', 'Page title')), body)])
+
+
+@pytest.mark.parametrize('extract_links', [False, True])
+def test_direct_conversion_matches_markdownify(extract_links):
+	page = _page()
+
+	direct, direct_stats = dom_tree_to_markdown(page, extract_links=extract_links)
+	expected, markdownify_stats = dom_tree_to_markdown(page, extract_links=extract_links, converter='markdownify')
+
+	assert direct == expected
+	assert 'shadow content' in direct and 'Inside the *iframe*' in direct
+	assert ('[a link](/docs?a=1&b=2 "Docs")' in direct) == extract_links
+	assert direct_stats['dom_nodes'] > 40 and markdownify_stats['original_html_chars'] > 0
+	# the key of the HTML conversion stays in the stats of the direct conversion
+	assert direct_stats['original_html_chars'] == 0
+	assert describe_content_source(direct_stats).endswith('DOM nodes')
+	assert describe_content_source(markdownify_stats).endswith('HTML chars')
+
+
+def test_deep_pages_are_converted_without_recursion():
+	depth = sys.getrecursionlimit() * 2
+	node = _el('p', 'deep text')
+	for _ in range(depth):
+		node = _el('div', node)
+
+	serializer = MarkdownSerializer()
+	assert serializer.serialize(_el('body', node)) == 'deep text'
+	assert serializer.node_count == depth + 3
+
+
+def test_falls_back_to_markdownify_when_direct_conversion_fails(monkeypatch, caplog):
+	def failing_serialize(self, node):
+		raise KeyError('unexpected node data')
+
+	monkeypatch.setattr(markdown_extractor.MarkdownSerializer, 'serialize', failing_serialize)
+
+	content, stats = dom_tree_to_markdown(_page())
+
+	assert content.startswith('# Title with spaces')
+	assert 'original_html_chars' in stats and 'dom_nodes' not in stats
+	assert any(record.levelname == 'WARNING' and 'falling back to markdownify' in record.message for record in caplog.records)
+
+
+def test_unrelated_errors_are_not_hidden_by_the_fallback(monkeypatch):
+	def failing_serialize(self, node):
+		raise MemoryError
+
+	monkeypatch.setattr(markdown_extractor.MarkdownSerializer, 'serialize', failing_serialize)
+
+	with pytest.raises(MemoryError):
+		dom_tree_to_markdown(_page())
@@ -0,0 +1,83 @@
+"""
+Tests for NetworkActivityTracker, the event-driven network idle signal used by pipelined_state_capture.
+"""
+
+import asyncio
+import time
+
+from browser_use.browser.network_tracker import NetworkActivityTracker
+from browser_use.browser.watchdogs.dom_watchdog import DOMWatchdog
+from browser_use.dom.service import DomService
+
+SESSION_ID = 'session-1'
+
+
+def _request(tracker: NetworkActivityTracker, request_id: str, url: str, resource_type: str = 'XHR', session_id=SESSION_ID):
+	tracker.on_request_will_be_sent(
+		{'requestId': request_id, 'type': resource_type, 'request': {'url': url, 'method': 'POST'}}, session_id
+	)
+
+
+def test_tracks_pending_requests_per_session_and_ignores_noise():
+	tracker = NetworkActivityTracker()
+	_request(tracker, '1', 'https://example.com/api/items')
+	_request(tracker, '2', 'https://www.google-analytics.com/collect')  # tracking
+	_request(tracker, '3', 'wss://example.com/socket', resource_type='WebSocket')  # long-lived
+	_request(tracker, '4', 'data:image/png;base64,AAAA', resource_type='Image')
+	_request(tracker, '5', 'https://example.com/other-tab', session_id='session-2')
+
+	pending = tracker.get_pending_requests(SESSION_ID)
+	assert [(r.url, r.method, r.resource_type) for r in pending] == [('https://example.com/api/items', 'POST', 'XHR')]
+	assert not tracker.is_idle(SESSION_ID)
+
+	tracker.on_loading_failed({'requestId': '1'}, SESSION_ID)
+	assert tracker.is_idle(SESSION_ID)
+	assert not tracker.is_idle('session-2')
+
+
+def test_stuck_and_slow_non_critical_requests_do_not_block_idle():
+	tracker = NetworkActivityTracker(stuck_request_timeout=10.0)
+	_request(tracker, 'poll', 'https://example.com/poll')
+	_request(tracker, 'img', 'https://example.com/hero.jpg', resource_type='Image')
+	assert len(tracker.get_pending_requests(SESSION_ID)) == 2
+
+	requests = tracker._requests[SESSION_ID]
+	requests['poll'].start_time = time.monotonic() - 11
+	requests['img'].start_time = time.monotonic() - 4
+	assert tracker.is_idle(SESSION_ID)
+
+
+async def test_wait_for_idle_returns_as_soon_as_requests_finish():
+	tracker = NetworkActivityTracker()
+	assert await tracker.wait_for_idle(SESSION_ID, timeout=5.0)
+
+	_request(tracker, '1', 'https://example.com/a')
+	_request(tracker, '2', 'https://example.com/b')
+	loop = asyncio.get_running_loop()
+	loop.call_later(0.01, tracker.on_loading_finished, {'requestId': '1'}, SESSION_ID)
+	loop.call_later(0.02, tracker.on_loading_finished, {'requestId': '2'}, SESSION_ID)
+
+	start = time.monotonic()
+	assert await tracker.wait_for_idle(SESSION_ID, timeout=5.0)
+	assert time.monotonic() - start < 1.0
+
+	_request(tracker, '3', 'https://example.com/slow')
+	assert not await tracker.wait_for_idle(SESSION_ID, timeout=0.05)
+	assert tracker._idle_waiters.get(SESSION_ID) == []
+
+
+def test_page_info_and_pixel_ratio_from_layout_metrics():
+	metrics = {
+		'layoutViewport': {'pageX': 0, 'pageY': 0, 'clientWidth': 2560, 'clientHeight': 1440},
+		'visualViewport': {'clientWidth': 2560, 'clientHeight': 1440},
+		'cssLayoutViewport': {'pageX': 0, 'pageY': 300, 'clientWidth': 1280, 'clientHeight': 720},
+		'cssVisualViewport': {'pageX': 0, 'pageY': 300, 'clientWidth': 1280, 'clientHeight': 720},
+		'contentSize': {'x': 0, 'y': 0, 'width': 2560, 'height': 6000},
+	}
+	assert DomService._device_pixel_ratio(metrics) == 2.0  # type: ignore[arg-type]
+	assert DomService._device_pixel_ratio(None) == 1.0
+
+	page_info = DOMWatchdog._page_info_from_layout_metrics(metrics)  # type: ignore[arg-type]
+	assert (page_info.viewport_width, page_info.viewport_height) == (1280, 720)
+	assert (page_info.page_width, page_info.page_height) == (1280, 3000)
+	assert (page_info.pixels_above, page_info.pixels_below) == (300, 1980)
@@ -0,0 +1,89 @@
+"""
+Tests for the paint order occlusion engines: RectUnionGrid must give exactly the results of RectUnionPure.
+"""
+
+import random
+
+import pytest
+
+from browser_use.dom.serializer.paint_order import PaintOrderRemover, Rect, RectUnionGrid, RectUnionPure
+from browser_use.dom.views import DOMRect, EnhancedDOMTreeNode, EnhancedSnapshotNode, NodeType, SimplifiedNode
+
+
+def _random_rect(rng: random.Random, snap: bool) -> Rect:
+	x, y = rng.uniform(-50, 2000), rng.uniform(-50, 6000)
+	width = rng.choice([0, rng.uniform(1, 80), rng.uniform(50, 400), rng.uniform(300, 2500)])
+	height = rng.choice([0, rng.uniform(1, 80), rng.uniform(50, 400), rng.uniform(1000, 6000)])
+	if snap:
+		# shared edges and degenerate rects are where splitting is most fragile
+		x, y, width, height = round(x / 20) * 20, round(y / 20) * 20, round(width / 20) * 20, round(height / 20) * 20
+	return Rect(x, y, x + width, y + height)
+
+
+@pytest.mark.parametrize('snap', [False, True])
+def test_grid_union_matches_pure_union(snap):
+	rng = random.Random(7)
+	pure, grid = RectUnionPure(), RectUnionGrid(cell_size=128)
+	for _ in range(2000):
+		rect = _random_rect(rng, snap)
+		if rng.random() < 0.5:
+			assert grid.contains(rect) == pure.contains(rect)
+		else:
+			assert grid.add(rect) == pure.add(rect)
+	# the grid only narrows down which rectangles are split against, the stored pieces are the same
+	assert grid._rects == pure._rects
+	assert grid._large
+
+
+def _snapshot_node(bounds: DOMRect, paint_order: int, styles: dict[str, str]) -> EnhancedSnapshotNode:
+	return EnhancedSnapshotNode(
+		is_clickable=None,
+		cursor_style=None,
+		bounds=bounds,
+		clientRects=None,
+		scrollRects=None,
+		computed_styles=styles,
+		paint_order=paint_order,
+		stacking_contexts=None,
+	)
+
+
+def _layout(rng: random.Random, count: int) -> SimplifiedNode:
+	children = []
+	for i in range(count):
+		bounds = DOMRect(x=rng.randrange(0, 1900, 10), y=rng.randrange(0, 4000, 10), width=rng.randrange(10, 300, 10), height=40)
+		styles = {'background-color': 'rgb(255, 255, 255)' if rng.random() < 0.7 else 'rgba(0, 0, 0, 0)', 'opacity': '1'}
+		node = EnhancedDOMTreeNode(
+			node_id=i,
+			backend_node_id=i,
+			node_type=NodeType.ELEMENT_NODE,
+			node_name='DIV',
+			node_value='',
+			attributes={},
+			is_scrollable=False,
+			is_visible=True,
+			absolute_position=None,
+			target_id='target-1',
+			frame_id=None,
+			session_id=None,
+			content_document=None,
+			shadow_root_type=None,
+			shadow_roots=None,
+			parent_node=None,
+			children_nodes=[],
+			ax_node=None,
+			snapshot_node=_snapshot_node(bounds, rng.randrange(count // 4 + 1), styles),
+		)
+		children.append(SimplifiedNode(original_node=node, children=[]))
+	root = SimplifiedNode(original_node=children[0].original_node, children=children)
+	return root
+
+
+def test_paint_order_remover_engines_mark_the_same_nodes():
+	results = {}
+	for engine in ('pure', 'grid'):
+		root = _layout(random.Random(11), 1500)
+		PaintOrderRemover(root, engine=engine).calculate_paint_order()
+		results[engine] = [child.ignored_by_paint_order for child in root.children]
+	assert results['grid'] == results['pure']
+	assert 0 < sum(results['grid']) < len(results['grid'])
@@ -0,0 +1,92 @@
+"""
+Tests for block_resources: the URL patterns handed to Network.setBlockedURLs, per-site overrides and the counters.
+"""
+
+from types import SimpleNamespace
+
+from bubus import EventBus
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.network_tracker import NetworkActivityTracker
+from browser_use.browser.watchdogs.dom_watchdog import DOMWatchdog
+from browser_use.browser.watchdogs.resource_blocking_watchdog import (
+	ESTIMATED_BYTES_PER_REQUEST,
+	ResourceBlockingStats,
+	ResourceBlockingWatchdog,
+	blocked_url_patterns,
+)
+
+
+class _RecordingNetwork:
+	def __init__(self):
+		self.blocked_urls: list[tuple[str, list[str]]] = []
+
+	async def enable(self, session_id=None):
+		return {}
+
+	async def setBlockedURLs(self, params, session_id=None):
+		self.blocked_urls.append((session_id, params['urls']))
+		return {}
+
+
+def _watchdog(monkeypatch, **profile_kwargs) -> tuple[ResourceBlockingWatchdog, _RecordingNetwork]:
+	browser_session = BrowserSession(browser_profile=BrowserProfile(headless=True, user_data_dir=None, **profile_kwargs))
+	network = _RecordingNetwork()
+	cdp_client = SimpleNamespace(send=SimpleNamespace(Network=network), register=SimpleNamespace())
+
+	async def get_or_create_cdp_session(self, target_id=None, focus=True):
+		return SimpleNamespace(cdp_client=cdp_client, session_id=f'session-{target_id}')
+
+	monkeypatch.setattr(BrowserSession, 'get_or_create_cdp_session', get_or_create_cdp_session)
+	return ResourceBlockingWatchdog(browser_session=browser_session, event_bus=EventBus()), network
+
+
+def test_blocked_url_patterns():
+	patterns = blocked_url_patterns(('image', 'font'))
+	assert '*.png' in patterns and '*.png?*' in patterns and '*.woff2' in patterns
+	assert not any('css' in pattern for pattern in patterns)
+
+	trackers = blocked_url_patterns(('tracker',), 'www.example.com')
+	assert '*://doubleclick.net/*' in trackers and '*://*.doubleclick.net/*' in trackers
+
+	# the page's own site is never blocked as a tracker
+	first_party = blocked_url_patterns(('tracker',), 'www.hotjar.com')
+	assert '*://*.hotjar.com/*' not in first_party and '*://*.doubleclick.net/*' in first_party
+
+
+async def test_patterns_follow_the_site_overrides(monkeypatch):
+	watchdog, network = _watchdog(
+		monkeypatch,
+		block_resources=['image', 'tracker'],
+		block_resources_overrides={'*.maps.example.com': ['tracker'], 'https://video.example.com': []},
+	)
+
+	await watchdog._apply_blocking('tab1', 'https://news.example.com/article')
+	await watchdog._apply_blocking('tab1', 'https://news.example.com/other')  # same patterns, not sent again
+	await watchdog._apply_blocking('tab1', 'https://maps.example.com/place')
+	await watchdog._apply_blocking('tab2', 'https://video.example.com/watch')
+
+	assert [session_id for session_id, _ in network.blocked_urls] == ['session-tab1', 'session-tab1', 'session-tab2']
+	default, maps, video = (urls for _, urls in network.blocked_urls)
+	assert '*.jpg' in default and '*://*.doubleclick.net/*' in default
+	assert '*.jpg' not in maps and '*://*.doubleclick.net/*' in maps
+	assert video == []
+
+
+async def test_blocked_requests_are_counted(monkeypatch):
+	watchdog, _ = _watchdog(monkeypatch, block_resources=['image'])
+	dom_watchdog = DOMWatchdog(browser_session=watchdog.browser_session, event_bus=watchdog.event_bus)
+	dom_watchdog._network_tracker = NetworkActivityTracker()
+	watchdog.browser_session._dom_watchdog = dom_watchdog
+	tracker = dom_watchdog._network_tracker
+
+	tracker.on_loading_failed({'requestId': '1', 'type': 'Image', 'blockedReason': 'inspector'}, 'session')
+	tracker.on_loading_failed({'requestId': '2', 'type': 'Image', 'blockedReason': 'inspector'}, 'session')
+	tracker.on_loading_failed({'requestId': '3', 'type': 'Script', 'blockedReason': 'inspector'}, 'session')
+	tracker.on_loading_failed({'requestId': '4', 'type': 'Image', 'errorText': 'net::ERR_FAILED'}, 'session')
+
+	stats = watchdog.stats
+	assert stats.blocked_requests == {'Image': 2, 'Script': 1}
+	assert stats.total_blocked_requests == 3
+	assert stats.estimated_bytes_saved == 2 * ESTIMATED_BYTES_PER_REQUEST['Image'] + ESTIMATED_BYTES_PER_REQUEST['Script']
+	assert ResourceBlockingStats().estimated_bytes_saved == 0
@@ -0,0 +1,85 @@
+"""
+Tests for the content-addressed screenshot store.
+"""
+
+import base64
+import io
+import json
+
+import pytest
+from PIL import Image
+
+from browser_use.agent.views import AgentHistory, AgentHistoryList
+from browser_use.browser.views import BrowserStateHistory
+from browser_use.screenshots.service import ScreenshotService
+
+
+def _png(color: tuple[int, int, int]) -> str:
+	buffer = io.BytesIO()
+	Image.new('RGB', (400, 300), color).save(buffer, format='PNG')
+	return base64.b64encode(buffer.getvalue()).decode()
+
+
+async def test_identical_screenshots_are_stored_once(tmp_path):
+	service = ScreenshotService(tmp_path)
+	white, black = _png((255, 255, 255)), _png((0, 0, 0))
+
+	first = await service.store_screenshot(white, 1)
+	second = await service.store_screenshot(white, 2)
+	third = await service.store_screenshot(black, 3)
+	await service.flush()
+
+	assert first == second != third
+	assert sorted(p.name for p in service.blobs_dir.iterdir()) == sorted([first.rsplit('/', 1)[1], third.rsplit('/', 1)[1]])
+	index = [json.loads(line) for line in service.index_path.read_text().splitlines()]
+	assert [entry['step'] for entry in index] == [1, 2, 3]
+	assert index[0]['blob'] == index[1]['blob']
+	assert service.get_step_path(2) == first
+	assert service.stats.screenshots_stored == 3 and service.stats.screenshots_deduplicated == 1
+	assert service.stats.blobs_written == 2
+
+	# history items point at the shared blob
+	history = AgentHistoryList(
+		history=[
+			AgentHistory(
+				model_output=None,
+				result=[],
+				state=BrowserStateHistory(url='', title='', tabs=[], interacted_element=[], screenshot_path=path),
+			)
+			for path in (first, second, third)
+		]
+	)
+	assert history.screenshots() == [white, white, black]
+
+
+async def test_queued_screenshots_are_served_before_they_are_written(tmp_path):
+	service = ScreenshotService(tmp_path)
+	screenshot = _png((10, 20, 30))
+
+	path = await service.store_screenshot(screenshot, 1)
+
+	assert await service.get_screenshot(path) == screenshot
+	await service.flush()
+	assert await service.get_screenshot(path) == screenshot
+	assert await service.get_screenshot(str(tmp_path / 'missing.png')) is None
+
+
+@pytest.mark.parametrize('image_format', ['webp', 'jpeg'])
+async def test_screenshots_are_transcoded(tmp_path, image_format):
+	service = ScreenshotService(tmp_path, image_format=image_format, quality=60)
+
+	path = await service.store_screenshot(_png((200, 100, 50)), 1)
+	await service.flush()
+
+	assert path.endswith(f'.{image_format}')
+	with Image.open(path) as image:
+		assert image.format == image_format.upper()
+		assert image.size == (400, 300)
+	assert service.stats.bytes_written < service.stats.bytes_received
+
+
+def test_invalid_settings_are_rejected(tmp_path):
+	with pytest.raises(ValueError):
+		ScreenshotService(tmp_path, image_format='gif')  # type: ignore[arg-type]
+	with pytest.raises(ValueError):
+		ScreenshotService(tmp_path, quality=0)
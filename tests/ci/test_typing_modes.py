@@ -0,0 +1,118 @@
+"""
+Tests for the typing modes ('human', 'pipelined', 'fast') of Element.fill and the shared keystroke dispatch helpers.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from browser_use.actor.element import Element
+from browser_use.browser.keyboard import ENTER_KEY_EVENTS, FRAMEWORK_EVENTS_JS, dispatch_key_events_pipelined, insert_text
+from browser_use.browser.profile import BrowserProfile
+
+TEXT = 'Hi @you\nok'
+
+
+class FakeCDPClient:
+	"""Records every `client.send.<Domain>.<method>(params=..., session_id=...)` call."""
+
+	def __init__(self, response_delay: float = 0.0):
+		self.calls: list[tuple[str, dict]] = []
+		self.in_flight = 0
+		self.max_in_flight = 0
+		self.response_delay = response_delay
+		self.send = SimpleNamespace(
+			**{domain: _Domain(self, domain) for domain in ('DOM', 'Runtime', 'Input')},
+		)
+
+	async def call(self, method: str, params: dict | None) -> dict:
+		self.calls.append((method, params or {}))
+		self.in_flight += 1
+		self.max_in_flight = max(self.max_in_flight, self.in_flight)
+		try:
+			await asyncio.sleep(self.response_delay)
+		finally:
+			self.in_flight -= 1
+		if method == 'DOM.resolveNode':
+			return {'object': {'objectId': 'object-1'}}
+		return {'result': {'value': True}}
+
+	def key_events(self) -> list[dict]:
+		return [params for method, params in self.calls if method == 'Input.dispatchKeyEvent']
+
+
+class _Domain:
+	def __init__(self, client: FakeCDPClient, domain: str):
+		self._client = client
+		self._domain = domain
+
+	def __getattr__(self, method: str):
+		async def send(params: dict | None = None, session_id: str | None = None) -> dict:
+			return await self._client.call(f'{self._domain}.{method}', params)
+
+		return send
+
+
+def _element(client: FakeCDPClient, typing_mode: str = 'human') -> Element:
+	browser_session = SimpleNamespace(cdp_client=client, browser_profile=BrowserProfile(typing_mode=typing_mode))
+	return Element(browser_session, backend_node_id=42, session_id='session-1')  # type: ignore[arg-type]
+
+
+async def test_pipelined_sends_the_same_key_events_concurrently():
+	human_client = FakeCDPClient(response_delay=0.001)
+	await _element(human_client).fill(TEXT, clear=False)
+	pipelined_client = FakeCDPClient(response_delay=0.001)
+	await _element(pipelined_client).fill(TEXT, clear=False, typing_mode='pipelined')
+
+	human_events = human_client.key_events()
+	assert human_events == pipelined_client.key_events()
+	assert len(human_events) == 3 * len(TEXT)
+	assert human_events[3:6] == [
+		{'type': 'keyDown', 'key': 'i', 'code': 'KeyI', 'modifiers': 0, 'windowsVirtualKeyCode': 73},
+		{'type': 'char', 'text': 'i', 'key': 'i'},
+		{'type': 'keyUp', 'key': 'i', 'code': 'KeyI', 'modifiers': 0, 'windowsVirtualKeyCode': 73},
+	]
+	assert human_events[9]['key'] == '2' and human_events[9]['modifiers'] == 8  # '@' is Shift+2
+	assert tuple(human_events[21:24]) == ENTER_KEY_EVENTS
+
+	assert human_client.max_in_flight == 1
+	assert pipelined_client.max_in_flight == len(human_events)
+
+
+async def test_fast_mode_inserts_lines_and_triggers_framework_events():
+	client = FakeCDPClient()
+	await _element(client, typing_mode='fast').fill(TEXT, clear=False)
+
+	typing_calls = [call for call in client.calls if call[0].startswith('Input.')]
+	assert typing_calls == [
+		('Input.insertText', {'text': 'Hi @you'}),
+		*[('Input.dispatchKeyEvent', params) for params in ENTER_KEY_EVENTS],
+		('Input.insertText', {'text': 'ok'}),
+	]
+	method, params = client.calls[-1]
+	assert method == 'Runtime.callFunctionOn'
+	assert params['functionDeclaration'] == FRAMEWORK_EVENTS_JS and params['objectId'] == 'object-1'
+
+
+async def test_insert_text_only_newlines_and_empty_text():
+	client = FakeCDPClient()
+	await insert_text(client, 'session-1', '\n\n')
+	assert [params for _, params in client.calls] == list(ENTER_KEY_EVENTS) * 2
+
+	client = FakeCDPClient()
+	await insert_text(client, 'session-1', '')
+	await dispatch_key_events_pipelined(client, 'session-1', [])
+	assert client.calls == []
+
+
+async def test_pipelined_dispatch_propagates_errors():
+	class FailingClient(FakeCDPClient):
+		async def call(self, method: str, params: dict | None) -> dict:
+			if params and params.get('text') == 'x':
+				raise RuntimeError('Input.dispatchKeyEvent failed')
+			return await super().call(method, params)
+
+	client = FailingClient()
+	with pytest.raises(RuntimeError):
+		await dispatch_key_events_pipelined(client, 'session-1', [{'type': 'char', 'text': 'a'}, {'type': 'char', 'text': 'x'}])
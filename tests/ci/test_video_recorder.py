@@ -0,0 +1,74 @@
+"""
+Tests for the threaded video recorder pipeline (VideoRecorderService).
+"""
+
+import base64
+import io
+import threading
+
+import pytest
+from PIL import Image
+
+pytest.importorskip('imageio_ffmpeg')
+pytest.importorskip('numpy')
+
+from browser_use.browser.profile import ViewportSize
+from browser_use.browser.video_recorder import VideoRecorderService
+
+
+def _png_frame(width: int, height: int, color: str) -> str:
+	buffer = io.BytesIO()
+	Image.new('RGB', (width, height), color=color).save(buffer, format='PNG')
+	return base64.b64encode(buffer.getvalue()).decode()
+
+
+def test_frames_are_resized_padded_and_encoded(tmp_path):
+	output_path = tmp_path / 'recording.mp4'
+	recorder = VideoRecorderService(output_path=output_path, size=ViewportSize(width=100, height=50), framerate=10)
+	recorder.start()
+	assert recorder._is_active
+
+	for color in ('red', 'green', 'blue'):
+		recorder.add_frame(_png_frame(200, 100, color))
+	recorder.stop_and_save()
+
+	assert output_path.exists() and output_path.stat().st_size > 0
+	assert recorder.stats.frames_received == 3
+	assert recorder.stats.frames_encoded == 3
+	assert recorder.stats.frames_dropped == 0
+	assert (recorder.padded_size['width'], recorder.padded_size['height']) == (112, 64)
+
+
+def test_add_frame_drops_oldest_frames_under_backpressure(tmp_path):
+	recorder = VideoRecorderService(
+		output_path=tmp_path / 'recording.mp4', size=ViewportSize(width=32, height=32), framerate=10, max_queued_frames=2
+	)
+	release_encoder = threading.Event()
+	encoded_shapes = []
+
+	class SlowWriter:
+		def append_data(self, frame):
+			release_encoder.wait(timeout=5)
+			encoded_shapes.append(frame.shape)
+
+		def close(self):
+			pass
+
+	# simulate start() with a writer that blocks until released
+	recorder._writer = SlowWriter()  # type: ignore[assignment]
+	recorder._is_active = True
+	recorder._encoder_thread = threading.Thread(target=recorder._encode_frames, daemon=True)
+	recorder._encoder_thread.start()
+
+	frame = _png_frame(32, 32, 'white')
+	for _ in range(10):
+		recorder.add_frame(frame)  # must never block, even though the encoder is stuck
+
+	release_encoder.set()
+	recorder.stop_and_save()
+
+	stats = recorder.stats
+	assert stats.frames_received == 10
+	assert stats.frames_dropped > 0
+	assert stats.frames_encoded + stats.frames_dropped == 10
+	assert set(encoded_shapes) == {(32, 32, 3)}
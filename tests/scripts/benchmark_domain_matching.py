@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Benchmark domain list matching: one fnmatch per pattern vs the compiled matchers of browser_use.domain_policy.
+
+Usage:
+	python tests/scripts/benchmark_domain_matching.py [--patterns 100 1000 10000] [--urls 2000]
+
+The pattern lists mix exact domains, *.domain patterns and a few other globs, like an enterprise block list. The URLs
+are drawn from a few hundred hosts (some blocked, most not), so the per-host verdict cache sees realistic reuse.
+The "loop" columns are the previous implementations (SecurityWatchdog._is_url_match / match_url_with_domain_pattern
+called for every pattern until one matches).
+"""
+
+import argparse
+import fnmatch
+import random
+import time
+from urllib.parse import urlparse
+
+from browser_use.domain_policy import DomainListMatcher, UrlPatternMatcher, is_root_domain
+
+TLDS = ['com', 'net', 'org', 'io', 'de']
+
+
+def build_patterns(count: int, rng: random.Random) -> list[str]:
+	patterns = []
+	for i in range(count):
+		domain = f'tracker{i}.{rng.choice(TLDS)}'
+		kind = i % 10
+		if kind < 6:
+			patterns.append(domain)
+		elif kind < 9:
+			patterns.append(f'*.{domain}')
+		else:
+			patterns.append(f'http*://ads{i}.{rng.choice(TLDS)}')
+	return patterns
+
+
+def build_urls(count: int, patterns: list[str], rng: random.Random) -> list[str]:
+	hosts = [f'site{i}.{rng.choice(TLDS)}' for i in range(300)]
+	hosts += [pattern.split('://')[-1].replace('*.', 'cdn.') for pattern in rng.sample(patterns, min(100, len(patterns)))]
+	return [f'https://{rng.choice(hosts)}/page/{rng.randint(0, 1000)}' for _ in range(count)]
+
+
+def domain_list_loop(url: str, patterns: list[str]) -> bool:
+	parsed = urlparse(url)
+	host, scheme = parsed.hostname or '', parsed.scheme
+	for pattern in patterns:
+		if '*' in pattern:
+			if pattern.startswith('*.'):
+				domain_part = pattern[2:]
+				if (host == domain_part or host.endswith('.' + domain_part)) and scheme in ['http', 'https']:
+					return True
+			elif pattern.endswith('/*'):
+				if fnmatch.fnmatch(url, pattern):
+					return True
+			elif fnmatch.fnmatch(f'{scheme}://{host}' if '://' in pattern else host, pattern):
+				return True
+		elif '://' in pattern:
+			if url.startswith(pattern):
+				return True
+		elif host.lower() == pattern.lower() or (is_root_domain(pattern) and host.lower() == f'www.{pattern.lower()}'):
+			return True
+	return False
+
+
+def url_pattern_loop(url: str, patterns: list[str]) -> bool:
+	parsed = urlparse(url)
+	scheme, domain = parsed.scheme.lower(), (parsed.hostname or '').lower()
+	for domain_pattern in patterns:
+		domain_pattern = domain_pattern.lower()
+		pattern_scheme, pattern_domain = domain_pattern.split('://', 1) if '://' in domain_pattern else ('https', domain_pattern)
+		if not fnmatch.fnmatch(scheme, pattern_scheme):
+			continue
+		if domain == pattern_domain:
+			return True
+		if pattern_domain.startswith('*.') and (domain == pattern_domain[2:] or fnmatch.fnmatch(domain, pattern_domain)):
+			return True
+	return False
+
+
+def per_url(func, urls: list[str]) -> tuple[float, list[bool]]:
+	start = time.perf_counter()
+	results = [func(url) for url in urls]
+	return (time.perf_counter() - start) / len(urls), results
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--patterns', type=int, nargs='+', default=[100, 1000, 10_000])
+	parser.add_argument('--urls', type=int, default=2000)
+	args = parser.parse_args()
+	rng = random.Random(0)
+
+	print(f'{"patterns":>8} {"build":>9} {"list loop":>11} {"list":>9} {"action loop":>12} {"action":>9} {"matched":>8}')
+	for count in args.patterns:
+		patterns = build_patterns(count, rng)
+		urls = build_urls(args.urls, patterns, rng)
+		loop_urls = urls[: max(50, args.urls * 100 // count)]
+
+		start = time.perf_counter()
+		domain_list = DomainListMatcher(patterns)
+		url_patterns = UrlPatternMatcher(patterns)
+		build_time = time.perf_counter() - start
+
+		def compiled_list(url: str) -> bool:
+			parsed = urlparse(url)
+			return domain_list.matches(url, parsed.hostname or '', parsed.scheme)
+
+		list_loop_time, expected = per_url(lambda url: domain_list_loop(url, patterns), loop_urls)
+		list_time, results = per_url(compiled_list, urls)
+		assert results[: len(loop_urls)] == expected
+		action_loop_time, expected = per_url(lambda url: url_pattern_loop(url, patterns), loop_urls)
+		action_time, results = per_url(url_patterns.matches, urls)
+		assert results[: len(loop_urls)] == expected
+		print(
+			f'{count:>8} {build_time * 1000:7.1f}ms {list_loop_time * 1e6:9.1f}us {list_time * 1e6:7.2f}us '
+			f'{action_loop_time * 1e6:10.1f}us {action_time * 1e6:7.2f}us {sum(results):>8}'
+		)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Benchmark the DOM to markdown conversion: HTMLSerializer + markdownify vs the direct MarkdownSerializer.
+
+Usage:
+	python tests/scripts/benchmark_markdown_conversion.py [--sizes 1000 10000 50000] [--links]
+
+Each page is a synthetic enhanced DOM tree with a navigation list, article sections (headings, paragraphs with
+inline formatting and links, lists, code blocks), data tables and an iframe. Both converters run on the same tree
+and their markdown is compared.
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from browser_use.dom.markdown_extractor import dom_tree_to_markdown
+from browser_use.dom.views import EnhancedDOMTreeNode, NodeType
+
+WORDS = ['browser', 'agent', 'page', 'table', 'value', 'result', 'search', 'price', 'order', 'user', 'the', 'a', 'of']
+
+
+def _node(node_type: NodeType, name: str, value: str = '', children: list[EnhancedDOMTreeNode] | None = None, **attributes):
+	node = EnhancedDOMTreeNode(
+		node_id=0,
+		backend_node_id=0,
+		node_type=node_type,
+		node_name=name,
+		node_value=value,
+		attributes=attributes,
+		is_scrollable=False,
+		is_visible=True,
+		absolute_position=None,
+		target_id='benchmark',
+		frame_id=None,
+		session_id=None,
+		content_document=None,
+		shadow_root_type=None,
+		shadow_roots=None,
+		parent_node=None,
+		children_nodes=children or [],
+		ax_node=None,
+		snapshot_node=None,
+	)
+	for child in node.children_nodes:
+		child.parent_node = node
+	return node
+
+
+def _el(name: str, *children: EnhancedDOMTreeNode, **attributes) -> EnhancedDOMTreeNode:
+	return _node(NodeType.ELEMENT_NODE, name.upper(), children=list(children), **attributes)
+
+
+def _text(value: str) -> EnhancedDOMTreeNode:
+	return _node(NodeType.TEXT_NODE, '#text', value)
+
+
+def _sentence(rng: random.Random, words: int = 12) -> str:
+	return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def _paragraph(rng: random.Random) -> EnhancedDOMTreeNode:
+	return _el(
+		'p',
+		_text(_sentence(rng) + ' '),
+		_el('a', _text(_sentence(rng, 3)), href=f'/item/{rng.randint(0, 10_000)}?ref=list&page=2'),
+		_text(' and '),
+		_el('strong', _text(_sentence(rng, 2))),
+		_text(', ' + _sentence(rng, 8) + '.'),
+	)
+
+
+def _table(rng: random.Random, rows: int) -> EnhancedDOMTreeNode:
+	header = _el('thead', _el('tr', *(_el('th', _text(word)) for word in ('Name', 'Price', 'Stock'))))
+	body = _el(
+		'tbody',
+		*(
+			_el(
+				'tr', _el('td', _text(_sentence(rng, 2))), _el('td', _text(f'${rng.randint(1, 999)}.99')), _el('td', _text('yes'))
+			)
+			for _ in range(rows)
+		),
+	)
+	return _el('table', header, body)
+
+
+def build_page(size: int, seed: int = 0) -> EnhancedDOMTreeNode:
+	"""A page with roughly `size` nodes."""
+	rng = random.Random(seed)
+	nav = _el('nav', _el('ul', *(_el('li', _el('a', _text(word.title()), href=f'/{word}')) for word in WORDS)))
+	sections: list[EnhancedDOMTreeNode] = []
+	nodes = 0
+	while nodes < size:
+		section = _el(
+			'section',
+			_el('h2', _text(_sentence(rng, 4).title())),
+			*(_paragraph(rng) for _ in range(4)),
+			_el('ul', *(_el('li', _text(_sentence(rng, 6))) for _ in range(5))),
+			_el('pre', _el('code', _text('for item in items:\n    print(item)\n'))),
+			_table(rng, 8),
+			_el('script', _text('window.analytics = {};')),
+		)
+		sections.append(section)
+		nodes += 150
+
+	frame_document = _node(NodeType.DOCUMENT_NODE, '#document', children=[_el('html', _el('body', _paragraph(rng)))])
+	iframe = _el('iframe', src='/embedded')
+	iframe.content_document = frame_document
+	body = _el('body', nav, _el('main', *sections), iframe)
+	return _node(NodeType.DOCUMENT_NODE, '#document', children=[_el('html', _el('head', _el('title', _text('Page'))), body)])
+
+
+def run(converter: str, page: EnhancedDOMTreeNode, extract_links: bool) -> tuple[float, str]:
+	start = time.perf_counter()
+	content, _ = dom_tree_to_markdown(page, extract_links=extract_links, converter=converter)
+	return time.perf_counter() - start, content
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000])
+	parser.add_argument('--links', action='store_true', help='keep links in the markdown (extract_links=True)')
+	args = parser.parse_args()
+	sys.setrecursionlimit(10_000)  # markdownify converts recursively
+	run('markdownify', build_page(100), args.links)  # warm up (imports markdownify and bs4)
+
+	print(f'{"nodes":>8} {"markdownify":>13} {"direct":>12} {"speedup":>9} {"markdown":>10}  identical')
+	for size in args.sizes:
+		page = build_page(size)
+		markdownify_time, markdownify_content = run('markdownify', page, args.links)
+		direct_time, direct_content = run('dom', page, args.links)
+		print(
+			f'{size:>8} {markdownify_time * 1000:11.1f}ms {direct_time * 1000:10.1f}ms '
+			f'{markdownify_time / direct_time:8.1f}x {len(direct_content):>10}  {markdownify_content == direct_content}'
+		)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Benchmark the paint order occlusion engines (RectUnionPure vs RectUnionGrid) on synthetic layouts.
+
+Usage:
+	python tests/scripts/benchmark_paint_order.py [--sizes 1000 10000 50000] [--max-pure-size 10000]
+
+Each layout is a virtualized grid of cells (spreadsheet / data table) with sticky headers, a map-like layer of
+overlapping markers and a modal covering part of the page. Both engines run PaintOrderRemover on the same tree
+and the ignored_by_paint_order flags are compared.
+"""
+
+import argparse
+import random
+import time
+
+from browser_use.dom.serializer.paint_order import PaintOrderRemover
+from browser_use.dom.views import DOMRect, EnhancedDOMTreeNode, EnhancedSnapshotNode, NodeType, SimplifiedNode
+
+OPAQUE = {'background-color': 'rgb(255, 255, 255)', 'opacity': '1'}
+TRANSPARENT = {'background-color': 'rgba(0, 0, 0, 0)', 'opacity': '1'}
+
+
+def _node(index: int, x: float, y: float, width: float, height: float, paint_order: int, styles: dict) -> SimplifiedNode:
+	snapshot = EnhancedSnapshotNode(
+		is_clickable=None,
+		cursor_style=None,
+		bounds=DOMRect(x=x, y=y, width=width, height=height),
+		clientRects=None,
+		scrollRects=None,
+		computed_styles=styles,
+		paint_order=paint_order,
+		stacking_contexts=None,
+	)
+	original = EnhancedDOMTreeNode(
+		node_id=index,
+		backend_node_id=index,
+		node_type=NodeType.ELEMENT_NODE,
+		node_name='DIV',
+		node_value='',
+		attributes={},
+		is_scrollable=False,
+		is_visible=True,
+		absolute_position=None,
+		target_id='benchmark',
+		frame_id=None,
+		session_id=None,
+		content_document=None,
+		shadow_root_type=None,
+		shadow_roots=None,
+		parent_node=None,
+		children_nodes=[],
+		ax_node=None,
+		snapshot_node=snapshot,
+	)
+	return SimplifiedNode(original_node=original, children=[])
+
+
+def build_layout(size: int, seed: int = 0) -> SimplifiedNode:
+	rng = random.Random(seed)
+	nodes: list[SimplifiedNode] = []
+	root = _node(0, 0, 0, 1920, 1080, 0, OPAQUE)
+
+	columns = 20
+	cell_width, cell_height = 96.0, 24.0
+	cells = int(size * 0.8)
+	for i in range(cells):
+		row, column = divmod(i, columns)
+		# cell background and its (transparent) text span on top of it
+		styles = OPAQUE if i % 2 == 0 else TRANSPARENT
+		nodes.append(_node(len(nodes) + 1, column * cell_width, 40 + row * cell_height, cell_width, cell_height, i + 1, styles))
+
+	# sticky header row painted above the cells
+	for column in range(columns):
+		nodes.append(_node(len(nodes) + 1, column * cell_width, 40, cell_width, 40, cells + column + 1, OPAQUE))
+
+	# map-like markers scattered over the grid, overlapping each other
+	page_height = 40 + (cells // columns + 1) * cell_height
+	for i in range(size - len(nodes) - 1):
+		x, y = rng.uniform(0, 1900), rng.uniform(0, page_height)
+		nodes.append(_node(len(nodes) + 1, x, y, rng.uniform(12, 40), rng.uniform(12, 40), cells + columns + i + 1, OPAQUE))
+
+	# modal dialog on top of everything
+	nodes.append(_node(len(nodes) + 1, 480, 200, 960, 600, cells + size, OPAQUE))
+
+	root.children = nodes
+	return root
+
+
+def run_engine(engine: str, size: int) -> tuple[float, list[bool]]:
+	root = build_layout(size)
+	start = time.perf_counter()
+	PaintOrderRemover(root, engine=engine).calculate_paint_order()  # type: ignore[arg-type]
+	elapsed = time.perf_counter() - start
+	return elapsed, [child.ignored_by_paint_order for child in root.children]
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000])
+	parser.add_argument(
+		'--max-pure-size', type=int, default=10000, help='skip RectUnionPure above this many rects (it is quadratic)'
+	)
+	args = parser.parse_args()
+
+	print(f'{"rects":>8} {"pure":>12} {"grid":>12} {"speedup":>9} {"ignored":>9}  identical')
+	for size in args.sizes:
+		grid_time, grid_flags = run_engine('grid', size)
+		if size <= args.max_pure_size:
+			pure_time, pure_flags = run_engine('pure', size)
+			pure_column = f'{pure_time * 1000:10.1f}ms'
+			speedup = f'{pure_time / grid_time:8.1f}x'
+			identical = str(pure_flags == grid_flags)
+		else:
+			pure_column, speedup, identical = f'{"skipped":>12}', f'{"-":>9}', '-'
+		print(f'{size:>8} {pure_column} {grid_time * 1000:10.1f}ms {speedup} {sum(grid_flags):>9}  {identical}')
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Benchmark masking sensitive data: one str.replace per secret vs the compiled SensitiveDataMatcher.
+
+Usage:
+	python tests/scripts/benchmark_sensitive_data_masking.py [--secrets 10 100 500 2000] [--chars 100000]
+
+The text is a synthetic DOM prompt (words, URLs, numbers) with a few of the secrets embedded. The secrets are
+passwords, API tokens and e-mail addresses split over a few domains in the {domain: {key: value}} format. The
+"replace" column is the previous implementation (flatten the dict on every call, then one replace per secret).
+"""
+
+import argparse
+import random
+import string
+import time
+
+from browser_use.sensitive_data import MASK_REGEX_MIN_SECRETS, get_sensitive_data_matcher
+
+WORDS = ['browser', 'agent', 'page', 'table', 'value', 'result', 'search', 'price', 'order', 'user', 'the', 'a', 'of']
+
+
+def build_secrets(count: int, rng: random.Random) -> dict[str, str | dict[str, str]]:
+	secrets: dict[str, str | dict[str, str]] = {}
+	for i in range(count):
+		kind = i % 3
+		if kind == 0:
+			value = ''.join(rng.choices(string.ascii_letters + string.digits + '!@#$%', k=rng.randint(10, 20)))
+		elif kind == 1:
+			value = 'sk-' + ''.join(rng.choices(string.ascii_letters + string.digits, k=40))
+		else:
+			value = f'{rng.choice(WORDS)}.{i}@example.com'
+		domain_secrets = secrets.setdefault(f'https://*.site{i % 8}.com', {})
+		assert isinstance(domain_secrets, dict)
+		domain_secrets[f'secret_{i}'] = value
+	return secrets
+
+
+def build_text(chars: int, secrets: dict[str, str | dict[str, str]], rng: random.Random) -> str:
+	values = [value for content in secrets.values() if isinstance(content, dict) for value in content.values()]
+	parts: list[str] = []
+	size = 0
+	while size < chars:
+		part = rng.choice(
+			[
+				' '.join(rng.choice(WORDS) for _ in range(8)),
+				f'[{rng.randint(1, 500)}]<a href=/item/{rng.randint(0, 10_000)}>{rng.choice(WORDS)}</a>',
+				f'${rng.randint(1, 999)}.{rng.randint(10, 99)}',
+			]
+		)
+		if rng.random() < 0.002 and values:
+			part = rng.choice(values)
+		parts.append(part)
+		size += len(part) + 1
+	return '\n'.join(parts)
+
+
+def replace_each(text: str, sensitive_data: dict[str, str | dict[str, str]]) -> str:
+	sensitive_values: dict[str, str] = {}
+	for key_or_domain, content in sensitive_data.items():
+		if isinstance(content, dict):
+			for key, val in content.items():
+				if val:
+					sensitive_values[key] = val
+		elif content:
+			sensitive_values[key_or_domain] = content
+	for key, val in sensitive_values.items():
+		text = text.replace(val, f'<secret>{key}</secret>')
+	return text
+
+
+def timed(func, *args, repeat: int = 5) -> tuple[float, str]:
+	result = func(*args)
+	start = time.perf_counter()
+	for _ in range(repeat):
+		result = func(*args)
+	return (time.perf_counter() - start) / repeat, result
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--secrets', type=int, nargs='+', default=[10, 100, 500, 2000])
+	parser.add_argument('--chars', type=int, default=100_000)
+	args = parser.parse_args()
+	rng = random.Random(0)
+
+	print(f'regex matcher from {MASK_REGEX_MIN_SECRETS} secrets, {args.chars} characters of text')
+	print(f'{"secrets":>8} {"build":>9} {"replace":>10} {"matcher":>10} {"speedup":>9} {"masked":>7}')
+	for count in args.secrets:
+		sensitive_data = build_secrets(count, rng)
+		text = build_text(args.chars, sensitive_data, rng)
+
+		start = time.perf_counter()
+		matcher = get_sensitive_data_matcher(sensitive_data)
+		build_time = time.perf_counter() - start
+
+		replace_time, _ = timed(replace_each, text, sensitive_data)
+		matcher_time, masked = timed(lambda value: get_sensitive_data_matcher(sensitive_data).mask(value), text)
+		assert matcher.mask(text) == masked
+		print(
+			f'{count:>8} {build_time * 1000:7.1f}ms {replace_time * 1000:8.1f}ms {matcher_time * 1000:8.1f}ms '
+			f'{replace_time / matcher_time:8.1f}x {masked.count("<secret>"):>7}'
+		)
+
+
+if __name__ == '__main__':
+	main()